@@ -0,0 +1,260 @@
+"""
+10/19/2026
+
+Purpose:
+    Local cache of the generated files (pickle, db, build record) stored by the hash of the inputs they were made with
+
+Important Note:
+    The key of a set of generated files is the sha256 of champions.json, traits.json, the team_composition_size and
+    the ENGINE_VERSION so generated files from another patch (or from an older version of the search) are never reused.
+
+    Checking a cache entry only compares the size of its files to the size in the manifest, hashing an 11 GB db file
+    on every startup would defeat the purpose of the cache.
+
+    Cache layout:
+        DIR_ARTIFACT_CACHE/
+            manifest.json
+            <key>/
+                TFT_Champion_Combinations_Pickle_list_tuple.pickle
+                champion_name_team_composition.db
+                build_record/
+
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict
+
+from Teamfight_Tactics_Composition_Solver.constants import DIR_ARTIFACT_CACHE, NAME_ARTIFACT_CACHE_MANIFEST, \
+    ENGINE_VERSION, NAME_PICKLE_LIST_TUPLE, NAME_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION
+
+# Name of the build record dir in a cache entry
+NAME_DIR_BUILD_RECORD = "build_record"
+
+# Size of the chunks read when hashing a file
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _get_file_sha256(path: str) -> str:
+    """
+    Get the sha256 of a file
+
+    :param path: path to the file
+    :return: hex digest
+    """
+    hash_sha256 = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            hash_sha256.update(chunk)
+
+    return hash_sha256.hexdigest()
+
+
+class ArtifactCache:
+
+    def __init__(self, dir_cache: str = DIR_ARTIFACT_CACHE):
+        """
+        Cache of generated files keyed by the hash of the inputs they were made with
+
+        :param dir_cache: path to the dir of the cache
+        """
+        self.dir_cache = dir_cache  # type: str
+
+        self.path_manifest = os.path.join(self.dir_cache, NAME_ARTIFACT_CACHE_MANIFEST)  # type: str
+
+        # key -> dict of the entry
+        self.dict_key_value_dict_entry = {}  # type: Dict[str, dict]
+
+        self._load_manifest()
+
+    def _load_manifest(self):
+        """
+        Load the manifest of the cache if it exists
+        :return: None
+        """
+        if os.path.exists(self.path_manifest):
+            with open(self.path_manifest, "r") as file:
+                self.dict_key_value_dict_entry = json.load(file)
+
+    def _write_manifest(self):
+        """
+        Write the manifest of the cache (Written to a temp file first so a crash can not leave half of a manifest)
+        :return: None
+        """
+        os.makedirs(self.dir_cache, exist_ok=True)
+
+        path_manifest_temp = self.path_manifest + ".tmp"
+
+        with open(path_manifest_temp, "w") as file:
+            json.dump(self.dict_key_value_dict_entry, file, indent=4, sort_keys=True)
+
+        os.replace(path_manifest_temp, self.path_manifest)
+
+    @staticmethod
+    def get_dict_key_input(path_champions: str, path_traits: str, team_composition_size: int) -> dict:
+        """
+        Get the inputs that make up the key of a set of generated files
+
+        :param path_champions: path to json file of champions
+        :param path_traits: path to json file to traits of the champions
+        :param team_composition_size: team comp size
+        :return: dict of the inputs
+        """
+        return {"champions_sha256": _get_file_sha256(path_champions),
+                "traits_sha256": _get_file_sha256(path_traits),
+                "team_composition_size": team_composition_size,
+                "engine_version": ENGINE_VERSION}
+
+    @staticmethod
+    def get_key(dict_key_input: dict) -> str:
+        """
+        Get the key of a set of generated files given its inputs
+
+        :param dict_key_input: dict from get_dict_key_input
+        :return: key
+        """
+        return hashlib.sha256(json.dumps(dict_key_input, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get_dir_entry(self, key: str) -> str:
+        """
+        Get the path to the dir of a cache entry
+        :param key: key of the entry
+        :return: path
+        """
+        return os.path.join(self.dir_cache, key)
+
+    def get_path_pickle_list_tuple(self, key: str) -> str:
+        """
+        Get the path to the pickle file of a cache entry
+        :param key: key of the entry
+        :return: path
+        """
+        return os.path.join(self.get_dir_entry(key), NAME_PICKLE_LIST_TUPLE)
+
+    def get_path_db(self, key: str) -> str:
+        """
+        Get the path to the db file of a cache entry
+        :param key: key of the entry
+        :return: path
+        """
+        return os.path.join(self.get_dir_entry(key), NAME_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION)
+
+    def get_dir_build_record(self, key: str) -> str:
+        """
+        Get the path to the build record dir of a cache entry
+        :param key: key of the entry
+        :return: path
+        """
+        return os.path.join(self.get_dir_entry(key), NAME_DIR_BUILD_RECORD)
+
+    def is_entry_valid(self, key: str) -> bool:
+        """
+        Check if a cache entry is in the manifest and its files have the size recorded in the manifest
+
+        :param key: key of the entry
+        :return: bool
+        """
+        dict_entry = self.dict_key_value_dict_entry.get(key)
+
+        if dict_entry is None:
+            return False
+
+        for name_file, size_file in dict_entry["files"].items():
+            path_file = os.path.join(self.get_dir_entry(key), name_file)
+
+            if not os.path.isfile(path_file) or os.path.getsize(path_file) != size_file:
+                return False
+
+        return True
+
+    def get_path_db_valid(self, path_champions: str, path_traits: str, team_composition_size: int) -> str:
+        """
+        Get the path to the db file of the valid cache entry of the inputs (For the tools that read the db)
+
+        :param path_champions: path to json file of champions
+        :param path_traits: path to json file to traits of the champions
+        :param team_composition_size: team comp size
+        :return: path
+        :raises FileNotFoundError: there is no valid entry for the inputs
+        """
+        key = self.get_key(self.get_dict_key_input(path_champions, path_traits, team_composition_size))
+
+        if not self.is_entry_valid(key):
+            raise FileNotFoundError("No generated files for {} and {} with team composition size {}, run main.py "
+                                    "first".format(path_champions, path_traits, team_composition_size))
+
+        return self.get_path_db(key)
+
+    def add_entry(self, key: str, dict_key_input: dict) -> bool:
+        """
+        Add the generated files in the dir of a cache entry to the manifest
+
+        :param key: key of the entry
+        :param dict_key_input: dict from get_dict_key_input that made the key
+        :return: True if the entry was added, False if the generated files do not exist
+        """
+        dict_files = {}
+
+        for name_file in (NAME_PICKLE_LIST_TUPLE, NAME_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION):
+            path_file = os.path.join(self.get_dir_entry(key), name_file)
+
+            if not os.path.isfile(path_file):
+                print("{} does not exist, the cache entry {} was not added!".format(path_file, key))
+                return False
+
+            dict_files[name_file] = os.path.getsize(path_file)
+
+        self.dict_key_value_dict_entry[key] = {"input": dict_key_input,
+                                               "files": dict_files,
+                                               "time_created": time.time()}
+
+        self._write_manifest()
+
+        return True
+
+    def remove_entry(self, key: str):
+        """
+        Remove a cache entry from the manifest and delete its dir
+
+        :param key: key of the entry
+        :return: None
+        """
+        self.dict_key_value_dict_entry.pop(key, None)
+
+        self._write_manifest()
+
+        shutil.rmtree(self.get_dir_entry(key), ignore_errors=True)
+
+    def get_key_latest(self, team_composition_size: int) -> str:
+        """
+        Get the key of the newest valid cache entry made with the same team_composition_size and ENGINE_VERSION
+        (Used as the starting point of an incremental build)
+
+        :param team_composition_size: team comp size
+        :return: key or None if there is no such entry
+        """
+        list_tuple_time_created_key = [
+            (dict_entry["time_created"], key) for key, dict_entry in self.dict_key_value_dict_entry.items() if
+            dict_entry["input"]["team_composition_size"] == team_composition_size and
+            dict_entry["input"]["engine_version"] == ENGINE_VERSION and
+            self.is_entry_valid(key)]
+
+        if not list_tuple_time_created_key:
+            return None
+
+        return max(list_tuple_time_created_key)[1]
+
+    def copy_entry(self, key_source: str, key_destination: str):
+        """
+        Copy the files of a cache entry into the dir of another cache entry (Not added to the manifest)
+
+        :param key_source: key of the entry to copy
+        :param key_destination: key of the new entry
+        :return: None
+        """
+        shutil.rmtree(self.get_dir_entry(key_destination), ignore_errors=True)
+
+        shutil.copytree(self.get_dir_entry(key_source), self.get_dir_entry(key_destination))
@@ -0,0 +1,473 @@
+"""
+10/19/2026
+
+Purpose:
+    Run a file of query specs (The filters of the GUI) against the db on a pool of processes and stream the results
+    to a CSV or JSON lines report, for the nightly "best team compositions per champion/pair" tables
+
+Important Note:
+    A spec is a json object, the spec file is a json list of specs or one spec per line (JSON lines):
+
+        {"name": "Ahri best", "include": ["Ahri"], "exclude": ["Annie"], "size_min": 4, "size_max": 4,
+         "trait_total_min": 0, "trait_total_max": 100, "trait_count_discrete": false,
+         "sort": [["trait_count_discrete_total", "desc"], ["team_composition", "asc"]], "limit": 10,
+         "emblems": ["Rebel Medal", 68]}
+
+    Only include is required, the sort columns are team_composition, team_composition_size and
+    trait_count_discrete_total (First column is the primary sort), the default sort is the sort of the GUI. emblems are
+    item ids or item names, the results are the same as the emblems of TeamCompositionQueryServer (Only the team
+    compositions of the db are re-scored with the emblems, see EmblemSet).
+
+    --generate champion or --generate pair makes a spec for every champion or every pair of champions instead of
+    reading a spec file, the other arguments are the defaults of every spec.
+
+    Every worker process opens its own read only connection to the db (immutable, the db is not changed while the
+    report runs) and runs the same query and formatting as the GUI (SQLiteHandlerTeamCompositionSolver and
+    TeamCompositionFormatter). The results are written in the order of the specs as soon as they are done.
+
+    The report only queries the db, there is no other precomputed store of the team compositions to query.
+
+        python -m Teamfight_Tactics_Composition_Solver.BatchQuery --generate pair --size-min 4 --limit 5
+            --output pairs.csv --latency-output pairs_latency.csv
+
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.ArtifactCache import ArtifactCache
+from Teamfight_Tactics_Composition_Solver.TeamCompositionFormatter import get_list_tuples_to_be_inserted, \
+    sort_list_tuples_to_be_inserted, get_list_dict_team_composition, TUPLE_INDEX_INDEX_STATE_DEFAULT, \
+    INDEX_STATE_ASCENDING, INDEX_STATE_DESCENDING, INDEX_COLUMN_TEAM_COMPOSITION, INDEX_COLUMN_TEAM_COMPOSITION_SIZE, \
+    INDEX_COLUMN_TRAIT_COUNT_TOTAL, get_list_tuples_to_be_inserted_trait_count_total
+from Teamfight_Tactics_Composition_Solver.ItemPool import ItemPool
+from Teamfight_Tactics_Composition_Solver.TeamCompositionSolver import TeamCompositionSolver
+from Teamfight_Tactics_Composition_Solver.constants import PATH_CHAMPIONS, PATH_TRAITS, TEAM_COMPOSITION_SIZE_MIN, \
+    TEAM_COMPOSITION_SIZE_MAX, TRAIT_COUNT_DISCRETE_TOTAL_MIN, TRAIT_COUNT_TOTAL_MAX
+
+GENERATE_CHAMPION = "champion"
+GENERATE_PAIR = "pair"
+
+FORMAT_CSV = "csv"
+FORMAT_JSON_LINES = "jsonl"
+
+# Sort column name -> index of the column of a row of the Treeview
+DICT_KEY_SORT_COLUMN_VALUE_INDEX = {"team_composition": INDEX_COLUMN_TEAM_COMPOSITION,
+                                    "team_composition_size": INDEX_COLUMN_TEAM_COMPOSITION_SIZE,
+                                    "trait_count_discrete_total": INDEX_COLUMN_TRAIT_COUNT_TOTAL}
+
+DICT_KEY_SORT_DIRECTION_VALUE_INDEX_STATE = {"asc": INDEX_STATE_ASCENDING,
+                                             "desc": INDEX_STATE_DESCENDING}
+
+LIST_CSV_HEADER = ["query", "rank", "team_composition", "team_composition_size", "trait_count_discrete_total",
+                   "traits"]
+
+LIST_CSV_HEADER_LATENCY = ["query", "count", "latency_query_ms", "latency_format_ms", "process_id", "error"]
+
+# TeamCompositionSolver of a worker process (Made by _initialize_worker)
+_team_composition_solver_worker = None  # type: TeamCompositionSolver
+
+
+def get_tuple_index_index_state_from_sort(list_sort: list) -> Tuple[Tuple[int, int], ...]:
+    """
+    Get the (column index, index state) of sort_list_tuples_to_be_inserted from the sort of a spec
+
+    :param list_sort: list of [column name, "asc" or "desc"] with the primary sort first
+    :return: tuple of (column index, index state) with the primary sort last
+    """
+    list_tuple_index_index_state = []
+
+    for item in list_sort:
+        if not isinstance(item, (list, tuple)) or len(item) != 2:
+            raise ValueError("sort must be a list of [column, asc or desc]")
+
+        column, direction = item
+
+        if column not in DICT_KEY_SORT_COLUMN_VALUE_INDEX:
+            raise ValueError("Unknown sort column {} (Expected one of {})".format(
+                column, ", ".join(DICT_KEY_SORT_COLUMN_VALUE_INDEX)))
+
+        if direction not in DICT_KEY_SORT_DIRECTION_VALUE_INDEX_STATE:
+            raise ValueError("Unknown sort direction {} (Expected asc or desc)".format(direction))
+
+        list_tuple_index_index_state.append((DICT_KEY_SORT_COLUMN_VALUE_INDEX[column],
+                                             DICT_KEY_SORT_DIRECTION_VALUE_INDEX_STATE[direction]))
+
+    # Python's sort is stable so the primary sort is done last
+    return tuple(reversed(list_tuple_index_index_state))
+
+
+def get_dict_spec(dict_spec: dict, index: int, dict_key_champion_name_lower_value_champion_name: Dict[str, str],
+                  dict_spec_default: dict = None, item_pool: ItemPool = None) -> dict:
+    """
+    Validate and normalize a spec
+
+    :param dict_spec: spec from the spec file
+    :param index: position of the spec in the spec file (Its name if it has none)
+    :param dict_key_champion_name_lower_value_champion_name: lower case champion name -> champion name
+    :param dict_spec_default: values of the keys the spec does not have
+    :param item_pool: ItemPool the emblems are checked with (None to not check them)
+    :return: normalized spec
+    :raises ValueError: the spec is not valid
+    """
+    if not isinstance(dict_spec, dict):
+        raise ValueError("Spec {} is not a json object".format(index))
+
+    dict_spec = dict(dict_spec_default or {}, **dict_spec)
+
+    def _get_list_champion_name(key: str) -> List[str]:
+        list_champion_name = []
+
+        for champion_name in dict_spec.get(key) or []:
+            champion_name_found = dict_key_champion_name_lower_value_champion_name.get(str(champion_name).lower())
+
+            if champion_name_found is None:
+                raise ValueError("Unknown champion {} in {} of spec {}".format(champion_name, key, index))
+
+            list_champion_name.append(champion_name_found)
+
+        return list_champion_name
+
+    list_champion_name_include = _get_list_champion_name("include")
+
+    if not list_champion_name_include:
+        raise ValueError("include of spec {} must have at least one champion".format(index))
+
+    limit = dict_spec.get("limit")
+
+    list_item_key_emblem = list(dict_spec.get("emblems") or [])
+
+    if item_pool is not None:
+        try:
+            list_item_key_emblem = [item.item_id for item in item_pool.get_list_item(list_item_key_emblem)]
+        except KeyError as e:
+            raise ValueError("Unknown item {} in emblems of spec {}".format(e, index))
+
+    return {"name": str(dict_spec.get("name", index)),
+            "include": list_champion_name_include,
+            "exclude": _get_list_champion_name("exclude"),
+            "size_min": int(dict_spec.get("size_min", TEAM_COMPOSITION_SIZE_MIN)),
+            "size_max": int(dict_spec.get("size_max", TEAM_COMPOSITION_SIZE_MAX)),
+            "trait_total_min": int(dict_spec.get("trait_total_min", TRAIT_COUNT_DISCRETE_TOTAL_MIN)),
+            "trait_total_max": int(dict_spec.get("trait_total_max", TRAIT_COUNT_TOTAL_MAX)),
+            "trait_count_discrete": bool(dict_spec.get("trait_count_discrete", False)),
+            "tuple_index_index_state": get_tuple_index_index_state_from_sort(
+                dict_spec["sort"]) if dict_spec.get("sort") else TUPLE_INDEX_INDEX_STATE_DEFAULT,
+            "emblems": list_item_key_emblem,
+            "limit": int(limit) if limit is not None else None}
+
+
+def read_list_dict_spec(path_specs: str) -> List[dict]:
+    """
+    Read the specs of a json list file or a JSON lines file ("-" for stdin)
+
+    :param path_specs: path to the spec file
+    :return: list of the specs
+    """
+    if path_specs == "-":
+        string_specs = sys.stdin.read()
+    else:
+        with open(path_specs, "r") as file:
+            string_specs = file.read()
+
+    if string_specs.lstrip().startswith("["):
+        return json.loads(string_specs)
+
+    return [json.loads(line) for line in string_specs.splitlines() if line.strip()]
+
+
+def generate_list_dict_spec(generate: str, iter_champion_names: Iterable[str]) -> List[dict]:
+    """
+    Make a spec for every champion or for every pair of champions
+
+    :param generate: GENERATE_CHAMPION or GENERATE_PAIR
+    :param iter_champion_names: champion names
+    :return: list of the specs (Only name and include)
+    """
+    amount_champions = 1 if generate == GENERATE_CHAMPION else 2
+
+    return [{"name": " + ".join(tuple_champion_name), "include": list(tuple_champion_name)} for tuple_champion_name in
+            itertools.combinations(iter_champion_names, amount_champions)]
+
+
+def _initialize_worker(path_champions: str, path_traits: str, path_db: str):
+    """
+    Make the TeamCompositionSolver of a worker process
+
+    :param path_champions: path to json file of champions
+    :param path_traits: path to json file to traits of the champions
+    :param path_db: path to the db file
+    :return: None
+    """
+    global _team_composition_solver_worker
+
+    _team_composition_solver_worker = TeamCompositionSolver(path_champions, path_traits, path_db=path_db,
+                                                            bool_db_immutable=True)
+
+
+def _run_spec(dict_spec: dict) -> dict:
+    """
+    Run the query of a spec in a worker process
+
+    :param dict_spec: normalized spec
+    :return: dict of the result of the spec
+    """
+    dict_result = {"name": dict_spec["name"], "process_id": os.getpid(), "error": None}
+
+    try:
+        time_start = time.perf_counter()
+
+        emblem_set = _team_composition_solver_worker.get_emblem_set(dict_spec["emblems"])
+
+        # The trait count discrete totals in the db are without the emblems so they are filtered after the emblems
+        if emblem_set:
+            list_tuple_db_result = _team_composition_solver_worker.sqlite_handler_team_composition_solver.get_pickled_list_tuple_champion_composition(
+                dict_spec["include"],
+                dict_spec["exclude"],
+                dict_spec["size_min"],
+                dict_spec["size_max"] + emblem_set.team_composition_size_delta)
+
+        else:
+            list_tuple_db_result = _team_composition_solver_worker.sqlite_handler_team_composition_solver.get_pickled_list_tuple_champion_composition(
+                dict_spec["include"],
+                dict_spec["exclude"],
+                dict_spec["size_min"],
+                dict_spec["size_max"],
+                dict_spec["trait_total_min"],
+                dict_spec["trait_total_max"])
+
+        time_query = time.perf_counter()
+
+        list_tuples_to_be_inserted = get_list_tuples_to_be_inserted(
+            _team_composition_solver_worker.team_composition_container_factory,
+            list_tuple_db_result,
+            dict_spec["trait_count_discrete"],
+            emblem_set)
+
+        if emblem_set:
+            list_tuples_to_be_inserted = get_list_tuples_to_be_inserted_trait_count_total(
+                list_tuples_to_be_inserted, dict_spec["trait_total_min"], dict_spec["trait_total_max"])
+
+        sort_list_tuples_to_be_inserted(list_tuples_to_be_inserted, dict_spec["tuple_index_index_state"])
+
+        dict_result["count"] = len(list_tuples_to_be_inserted)
+
+        if dict_spec["limit"] is not None:
+            list_tuples_to_be_inserted = list_tuples_to_be_inserted[:dict_spec["limit"]]
+
+        dict_result["team_compositions"] = get_list_dict_team_composition(
+            list_tuples_to_be_inserted,
+            _team_composition_solver_worker.champion_trait_index.tuple_trait_id_name)
+
+        dict_result["latency_query_ms"] = (time_query - time_start) * 1000
+        dict_result["latency_format_ms"] = (time.perf_counter() - time_query) * 1000
+
+    except Exception as e:
+        dict_result["team_compositions"] = []
+        dict_result["count"] = 0
+        dict_result["latency_query_ms"] = None
+        dict_result["latency_format_ms"] = None
+        dict_result["error"] = "{}: {}".format(type(e).__name__, e)
+
+    return dict_result
+
+
+def run_batch_query(list_dict_spec: List[dict],
+                    path_champions: str,
+                    path_traits: str,
+                    path_db: str,
+                    workers: int = None,
+                    chunksize: int = 8) -> Iterator[dict]:
+    """
+    Run the specs on a pool of processes
+
+    :param list_dict_spec: normalized specs
+    :param path_champions: path to json file of champions
+    :param path_traits: path to json file to traits of the champions
+    :param path_db: path to the db file
+    :param workers: amount of processes (None for the amount of cpus)
+    :param chunksize: specs given to a process at a time
+    :return: iterator of the results in the order of the specs
+    """
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_initialize_worker,
+                             initargs=(path_champions, path_traits, path_db)) as process_pool_executor:
+        yield from process_pool_executor.map(_run_spec, list_dict_spec, chunksize=chunksize)
+
+
+def write_report(iter_dict_result: Iterable[dict], path_output: str, format_output: str,
+                 path_latency_output: str = None) -> List[dict]:
+    """
+    Write the results to the report as they come in
+
+    :param iter_dict_result: results of run_batch_query
+    :param path_output: path of the report ("-" for stdout)
+    :param format_output: FORMAT_CSV or FORMAT_JSON_LINES
+    :param path_latency_output: path of the CSV of the latency of every query (None to not write it)
+    :return: list of the results without their team compositions (For the summary)
+    """
+    list_dict_result_summary = []
+
+    file_output = sys.stdout if path_output == "-" else open(path_output, "w", newline="")
+    file_latency = open(path_latency_output, "w", newline="") if path_latency_output is not None else None
+
+    try:
+        csv_writer = csv.writer(file_output) if format_output == FORMAT_CSV else None
+        csv_writer_latency = csv.writer(file_latency) if file_latency is not None else None
+
+        if csv_writer is not None:
+            csv_writer.writerow(LIST_CSV_HEADER)
+
+        if csv_writer_latency is not None:
+            csv_writer_latency.writerow(LIST_CSV_HEADER_LATENCY)
+
+        for dict_result in iter_dict_result:
+            if csv_writer is not None:
+                for rank, dict_team_composition in enumerate(dict_result["team_compositions"], 1):
+                    csv_writer.writerow([dict_result["name"],
+                                         rank,
+                                         "; ".join(dict_team_composition["team_composition"]),
+                                         dict_team_composition["team_composition_size"],
+                                         dict_team_composition["trait_count_discrete_total"],
+                                         "; ".join("{} {}".format(trait_name, trait_count) for trait_name, trait_count
+                                                   in dict_team_composition["traits"].items())])
+            else:
+                file_output.write(json.dumps(dict_result))
+                file_output.write("\n")
+
+            if csv_writer_latency is not None:
+                csv_writer_latency.writerow([dict_result[key] for key in
+                                             ("name", "count", "latency_query_ms", "latency_format_ms", "process_id",
+                                              "error")])
+
+            if dict_result["error"] is not None:
+                print("Query {} failed: {}".format(dict_result["name"], dict_result["error"]), file=sys.stderr)
+
+            list_dict_result_summary.append({key: value for key, value in dict_result.items() if
+                                             key != "team_compositions"})
+
+    finally:
+        if file_output is not sys.stdout:
+            file_output.close()
+
+        if file_latency is not None:
+            file_latency.close()
+
+    return list_dict_result_summary
+
+
+def main(list_argument: List[str] = None):
+    parser = argparse.ArgumentParser(description="Run a file of team composition queries on a pool of processes")
+    parser.add_argument("--specs", default=None, help="json list or JSON lines file of specs (- for stdin)")
+    parser.add_argument("--generate", choices=(GENERATE_CHAMPION, GENERATE_PAIR), default=None,
+                        help="make a spec for every champion or every pair of champions instead of --specs")
+    parser.add_argument("--champions", default=PATH_CHAMPIONS, help="path to champions.json")
+    parser.add_argument("--traits", default=PATH_TRAITS, help="path to traits.json")
+    parser.add_argument("--db", default=None, help="path to the db (default is the db of the artifact cache)")
+    parser.add_argument("--team-composition-size", type=int, default=4,
+                        help="team composition size of the artifact cache db")
+    parser.add_argument("--size-min", type=int, default=None, help="default size_min of the specs")
+    parser.add_argument("--size-max", type=int, default=None, help="default size_max of the specs")
+    parser.add_argument("--trait-total-min", type=int, default=None, help="default trait_total_min of the specs")
+    parser.add_argument("--trait-total-max", type=int, default=None, help="default trait_total_max of the specs")
+    parser.add_argument("--sort", default=None,
+                        help="default sort of the specs, comma separated column:asc or column:desc")
+    parser.add_argument("--limit", type=int, default=None, help="default limit of the specs")
+    parser.add_argument("--emblems", default=None,
+                        help="default emblems of the specs, comma separated item ids or item names (Only the team "
+                             "compositions of the db are re-scored with them)")
+    parser.add_argument("--output", default="-", help="path of the report (- for stdout)")
+    parser.add_argument("--format", choices=(FORMAT_CSV, FORMAT_JSON_LINES), default=None,
+                        help="format of the report (default from the extension of --output, else jsonl)")
+    parser.add_argument("--latency-output", default=None, help="path of the CSV of the latency of every query")
+    parser.add_argument("--workers", type=int, default=None, help="amount of processes")
+    parser.add_argument("--chunksize", type=int, default=8, help="specs given to a process at a time")
+
+    namespace = parser.parse_args(list_argument)
+
+    if (namespace.specs is None) == (namespace.generate is None):
+        parser.error("pass one of --specs or --generate")
+
+    format_output = namespace.format
+
+    if format_output is None:
+        format_output = FORMAT_CSV if namespace.output.endswith(".csv") else FORMAT_JSON_LINES
+
+    team_composition_solver = TeamCompositionSolver(namespace.champions, namespace.traits)
+
+    dict_key_champion_name_lower_value_champion_name = {
+        champion_name.lower(): champion_name for champion_name in
+        team_composition_solver.champion_pool.dict_champion_pool_name}
+
+    dict_spec_default = {key: value for key, value in (("size_min", namespace.size_min),
+                                                       ("size_max", namespace.size_max),
+                                                       ("trait_total_min", namespace.trait_total_min),
+                                                       ("trait_total_max", namespace.trait_total_max),
+                                                       ("limit", namespace.limit)) if value is not None}
+
+    if namespace.sort is not None:
+        dict_spec_default["sort"] = [string_sort.split(":") for string_sort in namespace.sort.split(",")]
+
+    if namespace.emblems is not None:
+        dict_spec_default["emblems"] = [item_key.strip() for item_key in namespace.emblems.split(",") if
+                                        item_key.strip()]
+
+    if namespace.generate is not None:
+        list_dict_spec_raw = generate_list_dict_spec(namespace.generate,
+                                                     team_composition_solver.champion_pool.dict_champion_pool_name)
+    else:
+        list_dict_spec_raw = read_list_dict_spec(namespace.specs)
+
+    # Every spec is checked before any query runs
+    try:
+        list_dict_spec = [get_dict_spec(dict_spec, index, dict_key_champion_name_lower_value_champion_name,
+                                        dict_spec_default, team_composition_solver.item_pool) for index, dict_spec in
+                          enumerate(list_dict_spec_raw)]
+    except (ValueError, TypeError) as e:
+        parser.error(str(e))
+
+    path_db = namespace.db
+
+    if path_db is None:
+        path_db = ArtifactCache().get_path_db_valid(namespace.champions, namespace.traits,
+                                                    namespace.team_composition_size)
+
+    if not os.path.isfile(path_db):
+        parser.error("{} does not exist".format(path_db))
+
+    time_start = time.perf_counter()
+
+    list_dict_result_summary = write_report(
+        run_batch_query(list_dict_spec, namespace.champions, namespace.traits, path_db, namespace.workers,
+                        namespace.chunksize),
+        namespace.output,
+        format_output,
+        namespace.latency_output)
+
+    time_total = time.perf_counter() - time_start
+
+    list_latency_query = [dict_result["latency_query_ms"] for dict_result in list_dict_result_summary if
+                          dict_result["error"] is None]
+
+    print("{} queries ({} failed) in {:.2f} Sec".format(len(list_dict_result_summary),
+                                                        len(list_dict_result_summary) - len(list_latency_query),
+                                                        time_total), file=sys.stderr)
+
+    if list_latency_query:
+        list_latency_query.sort()
+
+        print("Query latency ms: median {:.2f}, p95 {:.2f}, max {:.2f}".format(
+            statistics.median(list_latency_query),
+            list_latency_query[min(len(list_latency_query) - 1, int(len(list_latency_query) * 0.95))],
+            list_latency_query[-1]), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
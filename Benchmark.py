@@ -0,0 +1,491 @@
+"""
+10/19/2026
+
+Purpose:
+    Headless benchmark suite for the TeamCompositionCombinationsSearcher, the TeamCompositionContainerFactory, the
+    SQLiteHandlerTeamCompositionSolver and the formatting of the GUI (TeamCompositionFormatter)
+
+    The results are written as json so that runs can be compared over time (--compare)
+
+Important Note:
+    Run from the directory that contains resources/ (Same as main.py)
+
+        python -m Teamfight_Tactics_Composition_Solver.Benchmark --output benchmark.json
+        python -m Teamfight_Tactics_Composition_Solver.Benchmark --output new.json --compare benchmark.json
+
+    The db benchmarks build their own small db (--db-size) in a temp dir so the real generated files are not used.
+
+    Every benchmark is ran --repeat times and the median is used to compare runs, the search is only ran once per
+    size because it is the slowest part.
+
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.Instrumentation import get_memory_max_rss
+from Teamfight_Tactics_Composition_Solver.TeamCompositionFormatter import get_list_tuples_to_be_inserted, \
+    sort_list_tuples_to_be_inserted, TUPLE_INDEX_INDEX_STATE_DEFAULT
+from Teamfight_Tactics_Composition_Solver.TeamCompositionSolver import TeamCompositionSolver
+from Teamfight_Tactics_Composition_Solver.constants import PATH_CHAMPIONS, PATH_TRAITS, ENGINE_VERSION
+
+# Increase when the json format of the results changes
+BENCHMARK_FORMAT_VERSION = 1
+
+TUPLE_SEARCH_SIZES_DEFAULT = (3, 4, 5, 6, 7)
+
+
+class BenchmarkResult:
+    __slots__ = ['name',
+                 'dict_parameters',
+                 'list_time',
+                 'amount_items',
+                 'memory_peak'
+                 ]
+
+    def __init__(self, name: str, dict_parameters: dict, list_time: List[float], amount_items: int,
+                 memory_peak: int = None):
+        """
+        Result of a single benchmark
+
+        :param name: name of the benchmark
+        :param dict_parameters: parameters of the benchmark
+        :param list_time: time of every run in seconds
+        :param amount_items: amount of items handled by a run (team compositions, rows, ...)
+        :param memory_peak: peak memory allocated by python during the first run in bytes (None if not traced)
+        """
+        self.name = name  # type: str
+        self.dict_parameters = dict_parameters  # type: dict
+        self.list_time = list_time  # type: List[float]
+        self.amount_items = amount_items  # type: int
+        self.memory_peak = memory_peak  # type: int
+
+    def get_key(self) -> str:
+        """
+        Key used to match the same benchmark between runs
+        :return: key
+        """
+        return "{} {}".format(self.name, json.dumps(self.dict_parameters, sort_keys=True))
+
+    def to_dict(self) -> dict:
+        """
+        Json serializable version of the result
+        :return: dict
+        """
+        time_median = statistics.median(self.list_time)
+
+        return {"name": self.name,
+                "parameters": self.dict_parameters,
+                "times": self.list_time,
+                "time_min": min(self.list_time),
+                "time_median": time_median,
+                "amount_items": self.amount_items,
+                "items_per_second": self.amount_items / time_median if time_median else None,
+                "memory_peak": self.memory_peak}
+
+
+def time_callable(callable_given: Callable, repeat: int = 1, bool_trace_memory: bool = False) -> Tuple:
+    """
+    Time a callable (The result of the last run is returned so the benchmark can count what it made)
+
+    :param callable_given: callable without arguments
+    :param repeat: amount of runs
+    :param bool_trace_memory: trace the peak memory of the first run with tracemalloc (Slows down that run)
+    :return: tuple of the list of times, the result of the callable and the peak memory (None if not traced)
+    """
+    list_time = []
+    result = None
+    memory_peak = None
+
+    for index in range(repeat):
+        if bool_trace_memory and index == 0:
+            tracemalloc.start()
+
+        time_start = time.perf_counter()
+        result = callable_given()
+        time_end = time.perf_counter()
+
+        if bool_trace_memory and index == 0:
+            memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        list_time.append(time_end - time_start)
+
+    return list_time, result, memory_peak
+
+
+def _get_git_commit() -> str:
+    """
+    Get the commit of the source code that is benchmarked
+    :return: commit hash or None if it is not a git repo
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkSuite:
+
+    def __init__(self,
+                 path_champions: str = PATH_CHAMPIONS,
+                 path_traits: str = PATH_TRAITS,
+                 repeat: int = 3,
+                 seed: int = 0,
+                 bool_trace_memory: bool = False):
+        """
+        Benchmark suite of the components of the solver
+
+        :param path_champions: path to json file of champions
+        :param path_traits: path to json file to traits of the champions
+        :param repeat: amount of runs of every benchmark (Except the search)
+        :param seed: seed of the random team compositions
+        :param bool_trace_memory: trace the peak memory of every benchmark
+        """
+        self.path_champions = path_champions  # type: str
+        self.path_traits = path_traits  # type: str
+        self.repeat = repeat  # type: int
+        self.seed = seed  # type: int
+        self.bool_trace_memory = bool_trace_memory  # type: bool
+
+        # Temp dir of the generated files of the db benchmarks
+        self.dir_temp = tempfile.mkdtemp(prefix="tft_benchmark_")  # type: str
+
+        self.team_composition_solver = TeamCompositionSolver(
+            self.path_champions,
+            self.path_traits,
+            os.path.join(self.dir_temp, "list_tuple.pickle"),
+            os.path.join(self.dir_temp, "team_composition.db"),
+            os.path.join(self.dir_temp, "build_record"))  # type: TeamCompositionSolver
+
+        self.list_benchmark_result = []  # type: List[BenchmarkResult]
+
+    def _add_result(self, name: str, dict_parameters: dict, callable_given: Callable, repeat: int,
+                    callable_amount_items: Callable = len):
+        """
+        Time a callable and add its result
+
+        :param name: name of the benchmark
+        :param dict_parameters: parameters of the benchmark
+        :param callable_given: callable without arguments
+        :param repeat: amount of runs
+        :param callable_amount_items: callable that gets the amount of items from the result of callable_given
+        :return: result of callable_given
+        """
+        list_time, result, memory_peak = time_callable(callable_given, repeat, self.bool_trace_memory)
+
+        benchmark_result = BenchmarkResult(name, dict_parameters, list_time, callable_amount_items(result),
+                                           memory_peak)
+
+        self.list_benchmark_result.append(benchmark_result)
+
+        # Progress goes to stderr so stdout only has the json results
+        print("{:<60}{:>12.4f} sec".format(benchmark_result.get_key(), statistics.median(list_time)), file=sys.stderr)
+
+        return result
+
+    def benchmark_search(self, iter_team_composition_size: iter = TUPLE_SEARCH_SIZES_DEFAULT):
+        """
+        Time TeamCompositionCombinationsSearcher.get_set_frozenset_compositions_combinations (the recursive
+        _get_set_frozenset_compositions_combinations) for every size
+
+        :param iter_team_composition_size: team comp sizes
+        :return: None
+        """
+        team_composition_combinations_searcher = self.team_composition_solver.team_composition_combinations_searcher
+
+        for team_composition_size in iter_team_composition_size:
+            self._add_result(
+                "search",
+                {"team_composition_size": team_composition_size},
+                lambda: team_composition_combinations_searcher.get_set_frozenset_compositions_combinations(
+                    team_composition_size),
+                1)
+
+    def benchmark_factory(self, amount_team_compositions: int = 100000):
+        """
+        Time TeamCompositionContainerFactory.get_team_composition_container and get_team_composition_container_batch
+        on random team compositions
+
+        :param amount_team_compositions: amount of random team compositions
+        :return: None
+        """
+        team_composition_container_factory = self.team_composition_solver.team_composition_container_factory
+        champion_trait_index = self.team_composition_solver.champion_trait_index
+
+        random_given = random.Random(self.seed)
+
+        list_tuple_champion_id = [
+            tuple(random_given.sample(range(champion_trait_index.number_champions),
+                                      random_given.randint(1, min(9, champion_trait_index.number_champions)))) for _
+            in range(amount_team_compositions)]
+
+        list_tuple_champion_name = [champion_trait_index.get_tuple_champion_name(tuple_champion_id) for
+                                    tuple_champion_id in list_tuple_champion_id]
+
+        dict_parameters = {"amount_team_compositions": amount_team_compositions}
+
+        self._add_result(
+            "factory_get_team_composition_container",
+            dict_parameters,
+            lambda: [team_composition_container_factory.get_team_composition_container(tuple_champion_name) for
+                     tuple_champion_name in list_tuple_champion_name],
+            self.repeat)
+
+        self._add_result(
+            "factory_get_team_composition_container_batch",
+            dict_parameters,
+            lambda: team_composition_container_factory.get_team_composition_container_batch(list_tuple_champion_id),
+            self.repeat)
+
+    def _build_db(self, team_composition_size: int):
+        """
+        Build the pickle and the db of the given size in the temp dir (Without asking)
+
+        :param team_composition_size: team comp size
+        :return: None
+        """
+        self.team_composition_solver._create_pickle_list_tuple_compositions_combinations(team_composition_size)
+        self.team_composition_solver._run_complete_calculation_list_tuple_faster_operations(team_composition_size)
+
+    def get_list_tuple_query(self, team_composition_size: int) -> List[Tuple[str, dict]]:
+        """
+        Get representative filters of the GUI for the current dataset (Based on the champion that shares a trait with
+        the most champions so the queries return many rows)
+
+        :param team_composition_size: team comp size of the db
+        :return: list of tuples of the name of the query and the kwargs of get_pickled_list_tuple_champion_composition
+        """
+        champion_trait_index = self.team_composition_solver.champion_trait_index
+
+        list_champion_id_bitmask_neighbor = []
+
+        for champion_id, tuple_trait_id in enumerate(champion_trait_index.tuple_champion_id_tuple_trait_id):
+            bitmask_neighbor = 0
+
+            for trait_id in tuple_trait_id:
+                bitmask_neighbor |= champion_trait_index.tuple_trait_id_bitmask_champion[trait_id]
+
+            list_champion_id_bitmask_neighbor.append(bitmask_neighbor & ~(1 << champion_id))
+
+        champion_id_0 = max(range(champion_trait_index.number_champions),
+                            key=lambda champion_id: bin(list_champion_id_bitmask_neighbor[champion_id]).count("1"))
+
+        list_champion_name_neighbor = champion_trait_index.get_tuple_champion_name(
+            champion_trait_index.get_tuple_champion_id_from_bitmask(list_champion_id_bitmask_neighbor[champion_id_0]))
+
+        champion_name_0 = champion_trait_index.tuple_champion_id_name[champion_id_0]
+        champion_name_1 = list_champion_name_neighbor[0] if list_champion_name_neighbor else champion_name_0
+        champion_name_2 = list_champion_name_neighbor[-1] if list_champion_name_neighbor else champion_name_0
+
+        return [
+            ("one_champion",
+             {"iter_team_composition_current": [champion_name_0],
+              "iter_team_composition_exclude": []}),
+            ("two_champions",
+             {"iter_team_composition_current": [champion_name_0, champion_name_1],
+              "iter_team_composition_exclude": []}),
+            ("one_champion_exclude_one",
+             {"iter_team_composition_current": [champion_name_0],
+              "iter_team_composition_exclude": [champion_name_2]}),
+            ("one_champion_size_max",
+             {"iter_team_composition_current": [champion_name_0],
+              "iter_team_composition_exclude": [],
+              "team_composition_size_min": team_composition_size,
+              "team_composition_size_max": team_composition_size}),
+            ("one_champion_trait_count_discrete_total_min",
+             {"iter_team_composition_current": [champion_name_0],
+              "iter_team_composition_exclude": [],
+              "trait_count_discrete_total_min": team_composition_size}),
+        ]
+
+    def benchmark_db_and_formatter(self, team_composition_size: int = 4):
+        """
+        Time SQLiteHandlerTeamCompositionSolver.get_pickled_list_tuple_champion_composition on representative filters
+        against a db of the given size and the formatting of their results for the Treeview
+
+        :param team_composition_size: team comp size of the db
+        :return: None
+        """
+        self._add_result("db_build", {"team_composition_size": team_composition_size},
+                         lambda: self._build_db(team_composition_size), 1,
+                         lambda result: len(self.team_composition_solver.list_tuple_compositions_combinations))
+
+        sqlite_handler = self.team_composition_solver.sqlite_handler_team_composition_solver
+        team_composition_container_factory = self.team_composition_solver.team_composition_container_factory
+
+        for query_name, dict_kwargs in self.get_list_tuple_query(team_composition_size):
+            dict_parameters = {"team_composition_size": team_composition_size, "query": query_name}
+
+            list_tuple_db_result = self._add_result(
+                "db_query",
+                dict_parameters,
+                lambda: sqlite_handler.get_pickled_list_tuple_champion_composition(**dict_kwargs),
+                self.repeat)
+
+            for bool_trait_count_discrete in (False, True):
+                self._add_result(
+                    "formatter",
+                    dict(dict_parameters, trait_count_discrete=bool_trait_count_discrete),
+                    lambda: self._format(team_composition_container_factory, list_tuple_db_result,
+                                         bool_trait_count_discrete),
+                    self.repeat)
+
+    @staticmethod
+    def _format(team_composition_container_factory, list_tuple_db_result: list, bool_trait_count_discrete: bool):
+        """
+        Format and sort the rows the same way as the default state of the GUI (Ascending names, descending total)
+
+        :return: list of the rows of the Treeview
+        """
+        list_tuples_to_be_inserted = get_list_tuples_to_be_inserted(team_composition_container_factory,
+                                                                    list_tuple_db_result,
+                                                                    bool_trait_count_discrete)
+
+        sort_list_tuples_to_be_inserted(list_tuples_to_be_inserted, TUPLE_INDEX_INDEX_STATE_DEFAULT)
+
+        return list_tuples_to_be_inserted
+
+    def get_dict_metadata(self) -> dict:
+        """
+        Information about the machine, the source code and the dataset of the run
+        :return: dict
+        """
+        champion_trait_index = self.team_composition_solver.champion_trait_index
+
+        return {"benchmark_format_version": BENCHMARK_FORMAT_VERSION,
+                "engine_version": ENGINE_VERSION,
+                "git_commit": _get_git_commit(),
+                "time": time.time(),
+                "python_version": platform.python_version(),
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "cpu_count": os.cpu_count(),
+                "path_champions": self.path_champions,
+                "path_traits": self.path_traits,
+                "number_champions": champion_trait_index.number_champions,
+                "number_traits": champion_trait_index.number_traits,
+                "repeat": self.repeat,
+                "seed": self.seed,
+                "memory_max_rss": get_memory_max_rss()}
+
+    def get_dict_results(self) -> dict:
+        """
+        Json serializable version of the run
+        :return: dict
+        """
+        dict_results = {"metadata": self.get_dict_metadata(),
+                        "results": [benchmark_result.to_dict() for benchmark_result in self.list_benchmark_result]}
+
+        # Time of every query shape ran by the db benchmark
+        if self.team_composition_solver._sqlite_handler_team_composition_solver is not None:
+            dict_results["query_shapes"] = \
+                self.team_composition_solver.sqlite_handler_team_composition_solver.get_list_dict_query_shape_stats()
+
+        return dict_results
+
+    def close(self):
+        """
+        Close the db and delete the temp dir
+        :return: None
+        """
+        if self.team_composition_solver._sqlite_handler_team_composition_solver is not None:
+            self.team_composition_solver.sqlite_handler_team_composition_solver.close()
+
+        shutil.rmtree(self.dir_temp, ignore_errors=True)
+
+
+def compare_dict_results(dict_results_old: dict, dict_results_new: dict) -> List[Tuple[str, float, float, float]]:
+    """
+    Compare the median times of the benchmarks that are in both runs
+
+    :param dict_results_old: json of the old run
+    :param dict_results_new: json of the new run
+    :return: list of tuples of the key of the benchmark, old median, new median and new / old
+    """
+    def _get_dict_key_value_time_median(dict_results: dict) -> Dict[str, float]:
+        return {"{} {}".format(dict_result["name"], json.dumps(dict_result["parameters"], sort_keys=True)):
+                    dict_result["time_median"] for dict_result in dict_results["results"]}
+
+    dict_key_value_time_median_old = _get_dict_key_value_time_median(dict_results_old)
+    dict_key_value_time_median_new = _get_dict_key_value_time_median(dict_results_new)
+
+    return [(key, dict_key_value_time_median_old[key], time_median_new,
+             time_median_new / dict_key_value_time_median_old[key] if dict_key_value_time_median_old[key] else None)
+            for key, time_median_new in dict_key_value_time_median_new.items() if
+            key in dict_key_value_time_median_old]
+
+
+def main(list_argument: List[str] = None):
+    parser = argparse.ArgumentParser(description="Headless benchmark suite of the TFT team composition solver")
+    parser.add_argument("--champions", default=PATH_CHAMPIONS, help="path to champions.json")
+    parser.add_argument("--traits", default=PATH_TRAITS, help="path to traits.json")
+    parser.add_argument("--search-sizes", default=",".join(map(str, TUPLE_SEARCH_SIZES_DEFAULT)),
+                        help="comma separated team composition sizes of the search benchmark (empty to skip)")
+    parser.add_argument("--factory-amount", type=int, default=100000,
+                        help="amount of random team compositions of the factory benchmark (0 to skip)")
+    parser.add_argument("--db-size", type=int, default=4,
+                        help="team composition size of the db of the db and formatter benchmarks (0 to skip)")
+    parser.add_argument("--repeat", type=int, default=3, help="amount of runs of every benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random team compositions")
+    parser.add_argument("--memory", action="store_true", help="trace the peak memory of every benchmark")
+    parser.add_argument("--output", default=None, help="path of the json results (stdout if not given)")
+    parser.add_argument("--compare", default=None, help="path of the json results of an older run to compare to")
+
+    namespace = parser.parse_args(list_argument)
+
+    # The searcher and the solver print while they run, stdout only gets the json results (Or nothing with --output)
+    with redirect_stdout(sys.stderr):
+        benchmark_suite = BenchmarkSuite(namespace.champions, namespace.traits, namespace.repeat, namespace.seed,
+                                         namespace.memory)
+
+        try:
+            if namespace.search_sizes:
+                benchmark_suite.benchmark_search(int(size) for size in namespace.search_sizes.split(","))
+
+            if namespace.factory_amount:
+                benchmark_suite.benchmark_factory(namespace.factory_amount)
+
+            if namespace.db_size:
+                benchmark_suite.benchmark_db_and_formatter(namespace.db_size)
+
+            dict_results = benchmark_suite.get_dict_results()
+
+        finally:
+            benchmark_suite.close()
+
+    if namespace.output is None:
+        json.dump(dict_results, sys.stdout, indent=4)
+        print()
+
+    else:
+        with open(namespace.output, "w") as file:
+            json.dump(dict_results, file, indent=4)
+
+    if namespace.compare is not None:
+        with open(namespace.compare, "r") as file:
+            dict_results_old = json.load(file)
+
+        print("{:<100}{:>12}{:>12}{:>10}".format("Benchmark", "Old (s)", "New (s)", "New/Old"), file=sys.stderr)
+
+        for key, time_median_old, time_median_new, ratio in compare_dict_results(dict_results_old, dict_results):
+            print("{:<100}{:>12.4f}{:>12.4f}{:>10}".format(key, time_median_old, time_median_new,
+                                                          "{:.2f}".format(ratio) if ratio is not None else ""),
+                  file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
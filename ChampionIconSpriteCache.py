@@ -0,0 +1,152 @@
+"""
+10/19/2026
+
+Purpose:
+    Cache of the champion icons decoded into a single PPM sprite sheet so that the GUI does not decode a png for every
+    champion at startup
+
+Important Note:
+    Anything that makes a PhotoImage must be ran on the main thread (Tk), read_sprite_cache only reads files so it can
+    be ran on a thread.
+
+    PPM is the only format Tk decodes without any work (No zlib, no filters) but it has no alpha channel, the champion
+    icons are opaque so nothing is lost.
+
+    The sprite cache is made the first time the icons are loaded from the png files and is made again if any icon in
+    DIR_CHAMPION_ICONS is added, removed or modified.
+
+"""
+import json
+import os
+from tkinter import PhotoImage
+from typing import Dict, Tuple
+
+from Teamfight_Tactics_Composition_Solver.constants import DIR_CHAMPION_ICONS, DIR_SPRITE_CACHE, \
+    NAME_SPRITE_CACHE_CHAMPION_ICONS, NAME_SPRITE_CACHE_CHAMPION_ICONS_INDEX
+
+# File formats of the champion icons
+TUPLE_ICON_FILE_FORMAT = ('.jpeg', '.png')
+
+
+class ChampionIconSpriteCache:
+
+    def __init__(self, dir_icons: str = DIR_CHAMPION_ICONS, dir_cache: str = DIR_SPRITE_CACHE):
+        """
+        Sprite sheet cache of the champion icons
+
+        :param dir_icons: path to the dir of the champion icons
+        :param dir_cache: path to the dir of the sprite cache
+        """
+        self.dir_icons = dir_icons  # type: str
+
+        self.path_sprite = os.path.join(dir_cache, NAME_SPRITE_CACHE_CHAMPION_ICONS)  # type: str
+        self.path_index = os.path.join(dir_cache, NAME_SPRITE_CACHE_CHAMPION_ICONS_INDEX)  # type: str
+
+    def get_dict_key_icon_name_value_path(self) -> Dict[str, str]:
+        """
+        Get the paths of the champion icons by their name (The file name without the extension)
+        :return: dict of the icon name and the path to the icon
+        """
+        dict_key_icon_name_value_path = {}
+
+        for dir_name, dir_sub_list, file_list in os.walk(self.dir_icons):
+            for file in file_list:
+                if any(file_format in file for file_format in TUPLE_ICON_FILE_FORMAT):
+                    dict_key_icon_name_value_path[str(file.split(".")[0])] = os.path.join(dir_name, file)
+
+        return dict_key_icon_name_value_path
+
+    def _get_dict_key_icon_name_value_stat(self) -> Dict[str, list]:
+        """
+        Get the size and modification time of every champion icon (Used to know if the sprite cache is outdated)
+        :return: dict of the icon name and [size, modification time]
+        """
+        dict_key_icon_name_value_stat = {}
+
+        for icon_name, path_icon in self.get_dict_key_icon_name_value_path().items():
+            stat_result = os.stat(path_icon)
+
+            dict_key_icon_name_value_stat[icon_name] = [stat_result.st_size, stat_result.st_mtime_ns]
+
+        return dict_key_icon_name_value_stat
+
+    def read_sprite_cache(self) -> Tuple[bytes, Dict[str, list]]:
+        """
+        Read the sprite sheet and its index if they match the current champion icons (Does not use Tk)
+
+        :return: tuple of the PPM bytes of the sprite sheet and the dict of the icon name and [x, width, height] or
+            None if the sprite cache does not exist or is outdated
+        """
+        if not (os.path.isfile(self.path_sprite) and os.path.isfile(self.path_index)):
+            return None
+
+        with open(self.path_index, "r") as file:
+            dict_index = json.load(file)
+
+        if dict_index.get("input") != self._get_dict_key_icon_name_value_stat():
+            return None
+
+        with open(self.path_sprite, "rb") as file:
+            bytes_sprite = file.read()
+
+        return bytes_sprite, dict_index["icons"]
+
+    def write_sprite_cache(self, dict_key_icon_name_value_photo_image: Dict[str, PhotoImage]):
+        """
+        Put the decoded champion icons next to each other in a sprite sheet and write it with its index
+
+        Must be ran on the main thread
+
+        :param dict_key_icon_name_value_photo_image: dict of the icon name and the decoded icon
+        :return: None
+        """
+        dict_key_icon_name_value_list_position = {}
+
+        x = 0
+        height_max = 0
+
+        for icon_name, photo_image in dict_key_icon_name_value_photo_image.items():
+            dict_key_icon_name_value_list_position[icon_name] = [x, photo_image.width(), photo_image.height()]
+
+            x += photo_image.width()
+            height_max = max(height_max, photo_image.height())
+
+        photo_image_sprite = PhotoImage(width=max(x, 1), height=max(height_max, 1))
+
+        for icon_name, (x, width, height) in dict_key_icon_name_value_list_position.items():
+            photo_image_sprite.tk.call(photo_image_sprite, "copy", dict_key_icon_name_value_photo_image[icon_name],
+                                       "-to", x, 0)
+
+        os.makedirs(os.path.dirname(self.path_sprite), exist_ok=True)
+
+        photo_image_sprite.write(self.path_sprite, format="ppm")
+
+        with open(self.path_index, "w") as file:
+            json.dump({"input": self._get_dict_key_icon_name_value_stat(),
+                       "icons": dict_key_icon_name_value_list_position}, file)
+
+
+def get_dict_key_icon_name_value_photo_image_from_sprite(bytes_sprite: bytes,
+                                                         dict_key_icon_name_value_list_position: Dict[str, list]
+                                                         ) -> Dict[str, PhotoImage]:
+    """
+    Cut the champion icons out of the sprite sheet read by ChampionIconSpriteCache.read_sprite_cache
+
+    Must be ran on the main thread
+
+    :param bytes_sprite: PPM bytes of the sprite sheet
+    :param dict_key_icon_name_value_list_position: dict of the icon name and [x, width, height]
+    :return: dict of the icon name and the icon
+    """
+    photo_image_sprite = PhotoImage(data=bytes_sprite, format="ppm")
+
+    dict_key_icon_name_value_photo_image = {}
+
+    for icon_name, (x, width, height) in dict_key_icon_name_value_list_position.items():
+        photo_image = PhotoImage(width=width, height=height)
+
+        photo_image.tk.call(photo_image, "copy", photo_image_sprite, "-from", x, 0, x + width, height)
+
+        dict_key_icon_name_value_photo_image[icon_name] = photo_image
+
+    return dict_key_icon_name_value_photo_image
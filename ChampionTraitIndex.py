@@ -0,0 +1,217 @@
+"""
+10/19/2026
+
+Purpose:
+    Frozen integer indexed version of the ChampionPool and the TraitPool
+
+Important Note:
+    Champion ids are the Champion.index_dict_position (the same integers already stored in the db) and trait ids are
+    the insertion order of TraitPool.dict_trait_pool (the same order as the trait columns in the GUI).
+
+    Everything is built once at load and is only made of tuples and arrays so nothing in here should be modified
+    after the constructor is done.
+
+    The bytes translation tables (256 bytes each) exist for the batch operations in
+    TeamCompositionContainerFactory.get_team_composition_container_batch which means that champion ids have to fit in a
+    byte and CHAMPION_ID_PADDING is reserved for padding the rows of an index matrix.
+
+"""
+from array import array
+from typing import Dict, Iterable, Tuple
+
+from Teamfight_Tactics_Composition_Solver.ChamptionPool import ChampionPool
+from Teamfight_Tactics_Composition_Solver.TraitPool import TraitPool
+
+# Champion id used to pad the rows of an index matrix of team compositions smaller than the row width
+CHAMPION_ID_PADDING = 255
+
+
+class ChampionTraitIndex:
+    __slots__ = ['number_champions',
+                 'number_traits',
+                 'tuple_champion_id_name',
+                 'dict_key_champion_name_value_champion_id',
+                 'tuple_trait_id_name',
+                 'dict_key_trait_name_value_trait_id',
+                 'tuple_champion_id_tuple_trait_id',
+                 'array_champion_id_cost',
+                 'tuple_trait_id_array_count_discrete',
+                 'tuple_trait_id_array_count_discrete_difference',
+                 'tuple_trait_id_bitmask_champion',
+                 'tuple_trait_id_bytes_incidence',
+                 'tuple_trait_id_bytes_count_discrete',
+                 'bytes_champion_id_not_padding'
+                 ]
+
+    def __init__(self, champion_pool: ChampionPool, trait_pool: TraitPool):
+        """
+        Array backed representation of the champion pool and the trait pool so that the hot loops can use integer ids
+        instead of hashing champion names and trait names
+
+        :param champion_pool: champion pool object
+        :param trait_pool: trait pool object
+        """
+        # Amount of champions and traits
+        self.number_champions = len(champion_pool.dict_champion_pool_index_dict_position)  # type: int
+        self.number_traits = len(trait_pool.dict_trait_pool)  # type: int
+
+        # champion id -> champion name and champion name -> champion id
+        self.tuple_champion_id_name = tuple(
+            champion_pool.dict_champion_pool_index_dict_position[champion_id].name for champion_id in
+            range(self.number_champions))  # type: Tuple[str, ...]
+
+        self.dict_key_champion_name_value_champion_id = {
+            champion_name: champion_id for champion_id, champion_name in
+            enumerate(self.tuple_champion_id_name)}  # type: Dict[str, int]
+
+        # trait id -> trait name and trait name -> trait id
+        self.tuple_trait_id_name = tuple(trait_pool.dict_trait_pool)  # type: Tuple[str, ...]
+
+        self.dict_key_trait_name_value_trait_id = {
+            trait_name: trait_id for trait_id, trait_name in
+            enumerate(self.tuple_trait_id_name)}  # type: Dict[str, int]
+
+        # champion id -> tuple of trait ids
+        self.tuple_champion_id_tuple_trait_id = tuple(
+            tuple(self.dict_key_trait_name_value_trait_id[trait_name] for trait_name in
+                  champion_pool.dict_champion_pool_index_dict_position[champion_id].list_traits)
+            for champion_id in range(self.number_champions))  # type: Tuple[Tuple[int, ...], ...]
+
+        # champion id -> cost
+        self.array_champion_id_cost = array('B', (
+            champion_pool.dict_champion_pool_index_dict_position[champion_id].cost for champion_id in
+            range(self.number_champions)))  # type: array
+
+        # trait id -> bitmask of the champion ids that have that trait
+        list_trait_id_bitmask_champion = [0] * self.number_traits
+
+        for champion_id, tuple_trait_id in enumerate(self.tuple_champion_id_tuple_trait_id):
+            for trait_id in tuple_trait_id:
+                list_trait_id_bitmask_champion[trait_id] |= 1 << champion_id
+
+        self.tuple_trait_id_bitmask_champion = tuple(list_trait_id_bitmask_champion)  # type: Tuple[int, ...]
+
+        """
+        trait id -> (trait count -> trait count discrete) and trait id -> (trait count -> units until the next division)
+
+        A trait count can never be larger than the amount of champions (even with emblems every unit only counts once)
+        so every lookup table has number_champions + 1 entries and can be indexed without checking the bounds.
+        """
+        list_trait_id_array_count_discrete = []
+        list_trait_id_array_count_discrete_difference = []
+
+        for trait_name in self.tuple_trait_id_name:
+            list_divisions = trait_pool.dict_trait_pool[trait_name].list_divisions
+
+            array_count_discrete = array('B', bytes(self.number_champions + 1))
+            array_count_discrete_difference = array('B', bytes(self.number_champions + 1))
+
+            for trait_count in range(self.number_champions + 1):
+                for trait_division in list_divisions:
+                    if trait_count >= trait_division:
+                        array_count_discrete[trait_count] = trait_division
+
+                    # The first division that has not been reached yet
+                    else:
+                        array_count_discrete_difference[trait_count] = trait_division - trait_count
+                        break
+
+            list_trait_id_array_count_discrete.append(array_count_discrete)
+            list_trait_id_array_count_discrete_difference.append(array_count_discrete_difference)
+
+        self.tuple_trait_id_array_count_discrete = tuple(list_trait_id_array_count_discrete)  # type: Tuple[array, ...]
+        self.tuple_trait_id_array_count_discrete_difference = tuple(
+            list_trait_id_array_count_discrete_difference)  # type: Tuple[array, ...]
+
+        if self.number_champions >= CHAMPION_ID_PADDING:
+            raise ValueError("Champion ids must be smaller than {}".format(CHAMPION_ID_PADDING))
+
+        """
+        trait id -> column of the champion x trait incidence matrix as a bytes translation table
+        (champion id -> 1 if the champion has the trait else 0, CHAMPION_ID_PADDING -> 0)
+        """
+        self.tuple_trait_id_bytes_incidence = tuple(
+            bytes((bitmask_champion >> champion_id) & 1 if champion_id < self.number_champions else 0 for champion_id in
+                  range(256))
+            for bitmask_champion in self.tuple_trait_id_bitmask_champion)  # type: Tuple[bytes, ...]
+
+        # trait id -> (trait count -> trait count discrete) as a bytes translation table
+        self.tuple_trait_id_bytes_count_discrete = tuple(
+            bytes(array_count_discrete[min(trait_count, self.number_champions)] for trait_count in range(256))
+            for array_count_discrete in self.tuple_trait_id_array_count_discrete)  # type: Tuple[bytes, ...]
+
+        # champion id -> 1 as a bytes translation table (CHAMPION_ID_PADDING -> 0), counts the champions of a row
+        self.bytes_champion_id_not_padding = bytes(
+            1 if champion_id < self.number_champions else 0 for champion_id in range(256))  # type: bytes
+
+    def get_tuple_champion_id(self, iter_champion_names: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Given an iterable of champion names get the tuple of their champion ids
+
+        :param iter_champion_names: iterable of champion names
+        :return: tuple of champion ids
+        """
+        return tuple(self.dict_key_champion_name_value_champion_id[champion_name] for champion_name in
+                     iter_champion_names)
+
+    def get_tuple_champion_name(self, iter_champion_ids: Iterable[int]) -> Tuple[str, ...]:
+        """
+        Given an iterable of champion ids get the tuple of their champion names
+
+        :param iter_champion_ids: iterable of champion ids
+        :return: tuple of champion names
+        """
+        return tuple(self.tuple_champion_id_name[champion_id] for champion_id in iter_champion_ids)
+
+    def get_bitmask_champion(self, iter_champion_names: Iterable[str]) -> int:
+        """
+        Given an iterable of champion names get the bitmask where bit champion_id is set for every champion
+
+        :param iter_champion_names: iterable of champion names
+        :return: bitmask of the champions
+        """
+        bitmask_champion = 0
+
+        for champion_name in iter_champion_names:
+            bitmask_champion |= 1 << self.dict_key_champion_name_value_champion_id[champion_name]
+
+        return bitmask_champion
+
+    def get_tuple_champion_id_from_bitmask(self, bitmask_champion: int) -> Tuple[int, ...]:
+        """
+        Given a bitmask of champions get the tuple of champion ids in ascending order
+
+        :param bitmask_champion: bitmask of the champions
+        :return: tuple of champion ids
+        """
+        list_champion_id = []
+
+        while bitmask_champion:
+            # Lowest set bit
+            bitmask_champion_lowest = bitmask_champion & -bitmask_champion
+
+            list_champion_id.append(bitmask_champion_lowest.bit_length() - 1)
+
+            bitmask_champion ^= bitmask_champion_lowest
+
+        return tuple(list_champion_id)
+
+    def get_trait_count_discrete(self, trait_id: int, trait_count: int) -> int:
+        """
+        Get the discrete trait count of a trait given its trait count
+
+        :param trait_id: trait id
+        :param trait_count: amount of units with that trait
+        :return: trait count discrete
+        """
+        return self.tuple_trait_id_array_count_discrete[trait_id][trait_count]
+
+    def get_trait_count_discrete_difference(self, trait_id: int, trait_count: int) -> int:
+        """
+        Get the amount of units needed to reach the next division of a trait, 0 if there is no next division
+
+        :param trait_id: trait id
+        :param trait_count: amount of units with that trait
+        :return: units until the next division
+        """
+        return self.tuple_trait_id_array_count_discrete_difference[trait_id][trait_count]
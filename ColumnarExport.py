@@ -0,0 +1,472 @@
+"""
+10/19/2026
+
+Purpose:
+    Export the team_composition_combination table with its decoded champion ids, the trait count and the trait count
+    discrete of every trait and derived columns into a columnar format that analytics tools scan without unpickling a
+    BLOB per row
+
+Important Note:
+    Formats:
+        npy     A dir with a NumPy .npy file per column and metadata.json (Column -> file, dtype, trait names), read
+                with numpy.load(path, mmap_mode="r"). The .npy files are written here without numpy.
+        arrow   A single Arrow IPC file with a record batch per chunk (Needs pyarrow).
+
+    Columns (Every column is little endian, row i of every column is the same team composition):
+        team_composition_index          uint32
+        team_composition_size           uint8
+        trait_count_discrete_total      uint8
+        champion_ids                    uint8 N x width, padded with CHAMPION_ID_PADDING (255)
+        cost_total                      uint8 (Sum of the costs of the champions)
+        amount_traits_active            uint8 (Traits with a trait count discrete above 0)
+        trait_count__<trait>            uint8 per trait
+        trait_count_discrete__<trait>   uint8 per trait
+
+    The table is read TEAM_COMPOSITION_BATCH_SIZE rows at a time and every chunk is written before the next is read so
+    the memory used does not depend on the size of the table. The trait columns of a chunk are made the same way as the
+    TeamCompositionContainerBatch (A bytes.translate per column of the index matrix), so no column is made row by row
+    except for unpickling the champion ids.
+
+        python -m Teamfight_Tactics_Composition_Solver.ColumnarExport --output export_dir --format npy
+
+"""
+import argparse
+import json
+import os
+import pickle
+import re
+import sqlite3
+import sys
+from array import array
+from typing import Dict, List, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pyarrow is only needed for --format arrow
+    pyarrow = None
+
+from Teamfight_Tactics_Composition_Solver.ArtifactCache import ArtifactCache
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import CHAMPION_ID_PADDING
+from Teamfight_Tactics_Composition_Solver.SQLiteConnectionPool import SQLiteConnectionPool
+from Teamfight_Tactics_Composition_Solver.SQLiteHandlerTeamCompositionSolver import \
+    STRING_CHAMPION_COMPOSITIONS_TABLE_NAME
+from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerFactory import TeamCompositionContainerFactory
+from Teamfight_Tactics_Composition_Solver.TeamCompositionSolver import TeamCompositionSolver
+from Teamfight_Tactics_Composition_Solver.constants import PATH_CHAMPIONS, PATH_TRAITS, TEAM_COMPOSITION_BATCH_SIZE
+
+FORMAT_NPY = "npy"
+FORMAT_ARROW = "arrow"
+
+NAME_METADATA = "metadata.json"
+NAME_ARROW = "team_composition_combination.arrow"
+
+COLUMN_TEAM_COMPOSITION_INDEX = "team_composition_index"
+COLUMN_TEAM_COMPOSITION_SIZE = "team_composition_size"
+COLUMN_TRAIT_COUNT_DISCRETE_TOTAL = "trait_count_discrete_total"
+COLUMN_CHAMPION_IDS = "champion_ids"
+COLUMN_COST_TOTAL = "cost_total"
+COLUMN_AMOUNT_TRAITS_ACTIVE = "amount_traits_active"
+
+PREFIX_COLUMN_TRAIT_COUNT = "trait_count__"
+PREFIX_COLUMN_TRAIT_COUNT_DISCRETE = "trait_count_discrete__"
+
+DESCR_UINT8 = "|u1"
+DESCR_UINT32 = "<u4"
+
+# Bytes of the header of a .npy file (Magic, version and header length included), a multiple of 64
+NPY_HEADER_SIZE = 128
+
+NPY_MAGIC = b"\x93NUMPY"
+
+REGEX_NOT_IDENTIFIER = re.compile(r"[^0-9A-Za-z]+")
+
+
+class NpyColumnWriter:
+
+    def __init__(self, path: str, descr: str, tuple_shape_row: Tuple[int, ...] = ()):
+        """
+        .npy file of a column written a chunk at a time, the amount of rows in the header is written on close
+
+        Reference:
+            https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+
+        :param path: path of the .npy file
+        :param descr: numpy dtype string of the column ("|u1", "<u4")
+        :param tuple_shape_row: shape of a row (() for a 1d column, (width,) for a N x width column)
+        """
+        self.path = path  # type: str
+        self.descr = descr  # type: str
+        self.tuple_shape_row = tuple_shape_row  # type: Tuple[int, ...]
+
+        self.number_rows = 0  # type: int
+
+        self.file = open(path, "wb")
+
+        # Header of 0 rows until the amount of rows is known
+        self.file.write(self._get_bytes_header())
+
+    def _get_bytes_header(self) -> bytes:
+        """
+        Get the header of the .npy file (Version 1.0) padded to NPY_HEADER_SIZE
+
+        :return: bytes of the header
+        """
+        tuple_shape = (self.number_rows,) + self.tuple_shape_row
+
+        string_header = "{{'descr': '{}', 'fortran_order': False, 'shape': {}, }}".format(self.descr,
+                                                                                          repr(tuple_shape))
+
+        # Magic (6) + version (2) + header length (2) + header, the header ends with a newline
+        length_header = NPY_HEADER_SIZE - 10
+
+        if len(string_header) + 1 > length_header:
+            raise ValueError("Header of {} does not fit in {} bytes".format(self.path, NPY_HEADER_SIZE))
+
+        return (NPY_MAGIC + bytes([1, 0]) + length_header.to_bytes(2, "little") +
+                (string_header.ljust(length_header - 1) + "\n").encode("latin1"))
+
+    def write(self, bytes_chunk: bytes, number_rows: int):
+        """
+        Append the rows of a chunk
+
+        :param bytes_chunk: little endian bytes of the rows (Row major for a N x width column)
+        :param number_rows: amount of rows in bytes_chunk
+        :return: None
+        """
+        self.file.write(bytes_chunk)
+        self.number_rows += number_rows
+
+    def close(self):
+        """
+        Write the amount of rows in the header and close the file
+
+        :return: None
+        """
+        self.file.seek(0)
+        self.file.write(self._get_bytes_header())
+        self.file.close()
+
+
+def _get_bytes_uint32(iter_int) -> bytes:
+    """
+    Get the little endian uint32 bytes of ints
+    :param iter_int: ints
+    :return: bytes
+    """
+    array_uint32 = array("I", iter_int)
+
+    if array_uint32.itemsize != 4:
+        array_uint32 = array("L", array_uint32)
+
+    if sys.byteorder == "big":
+        array_uint32.byteswap()
+
+    return array_uint32.tobytes()
+
+
+def _get_bytes_sum_columns(list_bytes_column: List[bytes], number_rows: int) -> bytes:
+    """
+    Add byte columns row by row with one big int addition per column (Same as TeamCompositionContainerBatch, the sum
+    of a row must fit in a byte)
+
+    :param list_bytes_column: columns of number_rows bytes
+    :param number_rows: amount of rows
+    :return: bytes of the sum of every row
+    """
+    int_sum = 0
+
+    for bytes_column in list_bytes_column:
+        int_sum += int.from_bytes(bytes_column, "little")
+
+    return int_sum.to_bytes(number_rows, "little")
+
+
+class ColumnarExport:
+
+    def __init__(self, team_composition_container_factory: TeamCompositionContainerFactory, path_db: str):
+        """
+        Exporter of the team_composition_combination table of a db
+
+        :param team_composition_container_factory: TeamCompositionContainerFactory of the champions and traits of the db
+        :param path_db: path to the db file
+        """
+        self.team_composition_container_factory = team_composition_container_factory
+        self.champion_trait_index = team_composition_container_factory.champion_trait_index
+        self.path_db = path_db  # type: str
+
+        # champion id -> cost as a bytes translation table (CHAMPION_ID_PADDING -> 0)
+        bytearray_table_cost = bytearray(256)
+
+        for champion_id, cost in enumerate(self.champion_trait_index.array_champion_id_cost):
+            bytearray_table_cost[champion_id] = cost
+
+        self.bytes_table_cost = bytes(bytearray_table_cost)  # type: bytes
+
+        # trait count discrete -> 1 if the trait is active as a bytes translation table
+        self.bytes_table_active = bytes([0] + [1] * 255)  # type: bytes
+
+        # Column names of the traits (Trait names are not identifiers, "Star Guardian", "Mech-Pilot")
+        self.tuple_trait_id_column_name = tuple(
+            REGEX_NOT_IDENTIFIER.sub("_", trait_name).strip("_") for trait_name in
+            self.champion_trait_index.tuple_trait_id_name)  # type: Tuple[str, ...]
+
+    def _get_width(self, connection: sqlite3.Connection) -> int:
+        """
+        Get the largest team composition size of the db (Width of the champion_ids column)
+
+        :param connection: connection to the db
+        :return: width
+        """
+        width = connection.execute("SELECT MAX(team_composition_size) FROM {};".format(
+            STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)).fetchone()[0]
+
+        return width or 0
+
+    def _iter_dict_key_column_value_bytes_chunk(self, connection: sqlite3.Connection, width: int,
+                                                chunk_size: int):
+        """
+        Read the table a chunk at a time and make the columns of every chunk
+
+        :param connection: connection to the db
+        :param width: width of the champion_ids column
+        :param chunk_size: rows per chunk
+        :return: iterator of (amount of rows, dict of column name -> bytes of the chunk)
+        """
+        cursor = connection.execute(
+            "SELECT team_composition_index, pickled_tuple_team_composition, team_composition_size, "
+            "trait_count_discrete_total FROM {} ORDER BY team_composition_index;".format(
+                STRING_CHAMPION_COMPOSITIONS_TABLE_NAME))
+
+        while True:
+            list_fetch = cursor.fetchmany(chunk_size)
+
+            if not list_fetch:
+                break
+
+            number_rows = len(list_fetch)
+
+            # Index matrix of the chunk (Row major, padded with CHAMPION_ID_PADDING)
+            bytearray_index_matrix = bytearray([CHAMPION_ID_PADDING]) * (width * number_rows)
+
+            for row, tuple_fetch in enumerate(list_fetch):
+                tuple_champion_ids = pickle.loads(tuple_fetch[1])
+                bytearray_index_matrix[row * width: row * width + len(tuple_champion_ids)] = bytes(tuple_champion_ids)
+
+            bytes_index_matrix = bytes(bytearray_index_matrix)
+
+            team_composition_container_batch = \
+                self.team_composition_container_factory.get_team_composition_container_batch_from_index_matrix(
+                    bytes_index_matrix, width)
+
+            list_bytes_column = [bytes_index_matrix[column::width] for column in range(width)]
+
+            dict_key_column_value_bytes_chunk = {
+                COLUMN_TEAM_COMPOSITION_INDEX: _get_bytes_uint32(tuple_fetch[0] for tuple_fetch in list_fetch),
+                COLUMN_TEAM_COMPOSITION_SIZE: bytes(tuple_fetch[2] for tuple_fetch in list_fetch),
+                COLUMN_TRAIT_COUNT_DISCRETE_TOTAL: bytes(tuple_fetch[3] for tuple_fetch in list_fetch),
+                COLUMN_CHAMPION_IDS: bytes_index_matrix,
+                COLUMN_COST_TOTAL: _get_bytes_sum_columns(
+                    [bytes_column.translate(self.bytes_table_cost) for bytes_column in list_bytes_column],
+                    number_rows),
+                COLUMN_AMOUNT_TRAITS_ACTIVE: _get_bytes_sum_columns(
+                    [bytes_trait_count_discrete.translate(self.bytes_table_active) for bytes_trait_count_discrete in
+                     team_composition_container_batch.tuple_trait_id_bytes_trait_count_discrete],
+                    number_rows)}  # type: Dict[str, bytes]
+
+            for trait_id, column_name in enumerate(self.tuple_trait_id_column_name):
+                dict_key_column_value_bytes_chunk[PREFIX_COLUMN_TRAIT_COUNT + column_name] = \
+                    team_composition_container_batch.tuple_trait_id_bytes_trait_count[trait_id]
+
+                dict_key_column_value_bytes_chunk[PREFIX_COLUMN_TRAIT_COUNT_DISCRETE + column_name] = \
+                    team_composition_container_batch.tuple_trait_id_bytes_trait_count_discrete[trait_id]
+
+            yield number_rows, dict_key_column_value_bytes_chunk
+
+    def get_list_tuple_column(self, width: int) -> List[Tuple[str, str, Tuple[int, ...]]]:
+        """
+        Get the columns of the export
+
+        :param width: width of the champion_ids column
+        :return: list of (column name, numpy dtype string, shape of a row)
+        """
+        list_tuple_column = [(COLUMN_TEAM_COMPOSITION_INDEX, DESCR_UINT32, ()),
+                             (COLUMN_TEAM_COMPOSITION_SIZE, DESCR_UINT8, ()),
+                             (COLUMN_TRAIT_COUNT_DISCRETE_TOTAL, DESCR_UINT8, ()),
+                             (COLUMN_CHAMPION_IDS, DESCR_UINT8, (width,)),
+                             (COLUMN_COST_TOTAL, DESCR_UINT8, ()),
+                             (COLUMN_AMOUNT_TRAITS_ACTIVE, DESCR_UINT8, ())]
+
+        for column_name in self.tuple_trait_id_column_name:
+            list_tuple_column.append((PREFIX_COLUMN_TRAIT_COUNT + column_name, DESCR_UINT8, ()))
+            list_tuple_column.append((PREFIX_COLUMN_TRAIT_COUNT_DISCRETE + column_name, DESCR_UINT8, ()))
+
+        return list_tuple_column
+
+    def get_dict_metadata(self, width: int, number_rows: int, format_output: str) -> dict:
+        """
+        Get the description of the export
+
+        :param width: width of the champion_ids column
+        :param number_rows: amount of rows
+        :param format_output: FORMAT_NPY or FORMAT_ARROW
+        :return: json serializable dict
+        """
+        return {"format": format_output,
+                "path_db": os.path.abspath(self.path_db),
+                "number_rows": number_rows,
+                "champion_id_padding": CHAMPION_ID_PADDING,
+                "champion_id_name": list(self.champion_trait_index.tuple_champion_id_name),
+                "trait_id_name": list(self.champion_trait_index.tuple_trait_id_name),
+                "trait_id_column_name": list(self.tuple_trait_id_column_name),
+                "columns": [{"name": column_name,
+                             "dtype": descr,
+                             "shape": [number_rows] + list(tuple_shape_row),
+                             "file": column_name + ".npy" if format_output == FORMAT_NPY else NAME_ARROW}
+                            for column_name, descr, tuple_shape_row in self.get_list_tuple_column(width)]}
+
+    def export(self, dir_output: str, format_output: str = FORMAT_NPY,
+               chunk_size: int = TEAM_COMPOSITION_BATCH_SIZE) -> dict:
+        """
+        Export the table into dir_output
+
+        :param dir_output: path to the output dir
+        :param format_output: FORMAT_NPY or FORMAT_ARROW
+        :param chunk_size: rows read and written at a time
+        :return: metadata of the export (Also written to metadata.json)
+        """
+        if format_output == FORMAT_ARROW and pyarrow is None:
+            raise ImportError("--format arrow needs pyarrow, use --format npy without it")
+
+        os.makedirs(dir_output, exist_ok=True)
+
+        # Read only connection (The export never changes the db)
+        sqlite_connection_pool = SQLiteConnectionPool(self.path_db, size=1)
+
+        number_rows = 0
+
+        try:
+            with sqlite_connection_pool.connection() as connection:
+                width = self._get_width(connection)
+
+                list_tuple_column = self.get_list_tuple_column(width)
+
+                iter_chunk = self._iter_dict_key_column_value_bytes_chunk(connection, width, chunk_size)
+
+                if format_output == FORMAT_NPY:
+                    dict_key_column_value_npy_column_writer = {
+                        column_name: NpyColumnWriter(os.path.join(dir_output, column_name + ".npy"), descr,
+                                                     tuple_shape_row)
+                        for column_name, descr, tuple_shape_row in list_tuple_column}
+
+                    try:
+                        for number_rows_chunk, dict_key_column_value_bytes_chunk in iter_chunk:
+                            for column_name, bytes_chunk in dict_key_column_value_bytes_chunk.items():
+                                dict_key_column_value_npy_column_writer[column_name].write(bytes_chunk,
+                                                                                           number_rows_chunk)
+
+                            number_rows += number_rows_chunk
+
+                    finally:
+                        for npy_column_writer in dict_key_column_value_npy_column_writer.values():
+                            npy_column_writer.close()
+
+                else:
+                    number_rows = self._export_arrow(os.path.join(dir_output, NAME_ARROW), list_tuple_column,
+                                                     iter_chunk)
+
+        finally:
+            sqlite_connection_pool.close()
+
+        dict_metadata = self.get_dict_metadata(width, number_rows, format_output)
+
+        with open(os.path.join(dir_output, NAME_METADATA), "w") as file:
+            json.dump(dict_metadata, file, indent=4)
+
+        return dict_metadata
+
+    @staticmethod
+    def _export_arrow(path_arrow: str, list_tuple_column: List[Tuple[str, str, Tuple[int, ...]]], iter_chunk) -> int:
+        """
+        Write the chunks as the record batches of an Arrow IPC file
+
+        :param path_arrow: path of the .arrow file
+        :param list_tuple_column: columns from get_list_tuple_column
+        :param iter_chunk: iterator of (amount of rows, dict of column name -> bytes of the chunk)
+        :return: amount of rows
+        """
+        dict_key_descr_value_type = {DESCR_UINT8: pyarrow.uint8(), DESCR_UINT32: pyarrow.uint32()}
+
+        list_field = []
+
+        for column_name, descr, tuple_shape_row in list_tuple_column:
+            type_arrow = dict_key_descr_value_type[descr]
+
+            if tuple_shape_row:
+                type_arrow = pyarrow.list_(type_arrow, tuple_shape_row[0])
+
+            list_field.append(pyarrow.field(column_name, type_arrow, nullable=False))
+
+        schema = pyarrow.schema(list_field)
+
+        number_rows = 0
+
+        with pyarrow.ipc.new_file(path_arrow, schema) as record_batch_file_writer:
+            for number_rows_chunk, dict_key_column_value_bytes_chunk in iter_chunk:
+                list_array = []
+
+                for column_name, descr, tuple_shape_row in list_tuple_column:
+                    type_value = dict_key_descr_value_type[descr]
+
+                    length = number_rows_chunk * (tuple_shape_row[0] if tuple_shape_row else 1)
+
+                    array_arrow = pyarrow.Array.from_buffers(
+                        type_value, length, [None, pyarrow.py_buffer(dict_key_column_value_bytes_chunk[column_name])])
+
+                    if tuple_shape_row:
+                        array_arrow = pyarrow.FixedSizeListArray.from_arrays(array_arrow, tuple_shape_row[0])
+
+                    list_array.append(array_arrow)
+
+                record_batch_file_writer.write_batch(pyarrow.RecordBatch.from_arrays(list_array, schema=schema))
+
+                number_rows += number_rows_chunk
+
+        return number_rows
+
+
+def main(list_argument: List[str] = None):
+    parser = argparse.ArgumentParser(description="Export the team compositions of the db into columnar files")
+    parser.add_argument("--output", required=True, help="path to the output dir")
+    parser.add_argument("--format", choices=(FORMAT_NPY, FORMAT_ARROW), default=FORMAT_NPY,
+                        help="npy (a .npy file per column) or arrow (Arrow IPC file, needs pyarrow)")
+    parser.add_argument("--champions", default=PATH_CHAMPIONS, help="path to champions.json")
+    parser.add_argument("--traits", default=PATH_TRAITS, help="path to traits.json")
+    parser.add_argument("--db", default=None, help="path to the db (default is the db of the artifact cache)")
+    parser.add_argument("--team-composition-size", type=int, default=4,
+                        help="team composition size of the artifact cache db")
+    parser.add_argument("--chunk-size", type=int, default=TEAM_COMPOSITION_BATCH_SIZE,
+                        help="rows read and written at a time")
+
+    namespace = parser.parse_args(list_argument)
+
+    path_db = namespace.db
+
+    if path_db is None:
+        path_db = ArtifactCache().get_path_db_valid(namespace.champions, namespace.traits,
+                                                    namespace.team_composition_size)
+
+    team_composition_solver = TeamCompositionSolver(namespace.champions, namespace.traits, path_db=path_db,
+                                                    bool_db_immutable=True)
+
+    columnar_export = ColumnarExport(team_composition_solver.team_composition_container_factory, path_db)
+
+    dict_metadata = columnar_export.export(namespace.output, namespace.format, namespace.chunk_size)
+
+    print("Exported {} rows and {} columns to {}".format(dict_metadata["number_rows"],
+                                                         len(dict_metadata["columns"]),
+                                                         namespace.output))
+
+
+if __name__ == '__main__':
+    main()
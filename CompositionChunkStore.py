@@ -0,0 +1,440 @@
+"""
+10/19/2026
+
+Purpose:
+    File of the team compositions sorted by (team composition size, trait count discrete total, bitmask of the
+    champions) and written in compressed chunks of CHUNK_STORE_CHUNK_ROWS rows, a query reads only the chunks whose
+    zone map can match
+
+Important Note:
+    File layout (Little endian):
+        CHUNK_STORE_MAGIC
+        The compressed chunks one after another
+        Footer (json): champion names, codec, amount of rows and the zone map of every chunk
+        Length of the footer (uint32), CHUNK_STORE_MAGIC
+
+    Zone map of a chunk (Kept in the footer so every zone map is read with one read and no chunk is read to skip it):
+        offset, length      bytes of the compressed chunk in the file
+        rows                rows of the chunk
+        width               bytes of a bitmask delta of the chunk
+        size_min/size_max   min/max team composition size
+        total_min/total_max min/max trait count discrete total
+        bitmask_or          OR of the bitmasks of the chunk (An included champion that is not in it can not match)
+        bitmask_and         AND of the bitmasks of the chunk (An excluded champion that is in it removes every row)
+        bitmask_first       bitmask of the first row (The deltas start from it)
+
+    A chunk before it is compressed:
+        team composition size of every row (1 byte)
+        trait count discrete total of every row (1 byte)
+        zigzag delta of the bitmask of every row from the bitmask of the row before it (0 for the first row) in width
+            bytes, stored as width byte planes (Every lowest byte, then every second byte...) since the high bytes of
+            small deltas are 0 and compress to nothing
+
+    The rows are sorted so the rows of a (size, total) are next to each other, their bitmasks go up and the deltas are
+    small. Deltas of 1, 2, 4 or 8 bytes are decoded by array.frombytes and itertools.accumulate.
+
+        python -m Teamfight_Tactics_Composition_Solver.CompositionChunkStore --output compositions.chunks
+
+"""
+import argparse
+import json
+import lzma
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.ArtifactCache import ArtifactCache
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import ChampionTraitIndex
+from Teamfight_Tactics_Composition_Solver.Instrumentation import span
+from Teamfight_Tactics_Composition_Solver.TeamCompositionSolver import TeamCompositionSolver
+from Teamfight_Tactics_Composition_Solver.constants import (PATH_CHAMPIONS, PATH_TRAITS, TEAM_COMPOSITION_SIZE_MIN,
+                                                            TEAM_COMPOSITION_SIZE_MAX, TRAIT_COUNT_DISCRETE_TOTAL_MIN,
+                                                            TRAIT_COUNT_TOTAL_MAX)
+
+CHUNK_STORE_MAGIC = b"CZS1"
+
+STRUCT_CHUNK_STORE_TRAILER = struct.Struct("<I4s")
+
+# Rows per chunk (A chunk is the smallest part of the file that is decompressed, smaller chunks compress a little worse
+# but their zone maps skip more of the file)
+CHUNK_STORE_CHUNK_ROWS = 1024
+
+CODEC_ZLIB = "zlib"
+CODEC_LZMA = "lzma"
+
+# codec -> (compress, decompress)
+DICT_KEY_CODEC_VALUE_TUPLE_CALLABLE = {
+    CODEC_ZLIB: (lambda bytes_data: zlib.compress(bytes_data, 9), zlib.decompress),
+    CODEC_LZMA: (lzma.compress, lzma.decompress),
+}
+
+# Bytes of a delta -> typecode of an array with items of that size
+DICT_KEY_WIDTH_VALUE_TYPECODE = {array(typecode).itemsize: typecode for typecode in "QLIHB"}
+
+ZONE_MAP_OFFSET = 0
+ZONE_MAP_LENGTH = 1
+ZONE_MAP_ROWS = 2
+ZONE_MAP_WIDTH = 3
+ZONE_MAP_SIZE_MIN = 4
+ZONE_MAP_SIZE_MAX = 5
+ZONE_MAP_TOTAL_MIN = 6
+ZONE_MAP_TOTAL_MAX = 7
+ZONE_MAP_BITMASK_OR = 8
+ZONE_MAP_BITMASK_AND = 9
+ZONE_MAP_BITMASK_FIRST = 10
+
+
+def _get_width(int_max: int) -> int:
+    """
+    Get the bytes of a delta, rounded up to the size of an array item if there is one
+
+    :param int_max: largest zigzag delta
+    :return: width
+    """
+    width = max((int_max.bit_length() + 7) // 8, 1)
+
+    for width_array in sorted(DICT_KEY_WIDTH_VALUE_TYPECODE):
+        if width <= width_array:
+            return width_array
+
+    return width
+
+
+def _get_bytes_chunk(list_tuple_row: List[Tuple[int, int, int]]) -> Tuple[bytes, int]:
+    """
+    Encode the rows of a chunk (Before compression)
+
+    :param list_tuple_row: rows of (team composition size, trait count discrete total, bitmask) in sorted order
+    :return: tuple of (bytes of the chunk, width of the deltas)
+    """
+    list_zigzag = []
+
+    bitmask_previous = list_tuple_row[0][2]
+
+    for _, _, bitmask in list_tuple_row:
+        delta = bitmask - bitmask_previous
+
+        list_zigzag.append(delta << 1 if delta >= 0 else ((-delta) << 1) - 1)
+
+        bitmask_previous = bitmask
+
+    width = _get_width(max(list_zigzag))
+
+    typecode = DICT_KEY_WIDTH_VALUE_TYPECODE.get(width)
+
+    if typecode is not None:
+        array_zigzag = array(typecode, list_zigzag)
+
+        if sys.byteorder == "big":
+            array_zigzag.byteswap()
+
+        bytes_delta = array_zigzag.tobytes()
+    else:
+        bytes_delta = b"".join(zigzag.to_bytes(width, "little") for zigzag in list_zigzag)
+
+    return (bytes(tuple_row[0] for tuple_row in list_tuple_row) +
+            bytes(tuple_row[1] for tuple_row in list_tuple_row) +
+            b"".join(bytes_delta[byte::width] for byte in range(width))), width
+
+
+def _get_list_bitmask(bytes_chunk: bytes, rows: int, width: int, bitmask_first: int) -> List[int]:
+    """
+    Decode the bitmasks of a chunk (After decompression)
+
+    :param bytes_chunk: bytes of the chunk
+    :param rows: rows of the chunk
+    :param width: width of the deltas
+    :param bitmask_first: bitmask of the first row
+    :return: list of the bitmask of every row
+    """
+    bytearray_delta = bytearray(rows * width)
+
+    for byte in range(width):
+        bytearray_delta[byte::width] = bytes_chunk[2 * rows + byte * rows: 2 * rows + (byte + 1) * rows]
+
+    typecode = DICT_KEY_WIDTH_VALUE_TYPECODE.get(width)
+
+    if typecode is not None:
+        array_zigzag = array(typecode)
+        array_zigzag.frombytes(bytearray_delta)
+
+        if sys.byteorder == "big":
+            array_zigzag.byteswap()
+    else:
+        array_zigzag = [int.from_bytes(bytearray_delta[row * width: (row + 1) * width], "little") for row in
+                        range(rows)]
+
+    return list(accumulate((zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1) for zigzag in array_zigzag),
+                           initial=bitmask_first))[1:]
+
+
+def write_composition_chunk_store(path: str,
+                                  champion_trait_index: ChampionTraitIndex,
+                                  iter_tuple_champion_ids_trait_count_discrete_total: Iterable[
+                                      Tuple[Tuple[int, ...], int]],
+                                  chunk_rows: int = CHUNK_STORE_CHUNK_ROWS,
+                                  codec: str = CODEC_ZLIB) -> dict:
+    """
+    Sort the team compositions and write them as a chunk store
+
+    The team compositions are bucketed by (size, total) and only the bitmasks of a bucket are sorted (8 bytes per team
+    composition with up to 64 champions).
+
+    :param path: path of the file
+    :param champion_trait_index: ChampionTraitIndex the champion ids are based on
+    :param iter_tuple_champion_ids_trait_count_discrete_total: iterable of (tuple of champion ids, trait count discrete
+        total) (See SQLiteHandlerTeamCompositionSolver.get_iter_tuple_champion_ids_trait_count_discrete_total)
+    :param chunk_rows: rows per chunk
+    :param codec: CODEC_ZLIB or CODEC_LZMA
+    :return: footer of the file
+    """
+    compress = DICT_KEY_CODEC_VALUE_TUPLE_CALLABLE[codec][0]
+
+    dict_key_tuple_size_total_value_bitmasks = {}  # type: Dict[Tuple[int, int], array]
+
+    for tuple_champion_ids, trait_count_discrete_total in iter_tuple_champion_ids_trait_count_discrete_total:
+        bitmask = 0
+
+        for champion_id in tuple_champion_ids:
+            bitmask |= 1 << champion_id
+
+        tuple_size_total = (len(tuple_champion_ids), trait_count_discrete_total)
+
+        bitmasks = dict_key_tuple_size_total_value_bitmasks.get(tuple_size_total)
+
+        if bitmasks is None:
+            bitmasks = array("Q") if champion_trait_index.number_champions <= 64 else []
+            dict_key_tuple_size_total_value_bitmasks[tuple_size_total] = bitmasks
+
+        bitmasks.append(bitmask)
+
+    def iter_tuple_row() -> Iterator[Tuple[int, int, int]]:
+        for (team_composition_size, trait_count_discrete_total), bitmasks in sorted(
+                dict_key_tuple_size_total_value_bitmasks.items()):
+            for bitmask in sorted(bitmasks):
+                yield team_composition_size, trait_count_discrete_total, bitmask
+
+    list_list_zone_map = []
+
+    rows_total = 0
+
+    path_temp = path + ".tmp"
+
+    with open(path_temp, "wb") as file:
+        file.write(CHUNK_STORE_MAGIC)
+
+        list_tuple_row = []
+
+        for tuple_row in iter_tuple_row():
+            list_tuple_row.append(tuple_row)
+
+            if len(list_tuple_row) < chunk_rows:
+                continue
+
+            list_list_zone_map.append(_write_chunk(file, list_tuple_row, compress))
+            rows_total += len(list_tuple_row)
+            list_tuple_row = []
+
+        if list_tuple_row:
+            list_list_zone_map.append(_write_chunk(file, list_tuple_row, compress))
+            rows_total += len(list_tuple_row)
+
+        dict_footer = {"champion_names": list(champion_trait_index.tuple_champion_id_name),
+                       "codec": codec,
+                       "rows": rows_total,
+                       "chunks": list_list_zone_map}
+
+        bytes_footer = json.dumps(dict_footer).encode()
+
+        file.write(bytes_footer)
+        file.write(STRUCT_CHUNK_STORE_TRAILER.pack(len(bytes_footer), CHUNK_STORE_MAGIC))
+
+    # A reader never sees a half written chunk store
+    os.replace(path_temp, path)
+
+    return dict_footer
+
+
+def _write_chunk(file, list_tuple_row: List[Tuple[int, int, int]], compress: callable) -> list:
+    """
+    Compress and write a chunk
+
+    :param file: file opened for writing
+    :param list_tuple_row: rows of the chunk
+    :param compress: compress callable of the codec
+    :return: zone map of the chunk
+    """
+    bytes_chunk, width = _get_bytes_chunk(list_tuple_row)
+
+    bytes_compressed = compress(bytes_chunk)
+
+    offset = file.tell()
+
+    file.write(bytes_compressed)
+
+    bitmask_or = 0
+    bitmask_and = -1
+
+    for _, _, bitmask in list_tuple_row:
+        bitmask_or |= bitmask
+        bitmask_and &= bitmask
+
+    return [offset, len(bytes_compressed), len(list_tuple_row), width,
+            min(tuple_row[0] for tuple_row in list_tuple_row), max(tuple_row[0] for tuple_row in list_tuple_row),
+            min(tuple_row[1] for tuple_row in list_tuple_row), max(tuple_row[1] for tuple_row in list_tuple_row),
+            bitmask_or, bitmask_and, list_tuple_row[0][2]]
+
+
+class CompositionChunkStore:
+    __slots__ = ['path',
+                 'champion_trait_index',
+                 'codec',
+                 'rows',
+                 'list_list_zone_map'
+                 ]
+
+    def __init__(self, path: str, champion_trait_index: ChampionTraitIndex):
+        """
+        Reader of a file written by write_composition_chunk_store (Only the footer is read here)
+
+        :param path: path of the file
+        :param champion_trait_index: ChampionTraitIndex of the champions of the file
+        :raises ValueError: the file is not a chunk store or its champions are not the champions of
+            champion_trait_index
+        """
+        self.path = path  # type: str
+        self.champion_trait_index = champion_trait_index  # type: ChampionTraitIndex
+
+        with open(path, "rb") as file:
+            file.seek(-STRUCT_CHUNK_STORE_TRAILER.size, os.SEEK_END)
+
+            length_footer, magic = STRUCT_CHUNK_STORE_TRAILER.unpack(file.read(STRUCT_CHUNK_STORE_TRAILER.size))
+
+            if magic != CHUNK_STORE_MAGIC:
+                raise ValueError("{} is not a chunk store".format(path))
+
+            file.seek(-STRUCT_CHUNK_STORE_TRAILER.size - length_footer, os.SEEK_END)
+
+            dict_footer = json.loads(file.read(length_footer))
+
+        if tuple(dict_footer["champion_names"]) != champion_trait_index.tuple_champion_id_name:
+            raise ValueError("{} was written with other champions".format(path))
+
+        self.codec = dict_footer["codec"]  # type: str
+        self.rows = dict_footer["rows"]  # type: int
+        self.list_list_zone_map = dict_footer["chunks"]  # type: List[list]
+
+    def __len__(self):
+        return self.rows
+
+    def get_iter_tuple_row(self,
+                           iter_champion_names_include: Iterable[str] = (),
+                           iter_champion_names_exclude: Iterable[str] = (),
+                           team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                           team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX,
+                           trait_count_discrete_total_min: int = TRAIT_COUNT_DISCRETE_TOTAL_MIN,
+                           trait_count_discrete_total_max: int = TRAIT_COUNT_TOTAL_MAX
+                           ) -> Iterator[Tuple[Tuple[int, ...], int, int]]:
+        """
+        Get the team compositions with every included champion, no excluded champion and a size and a total in the
+        bounds, a chunk is only read and decompressed if its zone map can match
+
+        :param iter_champion_names_include: champion names
+        :param iter_champion_names_exclude: champion names
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :param trait_count_discrete_total_min:
+        :param trait_count_discrete_total_max:
+        :return: iterator of (tuple of champion ids, team composition size, trait count discrete total) in the order of
+            the file
+        """
+        bitmask_include = self.champion_trait_index.get_bitmask_champion(iter_champion_names_include)
+        bitmask_exclude = self.champion_trait_index.get_bitmask_champion(iter_champion_names_exclude)
+
+        if bitmask_include & bitmask_exclude:
+            return
+
+        decompress = DICT_KEY_CODEC_VALUE_TUPLE_CALLABLE[self.codec][1]
+
+        get_tuple_champion_id_from_bitmask = self.champion_trait_index.get_tuple_champion_id_from_bitmask
+
+        with span("chunk_store.get_iter_tuple_row", chunks=len(self.list_list_zone_map)) as span_query:
+            chunks_read = 0
+
+            with open(self.path, "rb") as file:
+                for list_zone_map in self.list_list_zone_map:
+                    if (list_zone_map[ZONE_MAP_SIZE_MAX] < team_composition_size_min or
+                            list_zone_map[ZONE_MAP_SIZE_MIN] > team_composition_size_max or
+                            list_zone_map[ZONE_MAP_TOTAL_MAX] < trait_count_discrete_total_min or
+                            list_zone_map[ZONE_MAP_TOTAL_MIN] > trait_count_discrete_total_max or
+                            bitmask_include & ~list_zone_map[ZONE_MAP_BITMASK_OR] or
+                            bitmask_exclude & list_zone_map[ZONE_MAP_BITMASK_AND]):
+                        continue
+
+                    chunks_read += 1
+
+                    file.seek(list_zone_map[ZONE_MAP_OFFSET])
+
+                    bytes_chunk = decompress(file.read(list_zone_map[ZONE_MAP_LENGTH]))
+
+                    rows = list_zone_map[ZONE_MAP_ROWS]
+
+                    list_bitmask = _get_list_bitmask(bytes_chunk, rows, list_zone_map[ZONE_MAP_WIDTH],
+                                                     list_zone_map[ZONE_MAP_BITMASK_FIRST])
+
+                    for team_composition_size, trait_count_discrete_total, bitmask in zip(
+                            bytes_chunk[:rows], bytes_chunk[rows: 2 * rows], list_bitmask):
+
+                        if (bitmask & bitmask_include == bitmask_include and
+                                not bitmask & bitmask_exclude and
+                                team_composition_size_min <= team_composition_size <= team_composition_size_max and
+                                trait_count_discrete_total_min <= trait_count_discrete_total <=
+                                trait_count_discrete_total_max):
+                            yield (get_tuple_champion_id_from_bitmask(bitmask), team_composition_size,
+                                   trait_count_discrete_total)
+
+            span_query.set_argument("chunks_read", chunks_read)
+
+
+def main(list_argument: List[str] = None):
+    parser = argparse.ArgumentParser(description="Write the team compositions of the db as a compressed chunk store")
+    parser.add_argument("--output", required=True, help="path to the output file")
+    parser.add_argument("--codec", choices=tuple(DICT_KEY_CODEC_VALUE_TUPLE_CALLABLE), default=CODEC_ZLIB,
+                        help="compressor of the chunks")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_STORE_CHUNK_ROWS, help="rows per chunk")
+    parser.add_argument("--champions", default=PATH_CHAMPIONS, help="path to champions.json")
+    parser.add_argument("--traits", default=PATH_TRAITS, help="path to traits.json")
+    parser.add_argument("--db", default=None, help="path to the db (default is the db of the artifact cache)")
+    parser.add_argument("--team-composition-size", type=int, default=4,
+                        help="team composition size of the artifact cache db")
+
+    namespace = parser.parse_args(list_argument)
+
+    path_db = namespace.db
+
+    if path_db is None:
+        path_db = ArtifactCache().get_path_db_valid(namespace.champions, namespace.traits,
+                                                    namespace.team_composition_size)
+
+    team_composition_solver = TeamCompositionSolver(namespace.champions, namespace.traits, path_db=path_db,
+                                                    bool_db_immutable=True)
+
+    sqlite_handler = team_composition_solver.sqlite_handler_team_composition_solver
+
+    dict_footer = write_composition_chunk_store(namespace.output,
+                                                team_composition_solver.champion_trait_index,
+                                                sqlite_handler.get_iter_tuple_champion_ids_trait_count_discrete_total(),
+                                                namespace.chunk_rows,
+                                                namespace.codec)
+
+    print("Wrote {} rows in {} chunks to {} ({} bytes, the db is {} bytes)".format(
+        dict_footer["rows"], len(dict_footer["chunks"]), namespace.output, os.path.getsize(namespace.output),
+        os.path.getsize(path_db)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+10/19/2026
+
+Purpose:
+    Precomputed trait deltas of a set of emblems so the trait counts of a team composition with those emblems are
+    calculated from the trait counts without the emblems
+
+Important Note:
+    An emblem adds its trait to its holder if the holder does not have that trait already and the best holders of the
+    emblems of a trait are always the champions without that trait. So with e emblems of a trait, a team composition
+    of size n with a trait count of c gets
+
+        trait count with emblems = c + min(e, n - c)
+
+    which only needs the trait count and the team composition size, which champion holds which emblem does not change
+    the trait counts. The emblems of every trait are a delta vector indexed by trait id (array_trait_id_emblem_count)
+    and min(e, n - c) is a bytes translation table per trait so a TeamCompositionContainerBatch applies the emblems a
+    column at a time the same way it calculates the trait counts.
+
+    Every champion can hold ITEM_SLOTS_PER_CHAMPION items so the emblems are only limited by the slots when there are
+    more emblems than ITEM_SLOTS_PER_CHAMPION * n, that is not checked.
+
+    Force of Nature gives no trait, it is team_composition_size_delta (The searcher and the queries allow that many
+    more champions).
+
+    The results with emblems are limited to the team compositions of the db:
+        1.  The queries of the db (TeamCompositionQueryServer and BatchQuery) only re-score the rows of the db and the
+            db is built without emblems, a team composition that was pruned when the db was built (OPTIMIZATION 3 of
+            TeamCompositionCombinationsSearcher) is not in the db even if it is useful with the emblems.
+        2.  The searcher with an emblem_set only uses the emblems for the totals of OPTIMIZATION 3 and for the size, it
+            still grows the team compositions by the traits of the champions without the emblems, so a team
+            composition whose champions only share a trait through an emblem is not found either.
+
+"""
+from array import array
+from typing import Iterable, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import ChampionTraitIndex
+from Teamfight_Tactics_Composition_Solver.Item import Item
+
+# Items a champion can hold
+ITEM_SLOTS_PER_CHAMPION = 3
+
+
+class EmblemSet:
+    __slots__ = ['champion_trait_index',
+                 'tuple_item_id',
+                 'array_trait_id_emblem_count',
+                 'tuple_trait_id_emblem',
+                 'tuple_trait_id_bytes_emblem_bonus',
+                 'team_composition_size_delta'
+                 ]
+
+    def __init__(self, champion_trait_index: ChampionTraitIndex, iter_item: Iterable[Item]):
+        """
+        Trait deltas of a set of emblems (An emblem can be in iter_item more than once)
+
+        :param champion_trait_index: ChampionTraitIndex the trait ids are based on
+        :param iter_item: emblems (Items that are not emblems and not Force of Nature are ignored)
+        """
+        self.champion_trait_index = champion_trait_index  # type: ChampionTraitIndex
+
+        list_item = [item for item in iter_item if item.is_emblem() or item.get_team_composition_size_delta()]
+
+        # Sorted item ids of the emblems (Same emblems in any order give the same tuple, used as a key)
+        self.tuple_item_id = tuple(sorted(item.item_id for item in list_item))  # type: Tuple[int, ...]
+
+        # trait id -> amount of emblems of that trait (Trait delta vector)
+        self.array_trait_id_emblem_count = array('B', bytes(champion_trait_index.number_traits))  # type: array
+
+        self.team_composition_size_delta = 0  # type: int
+
+        for item in list_item:
+            self.team_composition_size_delta += item.get_team_composition_size_delta()
+
+            if item.is_emblem():
+                trait_id = champion_trait_index.dict_key_trait_name_value_trait_id.get(item.trait_emblem)
+
+                # Emblem of a trait that is not in the trait pool
+                if trait_id is None:
+                    raise KeyError("{} gives {} which is not a trait".format(item.name, item.trait_emblem))
+
+                self.array_trait_id_emblem_count[trait_id] += 1
+
+        # Trait ids that have emblems (The only traits that change)
+        self.tuple_trait_id_emblem = tuple(
+            trait_id for trait_id, emblem_count in enumerate(self.array_trait_id_emblem_count) if
+            emblem_count)  # type: Tuple[int, ...]
+
+        """
+        trait id -> (champions without the trait -> trait count added by the emblems) as a bytes translation table,
+        empty bytes for the traits without emblems
+        """
+        self.tuple_trait_id_bytes_emblem_bonus = tuple(
+            bytes(min(emblem_count, champions_without_trait) for champions_without_trait in range(256)) if
+            emblem_count else b"" for emblem_count in self.array_trait_id_emblem_count)  # type: Tuple[bytes, ...]
+
+    def __bool__(self):
+        return bool(self.tuple_item_id)
+
+    def __str__(self):
+        return "EmblemSet({}, team composition size +{})".format(
+            {self.champion_trait_index.tuple_trait_id_name[trait_id]: self.array_trait_id_emblem_count[trait_id] for
+             trait_id in self.tuple_trait_id_emblem},
+            self.team_composition_size_delta)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get_emblem_count_max(self) -> int:
+        """
+        Get the most emblems one champion can get (Used to check that a row of a batch can not overflow a byte)
+        :return: int
+        """
+        return min(len(self.tuple_trait_id_emblem), ITEM_SLOTS_PER_CHAMPION)
+
+    def get_array_trait_count(self, array_trait_count: array, team_composition_size: int) -> array:
+        """
+        Get the trait counts of a team composition with the emblems
+
+        :param array_trait_count: trait counts indexed by trait id without the emblems
+        :param team_composition_size: amount of champions in the team composition
+        :return: new array('B') of the trait counts with the emblems
+        """
+        array_trait_count_emblem = array_trait_count[:]
+
+        for trait_id in self.tuple_trait_id_emblem:
+            trait_count = array_trait_count[trait_id]
+
+            array_trait_count_emblem[trait_id] = trait_count + min(self.array_trait_id_emblem_count[trait_id],
+                                                                   team_composition_size - trait_count)
+
+        return array_trait_count_emblem
+
+    def get_list_bytes_trait_count(self,
+                                   tuple_trait_id_bytes_trait_count: Tuple[bytes, ...],
+                                   bytes_team_composition_size: bytes) -> List[bytes]:
+        """
+        Get the trait count columns of a batch with the emblems
+
+        The champions without a trait is the team composition size column minus the trait count column, a big int
+        subtraction can not borrow because the trait count of a row is never larger than its size.
+
+        :param tuple_trait_id_bytes_trait_count: trait id -> trait count of every row without the emblems
+        :param bytes_team_composition_size: team composition size of every row
+        :return: list of trait id -> trait count of every row with the emblems
+        """
+        list_bytes_trait_count = list(tuple_trait_id_bytes_trait_count)
+
+        number_rows = len(bytes_team_composition_size)
+
+        int_team_composition_size = int.from_bytes(bytes_team_composition_size, "little")
+
+        for trait_id in self.tuple_trait_id_emblem:
+            int_trait_count = int.from_bytes(list_bytes_trait_count[trait_id], "little")
+
+            bytes_champions_without_trait = (int_team_composition_size - int_trait_count).to_bytes(number_rows,
+                                                                                                   "little")
+
+            int_emblem_bonus = int.from_bytes(
+                bytes_champions_without_trait.translate(self.tuple_trait_id_bytes_emblem_bonus[trait_id]), "little")
+
+            list_bytes_trait_count[trait_id] = (int_trait_count + int_emblem_bonus).to_bytes(number_rows, "little")
+
+        return list_bytes_trait_count
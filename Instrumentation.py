@@ -0,0 +1,436 @@
+"""
+10/19/2026
+
+Purpose:
+    Spans, counters and histograms of the build stages, the db queries and the GUI worker tasks, exported to a JSON
+    lines file and to the Chrome trace format (chrome://tracing or https://ui.perfetto.dev)
+
+Important Note:
+    Instrumentation is enabled by setting the environment variable TFT_TRACE to the path prefix of the output files
+    before the application is started, nothing in the source code has to be changed to profile a session:
+
+        TFT_TRACE=resources/generated/trace/session python main.py
+
+    writes session.jsonl and session.trace.json when the process exits.
+
+    The decorators traced and counted return the callable unchanged when instrumentation is disabled at the time the
+    callable is decorated (At import), so a disabled decorator costs nothing, not even a function call. The context
+    manager span and the functions increment_counter and observe_histogram only check a bool when disabled.
+
+    Span durations are also observed into the histogram of the span name so the distribution of a repeated span (db
+    query, GUI worker task) is kept without keeping every span of a long session.
+
+"""
+import atexit
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Environment variable of the path prefix of the output files
+ENVIRONMENT_VARIABLE_TRACE = "TFT_TRACE"
+
+# Spans kept before the oldest spans are dropped (The histograms keep every span)
+SPAN_AMOUNT_MAX = 1000000
+
+EXTENSION_JSON_LINES = ".jsonl"
+EXTENSION_CHROME_TRACE = ".trace.json"
+
+
+class Histogram:
+    __slots__ = ["count", "total", "minimum", "maximum", "dict_key_bucket_value_count"]
+
+    def __init__(self):
+        """
+        Count, sum, min, max and power of 2 buckets of the observed values
+        """
+        self.count = 0  # type: int
+        self.total = 0.0  # type: float
+        self.minimum = math.inf  # type: float
+        self.maximum = -math.inf  # type: float
+
+        # Upper bound of the bucket (Power of 2) -> amount of values in the bucket
+        self.dict_key_bucket_value_count = {}  # type: Dict[float, int]
+
+    def observe(self, value: float):
+        """
+        Add a value to the histogram
+        :param value: value
+        :return: None
+        """
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+        bucket = 2.0 ** math.ceil(math.log2(value)) if value > 0 else 0.0
+
+        self.dict_key_bucket_value_count[bucket] = self.dict_key_bucket_value_count.get(bucket, 0) + 1
+
+    def get_dict(self) -> dict:
+        """
+        Get the histogram as a json serializable dict
+        :return: dict
+        """
+        return {"count": self.count,
+                "sum": self.total,
+                "min": self.minimum if self.count else None,
+                "max": self.maximum if self.count else None,
+                "mean": self.total / self.count if self.count else None,
+                "buckets": {str(bucket): count for bucket, count in sorted(self.dict_key_bucket_value_count.items())}}
+
+
+class _SpanDisabled:
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_argument(self, key: str, value):
+        pass
+
+
+# Shared span returned by span() when instrumentation is disabled
+SPAN_DISABLED = _SpanDisabled()
+
+
+class Span:
+    __slots__ = ["instrumentation", "name", "dict_args", "bool_memory", "time_start"]
+
+    def __init__(self, instrumentation: "Instrumentation", name: str, dict_args: dict, bool_memory: bool):
+        """
+        Context manager that records the time between its enter and its exit
+
+        :param instrumentation: Instrumentation the span is recorded into
+        :param name: name of the span
+        :param dict_args: arguments shown with the span
+        :param bool_memory: record the peak resident memory of the process at the end of the span
+        """
+        self.instrumentation = instrumentation
+        self.name = name
+        self.dict_args = dict_args
+        self.bool_memory = bool_memory
+        self.time_start = 0
+
+    def __enter__(self):
+        self.time_start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        time_end = time.perf_counter_ns()
+
+        if exc_type is not None:
+            self.dict_args["exception"] = exc_type.__name__
+
+        if self.bool_memory:
+            self.dict_args["memory_max_rss"] = get_memory_max_rss()
+
+        self.instrumentation.add_span(self.name, self.time_start, time_end, self.dict_args)
+
+        return False
+
+    def set_argument(self, key: str, value):
+        """
+        Add an argument to the span (Row count of a query, amount of team compositions of a stage)
+        :param key: key
+        :param value: json serializable value
+        :return: None
+        """
+        self.dict_args[key] = value
+
+
+class Instrumentation:
+
+    def __init__(self, path_prefix: str = None):
+        """
+        Spans, counters and histograms of a process
+
+        :param path_prefix: path prefix of the output files written at exit (None to not write them)
+        """
+        self.bool_enabled = path_prefix is not None  # type: bool
+
+        self.path_prefix = path_prefix  # type: str
+
+        # Spans are added by the GUI threads and the main thread
+        self.lock = threading.Lock()
+
+        # Origin of the span times
+        self.time_origin = time.perf_counter_ns()  # type: int
+
+        # (Name, start ns, end ns, thread id, args) of the spans in the order they ended
+        self.deque_tuple_span = deque(maxlen=SPAN_AMOUNT_MAX)  # type: Deque[tuple]
+
+        self.amount_span_dropped = 0  # type: int
+
+        # Thread id -> thread name (For the thread names of the Chrome trace)
+        self.dict_key_thread_id_value_thread_name = {}  # type: Dict[int, str]
+
+        self.dict_key_counter_name_value_count = {}  # type: Dict[str, int]
+
+        self.dict_key_histogram_name_value_histogram = {}  # type: Dict[str, Histogram]
+
+    def add_span(self, name: str, time_start: int, time_end: int, dict_args: dict):
+        """
+        Record a span that has ended
+
+        :param name: name of the span
+        :param time_start: perf_counter_ns at the start of the span
+        :param time_end: perf_counter_ns at the end of the span
+        :param dict_args: arguments of the span
+        :return: None
+        """
+        thread_current = threading.current_thread()
+
+        with self.lock:
+            # The oldest span is dropped by the deque
+            if len(self.deque_tuple_span) == SPAN_AMOUNT_MAX:
+                self.amount_span_dropped += 1
+
+            self.deque_tuple_span.append((name, time_start, time_end, thread_current.ident, dict_args))
+
+            self.dict_key_thread_id_value_thread_name[thread_current.ident] = thread_current.name
+
+            self._observe_histogram(name, (time_end - time_start) / 1e6)
+
+    def increment_counter(self, name: str, amount: int = 1):
+        """
+        Add amount to a counter
+        :param name: name of the counter
+        :param amount: amount
+        :return: None
+        """
+        with self.lock:
+            self.dict_key_counter_name_value_count[name] = self.dict_key_counter_name_value_count.get(name, 0) + amount
+
+    def observe_histogram(self, name: str, value: float):
+        """
+        Add a value to a histogram
+        :param name: name of the histogram
+        :param value: value
+        :return: None
+        """
+        with self.lock:
+            self._observe_histogram(name, value)
+
+    def _observe_histogram(self, name: str, value: float):
+        histogram = self.dict_key_histogram_name_value_histogram.get(name)
+
+        if histogram is None:
+            histogram = self.dict_key_histogram_name_value_histogram[name] = Histogram()
+
+        histogram.observe(value)
+
+    def get_dict_metrics(self) -> dict:
+        """
+        Get the counters and the histograms as a json serializable dict
+        :return: dict
+        """
+        with self.lock:
+            return {"counters": dict(self.dict_key_counter_name_value_count),
+                    "histograms": {name: histogram.get_dict() for name, histogram in
+                                   self.dict_key_histogram_name_value_histogram.items()},
+                    "spans_dropped": self.amount_span_dropped}
+
+    def write_json_lines(self, path: str):
+        """
+        Write every span, counter and histogram as a line of json
+
+        :param path: path of the .jsonl file
+        :return: None
+        """
+        dict_metrics = self.get_dict_metrics()
+
+        with self.lock:
+            list_tuple_span = list(self.deque_tuple_span)
+
+        with open(path, "w") as file:
+            for name, time_start, time_end, thread_id, dict_args in list_tuple_span:
+                file.write(json.dumps({"type": "span",
+                                       "name": name,
+                                       "start_ms": (time_start - self.time_origin) / 1e6,
+                                       "duration_ms": (time_end - time_start) / 1e6,
+                                       "thread_id": thread_id,
+                                       "args": dict_args}, default=str))
+                file.write("\n")
+
+            for name, count in dict_metrics["counters"].items():
+                file.write(json.dumps({"type": "counter", "name": name, "value": count}))
+                file.write("\n")
+
+            for name, dict_histogram in dict_metrics["histograms"].items():
+                file.write(json.dumps(dict({"type": "histogram", "name": name}, **dict_histogram)))
+                file.write("\n")
+
+    def write_chrome_trace(self, path: str):
+        """
+        Write the spans as complete events and the counters as counter events of the Chrome trace format
+
+        :param path: path of the .trace.json file
+        :return: None
+        """
+        process_id = os.getpid()
+
+        with self.lock:
+            list_tuple_span = list(self.deque_tuple_span)
+            dict_key_thread_id_value_thread_name = dict(self.dict_key_thread_id_value_thread_name)
+            dict_key_counter_name_value_count = dict(self.dict_key_counter_name_value_count)
+
+        list_dict_event = [{"name": "thread_name", "ph": "M", "pid": process_id, "tid": thread_id,
+                            "args": {"name": thread_name}} for thread_id, thread_name in
+                           dict_key_thread_id_value_thread_name.items()]
+
+        time_end_max = self.time_origin
+
+        for name, time_start, time_end, thread_id, dict_args in list_tuple_span:
+            list_dict_event.append({"name": name,
+                                    "cat": name.split(".", 1)[0],
+                                    "ph": "X",
+                                    "ts": (time_start - self.time_origin) / 1e3,
+                                    "dur": (time_end - time_start) / 1e3,
+                                    "pid": process_id,
+                                    "tid": thread_id,
+                                    "args": dict_args})
+
+            time_end_max = max(time_end_max, time_end)
+
+        # Counters are only kept as totals so they are shown once at the end of the trace
+        for name, count in dict_key_counter_name_value_count.items():
+            list_dict_event.append({"name": name,
+                                    "ph": "C",
+                                    "ts": (time_end_max - self.time_origin) / 1e3,
+                                    "pid": process_id,
+                                    "args": {"value": count}})
+
+        with open(path, "w") as file:
+            json.dump({"traceEvents": list_dict_event, "displayTimeUnit": "ms"}, file, default=str)
+
+    def write(self):
+        """
+        Write the .jsonl and the .trace.json files at self.path_prefix
+        :return: None
+        """
+        if self.path_prefix is None:
+            return
+
+        dir_output = os.path.dirname(self.path_prefix)
+
+        if dir_output:
+            os.makedirs(dir_output, exist_ok=True)
+
+        self.write_json_lines(self.path_prefix + EXTENSION_JSON_LINES)
+        self.write_chrome_trace(self.path_prefix + EXTENSION_CHROME_TRACE)
+
+
+def get_memory_max_rss() -> int:
+    """
+    Get the peak resident memory of this process
+    :return: bytes or None if it can not be measured on this platform
+    """
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Bytes on macOS, kilobytes on Linux
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+# Instrumentation of the process
+instrumentation = Instrumentation(os.environ.get(ENVIRONMENT_VARIABLE_TRACE) or None)
+
+if instrumentation.bool_enabled:
+    atexit.register(instrumentation.write)
+
+
+def is_enabled() -> bool:
+    return instrumentation.bool_enabled
+
+
+def span(name: str, **kwargs):
+    """
+    Context manager of a span
+
+        with span("db.query", size=4) as span_query:
+            ...
+            span_query.set_argument("rows", len(list_fetch))
+
+    :param name: name of the span (The part before the first "." is its category)
+    :param kwargs: arguments shown with the span
+    :return: Span or SPAN_DISABLED
+    """
+    if not instrumentation.bool_enabled:
+        return SPAN_DISABLED
+
+    return Span(instrumentation, name, kwargs, False)
+
+
+def increment_counter(name: str, amount: int = 1):
+    if instrumentation.bool_enabled:
+        instrumentation.increment_counter(name, amount)
+
+
+def observe_histogram(name: str, value: float):
+    if instrumentation.bool_enabled:
+        instrumentation.observe_histogram(name, value)
+
+
+def traced(name: str = None, bool_memory: bool = False) -> Callable:
+    """
+    Decorator that records a span for every call of the callable (Replaces the timer and memory_usage decorators)
+
+    :param name: name of the span (Default is the qualified name of the callable)
+    :param bool_memory: record the peak resident memory of the process at the end of the span
+    :return: decorator
+    """
+
+    def decorator(callable_given: Callable) -> Callable:
+        if not instrumentation.bool_enabled:
+            return callable_given
+
+        name_span = name if name is not None else callable_given.__qualname__
+
+        @functools.wraps(callable_given)
+        def wrapper(*args, **kwargs):
+            with Span(instrumentation, name_span, {}, bool_memory):
+                return callable_given(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def counted(name: str = None) -> Callable:
+    """
+    Decorator that counts the calls of the callable (Replaces the callable_called_count decorator)
+
+    :param name: name of the counter (Default is the qualified name of the callable)
+    :return: decorator
+    """
+
+    def decorator(callable_given: Callable) -> Callable:
+        if not instrumentation.bool_enabled:
+            return callable_given
+
+        name_counter = name if name is not None else callable_given.__qualname__
+
+        @functools.wraps(callable_given)
+        def wrapper(*args, **kwargs):
+            instrumentation.increment_counter(name_counter)
+            return callable_given(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,109 @@
+"""
+10/19/2026
+
+Purpose:
+    An Item container for TFT
+
+Important Note:
+    The id of an item is its recipe, the ids below 10 are the components and a completed item id is made of the ids of
+    its two components (12 = B.F. Sword (1) + Recurve Bow (2), 88 = Spatula (8) + Spatula (8)).
+
+    items.json does not have the traits given by the Spatula items so the emblems of Set 3 are below, an emblem adds its
+    trait to its holder if the holder does not have that trait already. Force of Nature does not give a trait, it adds
+    a champion to the team composition size.
+
+Reference:
+    DataSet
+        https://developer.riotgames.com/docs/tft#match-history_best-practices
+
+"""
+from typing import Tuple
+
+# Component id of the Spatula
+ITEM_ID_SPATULA = 8
+
+# Force of Nature (Spatula + Spatula), +1 team composition size
+ITEM_ID_FORCE_OF_NATURE = 88
+
+# Team composition size added by Force of Nature
+FORCE_OF_NATURE_TEAM_COMPOSITION_SIZE = 1
+
+# Completed item ids below this are components
+ITEM_ID_COMPONENT_MAX = 9
+
+# Emblem item id -> trait name it gives (Set 3)
+DICT_KEY_ITEM_ID_VALUE_TRAIT_NAME_EMBLEM = {
+    18: "Blademaster",  # Blade of the Ruined King
+    28: "Infiltrator",  # Infiltrator's Talons
+    38: "Demolitionist",  # Demolitionist's Charge
+    48: "Star Guardian",  # Star Guardian's Charm
+    58: "Rebel",  # Rebel Medal
+    68: "Celestial",  # Celestial Orb
+    78: "Protector",  # Protector's Chestguard
+    89: "Dark Star",  # Dark Star's Heart
+}
+
+
+class Item:
+    def __init__(self, dict_item: dict):
+        """
+        Item object that stores information about the item in TFT given dict of that item
+
+        :param dict_item: dict information of the item
+        """
+        self.item_id = 0  # type: int
+        self.name = ""  # type: str
+
+        # Component ids of a completed item, empty for a component
+        self.tuple_component_id = ()  # type: Tuple[int, ...]
+
+        # Trait name given to the holder, empty if the item is not an emblem
+        self.trait_emblem = ""  # type: str
+
+        self._load_information(dict_item)
+
+    def _load_information(self, dict_item: dict):
+        """
+        Given a dict of a TFT item fill in the appropriate item information
+
+        :param dict_item: dict based on the json file
+        :return: None
+        """
+        self.item_id = dict_item["id"]
+        self.name = dict_item["name"]
+
+        if self.item_id > ITEM_ID_COMPONENT_MAX:
+            self.tuple_component_id = divmod(self.item_id, 10)
+
+        self.trait_emblem = DICT_KEY_ITEM_ID_VALUE_TRAIT_NAME_EMBLEM.get(self.item_id, "")
+
+    def is_component(self) -> bool:
+        """
+        Check if the item is a component
+        :return: bool
+        """
+        return not self.tuple_component_id
+
+    def is_emblem(self) -> bool:
+        """
+        Check if the item adds a trait to its holder
+        :return: bool
+        """
+        return bool(self.trait_emblem)
+
+    def get_team_composition_size_delta(self) -> int:
+        """
+        Get the amount of champions the item adds to the team composition size
+        :return: int
+        """
+        return FORCE_OF_NATURE_TEAM_COMPOSITION_SIZE if self.item_id == ITEM_ID_FORCE_OF_NATURE else 0
+
+    def __str__(self):
+        """
+        String representation of the item object
+        :return: None
+        """
+        return "{}".format(self.name)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,78 @@
+"""
+10/19/2026
+
+Purpose:
+    Item pool for the Item objects
+
+"""
+from typing import Dict, Iterable, List
+
+from Teamfight_Tactics_Composition_Solver.Item import Item
+from Teamfight_Tactics_Composition_Solver.Pool import Pool
+
+
+class ItemPool(Pool):
+    def __init__(self, path):
+        """
+        Given a path to the item json file make Item objects based on that file and put them into a dict
+        :param path: path to the json file of the TFT items
+        """
+        super().__init__(path)
+
+        self.dict_item_pool_id = {}  # type: Dict[int, Item]
+
+        self.dict_item_pool_name = {}  # type: Dict[str, Item]
+
+        self._add_items()
+
+    def _add_items(self):
+        """
+        Create item objects and add them to the dicts
+        :return: None
+        """
+        list_items = super().get_list_from_json_file()
+
+        for dict_item in list_items:
+            item = Item(dict_item)
+
+            self.dict_item_pool_id[item.item_id] = item
+            self.dict_item_pool_name[item.name] = item
+
+    def get_item(self, key) -> Item:
+        """
+        Get an item by its id or its name (Case insensitive, an id can also be a str of digits)
+
+        :param key: item id or item name
+        :return: Item object
+        :raises KeyError: there is no such item
+        """
+        if isinstance(key, int) or (isinstance(key, str) and key.isdigit()):
+            return self.dict_item_pool_id[int(key)]
+
+        item = self.dict_item_pool_name.get(key)
+
+        if item is None:
+            for item_name, item_temp in self.dict_item_pool_name.items():
+                if item_name.lower() == key.lower():
+                    return item_temp
+
+            raise KeyError(key)
+
+        return item
+
+    def get_list_item(self, iter_key: Iterable) -> List[Item]:
+        """
+        Get the items of an iterable of item ids or item names (A key can be repeated)
+
+        :param iter_key: iterable of item ids or item names
+        :return: list of Item objects
+        """
+        return [self.get_item(key) for key in iter_key]
+
+    def get_list_item_emblem(self) -> List[Item]:
+        """
+        Get every item that changes the traits or the size of a team composition
+        :return: list of Item objects
+        """
+        return [item for item in self.dict_item_pool_id.values() if
+                item.is_emblem() or item.get_team_composition_size_delta()]
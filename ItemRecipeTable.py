@@ -0,0 +1,206 @@
+"""
+10/19/2026
+
+Purpose:
+    Recipe table of the completed items made from the component ids in items.json and the maximal completed item
+    builds of a set of held components
+
+Important Note:
+    A build is the completed items made from the held components and the components left over. A build is maximal when
+    no two of its left over components make a completed item (Any build can be finished into a maximal build so only
+    the maximal builds are worth looking at).
+
+    The builds are found by a search over the multiset of the held components (A tuple of the amount held of every
+    component) that is memoized by that multiset. The lowest component that is held is either combined with another
+    held component or left over, so every multiset is only searched once no matter the order the components were
+    picked up in and a round that holds the same components as an earlier round (Or a subset of them) is a dict
+    lookup.
+
+    A memoized multiset is never removed, the amount of multisets is bounded by the components a player can hold.
+
+        item_recipe_table.get_list_tuple_build_name(["B.F. Sword", "Recurve Bow", "Spatula", "Spatula"])
+
+"""
+from typing import Dict, Iterable, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.Item import Item
+from Teamfight_Tactics_Composition_Solver.ItemPool import ItemPool
+
+
+class ItemRecipeTable:
+    __slots__ = ['item_pool',
+                 'tuple_index_component_id',
+                 'dict_key_component_id_value_index_component',
+                 'dict_key_tuple_index_component_value_item_id',
+                 'dict_key_tuple_count_value_tuple_build',
+                 'dict_key_tuple_count_value_tuple_build_maximal'
+                 ]
+
+    def __init__(self, item_pool: ItemPool):
+        """
+        Recipe table of the completed items of an item pool
+
+        :param item_pool: ItemPool object
+        """
+        self.item_pool = item_pool  # type: ItemPool
+
+        # index of a component -> component id (Components in ascending id order)
+        self.tuple_index_component_id = tuple(
+            sorted(item.item_id for item in item_pool.dict_item_pool_id.values() if
+                   item.is_component()))  # type: Tuple[int, ...]
+
+        # component id -> index of the component
+        self.dict_key_component_id_value_index_component = {
+            component_id: index_component for index_component, component_id in
+            enumerate(self.tuple_index_component_id)}  # type: Dict[int, int]
+
+        # (index of the lower component, index of the higher component) -> completed item id
+        self.dict_key_tuple_index_component_value_item_id = {}  # type: Dict[Tuple[int, int], int]
+
+        for item in item_pool.dict_item_pool_id.values():
+            if item.is_component():
+                continue
+
+            # A completed item of a component that is not in items.json can not be made
+            if not all(component_id in self.dict_key_component_id_value_index_component for component_id in
+                       item.tuple_component_id):
+                continue
+
+            tuple_index_component = tuple(sorted(self.dict_key_component_id_value_index_component[component_id] for
+                                                 component_id in item.tuple_component_id))
+
+            self.dict_key_tuple_index_component_value_item_id[tuple_index_component] = item.item_id
+
+        # Amount held of every component -> every build (Memo of _get_tuple_build)
+        self.dict_key_tuple_count_value_tuple_build = {(0,) * len(self.tuple_index_component_id): (((), ()),)}
+
+        # Amount held of every component -> maximal builds (Memo of get_tuple_build)
+        self.dict_key_tuple_count_value_tuple_build_maximal = {}
+
+    def get_item_id(self, component_id_a: int, component_id_b: int) -> int:
+        """
+        Get the completed item id made from two components
+
+        :param component_id_a: component id
+        :param component_id_b: component id
+        :return: completed item id, None if the components do not make an item
+        """
+        return self.dict_key_tuple_index_component_value_item_id.get(tuple(sorted(
+            (self.dict_key_component_id_value_index_component[component_id_a],
+             self.dict_key_component_id_value_index_component[component_id_b]))))
+
+    def get_tuple_count(self, iter_component: Iterable) -> Tuple[int, ...]:
+        """
+        Get the multiset of held components
+
+        :param iter_component: component ids, component names or Item objects (Repeated for every copy held)
+        :return: tuple of the amount held of every component (Indexed by the index of the component)
+        :raises KeyError: an item does not exist
+        :raises ValueError: an item is not a component
+        """
+        list_count = [0] * len(self.tuple_index_component_id)
+
+        for component in iter_component:
+            item = component if isinstance(component, Item) else self.item_pool.get_item(component)
+
+            if not item.is_component():
+                raise ValueError("{} is not a component".format(item.name))
+
+            list_count[self.dict_key_component_id_value_index_component[item.item_id]] += 1
+
+        return tuple(list_count)
+
+    def _is_build_maximal(self, tuple_component_id_left_over: Tuple[int, ...]) -> bool:
+        """
+        Check that no two left over components make a completed item
+
+        :param tuple_component_id_left_over: left over component ids in ascending order
+        :return: bool
+        """
+        tuple_index_component = tuple(self.dict_key_component_id_value_index_component[component_id] for component_id
+                                      in tuple_component_id_left_over)
+
+        for index_a in range(len(tuple_index_component)):
+            for index_b in range(index_a + 1, len(tuple_index_component)):
+                if (tuple_index_component[index_a],
+                    tuple_index_component[index_b]) in self.dict_key_tuple_index_component_value_item_id:
+                    return False
+
+        return True
+
+    def _get_tuple_build(self, tuple_count: Tuple[int, ...]) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], ...]:
+        """
+        Get every build of a multiset of components (Maximal or not)
+
+        :param tuple_count: amount held of every component
+        :return: tuple of (completed item ids, left over component ids) both in ascending order
+        """
+        tuple_build = self.dict_key_tuple_count_value_tuple_build.get(tuple_count)
+
+        if tuple_build is not None:
+            return tuple_build
+
+        # Lowest component that is held
+        index_component = next(index for index, count in enumerate(tuple_count) if count)
+
+        list_count = list(tuple_count)
+        list_count[index_component] -= 1
+
+        set_build = set()
+
+        # The lowest component is left over
+        component_id = self.tuple_index_component_id[index_component]
+
+        for tuple_item_id, tuple_component_id_left_over in self._get_tuple_build(tuple(list_count)):
+            set_build.add((tuple_item_id, tuple(sorted(tuple_component_id_left_over + (component_id,)))))
+
+        # The lowest component is combined with a component that is not lower
+        for index_component_other in range(index_component, len(tuple_count)):
+            if not list_count[index_component_other]:
+                continue
+
+            item_id = self.dict_key_tuple_index_component_value_item_id.get((index_component, index_component_other))
+
+            if item_id is None:
+                continue
+
+            list_count[index_component_other] -= 1
+
+            for tuple_item_id, tuple_component_id_left_over in self._get_tuple_build(tuple(list_count)):
+                set_build.add((tuple(sorted(tuple_item_id + (item_id,))), tuple_component_id_left_over))
+
+            list_count[index_component_other] += 1
+
+        tuple_build = self.dict_key_tuple_count_value_tuple_build[tuple_count] = tuple(sorted(set_build))
+
+        return tuple_build
+
+    def get_tuple_build(self, iter_component: Iterable) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], ...]:
+        """
+        Get every maximal build of the held components
+
+        :param iter_component: component ids, component names or Item objects (Repeated for every copy held)
+        :return: tuple of (completed item ids, left over component ids) both in ascending order
+        """
+        tuple_count = self.get_tuple_count(iter_component)
+
+        tuple_build_maximal = self.dict_key_tuple_count_value_tuple_build_maximal.get(tuple_count)
+
+        if tuple_build_maximal is None:
+            tuple_build_maximal = self.dict_key_tuple_count_value_tuple_build_maximal[tuple_count] = tuple(
+                build for build in self._get_tuple_build(tuple_count) if self._is_build_maximal(build[1]))
+
+        return tuple_build_maximal
+
+    def get_list_tuple_build_name(self, iter_component: Iterable) -> List[Tuple[List[str], List[str]]]:
+        """
+        Get every maximal build of the held components by item name
+
+        :param iter_component: component ids, component names or Item objects (Repeated for every copy held)
+        :return: list of (completed item names, left over component names)
+        """
+        dict_item_pool_id = self.item_pool.dict_item_pool_id
+
+        return [([dict_item_pool_id[item_id].name for item_id in tuple_item_id],
+                 [dict_item_pool_id[component_id].name for component_id in tuple_component_id_left_over])
+                for tuple_item_id, tuple_component_id_left_over in self.get_tuple_build(iter_component)]
@@ -0,0 +1,147 @@
+"""
+10/19/2026
+
+Purpose:
+    Difference between two versions (patches) of the ChampionPool and the TraitPool
+
+Important Note:
+    Whether a team composition is found by the TeamCompositionCombinationsSearcher only depends on the traits of the
+    champions in it and the divisions of those traits, so a team composition that has none of the champions in
+    set_champion_names_invalidated is found (or not found) the same way in both versions.
+
+    The db and the pickle store the champions by their champion id (Their position in champions.json), so reordering
+    champions.json changes the team compositions of the db even if no champion or trait has changed, the champion ids
+    that moved are in dict_key_champion_id_old_value_champion_id_new.
+
+"""
+from typing import Dict, Set
+
+from Teamfight_Tactics_Composition_Solver.ChamptionPool import ChampionPool
+from Teamfight_Tactics_Composition_Solver.TraitPool import TraitPool
+
+
+class PoolDifference:
+
+    def __init__(self,
+                 champion_pool_old: ChampionPool,
+                 trait_pool_old: TraitPool,
+                 champion_pool_new: ChampionPool,
+                 trait_pool_new: TraitPool):
+        """
+        Difference between the old and the new version of the champion pool and the trait pool
+
+        :param champion_pool_old: champion pool the existing artifacts were made with
+        :param trait_pool_old: trait pool the existing artifacts were made with
+        :param champion_pool_new: current champion pool
+        :param trait_pool_new: current trait pool
+        """
+        self.champion_pool_old = champion_pool_old  # type: ChampionPool
+        self.trait_pool_old = trait_pool_old  # type: TraitPool
+        self.champion_pool_new = champion_pool_new  # type: ChampionPool
+        self.trait_pool_new = trait_pool_new  # type: TraitPool
+
+        # Champion names
+        self.set_champion_names_added = set()  # type: Set[str]
+        self.set_champion_names_removed = set()  # type: Set[str]
+        self.set_champion_names_changed = set()  # type: Set[str]
+
+        # Trait names
+        self.set_trait_names_added = set()  # type: Set[str]
+        self.set_trait_names_removed = set()  # type: Set[str]
+        self.set_trait_names_changed = set()  # type: Set[str]
+
+        # Champion names (new version) whose team compositions have to be searched again
+        self.set_champion_names_affected = set()  # type: Set[str]
+
+        # Champion names (old version) whose team compositions are no longer valid
+        self.set_champion_names_invalidated = set()  # type: Set[str]
+
+        # Old champion id -> new champion id of the champions that are in both versions
+        self.dict_key_champion_id_old_value_champion_id_new = {}  # type: Dict[int, int]
+
+        # If a champion that is in both versions has another champion id
+        self.bool_champion_id_changed = False  # type: bool
+
+        self._load_difference()
+
+    def _load_difference(self):
+        """
+        Compare the old and new pools and fill in the sets of the difference
+        :return: None
+        """
+        dict_champion_pool_name_old = self.champion_pool_old.dict_champion_pool_name
+        dict_champion_pool_name_new = self.champion_pool_new.dict_champion_pool_name
+
+        dict_trait_pool_old = self.trait_pool_old.dict_trait_pool
+        dict_trait_pool_new = self.trait_pool_new.dict_trait_pool
+
+        self.set_champion_names_added = set(dict_champion_pool_name_new) - set(dict_champion_pool_name_old)
+        self.set_champion_names_removed = set(dict_champion_pool_name_old) - set(dict_champion_pool_name_new)
+
+        # A champion has changed if its traits have changed (The cost is not used by the search or the db)
+        self.set_champion_names_changed = {
+            champion_name for champion_name in set(dict_champion_pool_name_new) & set(dict_champion_pool_name_old) if
+            sorted(dict_champion_pool_name_new[champion_name].list_traits) !=
+            sorted(dict_champion_pool_name_old[champion_name].list_traits)}
+
+        self.set_trait_names_added = set(dict_trait_pool_new) - set(dict_trait_pool_old)
+        self.set_trait_names_removed = set(dict_trait_pool_old) - set(dict_trait_pool_new)
+
+        # A trait has changed if its divisions have changed
+        self.set_trait_names_changed = {
+            trait_name for trait_name in set(dict_trait_pool_new) & set(dict_trait_pool_old) if
+            dict_trait_pool_new[trait_name].list_divisions != dict_trait_pool_old[trait_name].list_divisions}
+
+        # Every champion that has a trait that was changed (Champions with added or removed traits have changed)
+        set_champion_names_trait_changed = {
+            champion_name for champion_name, champion_object in dict_champion_pool_name_new.items() if
+            self.set_trait_names_changed.intersection(champion_object.list_traits)}
+
+        self.set_champion_names_affected = (self.set_champion_names_added |
+                                            self.set_champion_names_changed |
+                                            set_champion_names_trait_changed)
+
+        self.set_champion_names_invalidated = ((self.set_champion_names_affected - self.set_champion_names_added) |
+                                               self.set_champion_names_removed)
+
+        self.dict_key_champion_id_old_value_champion_id_new = {
+            champion_object.index_dict_position: dict_champion_pool_name_new[champion_name].index_dict_position for
+            champion_name, champion_object in dict_champion_pool_name_old.items() if
+            champion_name in dict_champion_pool_name_new}
+
+        self.bool_champion_id_changed = any(
+            champion_id_old != champion_id_new for champion_id_old, champion_id_new in
+            self.dict_key_champion_id_old_value_champion_id_new.items())
+
+    def is_empty(self) -> bool:
+        """
+        Check if there is no difference that changes the team compositions or their champion ids
+        :return: bool
+        """
+        return not (self.set_champion_names_affected or
+                    self.set_champion_names_invalidated or
+                    self.set_trait_names_added or
+                    self.set_trait_names_removed or
+                    self.bool_champion_id_changed)
+
+    def __str__(self):
+        string = ("Champions added: {}\n"
+                  "Champions removed: {}\n"
+                  "Champions changed: {}\n"
+                  "Traits added: {}\n"
+                  "Traits removed: {}\n"
+                  "Traits changed: {}\n"
+                  "Champions affected: {}\n"
+                  "Champion ids changed: {}").format(sorted(self.set_champion_names_added),
+                                                     sorted(self.set_champion_names_removed),
+                                                     sorted(self.set_champion_names_changed),
+                                                     sorted(self.set_trait_names_added),
+                                                     sorted(self.set_trait_names_removed),
+                                                     sorted(self.set_trait_names_changed),
+                                                     sorted(self.set_champion_names_affected),
+                                                     self.bool_champion_id_changed)
+
+        return string
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,311 @@
+"""
+10/19/2026
+
+Purpose:
+    Posting lists of the champions (The team_composition_index of every team composition a champion is in) as
+    RoaringBitmaps so the include and exclude champions of a query are a bitmap AND and ANDNOT instead of an
+    INTERSECT and EXCEPT of the champion tables of the db
+
+Important Note:
+    The posting index is written next to the db (NAME_POSTING_INDEX) by the builds with the size and the mtime of the
+    db it was made from, a posting index whose db has changed since is not loaded so a query never uses the posting
+    lists of another build (The champion tables of the db are used instead).
+
+    The counts of every champion and every pair of champions (QueryPlanner) are made when the posting index is made
+    and stored in the json header, a query intersects the includes in the order of its plan.
+
+    The build makes the posting lists from the index matrix of the team compositions (See
+    get_tuple_array_team_composition_index) instead of appending every champion of every team composition to a list.
+
+    File layout (Little endian):
+        POSTING_INDEX_MAGIC, length of the json header (uint32), json header
+        The RoaringBitmap of every champion in the order of "champion_names" in the json header
+
+"""
+import json
+import os
+import struct
+from array import array
+from itertools import combinations
+from typing import Dict, Iterable, Tuple
+
+try:
+    import numpy
+except ImportError:  # numpy only makes get_tuple_array_team_composition_index faster
+    numpy = None
+
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import CHAMPION_ID_PADDING
+from Teamfight_Tactics_Composition_Solver.QueryPlanner import QueryPlan, QueryPlanner, get_query_planner_from_dict
+from Teamfight_Tactics_Composition_Solver.RoaringBitmap import RoaringBitmap, get_roaring_bitmap_from_bytes, \
+    get_roaring_bitmap_from_array
+
+POSTING_INDEX_MAGIC = b"PIX1"
+
+STRUCT_POSTING_INDEX_HEADER = struct.Struct("<4sI")
+
+
+def _get_dict_db_fingerprint(path_db: str) -> dict:
+    """
+    Get the size and the mtime of the db (Hashing the db would be slower than the query it saves)
+
+    :param path_db: path to the db file
+    :return: dict of the fingerprint, empty if the db does not exist
+    """
+    try:
+        stat_result = os.stat(path_db)
+    except OSError:
+        return {}
+
+    return {"db_size": stat_result.st_size, "db_mtime_ns": stat_result.st_mtime_ns}
+
+
+class PostingIndex:
+    __slots__ = ['dict_key_champion_name_value_roaring_bitmap',
+                 'amount_team_compositions',
+                 'query_planner'
+                 ]
+
+    def __init__(self,
+                 dict_key_champion_name_value_roaring_bitmap: Dict[str, RoaringBitmap],
+                 amount_team_compositions: int,
+                 query_planner: QueryPlanner = None):
+        """
+        Posting lists of the champions
+
+        :param dict_key_champion_name_value_roaring_bitmap: champion name -> team_composition_index of the team
+            compositions with that champion
+        :param amount_team_compositions: amount of team compositions (The team_composition_index are 0 to N - 1)
+        :param query_planner: QueryPlanner of the posting lists (None to count the champions and the pairs of
+            champions of the posting lists)
+        """
+        self.dict_key_champion_name_value_roaring_bitmap = \
+            dict_key_champion_name_value_roaring_bitmap  # type: Dict[str, RoaringBitmap]
+
+        self.amount_team_compositions = amount_team_compositions  # type: int
+
+        if query_planner is None:
+            query_planner = self._get_query_planner()
+
+        self.query_planner = query_planner  # type: QueryPlanner
+
+    def _get_query_planner(self) -> QueryPlanner:
+        """
+        Count the team compositions of every champion and every pair of champions
+
+        :return: QueryPlanner object
+        """
+        dict_key_champion_name_value_cardinality = {
+            champion_name: len(roaring_bitmap) for champion_name, roaring_bitmap in
+            self.dict_key_champion_name_value_roaring_bitmap.items()}
+
+        dict_key_tuple_champion_name_value_cardinality = {}
+
+        for champion_name_a, champion_name_b in combinations(sorted(self.dict_key_champion_name_value_roaring_bitmap),
+                                                             2):
+            cardinality = len(self.dict_key_champion_name_value_roaring_bitmap[champion_name_a] &
+                              self.dict_key_champion_name_value_roaring_bitmap[champion_name_b])
+
+            if cardinality:
+                dict_key_tuple_champion_name_value_cardinality[(champion_name_a, champion_name_b)] = cardinality
+
+        return QueryPlanner(dict_key_champion_name_value_cardinality, dict_key_tuple_champion_name_value_cardinality,
+                            self.amount_team_compositions)
+
+    def get_roaring_bitmap(self, iter_champion_names_include: Iterable[str],
+                           iter_champion_names_exclude: Iterable[str] = ()) -> RoaringBitmap:
+        """
+        Get the team_composition_index of the team compositions with every included champion and no excluded champion
+
+        :param iter_champion_names_include: champion names (At least one)
+        :param iter_champion_names_exclude: champion names
+        :return: RoaringBitmap
+        """
+        return self.get_roaring_bitmap_query_plan(
+            self.query_planner.get_query_plan(iter_champion_names_include, iter_champion_names_exclude))
+
+    def get_roaring_bitmap_query_plan(self, query_plan: QueryPlan) -> RoaringBitmap:
+        """
+        Get the team_composition_index of the team compositions of a plan, the includes are intersected in the order
+        of the plan and the excludes are removed from the intersection
+
+        :param query_plan: QueryPlan object (At least one include)
+        :return: RoaringBitmap
+        """
+        roaring_bitmap_empty = RoaringBitmap()
+
+        roaring_bitmap = None
+
+        for champion_name in query_plan.list_champion_name_include:
+            roaring_bitmap_include = self.dict_key_champion_name_value_roaring_bitmap.get(champion_name,
+                                                                                          roaring_bitmap_empty)
+
+            if roaring_bitmap is None:
+                roaring_bitmap = roaring_bitmap_include
+            else:
+                roaring_bitmap = roaring_bitmap & roaring_bitmap_include
+
+            if not roaring_bitmap:
+                return roaring_bitmap
+
+        for champion_name in query_plan.list_champion_name_exclude:
+            if not roaring_bitmap:
+                break
+
+            roaring_bitmap_exclude = self.dict_key_champion_name_value_roaring_bitmap.get(champion_name)
+
+            if roaring_bitmap_exclude is not None:
+                roaring_bitmap = roaring_bitmap - roaring_bitmap_exclude
+
+        return roaring_bitmap
+
+    def get_size_bytes(self) -> int:
+        """
+        Get the bytes of the containers of every posting list
+
+        :return: int
+        """
+        return sum(roaring_bitmap.get_size_bytes() for roaring_bitmap in
+                   self.dict_key_champion_name_value_roaring_bitmap.values())
+
+    def write(self, path: str, path_db: str = None):
+        """
+        Write the posting index to a file
+
+        :param path: path of the file
+        :param path_db: path to the db the posting index was made from (None to not tie it to a db)
+        :return: None
+        """
+        list_champion_name = list(self.dict_key_champion_name_value_roaring_bitmap)
+
+        dict_header = {"champion_names": list_champion_name,
+                       "team_compositions": self.amount_team_compositions,
+                       "statistics": self.query_planner.get_dict()}
+
+        if path_db is not None:
+            dict_header.update(_get_dict_db_fingerprint(path_db))
+
+        bytes_header = json.dumps(dict_header).encode()
+
+        path_temp = path + ".tmp"
+
+        with open(path_temp, "wb") as file:
+            file.write(STRUCT_POSTING_INDEX_HEADER.pack(POSTING_INDEX_MAGIC, len(bytes_header)))
+            file.write(bytes_header)
+
+            for champion_name in list_champion_name:
+                file.write(self.dict_key_champion_name_value_roaring_bitmap[champion_name].to_bytes())
+
+        # A reader never sees a half written posting index
+        os.replace(path_temp, path)
+
+
+def get_tuple_array_team_composition_index(iter_bytes_index_matrix: Iterable[bytes],
+                                           width: int,
+                                           number_champions: int) -> Tuple[array, ...]:
+    """
+    Get the posting list of every champion id from the index matrix of the team compositions
+
+    With numpy a chunk of the index matrix is flattened, stably argsorted by champion id and split by the amount of
+    every champion id, the flat position // width is the row. The argsort is stable so the rows of a champion stay
+    in ascending order and the chunks are in row order so appending them keeps it. Without numpy the flat index
+    matrix is walked once appending to the arrays.
+
+    :param iter_bytes_index_matrix: chunks of a row major N x width index matrix padded with CHAMPION_ID_PADDING (The
+        rows of a chunk follow the rows of the chunk before it)
+    :param width: amount of champion ids per row
+    :param number_champions: amount of champion ids
+    :return: tuple of champion id -> array('I') of the team_composition_index of the team compositions with that
+        champion in ascending order
+    """
+    tuple_array_team_composition_index = tuple(array('I') for _ in range(number_champions))
+
+    row_start = 0
+
+    for bytes_index_matrix in iter_bytes_index_matrix:
+        number_rows = len(bytes_index_matrix) // width if width else 0
+
+        if numpy is not None:
+            ndarray_champion_id = numpy.frombuffer(bytes_index_matrix, dtype=numpy.uint8)
+
+            ndarray_row = (numpy.argsort(ndarray_champion_id, kind="stable") // width + row_start).astype(
+                numpy.uint32)
+
+            ndarray_offset = numpy.concatenate(
+                ([0], numpy.cumsum(numpy.bincount(ndarray_champion_id, minlength=CHAMPION_ID_PADDING + 1))))
+
+            for champion_id, array_team_composition_index in enumerate(tuple_array_team_composition_index):
+                array_team_composition_index.frombytes(
+                    ndarray_row[ndarray_offset[champion_id]: ndarray_offset[champion_id + 1]].tobytes())
+
+        else:
+            tuple_array_append = tuple(array_team_composition_index.append for array_team_composition_index in
+                                       tuple_array_team_composition_index)
+
+            for position, champion_id in enumerate(bytes_index_matrix):
+                if champion_id != CHAMPION_ID_PADDING:
+                    tuple_array_append[champion_id](row_start + position // width)
+
+        row_start += number_rows
+
+    return tuple_array_team_composition_index
+
+
+def get_posting_index_from_tuple_array(tuple_champion_id_name: Tuple[str, ...],
+                                       tuple_array_team_composition_index: Tuple[array, ...],
+                                       amount_team_compositions: int) -> PostingIndex:
+    """
+    Make the posting index from the posting list of every champion id
+
+    :param tuple_champion_id_name: champion id -> champion name
+    :param tuple_array_team_composition_index: from get_tuple_array_team_composition_index
+    :param amount_team_compositions: amount of team compositions
+    :return: PostingIndex object (Champions that are in no team composition are left out)
+    """
+    return PostingIndex({tuple_champion_id_name[champion_id]: get_roaring_bitmap_from_array(
+        array_team_composition_index) for champion_id, array_team_composition_index in
+        enumerate(tuple_array_team_composition_index) if array_team_composition_index},
+        amount_team_compositions)
+
+
+def get_posting_index_from_file(path: str, path_db: str = None) -> PostingIndex:
+    """
+    Read a posting index written by PostingIndex.write
+
+    :param path: path of the file
+    :param path_db: path to the db the posting index must have been made from (None to not check)
+    :return: PostingIndex object, None if the file does not exist or was made from another version of the db
+    :raises ValueError: the file is not a posting index
+    """
+    try:
+        with open(path, "rb") as file:
+            bytes_data = file.read()
+    except FileNotFoundError:
+        return None
+
+    magic, length_header = STRUCT_POSTING_INDEX_HEADER.unpack_from(bytes_data, 0)
+
+    if magic != POSTING_INDEX_MAGIC:
+        raise ValueError("{} is not a posting index".format(path))
+
+    offset = STRUCT_POSTING_INDEX_HEADER.size
+
+    dict_header = json.loads(bytes_data[offset: offset + length_header])
+
+    offset += length_header
+
+    if path_db is not None:
+        dict_db_fingerprint = _get_dict_db_fingerprint(path_db)
+
+        if any(dict_header.get(key) != value for key, value in dict_db_fingerprint.items()):
+            return None
+
+    memoryview_data = memoryview(bytes_data)
+
+    dict_key_champion_name_value_roaring_bitmap = {}
+
+    for champion_name in dict_header["champion_names"]:
+        dict_key_champion_name_value_roaring_bitmap[champion_name], offset = get_roaring_bitmap_from_bytes(
+            memoryview_data, offset)
+
+    return PostingIndex(dict_key_champion_name_value_roaring_bitmap, dict_header["team_compositions"],
+                        get_query_planner_from_dict(dict_header["statistics"]))
@@ -0,0 +1,201 @@
+"""
+10/19/2026
+
+Purpose:
+    Plan the champion include and exclude filters of a query from the cardinality of every champion and every pair
+    of champions (The team compositions they are in) instead of the order the champions were clicked in
+
+Important Note:
+    The statistics are made once by the build from the posting lists (See PostingIndex.write) and are stored in the
+    header of the posting index so a query never counts anything.
+
+    A plan:
+        1.  The includes are ordered smallest first, starting with the pair with the fewest team compositions and
+            adding the champion that keeps the estimate the smallest (The estimate of a set of champions is the
+            smallest cardinality of a champion or pair in it, an upper bound of the rows of the intersection)
+        2.  The excludes are applied after every include (To the smallest set) and an exclude that has no team
+            composition with one of the includes is dropped since it can not remove anything
+        3.  If the estimate is more than PLANNER_SCAN_SELECTIVITY of the team compositions reading every row in order
+            and checking the bitmask of its champions is cheaper than looking up that many rows (PLAN_SCAN), else
+            the rows of the posting list are looked up (PLAN_POSTING)
+
+"""
+from itertools import combinations
+from typing import Dict, Iterable, List, Tuple
+
+PLAN_POSTING = "posting"
+PLAN_SCAN = "scan"
+
+# Fraction of the team compositions a query must estimate for a scan of the team composition table
+PLANNER_SCAN_SELECTIVITY = 0.5
+
+
+class QueryPlan:
+    __slots__ = ['plan',
+                 'list_champion_name_include',
+                 'list_champion_name_exclude',
+                 'cardinality_estimate'
+                 ]
+
+    def __init__(self,
+                 plan: str,
+                 list_champion_name_include: List[str],
+                 list_champion_name_exclude: List[str],
+                 cardinality_estimate: int):
+        """
+        Plan of the champion filters of a query
+
+        :param plan: PLAN_POSTING or PLAN_SCAN
+        :param list_champion_name_include: includes in the order they are intersected
+        :param list_champion_name_exclude: excludes that can remove a team composition
+        :param cardinality_estimate: upper bound of the team compositions with every include
+        """
+        self.plan = plan  # type: str
+        self.list_champion_name_include = list_champion_name_include  # type: List[str]
+        self.list_champion_name_exclude = list_champion_name_exclude  # type: List[str]
+        self.cardinality_estimate = cardinality_estimate  # type: int
+
+    def __str__(self):
+        return "QueryPlan({}, include={}, exclude={}, estimate={})".format(self.plan,
+                                                                           self.list_champion_name_include,
+                                                                           self.list_champion_name_exclude,
+                                                                           self.cardinality_estimate)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class QueryPlanner:
+    __slots__ = ['dict_key_champion_name_value_cardinality',
+                 'dict_key_tuple_champion_name_value_cardinality',
+                 'amount_team_compositions'
+                 ]
+
+    def __init__(self,
+                 dict_key_champion_name_value_cardinality: Dict[str, int],
+                 dict_key_tuple_champion_name_value_cardinality: Dict[Tuple[str, str], int],
+                 amount_team_compositions: int):
+        """
+        Planner of the champion filters of the queries
+
+        :param dict_key_champion_name_value_cardinality: champion name -> team compositions with the champion
+        :param dict_key_tuple_champion_name_value_cardinality: sorted pair of champion names -> team compositions with
+            both champions (Pairs that are not in the dict have no team compositions)
+        :param amount_team_compositions: amount of team compositions
+        """
+        self.dict_key_champion_name_value_cardinality = \
+            dict_key_champion_name_value_cardinality  # type: Dict[str, int]
+
+        self.dict_key_tuple_champion_name_value_cardinality = \
+            dict_key_tuple_champion_name_value_cardinality  # type: Dict[Tuple[str, str], int]
+
+        self.amount_team_compositions = amount_team_compositions  # type: int
+
+    def get_cardinality(self, champion_name: str) -> int:
+        return self.dict_key_champion_name_value_cardinality.get(champion_name, 0)
+
+    def get_cardinality_pair(self, champion_name_a: str, champion_name_b: str) -> int:
+        if champion_name_a == champion_name_b:
+            return self.get_cardinality(champion_name_a)
+
+        return self.dict_key_tuple_champion_name_value_cardinality.get(
+            (champion_name_a, champion_name_b) if champion_name_a < champion_name_b else
+            (champion_name_b, champion_name_a), 0)
+
+    def get_list_champion_name_include(self, iter_champion_names_include: Iterable[str]) -> Tuple[List[str], int]:
+        """
+        Order the includes so every intersection is as small as possible
+
+        :param iter_champion_names_include: champion names
+        :return: tuple of (ordered champion names, estimate of the team compositions with all of them)
+        """
+        list_champion_name_left = sorted(set(iter_champion_names_include), key=self.get_cardinality)
+
+        if not list_champion_name_left:
+            return [], self.amount_team_compositions
+
+        if len(list_champion_name_left) == 1:
+            return list_champion_name_left, self.get_cardinality(list_champion_name_left[0])
+
+        # Start from the pair with the fewest team compositions
+        champion_name_a, champion_name_b = min(
+            combinations(list_champion_name_left, 2),
+            key=lambda tuple_champion_name: self.get_cardinality_pair(*tuple_champion_name))
+
+        list_champion_name_include = sorted((champion_name_a, champion_name_b), key=self.get_cardinality)
+
+        cardinality_estimate = self.get_cardinality_pair(champion_name_a, champion_name_b)
+
+        list_champion_name_left.remove(champion_name_a)
+        list_champion_name_left.remove(champion_name_b)
+
+        while list_champion_name_left:
+            # Champion whose pairs with the champions so far bound the intersection the most
+            dict_key_champion_name_value_estimate = {
+                champion_name: min(self.get_cardinality_pair(champion_name, champion_name_include) for
+                                   champion_name_include in list_champion_name_include) for
+                champion_name in list_champion_name_left}
+
+            champion_name_next = min(list_champion_name_left, key=dict_key_champion_name_value_estimate.get)
+
+            cardinality_estimate = min(cardinality_estimate,
+                                       dict_key_champion_name_value_estimate[champion_name_next])
+
+            list_champion_name_include.append(champion_name_next)
+            list_champion_name_left.remove(champion_name_next)
+
+        return list_champion_name_include, cardinality_estimate
+
+    def get_query_plan(self,
+                       iter_champion_names_include: Iterable[str],
+                       iter_champion_names_exclude: Iterable[str] = ()) -> QueryPlan:
+        """
+        Plan the champion filters of a query
+
+        :param iter_champion_names_include: champion names
+        :param iter_champion_names_exclude: champion names
+        :return: QueryPlan object
+        """
+        list_champion_name_include, cardinality_estimate = self.get_list_champion_name_include(
+            iter_champion_names_include)
+
+        set_champion_name_include = set(list_champion_name_include)
+
+        # Excludes that share a team composition with every include, the rest can not remove anything
+        list_champion_name_exclude = sorted(
+            (champion_name for champion_name in set(iter_champion_names_exclude) if
+             champion_name in set_champion_name_include or
+             all(self.get_cardinality_pair(champion_name, champion_name_include) for champion_name_include in
+                 list_champion_name_include) and self.get_cardinality(champion_name)),
+            key=self.get_cardinality, reverse=True)
+
+        if cardinality_estimate > PLANNER_SCAN_SELECTIVITY * self.amount_team_compositions:
+            plan = PLAN_SCAN
+        else:
+            plan = PLAN_POSTING
+
+        return QueryPlan(plan, list_champion_name_include, list_champion_name_exclude, cardinality_estimate)
+
+    def get_dict(self) -> dict:
+        """
+        Get the statistics as a json serializable dict
+
+        :return: dict
+        """
+        return {"team_compositions": self.amount_team_compositions,
+                "champions": self.dict_key_champion_name_value_cardinality,
+                "pairs": [[champion_name_a, champion_name_b, cardinality] for (champion_name_a, champion_name_b),
+                          cardinality in self.dict_key_tuple_champion_name_value_cardinality.items()]}
+
+
+def get_query_planner_from_dict(dict_statistics: dict) -> QueryPlanner:
+    """
+    Get the planner of the statistics made by QueryPlanner.get_dict
+
+    :param dict_statistics: dict
+    :return: QueryPlanner object
+    """
+    return QueryPlanner(dict(dict_statistics["champions"]),
+                        {(champion_name_a, champion_name_b): cardinality for champion_name_a, champion_name_b, cardinality
+                         in dict_statistics["pairs"]},
+                        dict_statistics["team_compositions"])
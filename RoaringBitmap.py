@@ -0,0 +1,469 @@
+"""
+10/19/2026
+
+Purpose:
+    Compressed bitmap of uint32 ids (Roaring style) used for the posting lists of the champions (The
+    team_composition_index of every team composition a champion is in) with fast AND and ANDNOT
+
+Important Note:
+    The ids are split by their high 16 bits into containers of the low 16 bits:
+
+        Array container     array('H') of the sorted low 16 bits, used when the container has
+                            ARRAY_CONTAINER_SIZE_MAX ids or less (2 bytes per id)
+        Bitmap container    int of 65536 bits where bit x is set for the low 16 bits x, used when the container has
+                            more ids (8 KB per container no matter the ids)
+
+    so a posting list costs at most 2 bytes per id instead of the 28 byte int plus the 8 byte list slot of a list of
+    ints. The AND and ANDNOT of two bitmap containers are one big int operation and an array container is only
+    checked against the other container, never expanded.
+
+    Serialized layout (Little endian):
+        SERIALIZE_MAGIC, amount of containers (uint32)
+        For every container: high 16 bits (uint16), CONTAINER_ARRAY or CONTAINER_BITMAP (uint8), amount of ids
+        (uint32) then the array container as uint16s or the bitmap container as BITMAP_CONTAINER_BYTES bytes
+
+"""
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # numpy only makes turning array containers into bitmap containers faster
+    numpy = None
+
+# Ids of an array container before it is turned into a bitmap container
+ARRAY_CONTAINER_SIZE_MAX = 4096
+
+# Bytes of a bitmap container (65536 bits)
+BITMAP_CONTAINER_BYTES = 1 << 13
+
+CONTAINER_ARRAY = 0
+CONTAINER_BITMAP = 1
+
+SERIALIZE_MAGIC = b"RBM1"
+
+STRUCT_HEADER = struct.Struct("<4sI")
+STRUCT_CONTAINER = struct.Struct("<HBI")
+
+# 0 and 1 -> "0" and "1" (To read one byte per bit as a binary int)
+BYTES_TRANSLATE_BIT_DIGIT = b"01" + bytes(254)
+
+# byte -> bits that are set in the byte (To list the ids of a bitmap container a byte at a time)
+TUPLE_BYTE_TUPLE_BIT = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def _get_bitmap_from_array(array_low: array) -> int:
+    """
+    Get the bitmap container of an array container
+
+    :param array_low: array('H') of the low 16 bits
+    :return: int bitmap
+    """
+    if numpy is not None:
+        ndarray_bit = numpy.zeros(BITMAP_CONTAINER_BYTES << 3, dtype=numpy.uint8)
+        ndarray_bit[numpy.frombuffer(array_low, dtype=numpy.uint16)] = 1
+
+        return int.from_bytes(numpy.packbits(ndarray_bit, bitorder="little").tobytes(), "little")
+
+    # One byte per bit, set by a map so the loop over the ids stays in C
+    bytearray_bit = bytearray(BITMAP_CONTAINER_BYTES << 3)
+
+    deque(map(bytearray_bit.__setitem__, array_low, repeat(1)), maxlen=0)
+
+    # The bytes as binary digits, highest bit first
+    return int(bytearray_bit.translate(BYTES_TRANSLATE_BIT_DIGIT)[::-1], 2)
+
+
+def _get_array_from_bitmap(bitmap: int) -> array:
+    """
+    Get the array container of a bitmap container
+
+    :param bitmap: int bitmap
+    :return: array('H') of the low 16 bits in ascending order
+    """
+    array_low = array('H')
+
+    for index_byte, byte in enumerate(bitmap.to_bytes(BITMAP_CONTAINER_BYTES, "little")):
+        if byte:
+            index_bit_base = index_byte << 3
+            array_low.extend(index_bit_base + bit for bit in TUPLE_BYTE_TUPLE_BIT[byte])
+
+    return array_low
+
+
+def _get_container(container: Union[array, int]) -> Union[array, int]:
+    """
+    Get the container in the form it should be stored in for its amount of ids
+
+    :param container: array container or bitmap container
+    :return: array container, bitmap container or None if the container is empty
+    """
+    if isinstance(container, array):
+        if not container:
+            return None
+
+        if len(container) > ARRAY_CONTAINER_SIZE_MAX:
+            return _get_bitmap_from_array(container)
+
+        return container
+
+    if not container:
+        return None
+
+    if bin(container).count("1") <= ARRAY_CONTAINER_SIZE_MAX:
+        return _get_array_from_bitmap(container)
+
+    return container
+
+
+def _get_container_and(container_a: Union[array, int], container_b: Union[array, int]) -> Union[array, int]:
+    """
+    Get the AND of two containers
+
+    :param container_a: array container or bitmap container
+    :param container_b: array container or bitmap container
+    :return: container of the ids in both, None if there are none
+    """
+    bool_array_a = isinstance(container_a, array)
+    bool_array_b = isinstance(container_b, array)
+
+    if not bool_array_a and not bool_array_b:
+        return _get_container(container_a & container_b)
+
+    if bool_array_a and bool_array_b:
+        if len(container_a) > len(container_b):
+            container_a, container_b = container_b, container_a
+
+        set_low_b = set(container_b)
+
+        return _get_container(array('H', (low for low in container_a if low in set_low_b)))
+
+    if not bool_array_a:
+        container_a, container_b = container_b, container_a
+
+    bytes_bitmap = container_b.to_bytes(BITMAP_CONTAINER_BYTES, "little")
+
+    return _get_container(array('H', (low for low in container_a if bytes_bitmap[low >> 3] >> (low & 7) & 1)))
+
+
+def _get_container_and_not(container_a: Union[array, int], container_b: Union[array, int]) -> Union[array, int]:
+    """
+    Get the ANDNOT of two containers
+
+    :param container_a: array container or bitmap container
+    :param container_b: array container or bitmap container of the ids to remove
+    :return: container of the ids of container_a that are not in container_b, None if there are none
+    """
+    bool_array_a = isinstance(container_a, array)
+    bool_array_b = isinstance(container_b, array)
+
+    if not bool_array_a:
+        if bool_array_b:
+            container_b = _get_bitmap_from_array(container_b)
+
+        return _get_container(container_a & ~container_b)
+
+    if bool_array_b:
+        set_low_b = set(container_b)
+
+        return _get_container(array('H', (low for low in container_a if low not in set_low_b)))
+
+    bytes_bitmap = container_b.to_bytes(BITMAP_CONTAINER_BYTES, "little")
+
+    return _get_container(array('H', (low for low in container_a if not bytes_bitmap[low >> 3] >> (low & 7) & 1)))
+
+
+class RoaringBitmap:
+    __slots__ = ['dict_key_high_value_container']
+
+    def __init__(self, iter_value: Iterable[int] = ()):
+        """
+        Compressed bitmap of the ids of iter_value (In any order, repeated ids are added once)
+
+        :param iter_value: uint32 ids
+        """
+        # high 16 bits -> container of the low 16 bits (Ascending high 16 bits)
+        self.dict_key_high_value_container = {}  # type: Dict[int, Union[array, int]]
+
+        dict_key_high_value_set_low = {}
+
+        for value in iter_value:
+            high = value >> 16
+
+            set_low = dict_key_high_value_set_low.get(high)
+
+            if set_low is None:
+                set_low = dict_key_high_value_set_low[high] = set()
+
+            set_low.add(value & 0xFFFF)
+
+        for high in sorted(dict_key_high_value_set_low):
+            self.dict_key_high_value_container[high] = _get_container(
+                array('H', sorted(dict_key_high_value_set_low[high])))
+
+    def __len__(self):
+        return sum(len(container) if isinstance(container, array) else bin(container).count("1") for container in
+                   self.dict_key_high_value_container.values())
+
+    def __bool__(self):
+        return bool(self.dict_key_high_value_container)
+
+    def __iter__(self) -> Iterator[int]:
+        for high, container in self.dict_key_high_value_container.items():
+            high_base = high << 16
+
+            if not isinstance(container, array):
+                container = _get_array_from_bitmap(container)
+
+            for low in container:
+                yield high_base | low
+
+    def __contains__(self, value: int) -> bool:
+        container = self.dict_key_high_value_container.get(value >> 16)
+
+        if container is None:
+            return False
+
+        if isinstance(container, array):
+            return (value & 0xFFFF) in container
+
+        return bool(container >> (value & 0xFFFF) & 1)
+
+    def __eq__(self, other):
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+
+        return self.dict_key_high_value_container == other.dict_key_high_value_container
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        roaring_bitmap = RoaringBitmap()
+
+        for high, container in self.dict_key_high_value_container.items():
+            container_other = other.dict_key_high_value_container.get(high)
+
+            if container_other is None:
+                continue
+
+            container_and = _get_container_and(container, container_other)
+
+            if container_and is not None:
+                roaring_bitmap.dict_key_high_value_container[high] = container_and
+
+        return roaring_bitmap
+
+    def __sub__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        roaring_bitmap = RoaringBitmap()
+
+        for high, container in self.dict_key_high_value_container.items():
+            container_other = other.dict_key_high_value_container.get(high)
+
+            if container_other is None:
+                roaring_bitmap.dict_key_high_value_container[high] = container
+                continue
+
+            container_and_not = _get_container_and_not(container, container_other)
+
+            if container_and_not is not None:
+                roaring_bitmap.dict_key_high_value_container[high] = container_and_not
+
+        return roaring_bitmap
+
+    def append(self, value: int):
+        """
+        Add an id that is larger than every id of the bitmap (For building a posting list in order without holding
+        the ids twice), the last container is only compressed when an id of the next container is appended or
+        optimize is called
+
+        :param value: uint32 id
+        :return: None
+        :raises ValueError: value is not larger than the last id
+        """
+        high = value >> 16
+
+        dict_key_high_value_container = self.dict_key_high_value_container
+
+        if dict_key_high_value_container:
+            high_last = next(reversed(dict_key_high_value_container))
+
+            if high == high_last:
+                container = dict_key_high_value_container[high]
+
+                if not isinstance(container, array):
+                    container = dict_key_high_value_container[high] = _get_array_from_bitmap(container)
+
+                if container[-1] >= value & 0xFFFF:
+                    raise ValueError("{} is not larger than the last id".format(value))
+
+                container.append(value & 0xFFFF)
+                return
+
+            if high < high_last:
+                raise ValueError("{} is not larger than the last id".format(value))
+
+            dict_key_high_value_container[high_last] = _get_container(dict_key_high_value_container[high_last])
+
+        dict_key_high_value_container[high] = array('H', (value & 0xFFFF,))
+
+    def optimize(self):
+        """
+        Compress the last container after the last append
+
+        :return: None
+        """
+        if self.dict_key_high_value_container:
+            high_last = next(reversed(self.dict_key_high_value_container))
+
+            self.dict_key_high_value_container[high_last] = _get_container(
+                self.dict_key_high_value_container[high_last])
+
+    def get_array(self) -> array:
+        """
+        Get the ids in ascending order
+
+        :return: array('I') of the ids
+        """
+        return array('I', self)
+
+    def get_size_bytes(self) -> int:
+        """
+        Get the bytes of the containers (The serialized size without the headers)
+
+        :return: int
+        """
+        return sum(len(container) * 2 if isinstance(container, array) else BITMAP_CONTAINER_BYTES for container in
+                   self.dict_key_high_value_container.values())
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the bitmap
+
+        :return: bytes
+        """
+        list_bytes = [STRUCT_HEADER.pack(SERIALIZE_MAGIC, len(self.dict_key_high_value_container))]
+
+        for high, container in self.dict_key_high_value_container.items():
+            if isinstance(container, array):
+                list_bytes.append(STRUCT_CONTAINER.pack(high, CONTAINER_ARRAY, len(container)))
+
+                if sys.byteorder != "little":
+                    container = array('H', container)
+                    container.byteswap()
+
+                list_bytes.append(container.tobytes())
+
+            else:
+                list_bytes.append(STRUCT_CONTAINER.pack(high, CONTAINER_BITMAP, bin(container).count("1")))
+                list_bytes.append(container.to_bytes(BITMAP_CONTAINER_BYTES, "little"))
+
+        return b"".join(list_bytes)
+
+
+def get_roaring_bitmap_from_bytes(bytes_data: bytes, offset: int = 0) -> Tuple[RoaringBitmap, int]:
+    """
+    Deserialize a bitmap made by RoaringBitmap.to_bytes
+
+    :param bytes_data: bytes (Or a memoryview)
+    :param offset: offset of the bitmap in bytes_data
+    :return: tuple of (RoaringBitmap, offset after the bitmap)
+    :raises ValueError: bytes_data does not have a bitmap at offset
+    """
+    magic, amount_containers = STRUCT_HEADER.unpack_from(bytes_data, offset)
+
+    if magic != SERIALIZE_MAGIC:
+        raise ValueError("No RoaringBitmap at offset {}".format(offset))
+
+    offset += STRUCT_HEADER.size
+
+    roaring_bitmap = RoaringBitmap()
+
+    for _ in range(amount_containers):
+        high, container_type, cardinality = STRUCT_CONTAINER.unpack_from(bytes_data, offset)
+
+        offset += STRUCT_CONTAINER.size
+
+        if container_type == CONTAINER_ARRAY:
+            container = array('H')
+            container.frombytes(bytes_data[offset: offset + cardinality * 2])
+
+            if sys.byteorder != "little":
+                container.byteswap()
+
+            offset += cardinality * 2
+
+        elif container_type == CONTAINER_BITMAP:
+            container = int.from_bytes(bytes_data[offset: offset + BITMAP_CONTAINER_BYTES], "little")
+
+            offset += BITMAP_CONTAINER_BYTES
+
+        else:
+            raise ValueError("Unknown container type {} at offset {}".format(container_type, offset))
+
+        roaring_bitmap.dict_key_high_value_container[high] = container
+
+    return roaring_bitmap, offset
+
+
+def get_roaring_bitmap_from_array(array_value: array) -> RoaringBitmap:
+    """
+    Get the bitmap of a sorted array of ids without going through the ids one at a time
+
+    The ids of a container are found by a bisect and their low 16 bits are the first 2 bytes of every 4 byte id (On
+    a little endian machine), so a container is made from byte slices.
+
+    :param array_value: array('I') of the ids in ascending order (No repeated ids)
+    :return: RoaringBitmap
+    """
+    roaring_bitmap = RoaringBitmap()
+
+    index_start = 0
+
+    while index_start < len(array_value):
+        high = array_value[index_start] >> 16
+
+        index_end = bisect_left(array_value, (high + 1) << 16, index_start)
+
+        array_chunk = array_value[index_start: index_end]
+
+        if array_chunk.itemsize == 4 and sys.byteorder == "little":
+            bytes_chunk = array_chunk.tobytes()
+
+            bytearray_low = bytearray(len(array_chunk) * 2)
+            bytearray_low[0::2] = bytes_chunk[0::4]
+            bytearray_low[1::2] = bytes_chunk[1::4]
+
+            array_low = array('H')
+            array_low.frombytes(bytearray_low)
+
+        else:
+            array_low = array('H', (value & 0xFFFF for value in array_chunk))
+
+        roaring_bitmap.dict_key_high_value_container[high] = _get_container(array_low)
+
+        index_start = index_end
+
+    return roaring_bitmap
+
+
+def get_roaring_bitmap_and(iter_roaring_bitmap: Iterable[RoaringBitmap]) -> RoaringBitmap:
+    """
+    Get the AND of bitmaps, smallest first so the intermediate bitmaps stay small
+
+    :param iter_roaring_bitmap: bitmaps (At least one)
+    :return: RoaringBitmap
+    """
+    list_roaring_bitmap = sorted(iter_roaring_bitmap, key=lambda roaring_bitmap: roaring_bitmap.get_size_bytes())
+
+    roaring_bitmap_and = list_roaring_bitmap[0]
+
+    for roaring_bitmap in list_roaring_bitmap[1:]:
+        if not roaring_bitmap_and:
+            break
+
+        roaring_bitmap_and = roaring_bitmap_and & roaring_bitmap
+
+    return roaring_bitmap_and
@@ -0,0 +1,158 @@
+"""
+10/19/2026
+
+Purpose:
+    Pool of read only connections to the db so the queries of the GUI, the batch tools and the prefetchers run in
+    parallel instead of one after the other on the single cursor of SQLite3Wrapper
+
+Important Note:
+    The connections are opened with the URI mode=ro so a query can never write to the db. immutable=1 is only for a
+    db that no process will change while the pool is open (A published build of the ArtifactCache), SQLite then skips
+    all locking and change detection. Using immutable=1 on a db that is being written to returns wrong results.
+
+    Every connection memory maps the db (mmap_size) so the connections (and every process that opens the db) read the
+    same pages of the OS page cache instead of copying them into the page cache of every connection, the page cache of
+    a connection (cache_size) only has to hold the temp b-trees of the INTERSECT/EXCEPT queries.
+
+    sqlite3 releases the GIL while a query runs so the queries of different threads run at the same time.
+
+    Reference:
+        https://www.sqlite.org/uri.html
+        https://www.sqlite.org/mmap.html
+
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from queue import LifoQueue
+from typing import List
+from urllib.request import pathname2url
+
+from Teamfight_Tactics_Composition_Solver.constants import SQLITE_CONNECTION_POOL_SIZE, SQLITE_MMAP_SIZE, \
+    SQLITE_CACHE_SIZE_KIB
+
+
+class SQLiteConnectionPool:
+
+    def __init__(self,
+                 path_db: str,
+                 size: int = SQLITE_CONNECTION_POOL_SIZE,
+                 bool_immutable: bool = False,
+                 mmap_size: int = SQLITE_MMAP_SIZE,
+                 cache_size_kib: int = SQLITE_CACHE_SIZE_KIB):
+        """
+        Pool of read only connections, the connections are opened the first time they are needed
+
+        :param path_db: path to the db file
+        :param size: max amount of connections
+        :param bool_immutable: open the db with immutable=1 (Only if nothing changes the db while the pool is open)
+        :param mmap_size: bytes of the db that are memory mapped by every connection
+        :param cache_size_kib: page cache of every connection in KiB
+        """
+        self.path_db = path_db  # type: str
+        self.size = size  # type: int
+        self.bool_immutable = bool_immutable  # type: bool
+        self.mmap_size = mmap_size  # type: int
+        self.cache_size_kib = cache_size_kib  # type: int
+
+        # Idle connections, the last connection returned is used first so its page cache is still warm
+        self.lifo_queue_connection = LifoQueue()  # type: LifoQueue
+
+        # Every connection opened by the pool
+        self.list_connection = []  # type: List[sqlite3.Connection]
+
+        self.lock = threading.Lock()
+
+        self.bool_closed = False  # type: bool
+
+    def get_uri(self) -> str:
+        """
+        Get the URI the connections are opened with
+        :return: URI
+        """
+        return "file:{}?mode=ro{}".format(pathname2url(os.path.abspath(self.path_db)),
+                                          "&immutable=1" if self.bool_immutable else "")
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Open a read only connection
+
+        :return: connection
+        """
+        # The connection is made by one thread and used by the thread that acquires it
+        connection = sqlite3.connect(self.get_uri(), uri=True, check_same_thread=False)
+
+        connection.execute("PRAGMA mmap_size = {};".format(int(self.mmap_size)))
+
+        # Negative cache_size is in KiB instead of pages
+        connection.execute("PRAGMA cache_size = -{};".format(int(self.cache_size_kib)))
+
+        # Temp b-trees of INTERSECT and EXCEPT are kept in memory
+        connection.execute("PRAGMA temp_store = MEMORY;")
+
+        return connection
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Get an idle connection, open a new one if all of them are in use and the pool is not full or else wait for one
+
+        :return: connection
+        """
+        if self.bool_closed:
+            raise sqlite3.ProgrammingError("SQLiteConnectionPool of {} is closed".format(self.path_db))
+
+        if self.lifo_queue_connection.empty():
+            with self.lock:
+                if len(self.list_connection) < self.size:
+                    connection = self._open_connection()
+                    self.list_connection.append(connection)
+                    return connection
+
+        return self.lifo_queue_connection.get()
+
+    def release(self, connection: sqlite3.Connection):
+        """
+        Give a connection back to the pool
+
+        :param connection: connection from acquire
+        :return: None
+        """
+        if self.bool_closed:
+            connection.close()
+            return
+
+        self.lifo_queue_connection.put(connection)
+
+    @contextmanager
+    def connection(self) -> sqlite3.Connection:
+        """
+        Context manager of a connection of the pool
+
+            with sqlite_connection_pool.connection() as connection:
+                connection.execute(...)
+
+        :return: connection
+        """
+        connection = self.acquire()
+
+        try:
+            yield connection
+
+        finally:
+            self.release(connection)
+
+    def close(self):
+        """
+        Close every connection of the pool (Connections in use are closed when they are released)
+
+        :return: None
+        """
+        with self.lock:
+            self.bool_closed = True
+
+            while not self.lifo_queue_connection.empty():
+                self.lifo_queue_connection.get().close()
+
+    def __len__(self):
+        return len(self.list_connection)
@@ -49,39 +49,154 @@ Reference:
         https://www.sqlitetutorial.net/sqlite-foreign-key/
 
 """
+import os
 import pickle
 import sqlite3
-from typing import Tuple, List
+import threading
+import time
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Tuple, List
 
 from Teamfight_Tactics_Composition_Solver.TeamCompositionContainer import TeamCompositionContainer
 from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerFactory import TeamCompositionContainerFactory
 from Teamfight_Tactics_Composition_Solver.TraitPool import TraitPool
 
+from Teamfight_Tactics_Composition_Solver.Instrumentation import traced, increment_counter
+from Teamfight_Tactics_Composition_Solver.PostingIndex import PostingIndex, get_posting_index_from_file
+from Teamfight_Tactics_Composition_Solver.QueryPlanner import QueryPlan, PLAN_SCAN
+from Teamfight_Tactics_Composition_Solver.SQLiteConnectionPool import SQLiteConnectionPool
+from Teamfight_Tactics_Composition_Solver.SQLiteQueryLog import SQLiteQueryLog, SLOW_QUERY_THRESHOLD_SEC
+from Teamfight_Tactics_Composition_Solver.SummaryStatistics import SummaryStatistics, get_summary_statistics_from_iter
 from Teamfight_Tactics_Composition_Solver.constants import (FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION,
                                                             TEAM_COMPOSITION_SIZE_MAX, TRAIT_COUNT_TOTAL_MAX,
-                                                            TEAM_COMPOSITION_SIZE_MIN, TRAIT_COUNT_DISCRETE_TOTAL_MIN)
+                                                            TEAM_COMPOSITION_SIZE_MIN, TRAIT_COUNT_DISCRETE_TOTAL_MIN,
+                                                            TEAM_COMPOSITION_BATCH_SIZE, NAME_SLOW_QUERY_LOG,
+                                                            NAME_POSTING_INDEX)
 
 from josephs_resources.database.functions_data_base_formatter import format_db_input
 from josephs_resources.database.sqlite3_wrapper import SQLite3Wrapper
 
 STRING_CHAMPION_COMPOSITIONS_TABLE_NAME = "team_composition_combination"
 
+# Table of a champion (table name, STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
+STRING_QUERY_CREATE_TABLE_CHAMPION = """
+    CREATE TABLE IF NOT EXISTS {}(
+        team_composition_index INT NOT NULL,
+        FOREIGN KEY (team_composition_index)
+            REFERENCES {}(team_composition_index)
+    );\n
+    """
+
+# Table of a trait (table name, STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
+STRING_QUERY_CREATE_TABLE_TRAIT = """
+    CREATE TABLE IF NOT EXISTS {}(
+        team_composition_index INT NOT NULL,
+        trait_count_discrete,
+        FOREIGN KEY (team_composition_index)
+            REFERENCES {}(team_composition_index)
+    );\n
+    """
+
+# team_composition_index bound per query of the posting path (SQLITE_MAX_VARIABLE_NUMBER of SQLite before 3.32), the
+# last chunk is padded with POSTING_QUERY_ID_PADDING so every chunk is the same query
+POSTING_QUERY_CHUNK_IDS = 999
+POSTING_QUERY_ID_PADDING = -1
+
+# Temp table used to join a list of team_composition_index against the tables
+STRING_TEMP_TABLE_TEAM_COMPOSITION_INDEX = "temp_team_composition_index"
+
+# Summary tables of the counts of the team compositions (See SummaryStatistics)
+STRING_SUMMARY_SIZE_TRAIT_COUNT_DISCRETE_TOTAL_TABLE_NAME = "summary_size_trait_count_discrete_total"
+STRING_SUMMARY_CHAMPION_SIZE_TABLE_NAME = "summary_champion_size"
+STRING_SUMMARY_TRAIT_TRAIT_COUNT_DISCRETE_SIZE_TABLE_NAME = "summary_trait_trait_count_discrete_size"
+
+STRING_QUERY_CREATE_TABLES_SUMMARY = """
+    DROP TABLE IF EXISTS {0};
+    DROP TABLE IF EXISTS {1};
+    DROP TABLE IF EXISTS {2};
+
+    CREATE TABLE {0}(
+        team_composition_size INT NOT NULL,
+        trait_count_discrete_total INT NOT NULL,
+        team_composition_count INT NOT NULL
+    );
+
+    CREATE TABLE {1}(
+        champion_name TEXT NOT NULL,
+        team_composition_size INT NOT NULL,
+        team_composition_count INT NOT NULL
+    );
+
+    CREATE TABLE {2}(
+        trait_name TEXT NOT NULL,
+        trait_count_discrete INT NOT NULL,
+        team_composition_size INT NOT NULL,
+        team_composition_count INT NOT NULL
+    );
+    """.format(STRING_SUMMARY_SIZE_TRAIT_COUNT_DISCRETE_TOTAL_TABLE_NAME,
+               STRING_SUMMARY_CHAMPION_SIZE_TABLE_NAME,
+               STRING_SUMMARY_TRAIT_TRAIT_COUNT_DISCRETE_SIZE_TABLE_NAME)
+
 
 class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
-    def __init__(self, team_composition_container_factory: TeamCompositionContainerFactory):
+    def __init__(self,
+                 team_composition_container_factory: TeamCompositionContainerFactory,
+                 path_db: str = FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION,
+                 slow_query_threshold: float = SLOW_QUERY_THRESHOLD_SEC,
+                 bool_db_immutable: bool = False):
         """
         SQLite handler to access the database of TFT team composition combinations
 
         :param team_composition_container_factory:
+        :param path_db: path to the db file
+        :param slow_query_threshold: queries that take longer (sec) are logged to the slow query log next to the db
+        :param bool_db_immutable: the db is a published build that will not change while it is open (The read only
+            connections skip locking)
         :return None
         """
 
-        super().__init__(FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION)
+        super().__init__(path_db)
+
+        self.path_db = path_db  # type: str
 
         self.team_composition_container_factory = team_composition_container_factory
         self.trait_pool = self.team_composition_container_factory.trait_pool
         self.champion_pool = self.team_composition_container_factory.champion_pool
 
+        # Time, rows and shape of every query (Slow queries are logged with their query plan)
+        self.sqlite_query_log = SQLiteQueryLog(
+            (format_db_input(champion_name) for champion_name in self.champion_pool.dict_champion_pool_name),
+            slow_query_threshold,
+            os.path.join(os.path.dirname(os.path.abspath(path_db)), NAME_SLOW_QUERY_LOG))
+
+        """
+        Read only connections used by the queries so queries from different threads run at the same time, the
+        inherited connection and cursor are only used to build and update the db
+        """
+        self.sqlite_connection_pool = SQLiteConnectionPool(path_db, bool_immutable=bool_db_immutable)
+
+        # Posting lists of the champions written next to the db by the builds (Read on first use, see get_posting_index)
+        self.path_posting_index = os.path.join(os.path.dirname(os.path.abspath(path_db)),
+                                               NAME_POSTING_INDEX)  # type: str
+
+        self._posting_index = None  # type: PostingIndex
+        self._bool_posting_index_read = False  # type: bool
+
+        # Estimated rows of the champion tables (Used to order the INTERSECT when there is no posting index)
+        self.dict_key_champion_name_value_rowid_max = {}  # type: Dict[str, int]
+
+        self.lock_rowid_max = threading.Lock()
+
+        self.lock_posting_index = threading.Lock()
+
+        # Counts of the team compositions read from the summary tables of the db (Read on first use, see
+        # get_summary_statistics)
+        self._summary_statistics = None  # type: SummaryStatistics
+        self._bool_summary_statistics_read = False  # type: bool
+
+        self.lock_summary_statistics = threading.Lock()
+
     def add_list_tuple_compositions_combinations_to_table_team_composition_combination(
             self,
             list_tuple_compositions_combinations_all):
@@ -93,19 +208,31 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
 
         Also assign the traits associated with the team composition index, also include the trait count discrete
 
+        The team compositions are handled TEAM_COMPOSITION_BATCH_SIZE at a time, the trait count discrete totals of a
+        batch come from one TeamCompositionContainerBatch and the rows of a batch are inserted with one executemany
+
         :param list_tuple_compositions_combinations_all: list of tuples of the team composition combinations
         :return: None
         """
-        for team_composition_index, tuple_composition in enumerate(list_tuple_compositions_combinations_all):
-            team_composition_container = self.team_composition_container_factory.get_team_composition_container(
-                tuple_composition)
+        for team_composition_index_start in range(0, len(list_tuple_compositions_combinations_all),
+                                                  TEAM_COMPOSITION_BATCH_SIZE):
 
-            self._add_team_composition_index_to_table_team_composition_combination(
-                team_composition_index,
+            # Batch of team compositions as champion ids
+            list_tuple_composition_transformed_integer = [
                 self.team_composition_container_factory.get_tuple_team_composition_transformed_integer(
-                    tuple_composition),
-                len(tuple_composition),
-                team_composition_container.get_trait_count_discrete_total()
+                    tuple_composition) for tuple_composition in
+                list_tuple_compositions_combinations_all[
+                team_composition_index_start:team_composition_index_start + TEAM_COMPOSITION_BATCH_SIZE]]
+
+            # Traits of the whole batch
+            team_composition_container_batch = self.team_composition_container_factory.get_team_composition_container_batch(
+                list_tuple_composition_transformed_integer)
+
+            self._add_list_team_composition_index_to_table_team_composition_combination(
+                range(team_composition_index_start,
+                      team_composition_index_start + len(list_tuple_composition_transformed_integer)),
+                list_tuple_composition_transformed_integer,
+                team_composition_container_batch.bytes_trait_count_discrete_total
             )
 
             # WARNING: ADDING TRAITS ADDS AN ADDITIONAL 30 MINUTES OR SOMETHING LIKE THAT.
@@ -114,6 +241,36 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
 
         self.connection.commit()
 
+    @traced("db.add_list_team_composition_index_to_table_team_composition_combination")
+    def _add_list_team_composition_index_to_table_team_composition_combination(self,
+                                                                               iter_team_composition_index,
+                                                                               list_tuple_composition,
+                                                                               iter_trait_count_discrete_total):
+        """
+        Batch version of _add_team_composition_index_to_table_team_composition_combination where the
+        team_composition_index of list_tuple_composition[i] is the i-th item of iter_team_composition_index
+
+        :param iter_team_composition_index: team_composition_index of every team composition
+        :param list_tuple_composition: list of team compositions as tuples of champion ids
+        :param iter_trait_count_discrete_total: trait count discrete total of every team composition
+        :return: None
+        """
+        self.cursor.executemany(
+            """
+            INSERT INTO {} VALUES (?, ?, ?, ?);
+            """.format(
+                STRING_CHAMPION_COMPOSITIONS_TABLE_NAME
+            ),
+            (
+                (team_composition_index,
+                 sqlite3.Binary(pickle.dumps(tuple_composition, protocol=pickle.HIGHEST_PROTOCOL)),
+                 len(tuple_composition),
+                 trait_count_discrete_total)
+                for team_composition_index, tuple_composition, trait_count_discrete_total in
+                zip(iter_team_composition_index, list_tuple_composition, iter_trait_count_discrete_total)
+            )
+        )
+
     def _add_team_composition_index_to_table_team_composition_combination(self,
                                                                           team_composition_index,
                                                                           tuple_composition,
@@ -206,9 +363,8 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
             # Format the champion_name for the database
             champion_name_formatted = format_db_input(champion_name)
 
-            for index_champion_composition in list_index_champion_composition:
-                self._add_team_composition_index_to_table_champion(champion_name_formatted,
-                                                                   index_champion_composition)
+            self._add_list_team_composition_index_to_table_champion(champion_name_formatted,
+                                                                    list_index_champion_composition)
 
         self.connection.commit()
 
@@ -227,13 +383,304 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
             {'team_composition_index': team_composition_index}
         )
 
+    @traced("db.add_list_team_composition_index_to_table_champion")
+    def _add_list_team_composition_index_to_table_champion(self,
+                                                           champion_name_formatted,
+                                                           iter_team_composition_index):
+        """
+        Batch version of _add_team_composition_index_to_table_champion
+
+        :param champion_name_formatted: champion name formatted
+        :param iter_team_composition_index: indices of the corresponding composition combinations
+        :return: None
+        """
+        self.cursor.executemany(
+            "INSERT INTO {} VALUES (?)".format(
+                champion_name_formatted),
+            ((team_composition_index,) for team_composition_index in iter_team_composition_index)
+        )
+
+    def create_tables_champion_and_trait(self, iter_champion_names: iter, iter_trait_names: iter):
+        """
+        Create the tables of the given champions and traits if they do not exist (Champions and traits added by a
+        patch)
+
+        :param iter_champion_names: iterable of champion names
+        :param iter_trait_names: iterable of trait names
+        :return: None
+        """
+        string_query_complete = ""
+
+        for champion_name in iter_champion_names:
+            string_query_complete += STRING_QUERY_CREATE_TABLE_CHAMPION.format(format_db_input(champion_name),
+                                                                               STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
+
+        for trait_name in iter_trait_names:
+            string_query_complete += STRING_QUERY_CREATE_TABLE_TRAIT.format(format_db_input(trait_name),
+                                                                            STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
+
+        # executescript commits first so the incremental update must call this before its other changes
+        self.cursor.executescript(string_query_complete)
+
+    def drop_tables_champion_and_trait(self, iter_champion_names: iter, iter_trait_names: iter):
+        """
+        Drop the tables of the given champions and traits (Champions and traits removed by a patch)
+
+        :param iter_champion_names: iterable of champion names
+        :param iter_trait_names: iterable of trait names
+        :return: None
+        """
+        for name in list(iter_champion_names) + list(iter_trait_names):
+            self.cursor.execute("DROP TABLE IF EXISTS {};".format(format_db_input(name)))
+
+    def _set_temp_table_team_composition_index(self, iter_tuple_team_composition_index: iter):
+        """
+        Fill the temp table STRING_TEMP_TABLE_TEAM_COMPOSITION_INDEX with the rows (team_composition_index_old,
+        team_composition_index_new) so that the updates can join against it instead of using a huge IN (...)
+
+        :param iter_tuple_team_composition_index: iterable of (team_composition_index_old, team_composition_index_new)
+        :return: None
+        """
+        self.cursor.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS {}(
+                team_composition_index_old INT PRIMARY KEY NOT NULL,
+                team_composition_index_new INT NOT NULL
+            );
+            """.format(STRING_TEMP_TABLE_TEAM_COMPOSITION_INDEX))
+
+        self.cursor.execute("DELETE FROM {};".format(STRING_TEMP_TABLE_TEAM_COMPOSITION_INDEX))
+
+        self.cursor.executemany(
+            "INSERT INTO {} VALUES (?, ?);".format(STRING_TEMP_TABLE_TEAM_COMPOSITION_INDEX),
+            iter_tuple_team_composition_index)
+
+    def delete_list_team_composition_index(self, list_team_composition_index: list, iter_champion_names: iter):
+        """
+        Delete the team compositions at the given indices from the team_composition_combination table and from the
+        tables of the given champions
+
+        :param list_team_composition_index: list of team_composition_index to delete
+        :param iter_champion_names: champion names whose tables can contain the indices
+        :return: None
+        """
+        self._set_temp_table_team_composition_index(
+            (team_composition_index, team_composition_index) for team_composition_index in
+            list_team_composition_index)
+
+        for table_name in [STRING_CHAMPION_COMPOSITIONS_TABLE_NAME] + [format_db_input(champion_name) for
+                                                                       champion_name in iter_champion_names]:
+            self.cursor.execute(
+                """
+                DELETE FROM {} WHERE team_composition_index IN (SELECT team_composition_index_old FROM {});
+                """.format(table_name, STRING_TEMP_TABLE_TEAM_COMPOSITION_INDEX))
+
+    def move_list_team_composition_index(self,
+                                         list_tuple_team_composition_index: list,
+                                         iter_champion_names: iter):
+        """
+        Move team compositions from one team_composition_index to another (free) team_composition_index in the
+        team_composition_combination table and in the tables of the given champions
+
+        :param list_tuple_team_composition_index: list of (team_composition_index_old, team_composition_index_new)
+        :param iter_champion_names: champion names whose tables can contain the indices
+        :return: None
+        """
+        self._set_temp_table_team_composition_index(list_tuple_team_composition_index)
+
+        for table_name in [STRING_CHAMPION_COMPOSITIONS_TABLE_NAME] + [format_db_input(champion_name) for
+                                                                       champion_name in iter_champion_names]:
+            self.cursor.execute(
+                """
+                UPDATE {0} SET team_composition_index = (
+                    SELECT team_composition_index_new FROM {1} 
+                    WHERE team_composition_index_old = {0}.team_composition_index
+                )
+                WHERE team_composition_index IN (SELECT team_composition_index_old FROM {1});
+                """.format(table_name, STRING_TEMP_TABLE_TEAM_COMPOSITION_INDEX))
+
+    def update_team_composition_champion_id(self, dict_key_champion_id_old_value_champion_id_new: dict):
+        """
+        Rewrite the pickled tuples of champion ids of every team composition when the champion ids have changed
+        (Champions added or removed in the middle of champions.json shift the ids of the champions after them)
+
+        :param dict_key_champion_id_old_value_champion_id_new: old champion id -> new champion id
+        :return: None
+        """
+        team_composition_index_start = -1
+
+        while True:
+            list_fetch = self.cursor.execute(
+                """
+                SELECT team_composition_index, pickled_tuple_team_composition FROM {}
+                WHERE team_composition_index > ? ORDER BY team_composition_index LIMIT ?;
+                """.format(STRING_CHAMPION_COMPOSITIONS_TABLE_NAME),
+                (team_composition_index_start, TEAM_COMPOSITION_BATCH_SIZE)).fetchall()
+
+            if not list_fetch:
+                break
+
+            team_composition_index_start = list_fetch[-1][0]
+
+            self.cursor.executemany(
+                "UPDATE {} SET pickled_tuple_team_composition = ? WHERE team_composition_index = ?;".format(
+                    STRING_CHAMPION_COMPOSITIONS_TABLE_NAME),
+                [(sqlite3.Binary(pickle.dumps(
+                    tuple(dict_key_champion_id_old_value_champion_id_new[champion_id] for champion_id in
+                          pickle.loads(pickled_tuple_team_composition)),
+                    protocol=pickle.HIGHEST_PROTOCOL)), team_composition_index) for
+                    team_composition_index, pickled_tuple_team_composition in list_fetch])
+
+    def add_list_tuple_compositions_combinations_at_list_team_composition_index(
+            self,
+            list_team_composition_index: list,
+            list_tuple_compositions_combinations: list):
+        """
+        Add team compositions (tuples of champion names) at the given team_composition_index to the
+        team_composition_combination table and to the tables of their champions
+
+        :param list_team_composition_index: team_composition_index of every team composition
+        :param list_tuple_compositions_combinations: list of tuples of the team composition combinations
+        :return: None
+        """
+        for index_start in range(0, len(list_tuple_compositions_combinations), TEAM_COMPOSITION_BATCH_SIZE):
+            list_tuple_composition_transformed_integer = [
+                self.team_composition_container_factory.get_tuple_team_composition_transformed_integer(
+                    tuple_composition) for tuple_composition in
+                list_tuple_compositions_combinations[index_start:index_start + TEAM_COMPOSITION_BATCH_SIZE]]
+
+            team_composition_container_batch = self.team_composition_container_factory.get_team_composition_container_batch(
+                list_tuple_composition_transformed_integer)
+
+            self._add_list_team_composition_index_to_table_team_composition_combination(
+                list_team_composition_index[index_start:index_start + TEAM_COMPOSITION_BATCH_SIZE],
+                list_tuple_composition_transformed_integer,
+                team_composition_container_batch.bytes_trait_count_discrete_total
+            )
+
+        dict_key_champion_name_value_list_index_champion_composition = defaultdict(list)
+
+        for team_composition_index, tuple_composition in zip(list_team_composition_index,
+                                                             list_tuple_compositions_combinations):
+            for champion_name in tuple_composition:
+                dict_key_champion_name_value_list_index_champion_composition[champion_name].append(
+                    team_composition_index)
+
+        for champion_name, list_index_champion_composition in dict_key_champion_name_value_list_index_champion_composition.items():
+            self._add_list_team_composition_index_to_table_champion(format_db_input(champion_name),
+                                                                    list_index_champion_composition)
+
+    def get_posting_index(self) -> PostingIndex:
+        """
+        Get the posting index of the db, it is read the first time it is used
+
+        :return: PostingIndex object, None if there is no posting index made from this version of the db (The champion
+            tables are used)
+        """
+        with self.lock_posting_index:
+            if not self._bool_posting_index_read:
+                self._posting_index = get_posting_index_from_file(self.path_posting_index, self.path_db)
+                self._bool_posting_index_read = True
+
+            return self._posting_index
+
+    def write_posting_index(self, posting_index: PostingIndex):
+        """
+        Write the posting index of the db next to the db, call after the last change to the db
+
+        :param posting_index: PostingIndex object made from the team compositions of the db
+        :return: None
+        """
+        self.connection.commit()
+
+        posting_index.write(self.path_posting_index, self.path_db)
+
+        with self.lock_posting_index:
+            self._posting_index = posting_index
+            self._bool_posting_index_read = True
+
+    def get_summary_statistics(self) -> SummaryStatistics:
+        """
+        Get the counts of the team compositions of the db, they are read from the summary tables the first time they
+        are used
+
+        :return: SummaryStatistics object, None if the db has no summary tables (Made by a build from before them)
+        """
+        with self.lock_summary_statistics:
+            if not self._bool_summary_statistics_read:
+                try:
+                    with self.sqlite_connection_pool.connection() as connection:
+                        self._summary_statistics = SummaryStatistics(
+                            {(team_composition_size, trait_count_discrete_total): team_composition_count for
+                             team_composition_size, trait_count_discrete_total, team_composition_count in
+                             connection.execute("SELECT * FROM {};".format(
+                                 STRING_SUMMARY_SIZE_TRAIT_COUNT_DISCRETE_TOTAL_TABLE_NAME))},
+                            {(champion_name, team_composition_size): team_composition_count for
+                             champion_name, team_composition_size, team_composition_count in
+                             connection.execute("SELECT * FROM {};".format(STRING_SUMMARY_CHAMPION_SIZE_TABLE_NAME))},
+                            {(trait_name, trait_count_discrete, team_composition_size): team_composition_count for
+                             trait_name, trait_count_discrete, team_composition_size, team_composition_count in
+                             connection.execute("SELECT * FROM {};".format(
+                                 STRING_SUMMARY_TRAIT_TRAIT_COUNT_DISCRETE_SIZE_TABLE_NAME))})
+
+                except sqlite3.OperationalError:
+                    self._summary_statistics = None
+
+                self._bool_summary_statistics_read = True
+
+            return self._summary_statistics
+
+    def write_summary_statistics(self) -> SummaryStatistics:
+        """
+        Count the team compositions of the db and replace the summary tables, call after the last change to the team
+        compositions of the db and before write_posting_index (Writing the summary tables changes the db the posting
+        index is tied to)
+
+        :return: SummaryStatistics object written
+        """
+        # The team compositions are read by the read only connections
+        self.connection.commit()
+
+        summary_statistics = get_summary_statistics_from_iter(
+            self.team_composition_container_factory,
+            self.get_iter_tuple_champion_ids_trait_count_discrete_total())
+
+        self.cursor.executescript(STRING_QUERY_CREATE_TABLES_SUMMARY)
+
+        self.cursor.executemany(
+            "INSERT INTO {} VALUES (?, ?, ?);".format(STRING_SUMMARY_SIZE_TRAIT_COUNT_DISCRETE_TOTAL_TABLE_NAME),
+            ((team_composition_size, trait_count_discrete_total, team_composition_count) for
+             (team_composition_size, trait_count_discrete_total), team_composition_count in
+             summary_statistics.dict_key_tuple_size_trait_count_discrete_total_value_count.items()))
+
+        self.cursor.executemany(
+            "INSERT INTO {} VALUES (?, ?, ?);".format(STRING_SUMMARY_CHAMPION_SIZE_TABLE_NAME),
+            ((champion_name, team_composition_size, team_composition_count) for
+             (champion_name, team_composition_size), team_composition_count in
+             summary_statistics.dict_key_tuple_champion_name_size_value_count.items()))
+
+        self.cursor.executemany(
+            "INSERT INTO {} VALUES (?, ?, ?, ?);".format(STRING_SUMMARY_TRAIT_TRAIT_COUNT_DISCRETE_SIZE_TABLE_NAME),
+            ((trait_name, trait_count_discrete, team_composition_size, team_composition_count) for
+             (trait_name, trait_count_discrete, team_composition_size), team_composition_count in
+             summary_statistics.dict_key_tuple_trait_name_trait_count_discrete_size_value_count.items()))
+
+        self.connection.commit()
+
+        with self.lock_summary_statistics:
+            self._summary_statistics = summary_statistics
+            self._bool_summary_statistics_read = True
+
+        return summary_statistics
+
     def get_pickled_list_tuple_champion_composition(self,
                                                     iter_team_composition_current: iter,
                                                     iter_team_composition_exclude: iter,
                                                     team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
                                                     team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX,
                                                     trait_count_discrete_total_min: int = TRAIT_COUNT_DISCRETE_TOTAL_MIN,
-                                                    trait_count_discrete_total_max: int = TRAIT_COUNT_TOTAL_MAX
+                                                    trait_count_discrete_total_max: int = TRAIT_COUNT_TOTAL_MAX,
+                                                    timeout: float = None
                                                     ) -> List[Tuple]:
         """
         Given a iterable of champion names, get a list of tuples containing the indices that corresponds to
@@ -245,6 +692,7 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
         :param team_composition_size_max:
         :param trait_count_discrete_total_min:
         :param trait_count_discrete_total_max:
+        :param timeout: sec before the query is interrupted with a TimeoutError (None for no timeout)
         :return: list that contains tuples of the rows
         """
 
@@ -252,15 +700,78 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
         if not iter_team_composition_current:
             return []
 
+        posting_index = self.get_posting_index()
+
+        if posting_index is not None:
+            query_plan = posting_index.query_planner.get_query_plan(iter_team_composition_current,
+                                                                    iter_team_composition_exclude)
+
+            increment_counter("db.query_plan.{}".format(query_plan.plan))
+
+            if query_plan.plan == PLAN_SCAN:
+                return self._get_pickled_list_tuple_champion_composition_scan(
+                    query_plan, team_composition_size_min, team_composition_size_max, trait_count_discrete_total_min,
+                    trait_count_discrete_total_max, timeout)
+
+            # The include and exclude are a bitmap AND and ANDNOT, only the matching rows are read from the db
+            roaring_bitmap = posting_index.get_roaring_bitmap_query_plan(query_plan)
+
+            if not roaring_bitmap:
+                return []
+
+            string_query_posting = """
+            SELECT team_composition_index, pickled_tuple_team_composition, team_composition_size, trait_count_discrete_total
+            FROM {}
+            WHERE team_composition_index IN ({})
+            AND team_composition_size >= ?
+            AND team_composition_size <= ?
+            AND trait_count_discrete_total >= ?
+            AND trait_count_discrete_total <= ?
+            ORDER BY team_composition_index
+            ;
+            """.format(STRING_CHAMPION_COMPOSITIONS_TABLE_NAME, ", ".join("?" * POSTING_QUERY_CHUNK_IDS))
+
+            tuple_parameters_filter = (team_composition_size_min, team_composition_size_max,
+                                       trait_count_discrete_total_min, trait_count_discrete_total_max)
+
+            # The ids of the bitmap are ascending so the rows of the chunks come out by team_composition_index like
+            # the INTERSECT
+            iterator_team_composition_index = iter(roaring_bitmap)
+
+            list_fetch = []
+
+            time_deadline = time.perf_counter() + timeout if timeout is not None else None
+
+            with self.sqlite_connection_pool.connection() as connection:
+                cursor = connection.cursor()
+
+                list_team_composition_index = list(islice(iterator_team_composition_index, POSTING_QUERY_CHUNK_IDS))
+
+                while list_team_composition_index:
+                    list_team_composition_index.extend(
+                        [POSTING_QUERY_ID_PADDING] * (POSTING_QUERY_CHUNK_IDS - len(list_team_composition_index)))
+
+                    list_fetch.extend(self.sqlite_query_log.execute_fetchall(
+                        cursor,
+                        string_query_posting,
+                        (*list_team_composition_index, *tuple_parameters_filter),
+                        timeout=max(time_deadline - time.perf_counter(), 0.0) if timeout is not None else None))
+
+                    list_team_composition_index = list(islice(iterator_team_composition_index,
+                                                              POSTING_QUERY_CHUNK_IDS))
+
+            return self._get_pickled_list_tuple_champion_composition_format(list_fetch, 1)
+
         # string for the selection
         string_query_select_base = "SELECT team_composition_index FROM {} "
 
         # Intersect keyword in sqlite
         string_intersect = "INTERSECT"
 
+        # Smallest champion table first so the INTERSECT never starts from the largest table
         string_query_intersect = "{} ".format(string_intersect).join(
             [string_query_select_base.format(format_db_input(champion_name)) for champion_name in
-             iter_team_composition_current])
+             self.get_list_champion_name_by_table_size(iter_team_composition_current)])
 
         string_except = "EXCEPT"
 
@@ -335,12 +846,98 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
             trait_count_discrete_total_max
         )
 
-        # print(string_query_full)
+        with self.sqlite_connection_pool.connection() as connection:
+            list_fetch = self.sqlite_query_log.execute_fetchall(connection.cursor(), string_query_full, timeout=timeout)
+
+        return self._get_pickled_list_tuple_champion_composition_format(list_fetch, 1)
+
+    def _get_pickled_list_tuple_champion_composition_scan(self,
+                                                          query_plan: QueryPlan,
+                                                          team_composition_size_min: int,
+                                                          team_composition_size_max: int,
+                                                          trait_count_discrete_total_min: int,
+                                                          trait_count_discrete_total_max: int,
+                                                          timeout: float = None) -> List[Tuple]:
+        """
+        get_pickled_list_tuple_champion_composition by reading every row of the team composition table in order and
+        checking the bitmask of its champions (For a plan that matches most of the table, looking up that many rows
+        by team_composition_index is slower than reading the table)
+
+        :param query_plan: QueryPlan object of PLAN_SCAN
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :param trait_count_discrete_total_min:
+        :param trait_count_discrete_total_max:
+        :param timeout: sec before the query is interrupted with a TimeoutError (None for no timeout)
+        :return: list that contains tuples of the rows
+        """
+        champion_trait_index = self.team_composition_container_factory.champion_trait_index
+
+        bitmask_include = champion_trait_index.get_bitmask_champion(query_plan.list_champion_name_include)
+        bitmask_exclude = champion_trait_index.get_bitmask_champion(query_plan.list_champion_name_exclude)
+
+        string_query_scan = """
+        SELECT team_composition_index, pickled_tuple_team_composition, team_composition_size, trait_count_discrete_total
+        FROM {}
+        WHERE team_composition_size >= ?
+        AND team_composition_size <= ?
+        AND trait_count_discrete_total >= ?
+        AND trait_count_discrete_total <= ?
+        ORDER BY team_composition_index
+        ;
+        """.format(STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
+
+        def is_match(tuple_row: tuple) -> bool:
+            bitmask_team_composition = 0
+
+            for champion_id in pickle.loads(tuple_row[1]):
+                bitmask_team_composition |= 1 << champion_id
 
-        self.cursor.execute(string_query_full)
+            return (bitmask_team_composition & bitmask_include == bitmask_include and
+                    not bitmask_team_composition & bitmask_exclude)
 
-        return self._get_pickled_list_tuple_champion_composition_format(self.cursor.fetchall(), 1)
+        # The rows are checked as they are fetched so only the matching rows are kept
+        with self.sqlite_connection_pool.connection() as connection:
+            list_fetch = self.sqlite_query_log.execute_fetchall(
+                connection.cursor(),
+                string_query_scan,
+                (team_composition_size_min, team_composition_size_max,
+                 trait_count_discrete_total_min, trait_count_discrete_total_max),
+                timeout=timeout,
+                callable_filter=is_match)
+
+        return self._get_pickled_list_tuple_champion_composition_format(list_fetch, 1)
+
+    def get_list_champion_name_by_table_size(self, iter_champion_names: iter) -> List[str]:
+        """
+        Order champion names by the rows of their champion table (Smallest first)
 
+        The rows of a table are estimated by its largest rowid which is a lookup at the end of its b-tree instead of a
+        COUNT(*) over the table, rows deleted by an incremental build are still counted. The estimates are read once
+        per handler.
+
+        :param iter_champion_names: iterable of champion names
+        :return: list of champion names
+        """
+        list_champion_name = list(iter_champion_names)
+
+        with self.lock_rowid_max:
+            list_champion_name_unknown = [champion_name for champion_name in list_champion_name if
+                                          champion_name not in self.dict_key_champion_name_value_rowid_max]
+
+        if list_champion_name_unknown:
+            with self.sqlite_connection_pool.connection() as connection:
+                dict_key_champion_name_value_rowid_max = {
+                    champion_name: connection.execute(
+                        "SELECT MAX(rowid) FROM {};".format(format_db_input(champion_name))).fetchone()[0] or 0
+                    for champion_name in list_champion_name_unknown}
+
+            with self.lock_rowid_max:
+                self.dict_key_champion_name_value_rowid_max.update(dict_key_champion_name_value_rowid_max)
+
+        return sorted(list_champion_name, key=self.dict_key_champion_name_value_rowid_max.get)
+
+    @traced("db.get_pickled_list_tuple_champion_composition_format")
     def _get_pickled_list_tuple_champion_composition_format(self, list_fetch: list, pickle_data_position) -> list:
         """
         load the pickled data in the list of tuples of rows
@@ -359,6 +956,7 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
 
         return list_fetch
 
+    @traced("db.get_index_list_tuple_champion_composition")
     def get_index_list_tuple_champion_composition(self, iter_champion_names: iter) -> List[Tuple]:
         """
         Given a iterable of champion names, get a list of tuples containing the indices that corresponds to
@@ -374,16 +972,16 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
         # Intersect keyword in sqlite
         string_intersect = "INTERSECT"
 
-        self._get_from_table_team_composition_combination(string_column_table_base,
-                                                          string_intersect,
-                                                          iter_champion_names)
+        list_fetch = self._get_from_table_team_composition_combination(string_column_table_base,
+                                                                       string_intersect,
+                                                                       iter_champion_names)
 
-        return [pickle.loads(i[0]) for i in self.cursor.fetchall()]
+        return [pickle.loads(i[0]) for i in list_fetch]
 
     def _get_from_table_team_composition_combination(self,
                                                      string_column_table_base: str,
                                                      operation: str,
-                                                     iter_champion_names: iter):
+                                                     iter_champion_names: iter) -> List[Tuple]:
         """
         Given the string_column_table_base, SQLite operation, and the iter_champion_names
         Execute that query
@@ -391,16 +989,56 @@ class SQLiteHandlerTeamCompositionSolver(SQLite3Wrapper):
         :param string_column_table_base:
         :param operation:
         :param iter_champion_names:
-        :return: None
+        :return: list that contains tuples of the rows
         """
 
         string_query = " {} ".format(operation).join(
             [string_column_table_base.format(format_db_input(champion_name)) for champion_name in iter_champion_names])
 
-        self.cursor.execute(string_query)
+        with self.sqlite_connection_pool.connection() as connection:
+            return self.sqlite_query_log.execute_fetchall(connection.cursor(), string_query)
+
+    def get_iter_tuple_champion_ids_trait_count_discrete_total(self, batch_size: int = TEAM_COMPOSITION_BATCH_SIZE):
+        """
+        Read every team composition of the db a batch at a time (Ordered by team_composition_index)
+
+        :param batch_size: rows read at a time
+        :return: iterator of (tuple of champion ids, trait count discrete total)
+        """
+        with self.sqlite_connection_pool.connection() as connection:
+            cursor = connection.execute(
+                "SELECT pickled_tuple_team_composition, trait_count_discrete_total FROM {} "
+                "ORDER BY team_composition_index;".format(STRING_CHAMPION_COMPOSITIONS_TABLE_NAME))
+
+            while True:
+                list_fetch = cursor.fetchmany(batch_size)
+
+                if not list_fetch:
+                    break
+
+                for pickled_tuple_team_composition, trait_count_discrete_total in list_fetch:
+                    yield pickle.loads(pickled_tuple_team_composition), trait_count_discrete_total
+
+    def close(self):
+        """
+        Close the read only connections and the connection used to build the db
+
+        :return: None
+        """
+        self.sqlite_connection_pool.close()
+        self.connection.close()
+
+    def get_list_dict_query_shape_stats(self) -> List[dict]:
+        """
+        Get the time and rows of every query shape ran by this handler, the shape with the most total time first
 
+        :return: list of dict of the stats
+        """
+        return self.sqlite_query_log.get_list_dict_query_shape_stats()
 
-def _create_db_champion_tables(champion_pool_dict: dict, trait_pool_dict: dict):
+
+def _create_db_champion_tables(champion_pool_dict: dict, trait_pool_dict: dict,
+                               path_db: str = FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION):
     """
     Given a dict containing the key champion_name with the value of list_index_champion_composition
         create a table that contains the amount of champions available in TFT (as in names of champions)
@@ -410,6 +1048,7 @@ def _create_db_champion_tables(champion_pool_dict: dict, trait_pool_dict: dict):
         a blob which contains the binary representation of the pickled (serialized) team composition combination tuple
 
     :param dict_key_champion_name_value_list_index_team_composition:
+    :param path_db: path to the db file
     :return: None
     """
 
@@ -423,36 +1062,17 @@ def _create_db_champion_tables(champion_pool_dict: dict, trait_pool_dict: dict):
     );\n
     """.format(STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
 
-    string_query_base_champion = """
-    CREATE TABLE {}(
-        team_composition_index INT NOT NULL,
-        FOREIGN KEY (team_composition_index)
-            REFERENCES {}(team_composition_index)
-    );\n
-    """
-
-    string_query_base_trait = """
-    CREATE TABLE {}(
-        team_composition_index INT NOT NULL,
-        trait_count_discrete,
-        FOREIGN KEY (team_composition_index)
-            REFERENCES {}(team_composition_index)
-    );\n
-    """
-
-    connection = sqlite3.connect(FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION)
+    connection = sqlite3.connect(path_db)
 
     cursor = connection.cursor()
 
     for champion_name, champion_object in champion_pool_dict.items():
-        string_query_complete += string_query_base_champion.format("{}".format(format_db_input(champion_name)),
-                                                                   STRING_CHAMPION_COMPOSITIONS_TABLE_NAME,
-                                                                   STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
+        string_query_complete += STRING_QUERY_CREATE_TABLE_CHAMPION.format("{}".format(format_db_input(champion_name)),
+                                                                           STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
 
     for trait_name, trait_object in trait_pool_dict.items():
-        string_query_complete += string_query_base_trait.format("{}".format(format_db_input(trait_name)),
-                                                                STRING_CHAMPION_COMPOSITIONS_TABLE_NAME,
-                                                                STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
+        string_query_complete += STRING_QUERY_CREATE_TABLE_TRAIT.format("{}".format(format_db_input(trait_name)),
+                                                                        STRING_CHAMPION_COMPOSITIONS_TABLE_NAME)
 
     cursor.executescript(string_query_complete)
 
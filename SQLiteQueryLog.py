@@ -0,0 +1,318 @@
+"""
+10/19/2026
+
+Purpose:
+    Time every query of the SQLiteHandlerTeamCompositionSolver, log the slow queries with their EXPLAIN QUERY PLAN and
+    keep the stats of every query shape
+
+Important Note:
+    The shape of a query is its text with the champion table names replaced by <champion> and the numbers replaced by
+    ?, so the queries of the GUI that only differ by which champions are selected or by the size and trait filters
+    share a shape while a query with one more selected champion (One more INTERSECT) or excluded champion (One more
+    EXCEPT) is another shape. The stats of the shapes show which filter combinations are slow.
+
+    The EXPLAIN QUERY PLAN of a slow query is only ran after the query is timed so it does not add to its time.
+
+    A query with a timeout is interrupted by the progress handler of its connection once the timeout has passed so the
+    connection is free for the next query instead of finishing a query nobody is waiting for.
+
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List
+
+from Teamfight_Tactics_Composition_Solver.Instrumentation import span
+
+# Queries that take longer than this are logged
+SLOW_QUERY_THRESHOLD_SEC = 1.0
+
+# Slow queries kept in memory (Every slow query is written to the log file)
+SLOW_QUERY_AMOUNT_MAX = 100
+
+# SQLite virtual machine instructions between the checks of the timeout of a query
+PROGRESS_HANDLER_INSTRUCTIONS = 10000
+
+# Rows fetched at a time by a query with a filter
+FETCH_MANY_ROWS = 4096
+
+STRING_SHAPE_CHAMPION = "<champion>"
+
+REGEX_NUMBER = re.compile(r"\b\d+\b")
+REGEX_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryShapeStats:
+    __slots__ = ["shape", "count", "time_total", "time_min", "time_max", "rows_total", "amount_slow"]
+
+    def __init__(self, shape: str):
+        """
+        Stats of the queries that share a shape
+
+        :param shape: normalized text of the queries
+        """
+        self.shape = shape  # type: str
+        self.count = 0  # type: int
+        self.time_total = 0.0  # type: float
+        self.time_min = float("inf")  # type: float
+        self.time_max = 0.0  # type: float
+        self.rows_total = 0  # type: int
+        self.amount_slow = 0  # type: int
+
+    def add_query(self, time_query: float, rows: int, bool_slow: bool):
+        """
+        Add a query to the stats
+
+        :param time_query: time of the query in sec
+        :param rows: amount of rows returned
+        :param bool_slow: the query was over the threshold
+        :return: None
+        """
+        self.count += 1
+        self.time_total += time_query
+        self.time_min = min(self.time_min, time_query)
+        self.time_max = max(self.time_max, time_query)
+        self.rows_total += rows
+        self.amount_slow += bool_slow
+
+    def get_dict(self) -> dict:
+        return {"shape": self.shape,
+                "count": self.count,
+                "time_total": self.time_total,
+                "time_mean": self.time_total / self.count if self.count else None,
+                "time_min": self.time_min if self.count else None,
+                "time_max": self.time_max,
+                "rows_total": self.rows_total,
+                "rows_mean": self.rows_total / self.count if self.count else None,
+                "amount_slow": self.amount_slow}
+
+
+class SQLiteQueryLog:
+
+    def __init__(self,
+                 iter_champion_table_names: Iterable[str] = (),
+                 slow_query_threshold: float = SLOW_QUERY_THRESHOLD_SEC,
+                 path_slow_query_log: str = None):
+        """
+        Timer of the queries of a db with a log of its slow queries
+
+        :param iter_champion_table_names: table names of the champions (Replaced by <champion> in the shape)
+        :param slow_query_threshold: queries that take longer (sec) are logged
+        :param path_slow_query_log: path of the json lines file the slow queries are appended to (None to only keep
+            them in memory)
+        """
+        self.slow_query_threshold = slow_query_threshold  # type: float
+        self.path_slow_query_log = path_slow_query_log  # type: str
+
+        # Longest names first so a name that is the start of another name does not replace part of it
+        list_champion_table_name = sorted(set(iter_champion_table_names), key=len, reverse=True)
+
+        self.regex_champion_table_name = re.compile(
+            r"\b(?:{})\b".format("|".join(re.escape(name) for name in list_champion_table_name))
+        ) if list_champion_table_name else None
+
+        # Queries are ran by the GUI threads
+        self.lock = threading.Lock()
+
+        # Shape -> stats of the shape
+        self.dict_key_shape_value_query_shape_stats = {}  # type: Dict[str, QueryShapeStats]
+
+        # Newest slow queries
+        self.deque_dict_slow_query = deque(maxlen=SLOW_QUERY_AMOUNT_MAX)  # type: Deque[dict]
+
+    def get_shape(self, string_query: str) -> str:
+        """
+        Get the shape of a query
+
+        :param string_query: query
+        :return: normalized query
+        """
+        string_shape = REGEX_WHITESPACE.sub(" ", string_query).strip()
+
+        if self.regex_champion_table_name is not None:
+            string_shape = self.regex_champion_table_name.sub(STRING_SHAPE_CHAMPION, string_shape)
+
+        return REGEX_NUMBER.sub("?", string_shape)
+
+    def execute_fetchall(self,
+                         cursor: sqlite3.Cursor,
+                         string_query: str,
+                         parameters: Iterable = (),
+                         timeout: float = None,
+                         callable_filter: Callable[[tuple], bool] = None) -> List[tuple]:
+        """
+        Execute a query, fetch all of its rows and record its time
+
+        :param cursor: cursor of the db
+        :param string_query: query
+        :param parameters: parameters of the query
+        :param timeout: sec before the query is interrupted (None for no timeout)
+        :param callable_filter: only the rows it returns True for are kept, the rows are fetched FETCH_MANY_ROWS at a
+            time so the rows it drops are never all in memory (None to keep every row)
+        :return: cursor.fetchall() (The rows kept by callable_filter)
+        :raises TimeoutError: the query was interrupted by the timeout
+        """
+        string_shape = self.get_shape(string_query)
+
+        with span("db.query", shape=string_shape) as span_query:
+            time_start = time.perf_counter()
+
+            if timeout is not None:
+                time_deadline = time_start + timeout
+
+                # Non zero return interrupts the query
+                cursor.connection.set_progress_handler(lambda: time.perf_counter() > time_deadline,
+                                                       PROGRESS_HANDLER_INSTRUCTIONS)
+
+            try:
+                cursor.execute(string_query, parameters)
+
+                if callable_filter is None:
+                    list_fetch = cursor.fetchall()
+
+                else:
+                    list_fetch = []
+
+                    list_fetch_many = cursor.fetchmany(FETCH_MANY_ROWS)
+
+                    while list_fetch_many:
+                        list_fetch.extend(filter(callable_filter, list_fetch_many))
+
+                        list_fetch_many = cursor.fetchmany(FETCH_MANY_ROWS)
+
+            except sqlite3.OperationalError as e:
+                if timeout is not None and time.perf_counter() > time_deadline:
+                    raise TimeoutError("Query interrupted after {} Sec: {}".format(timeout, string_shape)) from e
+
+                raise
+
+            finally:
+                if timeout is not None:
+                    cursor.connection.set_progress_handler(None, PROGRESS_HANDLER_INSTRUCTIONS)
+
+            time_query = time.perf_counter() - time_start
+
+            span_query.set_argument("rows", len(list_fetch))
+
+        bool_slow = time_query >= self.slow_query_threshold
+
+        with self.lock:
+            query_shape_stats = self.dict_key_shape_value_query_shape_stats.get(string_shape)
+
+            if query_shape_stats is None:
+                query_shape_stats = self.dict_key_shape_value_query_shape_stats[string_shape] = QueryShapeStats(
+                    string_shape)
+
+            query_shape_stats.add_query(time_query, len(list_fetch), bool_slow)
+
+        if bool_slow:
+            self._add_slow_query(cursor, string_query, parameters, string_shape, time_query, len(list_fetch))
+
+        return list_fetch
+
+    def _add_slow_query(self, cursor: sqlite3.Cursor, string_query: str, parameters: Iterable, string_shape: str,
+                        time_query: float, rows: int):
+        """
+        Log a slow query with its query plan
+
+        :param cursor: cursor of the db
+        :param string_query: query
+        :param parameters: parameters of the query
+        :param string_shape: shape of the query
+        :param time_query: time of the query in sec
+        :param rows: amount of rows returned
+        :return: None
+        """
+        try:
+            # Rows of EXPLAIN QUERY PLAN are (id, parent, notused, detail)
+            list_query_plan = [row[-1] for row in
+                               cursor.execute("EXPLAIN QUERY PLAN {}".format(string_query), parameters).fetchall()]
+
+        except sqlite3.Error as e:
+            list_query_plan = ["EXPLAIN QUERY PLAN failed: {}".format(e)]
+
+        dict_slow_query = {"time": time.time(),
+                           "duration": time_query,
+                           "rows": rows,
+                           "shape": string_shape,
+                           "query": REGEX_WHITESPACE.sub(" ", string_query).strip(),
+                           "query_plan": list_query_plan}
+
+        print("Slow query ({:.3f} Sec, {} rows): {}".format(time_query, rows, string_shape), file=sys.stderr)
+
+        for detail in list_query_plan:
+            print("    {}".format(detail), file=sys.stderr)
+
+        with self.lock:
+            self.deque_dict_slow_query.append(dict_slow_query)
+
+            if self.path_slow_query_log is not None:
+                try:
+                    with open(self.path_slow_query_log, "a") as file:
+                        file.write(json.dumps(dict_slow_query))
+                        file.write("\n")
+
+                except OSError as e:
+                    print(e, file=sys.stderr)
+
+    def get_list_dict_slow_query(self) -> List[dict]:
+        """
+        Get the newest slow queries (Oldest first)
+        :return: list of dict of the slow queries
+        """
+        with self.lock:
+            return list(self.deque_dict_slow_query)
+
+    def get_list_dict_query_shape_stats(self) -> List[dict]:
+        """
+        Get the stats of every query shape, the shape with the most total time first
+        :return: list of dict of the stats
+        """
+        with self.lock:
+            list_dict_query_shape_stats = [query_shape_stats.get_dict() for query_shape_stats in
+                                           self.dict_key_shape_value_query_shape_stats.values()]
+
+        list_dict_query_shape_stats.sort(key=lambda dict_query_shape_stats: dict_query_shape_stats["time_total"],
+                                         reverse=True)
+
+        return list_dict_query_shape_stats
+
+    def write_query_shape_stats(self, path: str):
+        """
+        Write the stats of every query shape as json
+
+        :param path: path of the json file
+        :return: None
+        """
+        dir_output = os.path.dirname(path)
+
+        if dir_output:
+            os.makedirs(dir_output, exist_ok=True)
+
+        with open(path, "w") as file:
+            json.dump({"slow_query_threshold": self.slow_query_threshold,
+                       "query_shapes": self.get_list_dict_query_shape_stats(),
+                       "slow_queries": self.get_list_dict_slow_query()}, file, indent=4)
+
+    def __str__(self):
+        list_string = ["{:>8}{:>12}{:>12}{:>12}{:>8}  {}".format("Count", "Total (s)", "Mean (s)", "Max (s)", "Slow",
+                                                                 "Shape")]
+
+        for dict_query_shape_stats in self.get_list_dict_query_shape_stats():
+            list_string.append("{:>8}{:>12.4f}{:>12.4f}{:>12.4f}{:>8}  {}".format(
+                dict_query_shape_stats["count"],
+                dict_query_shape_stats["time_total"],
+                dict_query_shape_stats["time_mean"],
+                dict_query_shape_stats["time_max"],
+                dict_query_shape_stats["amount_slow"],
+                dict_query_shape_stats["shape"]))
+
+        return "\n".join(list_string)
+
+    def __repr__(self):
+        return self.__str__()
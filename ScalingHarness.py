@@ -0,0 +1,214 @@
+"""
+10/19/2026
+
+Purpose:
+    Run the build and query pipeline (Benchmark db_build, db_query and formatter) on synthetic sets of increasing size
+    and report how the time, the amount of team compositions and the memory scale with the amount of champions
+
+Important Note:
+    Every size is ran in its own process so the peak memory (memory_max_rss) of a size is not hidden by an earlier size.
+
+    The growth is fitted as y = a * b ^ number_champions (The amount of team compositions is combinatorial in the amount
+    of champions) by least squares on log(y), b is the growth per champion and --predict extrapolates the fit to a
+    set that does not exist yet. The extrapolation is only as good as the synthetic sets look like the real one.
+
+        python -m Teamfight_Tactics_Composition_Solver.ScalingHarness --sizes 30,40,51,60 --predict 70 --output s.json
+
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.SyntheticDataset import write_dataset, add_argument_dataset, \
+    get_dict_kwargs_dataset
+
+# Measurements of a size that are fitted
+TUPLE_MEASUREMENT = ("time_build", "amount_team_compositions", "time_query_median", "time_formatter_median",
+                     "memory_max_rss")
+
+
+def _run_benchmark_process(path_champions: str, path_traits: str, team_composition_size: int, repeat: int,
+                           path_output: str):
+    """
+    Run the Benchmark db and formatter benchmarks of a dataset in a new process
+
+    :param path_champions: path to json file of champions
+    :param path_traits: path to json file to traits of the champions
+    :param team_composition_size: team comp size of the db
+    :param repeat: amount of runs of every benchmark
+    :param path_output: path of the json results
+    :return: None
+    """
+    # The package must be importable by the new process the same way it is by this one
+    dir_package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    dict_environment = dict(os.environ)
+    dict_environment["PYTHONPATH"] = os.pathsep.join(
+        path for path in (dir_package_parent, dict_environment.get("PYTHONPATH")) if path)
+
+    subprocess.check_call([sys.executable, "-m", "Teamfight_Tactics_Composition_Solver.Benchmark",
+                           "--champions", path_champions,
+                           "--traits", path_traits,
+                           "--search-sizes", "",
+                           "--factory-amount", "0",
+                           "--db-size", str(team_composition_size),
+                           "--repeat", str(repeat),
+                           "--output", path_output],
+                          env=dict_environment,
+                          stdout=subprocess.DEVNULL)
+
+
+def _get_dict_measurement(dict_results: dict) -> dict:
+    """
+    Get the measurements of a size from the json of its benchmark run
+
+    :param dict_results: json of the benchmark run
+    :return: dict of the measurements
+    """
+    list_dict_result = dict_results["results"]
+
+    dict_result_build = next(dict_result for dict_result in list_dict_result if dict_result["name"] == "db_build")
+
+    list_time_query = [dict_result["time_median"] for dict_result in list_dict_result if
+                       dict_result["name"] == "db_query"]
+
+    list_time_formatter = [dict_result["time_median"] for dict_result in list_dict_result if
+                           dict_result["name"] == "formatter"]
+
+    return {"number_champions": dict_results["metadata"]["number_champions"],
+            "number_traits": dict_results["metadata"]["number_traits"],
+            "time_build": dict_result_build["time_median"],
+            "amount_team_compositions": dict_result_build["amount_items"],
+            "time_query_median": sorted(list_time_query)[len(list_time_query) // 2] if list_time_query else None,
+            "time_formatter_median": sorted(list_time_formatter)[
+                len(list_time_formatter) // 2] if list_time_formatter else None,
+            "memory_max_rss": dict_results["metadata"]["memory_max_rss"]}
+
+
+def get_tuple_fit_exponential(list_tuple_x_y: List[Tuple[float, float]]) -> Tuple[float, float]:
+    """
+    Fit y = a * b ^ x by least squares on log(y)
+
+    :param list_tuple_x_y: list of (x, y) with y > 0
+    :return: tuple of a and b or None if there are less than 2 points
+    """
+    list_tuple_x_y = [(x, y) for x, y in list_tuple_x_y if y is not None and y > 0]
+
+    if len(set(x for x, y in list_tuple_x_y)) < 2:
+        return None
+
+    x_mean = sum(x for x, y in list_tuple_x_y) / len(list_tuple_x_y)
+    log_y_mean = sum(math.log(y) for x, y in list_tuple_x_y) / len(list_tuple_x_y)
+
+    slope = (sum((x - x_mean) * (math.log(y) - log_y_mean) for x, y in list_tuple_x_y) /
+             sum((x - x_mean) ** 2 for x, y in list_tuple_x_y))
+
+    return math.exp(log_y_mean - slope * x_mean), math.exp(slope)
+
+
+def run_scaling_harness(list_number_champions: List[int],
+                        team_composition_size: int = 4,
+                        repeat: int = 1,
+                        dict_kwargs_dataset: dict = None,
+                        list_number_champions_predict: List[int] = None) -> dict:
+    """
+    Run the pipeline on a synthetic set for every amount of champions and fit the growth
+
+    :param list_number_champions: amount of champions of every synthetic set
+    :param team_composition_size: team comp size of the db
+    :param repeat: amount of runs of every benchmark
+    :param dict_kwargs_dataset: kwargs of SyntheticDataset.generate_dataset
+    :param list_number_champions_predict: amount of champions to extrapolate the fit to
+    :return: json serializable dict of the measurements, the fits and the predictions
+    """
+    if dict_kwargs_dataset is None:
+        dict_kwargs_dataset = {}
+
+    list_dict_measurement = []
+
+    with tempfile.TemporaryDirectory(prefix="tft_scaling_") as dir_temp:
+        for number_champions in list_number_champions:
+            dir_dataset = os.path.join(dir_temp, str(number_champions))
+
+            path_champions, path_traits = write_dataset(dir_dataset, number_champions, **dict_kwargs_dataset)
+
+            path_output = os.path.join(dir_dataset, "benchmark.json")
+
+            _run_benchmark_process(path_champions, path_traits, team_composition_size, repeat, path_output)
+
+            with open(path_output, "r") as file:
+                dict_measurement = _get_dict_measurement(json.load(file))
+
+            list_dict_measurement.append(dict_measurement)
+
+            print("{:>4} champions {:>4} traits: {:>12} team compositions, build {:.3f} sec, query {:.4f} sec, "
+                  "{} MB".format(dict_measurement["number_champions"],
+                                 dict_measurement["number_traits"],
+                                 dict_measurement["amount_team_compositions"],
+                                 dict_measurement["time_build"],
+                                 dict_measurement["time_query_median"] or 0,
+                                 (dict_measurement["memory_max_rss"] or 0) // (1 << 20)))
+
+    # Measurement -> (a, b) of the fit
+    dict_key_measurement_value_fit = {}  # type: Dict[str, dict]
+
+    for measurement in TUPLE_MEASUREMENT:
+        tuple_fit = get_tuple_fit_exponential(
+            [(dict_measurement["number_champions"], dict_measurement[measurement]) for dict_measurement in
+             list_dict_measurement])
+
+        if tuple_fit is not None:
+            dict_key_measurement_value_fit[measurement] = {"a": tuple_fit[0], "growth_per_champion": tuple_fit[1]}
+
+    list_dict_prediction = [
+        dict({"number_champions": number_champions},
+             **{measurement: dict_fit["a"] * dict_fit["growth_per_champion"] ** number_champions for
+                measurement, dict_fit in dict_key_measurement_value_fit.items()})
+        for number_champions in (list_number_champions_predict or [])]
+
+    return {"team_composition_size": team_composition_size,
+            "dataset": {key: value if not isinstance(value, dict) else {str(k): v for k, v in value.items()} for
+                        key, value in dict_kwargs_dataset.items()},
+            "measurements": list_dict_measurement,
+            "fits": dict_key_measurement_value_fit,
+            "predictions": list_dict_prediction}
+
+
+def main(list_argument: List[str] = None):
+    parser = argparse.ArgumentParser(description="Scaling of the build and query pipeline on synthetic sets")
+    parser.add_argument("--sizes", default="30,40,51,60", help="comma separated amount of champions of every set")
+    parser.add_argument("--team-composition-size", type=int, default=4, help="team composition size of the db")
+    parser.add_argument("--repeat", type=int, default=1, help="amount of runs of every benchmark")
+    parser.add_argument("--predict", default="", help="comma separated amount of champions to extrapolate to")
+    parser.add_argument("--output", default=None, help="path of the json results")
+    add_argument_dataset(parser)
+
+    namespace = parser.parse_args(list_argument)
+
+    dict_scaling = run_scaling_harness([int(size) for size in namespace.sizes.split(",")],
+                                       namespace.team_composition_size,
+                                       namespace.repeat,
+                                       get_dict_kwargs_dataset(namespace),
+                                       [int(size) for size in namespace.predict.split(",") if size])
+
+    for measurement, dict_fit in dict_scaling["fits"].items():
+        print("{:<30} x{:.3f} per champion".format(measurement, dict_fit["growth_per_champion"]))
+
+    for dict_prediction in dict_scaling["predictions"]:
+        print("Predicted for {} champions: {}".format(
+            dict_prediction["number_champions"],
+            ", ".join("{} {:.4g}".format(key, value) for key, value in dict_prediction.items() if
+                      key != "number_champions")))
+
+    if namespace.output is not None:
+        with open(namespace.output, "w") as file:
+            json.dump(dict_scaling, file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
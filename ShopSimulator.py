@@ -0,0 +1,398 @@
+"""
+10/19/2026
+
+Purpose:
+    Monte Carlo simulation of the shop to estimate the rerolls and the gold needed to collect a team composition at a
+    player level so the team compositions of a query can be ranked by how reachable they are
+
+Important Note:
+    Every slot of a shop is a cost drawn from the odds of the level and then a champion drawn from the copies of that
+    cost left in the pool. A champion of the team composition is bought the first time it shows up (One copy, a one
+    star unit) and the trial ends when every champion has been bought. The first shop is free, every shop after it is a
+    reroll, the gold is the rerolls * SHOP_REROLL_COST plus the cost of the champions.
+
+    The champions of the same cost are the same to the shop so the rerolls only depend on the costs of the champions
+    of a team composition (Its cost signature, (1, 1, 2, 4) for 2 champions of cost 1, 1 of cost 2 and 1 of cost 4). A
+    whole query result is simulated as the set of its cost signatures, there are at most a few hundred of them no
+    matter how many team compositions there are, and every signature and level is only simulated once per
+    ShopSimulator.
+
+    The other players do not take champions out of the pool.
+
+    With numpy every trial of a cost signature is ran at once, a step buys one missing champion in every trial that
+    has not given up so there are only len(cost signature) steps of arrays of SHOP_TRIALS rows. Without numpy the
+    trials are ran one by one. Both draw the same distributions but not the same numbers, the results of a seed are
+    only the same with the same one of them.
+
+        python -m Teamfight_Tactics_Composition_Solver.ShopSimulator --level 8 Ahri Annie Syndra Zoe
+
+"""
+import argparse
+import math
+import random
+import statistics
+import threading
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy
+except ImportError:  # numpy only makes the trials faster
+    numpy = None
+
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import ChampionTraitIndex
+from Teamfight_Tactics_Composition_Solver.ChamptionPool import ChampionPool
+from Teamfight_Tactics_Composition_Solver.TraitPool import TraitPool
+from Teamfight_Tactics_Composition_Solver.constants import SHOP_SLOTS, SHOP_REROLL_COST, \
+    DICT_KEY_LEVEL_VALUE_TUPLE_SHOP_ODDS, TUPLE_SHOP_POOL_SIZE, SHOP_TRIALS, SHOP_REROLLS_MAX, PATH_CHAMPIONS, \
+    PATH_TRAITS
+
+# Percentile of the rerolls reported with the mean (A bad run)
+REROLLS_PERCENTILE = 0.9
+
+
+class ShopSimulationResult:
+    __slots__ = ["tuple_cost", "level", "trials", "rerolls_mean", "rerolls_stdev", "rerolls_percentile", "gold_mean",
+                 "probability_reached"]
+
+    def __init__(self, tuple_cost: Tuple[int, ...], level: int, list_rerolls: List[int], list_reached: List[bool]):
+        """
+        Result of the trials of a cost signature at a level
+
+        :param tuple_cost: cost signature (Ascending costs of the champions)
+        :param level: player level
+        :param list_rerolls: rerolls of every trial that collected the team composition
+        :param list_reached: if every trial collected the team composition before SHOP_REROLLS_MAX
+        """
+        self.tuple_cost = tuple_cost  # type: Tuple[int, ...]
+        self.level = level  # type: int
+        self.trials = len(list_reached)  # type: int
+
+        # Fraction of the trials that collected the team composition
+        self.probability_reached = sum(list_reached) / self.trials if self.trials else 0.0  # type: float
+
+        if list_rerolls:
+            list_rerolls = sorted(list_rerolls)
+
+            self.rerolls_mean = statistics.fmean(list_rerolls)  # type: float
+            self.rerolls_stdev = statistics.pstdev(list_rerolls)  # type: float
+            self.rerolls_percentile = list_rerolls[min(int(len(list_rerolls) * REROLLS_PERCENTILE),
+                                                       len(list_rerolls) - 1)]  # type: int
+            self.gold_mean = self.rerolls_mean * SHOP_REROLL_COST + sum(tuple_cost)  # type: float
+
+        # A cost that the level can not roll
+        else:
+            self.rerolls_mean = float("inf")
+            self.rerolls_stdev = float("inf")
+            self.rerolls_percentile = None
+            self.gold_mean = float("inf")
+
+    def get_dict(self) -> dict:
+        bool_reachable = self.rerolls_mean != float("inf")
+
+        return {"costs": list(self.tuple_cost),
+                "level": self.level,
+                "trials": self.trials,
+                "probability_reached": self.probability_reached,
+                "rerolls_mean": self.rerolls_mean if bool_reachable else None,
+                "rerolls_stdev": self.rerolls_stdev if bool_reachable else None,
+                "rerolls_percentile": self.rerolls_percentile,
+                "gold_mean": self.gold_mean if bool_reachable else None}
+
+    def __str__(self):
+        return "Costs {} at level {}: {:.1f} rerolls ({} at p{}), {:.1f} gold, {:.1%} reached".format(
+            self.tuple_cost, self.level, self.rerolls_mean, self.rerolls_percentile, int(REROLLS_PERCENTILE * 100),
+            self.gold_mean, self.probability_reached)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class ShopSimulator:
+
+    def __init__(self,
+                 champion_trait_index: ChampionTraitIndex,
+                 trials: int = SHOP_TRIALS,
+                 seed: int = None,
+                 dict_key_level_value_tuple_shop_odds: Dict[int, Tuple[int, ...]] = None,
+                 tuple_shop_pool_size: Tuple[int, ...] = TUPLE_SHOP_POOL_SIZE):
+        """
+        Shop simulator of the champions of a ChampionTraitIndex
+
+        :param champion_trait_index: ChampionTraitIndex the champion ids are based on
+        :param trials: trials of every cost signature
+        :param seed: seed of the random draws (None for a random seed)
+        :param dict_key_level_value_tuple_shop_odds: level -> percent odds of cost 1 to 5
+        :param tuple_shop_pool_size: copies of every champion of cost 1 to 5
+        """
+        self.champion_trait_index = champion_trait_index  # type: ChampionTraitIndex
+        self.trials = trials  # type: int
+        self.random = random.Random(seed)  # type: random.Random
+
+        # Random draws of the trials with numpy
+        self.generator = numpy.random.default_rng(seed) if numpy is not None else None  # type: numpy.random.Generator
+
+        if dict_key_level_value_tuple_shop_odds is None:
+            dict_key_level_value_tuple_shop_odds = DICT_KEY_LEVEL_VALUE_TUPLE_SHOP_ODDS
+
+        self.dict_key_level_value_tuple_shop_odds = dict_key_level_value_tuple_shop_odds
+        self.tuple_shop_pool_size = tuple_shop_pool_size  # type: Tuple[int, ...]
+
+        # Cost index (cost - 1) -> amount of champions of that cost
+        counter_cost = Counter(champion_trait_index.array_champion_id_cost)
+
+        self.tuple_cost_index_champions = tuple(
+            counter_cost[cost_index + 1] for cost_index in range(len(tuple_shop_pool_size)))  # type: Tuple[int, ...]
+
+        # (Cost signature, level) -> ShopSimulationResult
+        self.dict_key_tuple_cost_level_value_shop_simulation_result = {}  # type: Dict[tuple, ShopSimulationResult]
+
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        """
+        State of this object without the lock, a lock can not be pickled (The TeamCompositionSolver that has this
+        object is pickled for a ProcessPoolExecutor)
+
+        :return: dict of the state
+        """
+        dict_state = self.__dict__.copy()
+        del dict_state["lock"]
+        return dict_state
+
+    def __setstate__(self, dict_state):
+        """
+        Restore the state of this object from __getstate__ with a new lock
+
+        :param dict_state: dict of the state
+        :return: None
+        """
+        self.__dict__.update(dict_state)
+        self.lock = threading.Lock()
+
+    def get_tuple_cost(self, iter_champion_ids: Iterable[int]) -> Tuple[int, ...]:
+        """
+        Get the cost signature of a team composition
+
+        :param iter_champion_ids: champion ids of the team composition
+        :return: ascending costs of the champions
+        """
+        array_champion_id_cost = self.champion_trait_index.array_champion_id_cost
+
+        return tuple(sorted(array_champion_id_cost[champion_id] for champion_id in iter_champion_ids))
+
+    def _run_trials(self, tuple_cost: Tuple[int, ...], level: int) -> ShopSimulationResult:
+        """
+        Run the trials of a cost signature
+
+        :param tuple_cost: cost signature
+        :param level: player level
+        :return: ShopSimulationResult object
+        """
+        tuple_shop_odds = self.dict_key_level_value_tuple_shop_odds[level]
+        tuple_shop_pool_size = self.tuple_shop_pool_size
+
+        # A cost that can not show up in the shop at this level is never collected
+        if any(not tuple_shop_odds[cost - 1] for cost in tuple_cost):
+            return ShopSimulationResult(tuple_cost, level, [], [False] * self.trials)
+
+        tuple_cost_index = tuple(range(len(tuple_shop_pool_size)))
+
+        # Cost index -> odds of a slot being that cost
+        odds_total = sum(tuple_shop_odds)
+
+        tuple_cost_index_odds = tuple(odds / odds_total for odds in tuple_shop_odds)
+
+        # Cost index -> champions of the team composition of that cost
+        counter_cost_index = Counter(cost - 1 for cost in tuple_cost)
+
+        # Cost index -> copies of that cost in the pool
+        tuple_cost_index_copies = tuple(champions * pool_size for champions, pool_size in
+                                        zip(self.tuple_cost_index_champions, tuple_shop_pool_size))
+
+        # Slots before a trial gives up
+        slots_max = (SHOP_REROLLS_MAX + 1) * SHOP_SLOTS
+
+        if numpy is not None:
+            return self._run_trials_numpy(tuple_cost, level, tuple_cost_index_odds, counter_cost_index,
+                                          tuple_cost_index_copies, slots_max)
+
+        random_random = self.random.random
+
+        list_rerolls = []
+        list_reached = []
+
+        for _ in range(self.trials):
+            list_missing = [counter_cost_index[cost_index] for cost_index in tuple_cost_index]
+            list_copies = list(tuple_cost_index_copies)
+
+            amount_missing = len(tuple_cost)
+
+            # Slots seen until the last missing champion was bought
+            slots = 0
+
+            while amount_missing:
+                """
+                The slots are independent and only a bought champion changes the pool, so the slots until the next
+                missing champion are a geometric draw of the chance of a slot being a missing champion instead of a
+                draw for every slot
+                """
+                list_probability_hit = [
+                    tuple_cost_index_odds[cost_index] * list_missing[cost_index] * tuple_shop_pool_size[cost_index] /
+                    list_copies[cost_index] if list_missing[cost_index] else 0.0 for cost_index in tuple_cost_index]
+
+                probability_hit = sum(list_probability_hit)
+
+                if probability_hit >= 1.0:
+                    slots += 1
+                else:
+                    slots += int(math.log(1.0 - random_random()) / math.log(1.0 - probability_hit)) + 1
+
+                if slots > slots_max:
+                    break
+
+                # Cost of the missing champion that showed up
+                cost_index = bisect_right(list(accumulate(list_probability_hit)), random_random() * probability_hit)
+                cost_index = min(cost_index, len(tuple_cost_index) - 1)
+
+                list_missing[cost_index] -= 1
+                list_copies[cost_index] -= 1
+                amount_missing -= 1
+
+            list_reached.append(not amount_missing)
+
+            # The first shop is free
+            if not amount_missing:
+                list_rerolls.append((slots - 1) // SHOP_SLOTS)
+
+        return ShopSimulationResult(tuple_cost, level, list_rerolls, list_reached)
+
+    def _run_trials_numpy(self,
+                          tuple_cost: Tuple[int, ...],
+                          level: int,
+                          tuple_cost_index_odds: Tuple[float, ...],
+                          counter_cost_index: Counter,
+                          tuple_cost_index_copies: Tuple[int, ...],
+                          slots_max: int) -> ShopSimulationResult:
+        """
+        Run every trial of a cost signature at once with numpy, a row is a trial and a column is a cost index
+
+        :param tuple_cost: cost signature
+        :param level: player level
+        :param tuple_cost_index_odds: cost index -> odds of a slot being that cost
+        :param counter_cost_index: cost index -> champions of the team composition of that cost
+        :param tuple_cost_index_copies: cost index -> copies of that cost in the pool
+        :param slots_max: slots before a trial gives up
+        :return: ShopSimulationResult object
+        """
+        trials = self.trials
+        generator = self.generator
+
+        amount_cost_index = len(self.tuple_shop_pool_size)
+
+        ndarray_odds_pool_size = (numpy.array(tuple_cost_index_odds, dtype=numpy.float64) *
+                                  numpy.array(self.tuple_shop_pool_size, dtype=numpy.float64))
+
+        ndarray_missing = numpy.tile(numpy.array(
+            [counter_cost_index[cost_index] for cost_index in range(amount_cost_index)], dtype=numpy.float64),
+            (trials, 1))
+
+        # A cost without champions has no copies, 1 keeps the division defined (Nothing is missing of that cost)
+        ndarray_copies = numpy.tile(numpy.maximum(numpy.array(tuple_cost_index_copies, dtype=numpy.float64), 1.0),
+                                    (trials, 1))
+
+        ndarray_slots = numpy.zeros(trials, dtype=numpy.int64)
+
+        # Trials that have not given up
+        ndarray_active = numpy.ones(trials, dtype=bool)
+
+        ndarray_row = numpy.arange(trials)
+
+        # Every step buys one missing champion of every trial that has not given up
+        for _ in range(len(tuple_cost)):
+            ndarray_probability_hit = ndarray_odds_pool_size * ndarray_missing / ndarray_copies
+
+            ndarray_probability_hit_total = ndarray_probability_hit.sum(axis=1)
+
+            # Slots until the next missing champion (Same geometric draw as _run_trials)
+            ndarray_slots += numpy.where(ndarray_active,
+                                         generator.geometric(numpy.minimum(ndarray_probability_hit_total, 1.0)), 0)
+
+            ndarray_active &= ndarray_slots <= slots_max
+
+            # Cost of the missing champion that showed up (bisect_right of the cumulative chances of every row)
+            ndarray_cost_index = numpy.minimum(
+                (numpy.cumsum(ndarray_probability_hit, axis=1) <=
+                 (generator.random(trials) * ndarray_probability_hit_total)[:, None]).sum(axis=1),
+                amount_cost_index - 1)
+
+            ndarray_missing[ndarray_row[ndarray_active], ndarray_cost_index[ndarray_active]] -= 1
+            ndarray_copies[ndarray_row[ndarray_active], ndarray_cost_index[ndarray_active]] -= 1
+
+        # The first shop is free
+        list_rerolls = ((ndarray_slots[ndarray_active] - 1) // SHOP_SLOTS).tolist()
+
+        return ShopSimulationResult(tuple_cost, level, list_rerolls, ndarray_active.tolist())
+
+    def get_shop_simulation_result(self, tuple_cost: Tuple[int, ...], level: int) -> ShopSimulationResult:
+        """
+        Get the result of a cost signature at a level (Simulated the first time)
+
+        :param tuple_cost: cost signature
+        :param level: player level
+        :return: ShopSimulationResult object
+        """
+        if level not in self.dict_key_level_value_tuple_shop_odds:
+            raise ValueError("There are no shop odds for level {}".format(level))
+
+        key = (tuple_cost, level)
+
+        shop_simulation_result = self.dict_key_tuple_cost_level_value_shop_simulation_result.get(key)
+
+        if shop_simulation_result is None:
+            shop_simulation_result = self._run_trials(tuple_cost, level)
+
+            with self.lock:
+                self.dict_key_tuple_cost_level_value_shop_simulation_result[key] = shop_simulation_result
+
+        return shop_simulation_result
+
+    def get_list_shop_simulation_result(self,
+                                        iter_tuple_champion_ids: Iterable[Tuple[int, ...]],
+                                        level: int) -> List[ShopSimulationResult]:
+        """
+        Get the result of every team composition at a level (Every cost signature is simulated once)
+
+        :param iter_tuple_champion_ids: team compositions as tuples of champion ids
+        :param level: player level
+        :return: list of ShopSimulationResult objects in the order of the team compositions
+        """
+        return [self.get_shop_simulation_result(self.get_tuple_cost(tuple_champion_ids), level) for
+                tuple_champion_ids in iter_tuple_champion_ids]
+
+
+def main(list_argument: List[str] = None):
+    parser = argparse.ArgumentParser(description="Estimate the rerolls and gold to collect a team composition")
+    parser.add_argument("champions", nargs="+", help="champion names of the team composition")
+    parser.add_argument("--level", type=int, default=8, help="player level")
+    parser.add_argument("--trials", type=int, default=SHOP_TRIALS, help="trials of the team composition")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random draws")
+    parser.add_argument("--champions-json", default=PATH_CHAMPIONS, help="path to champions.json")
+    parser.add_argument("--traits-json", default=PATH_TRAITS, help="path to traits.json")
+
+    namespace = parser.parse_args(list_argument)
+
+    champion_trait_index = ChampionTraitIndex(ChampionPool(namespace.champions_json),
+                                              TraitPool(namespace.traits_json))
+
+    shop_simulator = ShopSimulator(champion_trait_index, namespace.trials, namespace.seed)
+
+    print(shop_simulator.get_shop_simulation_result(
+        shop_simulator.get_tuple_cost(champion_trait_index.get_tuple_champion_id(namespace.champions)),
+        namespace.level))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+10/19/2026
+
+Purpose:
+    Time of every phase of the startup of the application (Solver, Tk, frames, icons, first query)
+
+Important Note:
+    Phases can overlap (The icons are loaded while the first query runs) so every phase records its own start and end
+    relative to the start of the report instead of being chained one after the other.
+
+"""
+import time
+from typing import Dict, List, Tuple
+
+
+class StartupReport:
+
+    def __init__(self):
+        """
+        Report of the time taken by every phase of the startup
+        """
+        # Start of the startup
+        self.time_start = time.perf_counter()  # type: float
+
+        # Phase name -> start time of the phases that have not ended
+        self.dict_key_phase_name_value_time_start = {}  # type: Dict[str, float]
+
+        # (Phase name, start time, end time) of the phases that have ended in the order they ended
+        self.list_tuple_phase = []  # type: List[Tuple[str, float, float]]
+
+    def start_phase(self, phase_name: str):
+        """
+        Start timing a phase
+        :param phase_name: name of the phase
+        :return: None
+        """
+        self.dict_key_phase_name_value_time_start[phase_name] = time.perf_counter()
+
+    def end_phase(self, phase_name: str):
+        """
+        Stop timing a phase (Does nothing if the phase was not started or has already ended)
+        :param phase_name: name of the phase
+        :return: None
+        """
+        time_start = self.dict_key_phase_name_value_time_start.pop(phase_name, None)
+
+        if time_start is not None:
+            self.list_tuple_phase.append((phase_name, time_start, time.perf_counter()))
+
+    def is_phase_pending(self, phase_name: str) -> bool:
+        """
+        Check if a phase has been started and has not ended
+        :param phase_name: name of the phase
+        :return: bool
+        """
+        return phase_name in self.dict_key_phase_name_value_time_start
+
+    def __str__(self):
+        list_string = ["{:<40}{:>12}{:>12}{:>12}".format("Startup phase", "Start (s)", "End (s)", "Time (s)")]
+
+        for phase_name, time_start, time_end in self.list_tuple_phase:
+            list_string.append("{:<40}{:>12.4f}{:>12.4f}{:>12.4f}".format(phase_name,
+                                                                          time_start - self.time_start,
+                                                                          time_end - self.time_start,
+                                                                          time_end - time_start))
+
+        for phase_name in self.dict_key_phase_name_value_time_start:
+            list_string.append("{:<40}{:>12}".format(phase_name, "Not done"))
+
+        return "\n".join(list_string)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,260 @@
+"""
+10/19/2026
+
+Purpose:
+    Counts of the team compositions of the db by (team composition size, trait count discrete total), by
+    (champion, team composition size) and by (trait, trait count discrete, team composition size) so that count and
+    histogram questions are answered without a query of the team compositions
+
+Important Note:
+    The counts are made by the builds from the team compositions of the db after every other change to the db (See
+    SQLiteHandlerTeamCompositionSolver.write_summary_statistics) and are stored in the summary tables of the db.
+
+    Only the trait count discrete of the traits that are active are counted (A trait count discrete of 0 is the count
+    by team composition size minus the counts of the trait).
+
+    A question is a sum over the few hundred keys of a dict, no row of the team composition table is read.
+
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerFactory import TeamCompositionContainerFactory
+from Teamfight_Tactics_Composition_Solver.constants import (TEAM_COMPOSITION_SIZE_MAX, TEAM_COMPOSITION_SIZE_MIN,
+                                                            TRAIT_COUNT_DISCRETE_TOTAL_MIN, TRAIT_COUNT_TOTAL_MAX,
+                                                            TEAM_COMPOSITION_BATCH_SIZE)
+
+
+class SummaryStatistics:
+    __slots__ = ['dict_key_tuple_size_trait_count_discrete_total_value_count',
+                 'dict_key_tuple_champion_name_size_value_count',
+                 'dict_key_tuple_trait_name_trait_count_discrete_size_value_count'
+                 ]
+
+    def __init__(self,
+                 dict_key_tuple_size_trait_count_discrete_total_value_count: Dict[Tuple[int, int], int] = None,
+                 dict_key_tuple_champion_name_size_value_count: Dict[Tuple[str, int], int] = None,
+                 dict_key_tuple_trait_name_trait_count_discrete_size_value_count: Dict[Tuple[str, int, int], int] = None
+                 ):
+        """
+        Counts of the team compositions (Empty to count them with add_team_composition_container_batch)
+
+        :param dict_key_tuple_size_trait_count_discrete_total_value_count: (team composition size, trait count discrete
+            total) -> team compositions
+        :param dict_key_tuple_champion_name_size_value_count: (champion name, team composition size) -> team
+            compositions
+        :param dict_key_tuple_trait_name_trait_count_discrete_size_value_count: (trait name, trait count discrete, team
+            composition size) -> team compositions
+        """
+        self.dict_key_tuple_size_trait_count_discrete_total_value_count = Counter(
+            dict_key_tuple_size_trait_count_discrete_total_value_count or {})  # type: Dict[Tuple[int, int], int]
+
+        self.dict_key_tuple_champion_name_size_value_count = Counter(
+            dict_key_tuple_champion_name_size_value_count or {})  # type: Dict[Tuple[str, int], int]
+
+        self.dict_key_tuple_trait_name_trait_count_discrete_size_value_count = Counter(
+            dict_key_tuple_trait_name_trait_count_discrete_size_value_count or
+            {})  # type: Dict[Tuple[str, int, int], int]
+
+    def add_team_composition_container_batch(self,
+                                             team_composition_container_factory: TeamCompositionContainerFactory,
+                                             list_tuple_champion_ids: List[Tuple[int, ...]],
+                                             bytes_trait_count_discrete_total: bytes):
+        """
+        Count a batch of team compositions
+
+        :param team_composition_container_factory: TeamCompositionContainerFactory the champion ids are based on
+        :param list_tuple_champion_ids: team compositions as tuples of champion ids
+        :param bytes_trait_count_discrete_total: trait count discrete total of every team composition
+        :return: None
+        """
+        champion_trait_index = team_composition_container_factory.champion_trait_index
+
+        bytes_team_composition_size = bytes(map(len, list_tuple_champion_ids))
+
+        self.dict_key_tuple_size_trait_count_discrete_total_value_count.update(
+            zip(bytes_team_composition_size, bytes_trait_count_discrete_total))
+
+        # Counted by champion id first, the names are only looked up once per key
+        counter_tuple_champion_id_size = Counter(
+            (champion_id, len(tuple_champion_ids)) for tuple_champion_ids in list_tuple_champion_ids for champion_id in
+            tuple_champion_ids)
+
+        for (champion_id, team_composition_size), count in counter_tuple_champion_id_size.items():
+            self.dict_key_tuple_champion_name_size_value_count[
+                (champion_trait_index.tuple_champion_id_name[champion_id], team_composition_size)] += count
+
+        team_composition_container_batch = team_composition_container_factory.get_team_composition_container_batch(
+            list_tuple_champion_ids)
+
+        for trait_id, bytes_trait_count_discrete in enumerate(
+                team_composition_container_batch.tuple_trait_id_bytes_trait_count_discrete):
+
+            # Columns of a trait that is not active in any team composition of the batch are skipped
+            if bytes_trait_count_discrete.count(0) == len(bytes_trait_count_discrete):
+                continue
+
+            trait_name = champion_trait_index.tuple_trait_id_name[trait_id]
+
+            for (trait_count_discrete, team_composition_size), count in Counter(
+                    zip(bytes_trait_count_discrete, bytes_team_composition_size)).items():
+
+                if trait_count_discrete:
+                    self.dict_key_tuple_trait_name_trait_count_discrete_size_value_count[
+                        (trait_name, trait_count_discrete, team_composition_size)] += count
+
+    def get_count(self,
+                  team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                  team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX,
+                  trait_count_discrete_total_min: int = TRAIT_COUNT_DISCRETE_TOTAL_MIN,
+                  trait_count_discrete_total_max: int = TRAIT_COUNT_TOTAL_MAX) -> int:
+        """
+        Get the amount of team compositions with a size and a trait count discrete total in the bounds (The rows
+        get_pickled_list_tuple_champion_composition can return)
+
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :param trait_count_discrete_total_min:
+        :param trait_count_discrete_total_max:
+        :return: int
+        """
+        return sum(count for (team_composition_size, trait_count_discrete_total), count in
+                   self.dict_key_tuple_size_trait_count_discrete_total_value_count.items() if
+                   team_composition_size_min <= team_composition_size <= team_composition_size_max and
+                   trait_count_discrete_total_min <= trait_count_discrete_total <= trait_count_discrete_total_max)
+
+    def get_count_champion(self,
+                           champion_name: str,
+                           team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                           team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX) -> int:
+        """
+        Get the amount of team compositions with the champion and a size in the bounds
+
+        :param champion_name: champion name
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :return: int
+        """
+        return sum(self.dict_key_tuple_champion_name_size_value_count.get((champion_name, team_composition_size), 0)
+                   for team_composition_size in range(team_composition_size_min, team_composition_size_max + 1))
+
+    def get_count_trait(self,
+                        trait_name: str,
+                        trait_count_discrete_min: int = 1,
+                        team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                        team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX) -> int:
+        """
+        Get the amount of team compositions with the trait at trait_count_discrete_min or more and a size in the bounds
+
+        :param trait_name: trait name
+        :param trait_count_discrete_min: min trait count discrete of the trait (1 for the trait being active)
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :return: int
+        """
+        return sum(count for trait_count_discrete, count in self.get_dict_histogram_trait_count_discrete(
+            trait_name, team_composition_size_min, team_composition_size_max).items() if
+                   trait_count_discrete >= trait_count_discrete_min)
+
+    def get_dict_histogram_trait_count_discrete_total(self,
+                                                      team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                                                      team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX
+                                                      ) -> Dict[int, int]:
+        """
+        Get the amount of team compositions of every trait count discrete total of the team compositions with a size
+        in the bounds
+
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :return: dict of trait count discrete total -> team compositions (Ascending)
+        """
+        dict_key_trait_count_discrete_total_value_count = Counter()
+
+        for (team_composition_size, trait_count_discrete_total), count in \
+                self.dict_key_tuple_size_trait_count_discrete_total_value_count.items():
+            if team_composition_size_min <= team_composition_size <= team_composition_size_max:
+                dict_key_trait_count_discrete_total_value_count[trait_count_discrete_total] += count
+
+        return dict(sorted(dict_key_trait_count_discrete_total_value_count.items()))
+
+    def get_dict_histogram_team_composition_size(self,
+                                                 trait_count_discrete_total_min: int = TRAIT_COUNT_DISCRETE_TOTAL_MIN,
+                                                 trait_count_discrete_total_max: int = TRAIT_COUNT_TOTAL_MAX
+                                                 ) -> Dict[int, int]:
+        """
+        Get the amount of team compositions of every team composition size of the team compositions with a trait count
+        discrete total in the bounds
+
+        :param trait_count_discrete_total_min:
+        :param trait_count_discrete_total_max:
+        :return: dict of team composition size -> team compositions (Ascending)
+        """
+        dict_key_team_composition_size_value_count = Counter()
+
+        for (team_composition_size, trait_count_discrete_total), count in \
+                self.dict_key_tuple_size_trait_count_discrete_total_value_count.items():
+            if trait_count_discrete_total_min <= trait_count_discrete_total <= trait_count_discrete_total_max:
+                dict_key_team_composition_size_value_count[team_composition_size] += count
+
+        return dict(sorted(dict_key_team_composition_size_value_count.items()))
+
+    def get_dict_histogram_trait_count_discrete(self,
+                                                trait_name: str,
+                                                team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                                                team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX
+                                                ) -> Dict[int, int]:
+        """
+        Get the amount of team compositions of every trait count discrete of a trait of the team compositions with a
+        size in the bounds
+
+        :param trait_name: trait name
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :return: dict of trait count discrete -> team compositions (Ascending, the trait count discrete 0 is left out)
+        """
+        dict_key_trait_count_discrete_value_count = Counter()
+
+        for (trait_name_key, trait_count_discrete, team_composition_size), count in \
+                self.dict_key_tuple_trait_name_trait_count_discrete_size_value_count.items():
+            if (trait_name_key == trait_name and
+                    team_composition_size_min <= team_composition_size <= team_composition_size_max):
+                dict_key_trait_count_discrete_value_count[trait_count_discrete] += count
+
+        return dict(sorted(dict_key_trait_count_discrete_value_count.items()))
+
+
+def get_summary_statistics_from_iter(team_composition_container_factory: TeamCompositionContainerFactory,
+                                     iter_tuple_champion_ids_trait_count_discrete_total: Iterable[
+                                         Tuple[Tuple[int, ...], int]],
+                                     batch_size: int = TEAM_COMPOSITION_BATCH_SIZE) -> SummaryStatistics:
+    """
+    Count the team compositions a batch at a time
+
+    :param team_composition_container_factory: TeamCompositionContainerFactory the champion ids are based on
+    :param iter_tuple_champion_ids_trait_count_discrete_total: iterable of (tuple of champion ids, trait count discrete
+        total) (See SQLiteHandlerTeamCompositionSolver.get_iter_tuple_champion_ids_trait_count_discrete_total)
+    :param batch_size: team compositions counted at a time
+    :return: SummaryStatistics object
+    """
+    summary_statistics = SummaryStatistics()
+
+    list_tuple_champion_ids = []
+    bytearray_trait_count_discrete_total = bytearray()
+
+    for tuple_champion_ids, trait_count_discrete_total in iter_tuple_champion_ids_trait_count_discrete_total:
+        list_tuple_champion_ids.append(tuple_champion_ids)
+        bytearray_trait_count_discrete_total.append(trait_count_discrete_total)
+
+        if len(list_tuple_champion_ids) == batch_size:
+            summary_statistics.add_team_composition_container_batch(team_composition_container_factory,
+                                                                    list_tuple_champion_ids,
+                                                                    bytes(bytearray_trait_count_discrete_total))
+            list_tuple_champion_ids = []
+            bytearray_trait_count_discrete_total = bytearray()
+
+    if list_tuple_champion_ids:
+        summary_statistics.add_team_composition_container_batch(team_composition_container_factory,
+                                                                list_tuple_champion_ids,
+                                                                bytes(bytearray_trait_count_discrete_total))
+
+    return summary_statistics
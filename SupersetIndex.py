@@ -0,0 +1,248 @@
+"""
+10/19/2026
+
+Purpose:
+    In memory index of the team composition bitmasks of the db to find the team compositions that contain a board
+    (The champions a player already has) and have k more champions, grouped by the champions to add
+
+Important Note:
+    The GUI query is an INTERSECT of the champion tables of the selected champions which reads every row of every
+    selected champion and is then filtered by size. Here the answer of a board and k is found by one of three exact
+    plans, the one that touches the fewest rows is picked from the sizes that are known before the query runs:
+
+        PLAN_ENUMERATE  Look up board | added for every k champions that could be added (C(champions left, k))
+        PLAN_POSTING    Check the rows of the board champion that is in the fewest team compositions
+        PLAN_SIZE       Check the rows of the team compositions with size len(board) + k
+
+    so a board of 6 and k = 2 is about a thousand dict lookups however big the db is.
+
+    The index holds one int (bitmask) and one byte (trait count discrete total) per team composition plus a row
+    array per champion and per size, it is made once from the db and never changed (Make a new one after a build).
+
+"""
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import combinations
+from math import comb
+from typing import Dict, Iterable, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import ChampionTraitIndex
+from Teamfight_Tactics_Composition_Solver.Instrumentation import span
+
+PLAN_ENUMERATE = "enumerate"
+PLAN_POSTING = "posting"
+PLAN_SIZE = "size"
+
+# Answers of the newest queries kept so the pages of a query do not run it again
+UPGRADE_PATH_CACHE_SIZE = 16
+
+
+class SupersetIndex:
+
+    def __init__(self,
+                 champion_trait_index: ChampionTraitIndex,
+                 iter_tuple_champion_ids_trait_count_discrete_total: Iterable[Tuple[Tuple[int, ...], int]]):
+        """
+        Index of the team compositions given as (champion ids, trait count discrete total)
+
+        :param champion_trait_index: ChampionTraitIndex the champion ids are based on
+        :param iter_tuple_champion_ids_trait_count_discrete_total: rows of the team composition table
+        """
+        self.champion_trait_index = champion_trait_index  # type: ChampionTraitIndex
+
+        # row -> bitmask of the team composition
+        self.list_bitmask = []  # type: List[int]
+
+        # row -> trait count discrete total
+        self.array_trait_count_discrete_total = array('B')  # type: array
+
+        # bitmask -> row
+        self.dict_key_bitmask_value_row = {}  # type: Dict[int, int]
+
+        # champion id -> rows of the team compositions with that champion (Ascending)
+        self.tuple_champion_id_array_row = tuple(
+            array('I') for _ in range(champion_trait_index.number_champions))  # type: Tuple[array, ...]
+
+        # team composition size -> rows of the team compositions of that size (Ascending)
+        self.dict_key_size_value_array_row = {}  # type: Dict[int, array]
+
+        for tuple_champion_ids, trait_count_discrete_total in iter_tuple_champion_ids_trait_count_discrete_total:
+            row = len(self.list_bitmask)
+
+            bitmask = 0
+
+            for champion_id in tuple_champion_ids:
+                bitmask |= 1 << champion_id
+                self.tuple_champion_id_array_row[champion_id].append(row)
+
+            self.list_bitmask.append(bitmask)
+            self.array_trait_count_discrete_total.append(trait_count_discrete_total)
+            self.dict_key_bitmask_value_row[bitmask] = row
+
+            size = len(tuple_champion_ids)
+
+            array_row_size = self.dict_key_size_value_array_row.get(size)
+
+            if array_row_size is None:
+                array_row_size = self.dict_key_size_value_array_row[size] = array('I')
+
+            array_row_size.append(row)
+
+        # (board bitmask, exclude bitmask, k) -> sorted rows of the answer (Newest last)
+        self.ordered_dict_key_query_value_list_row = OrderedDict()  # type: OrderedDict
+
+        # Queries are ran by the server threads
+        self.lock_cache = threading.Lock()
+
+    def __len__(self):
+        return len(self.list_bitmask)
+
+    def get_dict_key_plan_value_cost(self, bitmask_board: int, bitmask_exclude: int, amount_add: int) -> Dict[str, int]:
+        """
+        Get the rows (or lookups) every plan would touch
+
+        :param bitmask_board: bitmask of the board
+        :param bitmask_exclude: bitmask of the champions that can not be added
+        :param amount_add: champions to add
+        :return: dict of plan -> cost
+        """
+        tuple_champion_id_board = self.champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask_board)
+
+        amount_champions_left = self.champion_trait_index.number_champions - bin(
+            bitmask_board | bitmask_exclude).count("1")
+
+        dict_key_plan_value_cost = {
+            PLAN_ENUMERATE: comb(amount_champions_left, amount_add) if amount_champions_left >= 0 else 0,
+            PLAN_SIZE: len(self.dict_key_size_value_array_row.get(len(tuple_champion_id_board) + amount_add, ()))}
+
+        if tuple_champion_id_board:
+            dict_key_plan_value_cost[PLAN_POSTING] = min(
+                len(self.tuple_champion_id_array_row[champion_id]) for champion_id in tuple_champion_id_board)
+
+        return dict_key_plan_value_cost
+
+    def get_list_row(self, bitmask_board: int, amount_add: int, bitmask_exclude: int = 0) -> List[int]:
+        """
+        Get the rows of the team compositions that contain the board, have amount_add more champions and do not have
+        an excluded champion, best trait count discrete total first (Then the lowest bitmask)
+
+        :param bitmask_board: bitmask of the board
+        :param amount_add: champions to add
+        :param bitmask_exclude: bitmask of the champions that can not be added
+        :return: list of rows
+        """
+        key_query = (bitmask_board, bitmask_exclude, amount_add)
+
+        with self.lock_cache:
+            list_row = self.ordered_dict_key_query_value_list_row.get(key_query)
+
+            if list_row is not None:
+                self.ordered_dict_key_query_value_list_row.move_to_end(key_query)
+                return list_row
+
+        dict_key_plan_value_cost = self.get_dict_key_plan_value_cost(bitmask_board, bitmask_exclude, amount_add)
+
+        plan = min(dict_key_plan_value_cost, key=dict_key_plan_value_cost.get)
+
+        size = bin(bitmask_board).count("1") + amount_add
+
+        with span("superset_index.get_list_row", plan=plan, cost=dict_key_plan_value_cost[plan]) as span_query:
+            if plan == PLAN_ENUMERATE:
+                dict_key_bitmask_value_row = self.dict_key_bitmask_value_row
+
+                tuple_champion_id_left = tuple(
+                    champion_id for champion_id in range(self.champion_trait_index.number_champions) if
+                    not (bitmask_board | bitmask_exclude) >> champion_id & 1)
+
+                list_row = []
+
+                for tuple_champion_id_add in combinations(tuple_champion_id_left, amount_add):
+                    bitmask = bitmask_board
+
+                    for champion_id in tuple_champion_id_add:
+                        bitmask |= 1 << champion_id
+
+                    row = dict_key_bitmask_value_row.get(bitmask)
+
+                    if row is not None:
+                        list_row.append(row)
+
+            else:
+                if plan == PLAN_POSTING:
+                    array_row = min((self.tuple_champion_id_array_row[champion_id] for champion_id in
+                                     self.champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask_board)),
+                                    key=len)
+                else:
+                    array_row = self.dict_key_size_value_array_row.get(size, ())
+
+                list_bitmask = self.list_bitmask
+
+                list_row = [row for row in array_row if
+                            list_bitmask[row] & bitmask_board == bitmask_board and
+                            not list_bitmask[row] & bitmask_exclude and
+                            bin(list_bitmask[row]).count("1") == size]
+
+            span_query.set_argument("rows", len(list_row))
+
+        array_trait_count_discrete_total = self.array_trait_count_discrete_total
+        list_bitmask = self.list_bitmask
+
+        list_row.sort(key=lambda row: (-array_trait_count_discrete_total[row], list_bitmask[row]))
+
+        with self.lock_cache:
+            self.ordered_dict_key_query_value_list_row[key_query] = list_row
+
+            while len(self.ordered_dict_key_query_value_list_row) > UPGRADE_PATH_CACHE_SIZE:
+                self.ordered_dict_key_query_value_list_row.popitem(last=False)
+
+        return list_row
+
+    def get_dict_upgrade_path(self,
+                              iter_champion_names_board: Iterable[str],
+                              amount_add: int,
+                              page: int = 0,
+                              page_size: int = None,
+                              iter_champion_names_exclude: Iterable[str] = ()) -> dict:
+        """
+        Get a page of the team compositions reachable from a board by adding amount_add champions, grouped by the
+        champions to add
+
+        :param iter_champion_names_board: champion names of the board
+        :param amount_add: champions to add
+        :param page: page of the answer (From 0)
+        :param page_size: groups per page (None for every group)
+        :param iter_champion_names_exclude: champion names that can not be added
+        :return: json serializable dict of the page
+        """
+        champion_trait_index = self.champion_trait_index
+
+        bitmask_board = champion_trait_index.get_bitmask_champion(iter_champion_names_board)
+        bitmask_exclude = champion_trait_index.get_bitmask_champion(iter_champion_names_exclude) & ~bitmask_board
+
+        list_row = self.get_list_row(bitmask_board, amount_add, bitmask_exclude)
+
+        if page_size is None:
+            list_row_page = list_row
+        else:
+            list_row_page = list_row[page * page_size: (page + 1) * page_size]
+
+        list_dict_group = []
+
+        for row in list_row_page:
+            bitmask = self.list_bitmask[row]
+
+            list_dict_group.append({
+                "add": list(champion_trait_index.get_tuple_champion_name(
+                    champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask & ~bitmask_board))),
+                "team_composition": list(champion_trait_index.get_tuple_champion_name(
+                    champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask))),
+                "trait_count_discrete_total": self.array_trait_count_discrete_total[row]})
+
+        return {"board": list(champion_trait_index.get_tuple_champion_name(
+            champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask_board))),
+            "amount_add": amount_add,
+            "count": len(list_row),
+            "page": page,
+            "page_size": page_size,
+            "groups": list_dict_group}
@@ -0,0 +1,221 @@
+"""
+10/19/2026
+
+Purpose:
+    Trie of the team compositions over their champion ids in ascending order that answers "contains all of these
+    champions, none of those champions and has a size between a and b" by walking only the branches that can match
+
+Important Note:
+    The trie is stored as flat arrays in preorder (A node is followed by its subtree), no node objects:
+
+        array_node_champion_id      champion id of the node (CHAMPION_ID_PADDING for the root)
+        array_node_end              index of the node after the subtree of the node (The next sibling)
+        array_node_terminal         1 if a team composition ends at the node
+        array_node_depth_max        size of the biggest team composition in the subtree of the node
+        array_node_bitmask_subtree  OR of the champion bitmasks of the subtree of the node
+
+    The first child of node n is n + 1 (If n + 1 < array_node_end[n]) and the sibling after child c is
+    array_node_end[c]. A branch is skipped when:
+
+        1.  Its champion is excluded
+        2.  A champion that must be included has a lower champion id than the champion of the node and is not on the
+            path (The champion ids only go up along a path so it can never be added)
+        3.  A champion that must be included is not in array_node_bitmask_subtree
+        4.  Its depth is more than the max size or array_node_depth_max is less than the min size
+
+    A node is about 15 bytes and the team compositions share the nodes of their prefixes, the dict of champion name ->
+    set of frozensets it replaces holds a reference to every frozenset once per champion in it.
+
+"""
+from array import array
+from typing import Iterable, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import ChampionTraitIndex, CHAMPION_ID_PADDING
+
+# The subtree bitmasks fit in an unsigned 64 bit int up to this many champions (Python ints are used after that)
+CHAMPION_AMOUNT_BITMASK_ARRAY_MAX = 64
+
+
+class SupersetTrie:
+    __slots__ = ['champion_trait_index',
+                 'array_node_champion_id',
+                 'array_node_end',
+                 'array_node_terminal',
+                 'array_node_depth_max',
+                 'array_node_bitmask_subtree',
+                 'amount_team_compositions'
+                 ]
+
+    def __init__(self, champion_trait_index: ChampionTraitIndex, iter_tuple_champion_ids: Iterable[Tuple[int, ...]]):
+        """
+        Trie of the team compositions given as champion ids (In any order)
+
+        :param champion_trait_index: ChampionTraitIndex the champion ids are based on
+        :param iter_tuple_champion_ids: team compositions as champion ids
+        """
+        self.champion_trait_index = champion_trait_index  # type: ChampionTraitIndex
+
+        self.array_node_champion_id = array('B', (CHAMPION_ID_PADDING,))  # type: array
+        self.array_node_end = array('I', (0,))  # type: array
+        self.array_node_terminal = array('B', (0,))  # type: array
+        self.array_node_depth_max = array('B', (0,))  # type: array
+
+        if champion_trait_index.number_champions <= CHAMPION_AMOUNT_BITMASK_ARRAY_MAX:
+            self.array_node_bitmask_subtree = array('Q', (0,))  # type: array
+        else:
+            self.array_node_bitmask_subtree = [0]  # type: list
+
+        self.amount_team_compositions = 0  # type: int
+
+        # Path of the open nodes from the root (The nodes whose subtree has not ended yet)
+        list_node_path = [0]
+
+        tuple_champion_id_previous = ()
+
+        # Sorted team compositions come in preorder so every node is appended once
+        for tuple_champion_id in sorted(set(tuple(sorted(tuple_champion_id)) for tuple_champion_id in
+                                            iter_tuple_champion_ids)):
+
+            # Length of the common prefix with the previous team composition
+            depth_prefix = 0
+
+            for champion_id, champion_id_previous in zip(tuple_champion_id, tuple_champion_id_previous):
+                if champion_id != champion_id_previous:
+                    break
+                depth_prefix += 1
+
+            # Close the nodes of the previous team composition that are not in the common prefix
+            while len(list_node_path) > depth_prefix + 1:
+                self._close_node(list_node_path.pop(), list_node_path[-1])
+
+            # Add the nodes after the common prefix
+            for depth in range(depth_prefix, len(tuple_champion_id)):
+                list_node_path.append(len(self.array_node_champion_id))
+
+                self.array_node_champion_id.append(tuple_champion_id[depth])
+                self.array_node_end.append(0)
+                self.array_node_terminal.append(0)
+                self.array_node_depth_max.append(depth + 1)
+                self.array_node_bitmask_subtree.append(1 << tuple_champion_id[depth])
+
+            self.array_node_terminal[list_node_path[-1]] = 1
+            self.amount_team_compositions += 1
+
+            tuple_champion_id_previous = tuple_champion_id
+
+        while len(list_node_path) > 1:
+            self._close_node(list_node_path.pop(), list_node_path[-1])
+
+        self.array_node_end[0] = len(self.array_node_champion_id)
+
+    def _close_node(self, node: int, node_parent: int):
+        """
+        End the subtree of a node and add its depth and bitmask to its parent
+
+        :param node: index of the node
+        :param node_parent: index of the parent of the node
+        :return: None
+        """
+        self.array_node_end[node] = len(self.array_node_champion_id)
+
+        self.array_node_bitmask_subtree[node_parent] |= self.array_node_bitmask_subtree[node]
+
+        if self.array_node_depth_max[node] > self.array_node_depth_max[node_parent]:
+            self.array_node_depth_max[node_parent] = self.array_node_depth_max[node]
+
+    def __len__(self):
+        return self.amount_team_compositions
+
+    def get_size_bytes(self) -> int:
+        """
+        Get the bytes of the node arrays (Not counting the list of the subtree bitmasks with more than
+        CHAMPION_AMOUNT_BITMASK_ARRAY_MAX champions)
+
+        :return: int
+        """
+        return sum(array_node.itemsize * len(array_node) for array_node in (
+            self.array_node_champion_id, self.array_node_end, self.array_node_terminal, self.array_node_depth_max,
+            self.array_node_bitmask_subtree) if isinstance(array_node, array))
+
+    def get_list_tuple_champion_id(self,
+                                   bitmask_include: int,
+                                   bitmask_exclude: int = 0,
+                                   team_composition_size_min: int = 0,
+                                   team_composition_size_max: int = None) -> List[Tuple[int, ...]]:
+        """
+        Get the team compositions that have every champion of bitmask_include, no champion of bitmask_exclude and a
+        size between the min and the max
+
+        :param bitmask_include: bitmask of the champions that must be in the team composition
+        :param bitmask_exclude: bitmask of the champions that must not be in the team composition
+        :param team_composition_size_min: min team composition size
+        :param team_composition_size_max: max team composition size (None for no max)
+        :return: list of the team compositions as champion ids in ascending order (In ascending order)
+        """
+        if team_composition_size_max is None:
+            team_composition_size_max = self.array_node_depth_max[0]
+
+        # A champion that is included and excluded can not match anything
+        if bitmask_include & bitmask_exclude:
+            return []
+
+        array_node_champion_id = self.array_node_champion_id
+        array_node_end = self.array_node_end
+        array_node_terminal = self.array_node_terminal
+        array_node_depth_max = self.array_node_depth_max
+        array_node_bitmask_subtree = self.array_node_bitmask_subtree
+
+        get_tuple_champion_id_from_bitmask = self.champion_trait_index.get_tuple_champion_id_from_bitmask
+
+        list_tuple_champion_id = []
+
+        """
+        Stack of (node, depth of the node, bitmask of the path to the node), the root is not a champion. A node of -1
+        is a team composition to output so a team composition comes out before the team compositions that extend it.
+        """
+        list_stack = [(0, 0, 0)]
+
+        while list_stack:
+            node_parent, depth_parent, bitmask_path_parent = list_stack.pop()
+
+            if node_parent == -1:
+                list_tuple_champion_id.append(get_tuple_champion_id_from_bitmask(bitmask_path_parent))
+                continue
+
+            depth = depth_parent + 1
+
+            if depth > team_composition_size_max:
+                continue
+
+            list_tuple_node_child = []
+
+            node = node_parent + 1
+            node_end = array_node_end[node_parent]
+
+            while node < node_end:
+                bitmask_champion = 1 << array_node_champion_id[node]
+
+                # Included champions that are not on the path after this node
+                bitmask_missing = bitmask_include & ~(bitmask_path_parent | bitmask_champion)
+
+                # 2.  The ids of the siblings only go up so no later sibling can have the missing champion either
+                if bitmask_missing & (bitmask_champion - 1):
+                    break
+
+                if (not bitmask_champion & bitmask_exclude and
+                        not bitmask_missing & ~array_node_bitmask_subtree[node] and
+                        array_node_depth_max[node] >= team_composition_size_min):
+                    list_tuple_node_child.append(
+                        (node, bitmask_path_parent | bitmask_champion,
+                         array_node_terminal[node] and not bitmask_missing and depth >= team_composition_size_min))
+
+                node = array_node_end[node]
+
+            # Reversed so the team compositions come out in ascending order
+            for node, bitmask_path, bool_team_composition in reversed(list_tuple_node_child):
+                list_stack.append((node, depth, bitmask_path))
+
+                if bool_team_composition:
+                    list_stack.append((-1, depth, bitmask_path))
+
+        return list_tuple_champion_id
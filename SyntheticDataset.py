@@ -0,0 +1,277 @@
+"""
+10/19/2026
+
+Purpose:
+    Generate synthetic champions.json and traits.json files (Same format as resources/official) with a configurable
+    amount of champions, traits per champion and trait breakpoints to measure how the solver scales to larger sets
+
+Important Note:
+    Like the official sets every champion has 1 origin and the rest of its traits are classes, every champion is given
+    the trait of that type with the fewest champions so the traits end up with about the same amount of champions.
+
+    The breakpoints of a trait are picked from the breakpoint layouts that fit the amount of champions with that trait.
+
+        python -m Teamfight_Tactics_Composition_Solver.SyntheticDataset --number-champions 80 --output synthetic
+
+"""
+import argparse
+import json
+import os
+import random
+from typing import Dict, List, Tuple
+
+# Breakpoint layouts of the Set 3 traits
+TUPLE_BREAKPOINT_LAYOUT_DEFAULT = ((2, 4), (3, 6), (2, 4, 6), (1,), (2,), (3,))
+
+# Amount of traits per champion -> weight (Set 3 has 48 champions with 2 traits and 3 with 3 traits)
+DICT_TRAITS_PER_CHAMPION_WEIGHT_DEFAULT = {2: 48, 3: 3}
+
+# Cost -> weight (Set 3 champion costs)
+DICT_COST_WEIGHT_DEFAULT = {1: 12, 2: 12, 3: 12, 4: 9, 5: 6}
+
+# Traits per champion of Set 3 (23 traits for 51 champions)
+RATIO_TRAITS_PER_CHAMPION = 23 / 51
+
+TRAIT_TYPE_ORIGIN = "origin"
+TRAIT_TYPE_CLASS = "class"
+
+NAME_CHAMPIONS = "champions.json"
+NAME_TRAITS = "traits.json"
+
+
+def _get_list_dict_sets(tuple_breakpoint: Tuple[int, ...]) -> List[dict]:
+    """
+    Get the "sets" of a trait in the json format from its breakpoints
+
+    :param tuple_breakpoint: breakpoints of the trait
+    :return: list of dict of the sets
+    """
+    list_dict_sets = []
+
+    for index, breakpoint_trait in enumerate(tuple_breakpoint):
+        # Last breakpoint is gold, first is bronze, the rest are silver
+        if index + 1 == len(tuple_breakpoint):
+            style = "gold"
+        elif index == 0:
+            style = "bronze"
+        else:
+            style = "silver"
+
+        dict_sets = {"style": style, "min": breakpoint_trait}
+
+        if index + 1 < len(tuple_breakpoint):
+            dict_sets["max"] = tuple_breakpoint[index + 1] - 1
+
+        list_dict_sets.append(dict_sets)
+
+    return list_dict_sets
+
+
+def generate_dataset(number_champions: int,
+                     number_traits: int = None,
+                     dict_traits_per_champion_weight: Dict[int, int] = None,
+                     tuple_breakpoint_layout: Tuple[Tuple[int, ...], ...] = TUPLE_BREAKPOINT_LAYOUT_DEFAULT,
+                     dict_cost_weight: Dict[int, int] = None,
+                     seed: int = 0) -> Tuple[List[dict], List[dict]]:
+    """
+    Generate the champions and traits of a synthetic set
+
+    :param number_champions: amount of champions
+    :param number_traits: amount of traits (None to scale the amount of traits of Set 3)
+    :param dict_traits_per_champion_weight: amount of traits per champion -> weight
+    :param tuple_breakpoint_layout: breakpoint layouts the traits pick from
+    :param dict_cost_weight: cost -> weight
+    :param seed: seed of the random choices
+    :return: tuple of the list of champion dicts and the list of trait dicts (The json content)
+    """
+    if dict_traits_per_champion_weight is None:
+        dict_traits_per_champion_weight = DICT_TRAITS_PER_CHAMPION_WEIGHT_DEFAULT
+
+    if dict_cost_weight is None:
+        dict_cost_weight = DICT_COST_WEIGHT_DEFAULT
+
+    if number_traits is None:
+        number_traits = max(2, round(number_champions * RATIO_TRAITS_PER_CHAMPION))
+
+    if number_traits < 2:
+        raise ValueError("A synthetic set needs at least 2 traits (1 origin and 1 class)")
+
+    if max(dict_traits_per_champion_weight) > number_traits:
+        raise ValueError("A champion can not have more traits than the {} traits of the set".format(number_traits))
+
+    random_given = random.Random(seed)
+
+    # Half of the traits are origins (At least 1 of each type)
+    number_origins = min(max(1, number_traits // 2), number_traits - 1)
+
+    list_trait_name = ["Trait{:02d}".format(index) for index in range(number_traits)]
+
+    dict_key_trait_name_value_trait_type = {
+        trait_name: TRAIT_TYPE_ORIGIN if index < number_origins else TRAIT_TYPE_CLASS for index, trait_name in
+        enumerate(list_trait_name)}
+
+    # Trait name -> amount of champions with that trait
+    dict_key_trait_name_value_count = {trait_name: 0 for trait_name in list_trait_name}
+
+    def _get_trait_name_least_used(trait_type: str, set_trait_name_exclude: set) -> str:
+        list_trait_name_candidate = [
+            trait_name for trait_name in list_trait_name if
+            (trait_type is None or dict_key_trait_name_value_trait_type[trait_name] == trait_type) and
+            trait_name not in set_trait_name_exclude]
+
+        count_min = min(dict_key_trait_name_value_count[trait_name] for trait_name in list_trait_name_candidate)
+
+        return random_given.choice([trait_name for trait_name in list_trait_name_candidate if
+                                    dict_key_trait_name_value_count[trait_name] == count_min])
+
+    list_dict_champion = []
+
+    list_traits_per_champion = list(dict_traits_per_champion_weight)
+    list_cost = list(dict_cost_weight)
+
+    for champion_index in range(number_champions):
+        amount_traits = random_given.choices(list_traits_per_champion,
+                                             weights=[dict_traits_per_champion_weight[i] for i in
+                                                      list_traits_per_champion])[0]
+
+        list_traits = [_get_trait_name_least_used(TRAIT_TYPE_ORIGIN, set())]
+
+        for _ in range(amount_traits - 1):
+            # Classes first, any type once every class has been used by the champion
+            set_trait_name_exclude = set(list_traits)
+
+            bool_class_available = any(
+                dict_key_trait_name_value_trait_type[trait_name] == TRAIT_TYPE_CLASS and
+                trait_name not in set_trait_name_exclude for trait_name in list_trait_name)
+
+            list_traits.append(_get_trait_name_least_used(TRAIT_TYPE_CLASS if bool_class_available else None,
+                                                          set_trait_name_exclude))
+
+        for trait_name in list_traits:
+            dict_key_trait_name_value_count[trait_name] += 1
+
+        list_dict_champion.append({
+            "name": "Champion{:03d}".format(champion_index),
+            "championId": "Synthetic_Champion{:03d}".format(champion_index),
+            "cost": random_given.choices(list_cost, weights=[dict_cost_weight[i] for i in list_cost])[0],
+            "traits": list_traits})
+
+    list_dict_trait = []
+
+    for trait_name in list_trait_name:
+        count = dict_key_trait_name_value_count[trait_name]
+
+        # Layouts whose first breakpoint can be reached, breakpoints that can not be reached are removed
+        list_tuple_breakpoint = [
+            tuple(breakpoint_trait for breakpoint_trait in tuple_breakpoint if breakpoint_trait <= count) for
+            tuple_breakpoint in tuple_breakpoint_layout if tuple_breakpoint[0] <= count]
+
+        tuple_breakpoint = random_given.choice(list_tuple_breakpoint) if list_tuple_breakpoint else (1,)
+
+        list_dict_trait.append({
+            "key": "Synthetic_{}".format(trait_name),
+            "name": trait_name,
+            "description": "Synthetic trait",
+            "type": dict_key_trait_name_value_trait_type[trait_name],
+            "sets": _get_list_dict_sets(tuple_breakpoint)})
+
+    return list_dict_champion, list_dict_trait
+
+
+def write_dataset(dir_output: str, number_champions: int, **kwargs) -> Tuple[str, str]:
+    """
+    Generate a synthetic set and write its champions.json and traits.json into dir_output
+
+    :param dir_output: path to the output dir
+    :param number_champions: amount of champions
+    :param kwargs: kwargs of generate_dataset
+    :return: tuple of the path to champions.json and the path to traits.json
+    """
+    list_dict_champion, list_dict_trait = generate_dataset(number_champions, **kwargs)
+
+    os.makedirs(dir_output, exist_ok=True)
+
+    path_champions = os.path.join(dir_output, NAME_CHAMPIONS)
+    path_traits = os.path.join(dir_output, NAME_TRAITS)
+
+    with open(path_champions, "w") as file:
+        json.dump(list_dict_champion, file, indent=4)
+
+    with open(path_traits, "w") as file:
+        json.dump(list_dict_trait, file, indent=4)
+
+    return path_champions, path_traits
+
+
+def get_dict_weight_from_string(string_weight: str) -> Dict[int, int]:
+    """
+    Parse "2:48,3:3" into {2: 48, 3: 3}
+
+    :param string_weight: comma separated value:weight
+    :return: dict of the value and its weight
+    """
+    dict_weight = {}
+
+    for string_item in string_weight.split(","):
+        value, weight = string_item.split(":")
+        dict_weight[int(value)] = int(weight)
+
+    return dict_weight
+
+
+def get_tuple_breakpoint_layout_from_string(string_layout: str) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Parse "2-4,3-6,2-4-6" into ((2, 4), (3, 6), (2, 4, 6))
+
+    :param string_layout: comma separated layouts of dash separated breakpoints
+    :return: tuple of the breakpoint layouts
+    """
+    return tuple(tuple(sorted(int(breakpoint_trait) for breakpoint_trait in string_item.split("-"))) for
+                 string_item in string_layout.split(","))
+
+
+def add_argument_dataset(parser: argparse.ArgumentParser):
+    """
+    Add the arguments of generate_dataset (Except the amount of champions) to a parser
+    :param parser: parser
+    :return: None
+    """
+    parser.add_argument("--number-traits", type=int, default=None,
+                        help="amount of traits (default scales the 23 traits per 51 champions of Set 3)")
+    parser.add_argument("--traits-per-champion", default="2:48,3:3",
+                        help="amount of traits per champion and its weight")
+    parser.add_argument("--breakpoints", default="2-4,3-6,2-4-6,1,2,3",
+                        help="breakpoint layouts the traits pick from")
+    parser.add_argument("--costs", default="1:12,2:12,3:12,4:9,5:6", help="champion cost and its weight")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random choices")
+
+
+def get_dict_kwargs_dataset(namespace: argparse.Namespace) -> dict:
+    """
+    Get the kwargs of generate_dataset from the arguments added by add_argument_dataset
+    :param namespace: parsed arguments
+    :return: kwargs
+    """
+    return {"number_traits": namespace.number_traits,
+            "dict_traits_per_champion_weight": get_dict_weight_from_string(namespace.traits_per_champion),
+            "tuple_breakpoint_layout": get_tuple_breakpoint_layout_from_string(namespace.breakpoints),
+            "dict_cost_weight": get_dict_weight_from_string(namespace.costs),
+            "seed": namespace.seed}
+
+
+def main(list_argument: List[str] = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic champions.json and traits.json")
+    parser.add_argument("--number-champions", type=int, required=True, help="amount of champions")
+    parser.add_argument("--output", required=True, help="path to the output dir")
+    add_argument_dataset(parser)
+
+    namespace = parser.parse_args(list_argument)
+
+    path_champions, path_traits = write_dataset(namespace.output, namespace.number_champions,
+                                                **get_dict_kwargs_dataset(namespace))
+
+    print("Wrote {} and {}".format(path_champions, path_traits))
+
+
+if __name__ == '__main__':
+    main()
@@ -257,14 +257,13 @@ CALCULATING APPROXIMATIONS:
 import threading
 from typing import List, Tuple, FrozenSet, Set
 
-from Teamfight_Tactics_Composition_Solver.TeamCompositionContainer import TeamCompositionContainer
+from Teamfight_Tactics_Composition_Solver.EmblemSet import EmblemSet
+from Teamfight_Tactics_Composition_Solver.Instrumentation import traced, counted
+from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerCompact import TeamCompositionContainerCompact
 from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerFactory import (TeamCompositionContainerFactory)
 
 from Teamfight_Tactics_Composition_Solver.constants import TEAM_COMPOSITION_SIZE_MAX
 
-from josephs_resources.decorators.v1.callable_called_count import callable_called_count
-from josephs_resources.decorators.v1.memory_usage import memory_usage
-from josephs_resources.decorators.v2.timer import timer
 
 
 class TeamCompositionCombinationsSearcher:
@@ -278,15 +277,16 @@ class TeamCompositionCombinationsSearcher:
         self.team_composition_container_factory = team_composition_container_factory
         self.champion_pool = self.team_composition_container_factory.champion_pool
         self.trait_pool = self.team_composition_container_factory.trait_pool
+        self.champion_trait_index = self.team_composition_container_factory.champion_trait_index
 
         self.team_composition_size = TEAM_COMPOSITION_SIZE_MAX
 
-    @memory_usage
-    @timer(show_arguments=False)
+    @traced("search.get_list_tuple_compositions_combinations", bool_memory=True)
     def get_list_tuple_compositions_combinations(self,
                                                  team_composition_size: int = None,
                                                  team_composition_selected: list = None,
-                                                 search_type: str = "and") -> List[Tuple]:
+                                                 search_type: str = "and",
+                                                 emblem_set: EmblemSet = None) -> List[Tuple]:
         """
         Wrapper over the get_set_frozenset_compositions_combinations to get a list tuple version from the
         set frozenset version
@@ -294,33 +294,44 @@ class TeamCompositionCombinationsSearcher:
         :param team_composition_size: team comp size
         :param team_composition_selected: list of a team composition
         :param search_type: use and or or when searching based on team_composition_selected
+        :param emblem_set: emblems available to the team composition (None for no emblems)
         :return: list_tuple_shared_solutions
         """
         set_frozenset_shared_solutions = self.get_set_frozenset_compositions_combinations(team_composition_size,
                                                                                           team_composition_selected,
-                                                                                          search_type)
+                                                                                          search_type,
+                                                                                          emblem_set)
 
         list_tuple_shared_solutions = [tuple(i) for i in set_frozenset_shared_solutions]
 
         return list_tuple_shared_solutions
 
-    @memory_usage
-    @timer(show_arguments=False)
+    @traced("search.get_set_frozenset_compositions_combinations", bool_memory=True)
     def get_set_frozenset_compositions_combinations(self,
                                                     team_composition_size: int = None,
                                                     team_composition_selected: list = None,
-                                                    search_type: str = "and") -> Set[FrozenSet]:
+                                                    search_type: str = "and",
+                                                    emblem_set: EmblemSet = None) -> Set[FrozenSet]:
         """
          Get a set of frozensets of the possible useful team composition combinations given the initial conditions
 
+         The trait count discrete totals of OPTIMIZATION 3 are the totals with the emblems of emblem_set on their best
+         holders and Force of Nature adds to team_composition_size. The champions are still added by the traits they
+         have without the emblems (OPTIMIZATION 2), a team composition that only shares a trait through an emblem is
+         not found (See EmblemSet).
+
          :param team_composition_size: team comp size
          :param team_composition_selected: list of a team composition
          :param search_type: use and or or when searching based on team_composition_selected
+         :param emblem_set: emblems available to the team composition (None for no emblems)
          :return: list_tuple_shared_solutions
          """
         if team_composition_size is None:
             team_composition_size = self.team_composition_size
 
+        if emblem_set:
+            team_composition_size += emblem_set.team_composition_size_delta
+
         # Set containing frozensets which are solutions
         set_frozenset_shared_solutions = set()  # type: Set[FrozenSet]
 
@@ -339,28 +350,181 @@ class TeamCompositionCombinationsSearcher:
         # Transform the champion name to it's dict_index_position_id equivalent for space saving
         # team_composition_selected = [self.champion_pool.dict_champion_pool_name.get(i) for i in team_composition_selected]
 
+        # Empty team composition container that the first champion is added to
+        team_composition_container_empty = self.team_composition_container_factory.get_team_composition_container_compact(
+            [])
+
         # Recursive call
         self._get_set_frozenset_compositions_combinations(list_temp_shared_generic_solution,
                                                           list_champions_temp,
                                                           set_frozenset_shared_solutions,
-                                                          None,
+                                                          team_composition_container_empty,
                                                           team_composition_size,
                                                           team_composition_selected,
-                                                          search_type)
+                                                          search_type,
+                                                          emblem_set)
 
         print("Total amount of team Compositions:", len(set_frozenset_shared_solutions))
 
         return set_frozenset_shared_solutions
 
-    @callable_called_count
+    @traced("search.get_set_frozenset_compositions_combinations_containing", bool_memory=True)
+    def get_set_frozenset_compositions_combinations_containing(self,
+                                                               team_composition_size: int,
+                                                               iter_champion_names: iter,
+                                                               emblem_set: EmblemSet = None) -> Set[FrozenSet]:
+        """
+        Get the team compositions of get_set_frozenset_compositions_combinations(team_composition_size) that contain at
+        least one of the champions in iter_champion_names without searching every team composition
+
+        Following the recursion of _get_set_frozenset_compositions_combinations (without team_composition_selected),
+        a team composition smaller than team_composition_size is found if and only if its champions are connected by
+        shared traits (Every champion added must share a trait with the champions before it and a team composition
+        that is connected can always be built in that order). A team composition of size team_composition_size is
+        found if and only if there is a champion in it that shares a trait with the rest of the team composition, the
+        rest of the team composition is connected and removing that champion lowers the trait count discrete total
+        (OPTIMIZATION 3).
+
+        So growing every team composition containing the champions one champion that shares a trait at a time gives
+        every connected team composition that contains them.
+
+        The shared traits are the traits of the champions without the emblems of emblem_set (The same as
+        OPTIMIZATION 2), the emblems only change the trait count discrete totals and the size, a team composition
+        that is only connected through an emblem is not found (See EmblemSet).
+
+        :param team_composition_size: team comp size
+        :param iter_champion_names: iterable of champion names
+        :param emblem_set: emblems available to the team composition (None for no emblems)
+        :return: set of frozensets of the team compositions
+        """
+        if emblem_set:
+            team_composition_size += emblem_set.team_composition_size_delta
+
+        tuple_champion_id_tuple_trait_id = self.champion_trait_index.tuple_champion_id_tuple_trait_id
+        tuple_trait_id_bitmask_champion = self.champion_trait_index.tuple_trait_id_bitmask_champion
+
+        # champion id -> bitmask of the champions that share a trait with that champion
+        list_champion_id_bitmask_neighbor = []
+
+        for champion_id, tuple_trait_id in enumerate(tuple_champion_id_tuple_trait_id):
+            bitmask_neighbor = 0
+
+            for trait_id in tuple_trait_id:
+                bitmask_neighbor |= tuple_trait_id_bitmask_champion[trait_id]
+
+            list_champion_id_bitmask_neighbor.append(bitmask_neighbor & ~(1 << champion_id))
+
+        # Set containing the bitmasks of the connected team compositions of every size
+        set_bitmask_shared_solutions = set()
+
+        # dict of the bitmasks of the team compositions of the current size and the bitmask of their neighbors
+        dict_key_bitmask_value_bitmask_neighbor = {
+            1 << champion_id: list_champion_id_bitmask_neighbor[champion_id] for champion_id in
+            self.champion_trait_index.get_tuple_champion_id(iter_champion_names)}
+
+        # Grow the team compositions one champion at a time until team_composition_size
+        for size in range(1, team_composition_size + 1):
+
+            # The team compositions of team_composition_size need OPTIMIZATION 3 (A single champion is always found)
+            if 1 < size == team_composition_size:
+                set_bitmask_shared_solutions.update(
+                    bitmask for bitmask in dict_key_bitmask_value_bitmask_neighbor if
+                    self._is_team_composition_size_max_solution(bitmask, list_champion_id_bitmask_neighbor,
+                                                                emblem_set))
+                break
+
+            set_bitmask_shared_solutions.update(dict_key_bitmask_value_bitmask_neighbor)
+
+            if size == team_composition_size:
+                break
+
+            dict_key_bitmask_value_bitmask_neighbor_new = {}
+
+            for bitmask, bitmask_neighbor in dict_key_bitmask_value_bitmask_neighbor.items():
+
+                # Neighbors that are not in the team composition
+                bitmask_neighbor &= ~bitmask
+
+                while bitmask_neighbor:
+                    bitmask_champion = bitmask_neighbor & -bitmask_neighbor
+                    bitmask_neighbor ^= bitmask_champion
+
+                    bitmask_new = bitmask | bitmask_champion
+
+                    if bitmask_new not in dict_key_bitmask_value_bitmask_neighbor_new:
+                        dict_key_bitmask_value_bitmask_neighbor_new[bitmask_new] = (
+                                dict_key_bitmask_value_bitmask_neighbor[bitmask] |
+                                list_champion_id_bitmask_neighbor[bitmask_champion.bit_length() - 1])
+
+            dict_key_bitmask_value_bitmask_neighbor = dict_key_bitmask_value_bitmask_neighbor_new
+
+        set_frozenset_shared_solutions = {
+            frozenset(self.champion_trait_index.get_tuple_champion_name(
+                self.champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask))) for bitmask in
+            set_bitmask_shared_solutions}
+
+        print("Total amount of team Compositions:", len(set_frozenset_shared_solutions))
+
+        return set_frozenset_shared_solutions
+
+    def _is_team_composition_size_max_solution(self, bitmask: int, list_champion_id_bitmask_neighbor: list,
+                                               emblem_set: EmblemSet = None) -> bool:
+        """
+        Check if a connected team composition of the maximum size would be found by
+        _get_set_frozenset_compositions_combinations, in other words if there is a last champion that could have been
+        added to the rest of the team composition (OPTIMIZATION 2 and OPTIMIZATION 3)
+
+        :param bitmask: bitmask of the team composition
+        :param list_champion_id_bitmask_neighbor: champion id -> bitmask of the champions that share a trait with it
+        :param emblem_set: emblems available to the team composition (None for no emblems)
+        :return: bool
+        """
+        tuple_champion_id = self.champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask)
+
+        trait_count_discrete_total = self.team_composition_container_factory.get_team_composition_container_compact_from_champion_ids(
+            tuple_champion_id).get_trait_count_discrete_total(emblem_set)
+
+        for champion_id in tuple_champion_id:
+            bitmask_rest = bitmask & ~(1 << champion_id)
+
+            # The last champion must share a trait with the rest of the team composition
+            if not list_champion_id_bitmask_neighbor[champion_id] & bitmask_rest:
+                continue
+
+            # The rest of the team composition must be connected
+            bitmask_reached = bitmask_rest & -bitmask_rest
+            bitmask_frontier = bitmask_reached
+
+            while bitmask_frontier:
+                bitmask_champion = bitmask_frontier & -bitmask_frontier
+                bitmask_frontier ^= bitmask_champion
+
+                bitmask_neighbor_new = list_champion_id_bitmask_neighbor[
+                                           bitmask_champion.bit_length() - 1] & bitmask_rest & ~bitmask_reached
+
+                bitmask_reached |= bitmask_neighbor_new
+                bitmask_frontier |= bitmask_neighbor_new
+
+            if bitmask_reached != bitmask_rest:
+                continue
+
+            # The last champion must increase the trait count discrete total
+            if trait_count_discrete_total > self.team_composition_container_factory.get_team_composition_container_compact_from_bitmask(
+                    bitmask_rest).get_trait_count_discrete_total(emblem_set):
+                return True
+
+        return False
+
+    @counted("search.recursion")
     def _get_set_frozenset_compositions_combinations(self,
                                                      list_temp_shared_generic_solution: list,
                                                      list_remaining_items: list,
                                                      set_frozenset_shared_solutions: set,
-                                                     team_composition_container_temp_old: TeamCompositionContainer,
+                                                     team_composition_container_temp_old: TeamCompositionContainerCompact,
                                                      team_composition_size: int,
                                                      team_composition_selected: list,
-                                                     search_type: str
+                                                     search_type: str,
+                                                     emblem_set: EmblemSet = None
                                                      ) -> None:
         """
         Recursive DFS of all permutations of a List, but making them unique via frozen set
@@ -368,8 +532,20 @@ class TeamCompositionCombinationsSearcher:
         :param list_temp_shared_generic_solution: temporary List of the current permutation (temp List is shared)
         :param list_remaining_items: List of remaining items that need to be added to list_temp
         :param set_frozenset_shared_solutions: set of frozensets that are part of the power set
+        :param team_composition_container_temp_old: team composition container of list_temp_shared_generic_solution
+        :param emblem_set: emblems available to the team composition (None for no emblems)
         :return:
         """
+        # Local references to the integer indexed pools (Avoids the attribute lookups in the loop)
+        dict_key_champion_name_value_champion_id = self.champion_trait_index.dict_key_champion_name_value_champion_id
+        tuple_champion_id_tuple_trait_id = self.champion_trait_index.tuple_champion_id_tuple_trait_id
+
+        # Set the traits given by current team composition (Trait counts indexed by trait id)
+        array_composition_traits_old = team_composition_container_temp_old.array_trait_count
+
+        # If the current team composition does not have any traits (Like when it's empty)
+        bool_composition_traits_old_empty = not any(array_composition_traits_old)
+
         # Loop through the remaining List
         for index in range(len(list_remaining_items)):
 
@@ -385,18 +561,16 @@ class TeamCompositionCombinationsSearcher:
             # Pop off the item with the index number
             list_remaining_items_new.pop(index)
 
-            # Set the traits given by current team composition
-            if team_composition_container_temp_old is not None:
-                dict_composition_traits_old = team_composition_container_temp_old.dict_trait_count
-            else:
-                dict_composition_traits_old = {}
+            # Champion id of the new champion
+            champion_id_new = dict_key_champion_name_value_champion_id[name_new]
 
-            # Temp team composition container
-            team_composition_container_temp_new = self.team_composition_container_factory.get_team_composition_container(
-                list_temp_shared_generic_solution)
+            # Temp team composition container (Only the traits of the new champion are added to the old one)
+            team_composition_container_temp_new = self.team_composition_container_factory.get_team_composition_container_compact_added(
+                team_composition_container_temp_old,
+                champion_id_new)
 
-            # Dict of traits for the current composition
-            dict_composition_traits_new = team_composition_container_temp_new.dict_trait_count
+            # Traits for the current composition (Trait counts indexed by trait id)
+            array_composition_traits_new = team_composition_container_temp_new.array_trait_count
 
             length_list_temp_shared_generic_solution = len(list_temp_shared_generic_solution)
 
@@ -475,11 +649,15 @@ class TeamCompositionCombinationsSearcher:
                 This allows for only champion synergies starting from the first champion then following champions
                 It also means that the amount of combinations is less than 
                 (Summation from r = 0 to 9 of (51!)/(r!(51-r)!))
+                
+                Only the traits of the new champion can increase so only those are checked, a trait count of 0 in the
+                old composition means that the trait is not one of the existing traits
                 """
-                for trait_key_old, trait_value_old in dict_composition_traits_old.items():
-                    trait_value_new = dict_composition_traits_new.get(trait_key_old)
+                for trait_id in tuple_champion_id_tuple_trait_id[champion_id_new]:
+                    trait_value_old = array_composition_traits_old[trait_id]
+                    trait_value_new = array_composition_traits_new[trait_id]
 
-                    bool_value_increased = trait_value_new > trait_value_old
+                    bool_value_increased = trait_value_old > 0 and trait_value_new > trait_value_old
 
                     remaining_units_till_max_comp_size = team_composition_size - length_list_temp_shared_generic_solution
 
@@ -542,8 +720,10 @@ class TeamCompositionCombinationsSearcher:
                                                 
                     """
                     if length_list_temp_shared_generic_solution == team_composition_size and bool_value_increased:
-                        dict_composition_traits_discrete_new = team_composition_container_temp_new.get_trait_count_discrete_total()
-                        dict_composition_traits_discrete_old = team_composition_container_temp_old.get_trait_count_discrete_total()
+                        dict_composition_traits_discrete_new = team_composition_container_temp_new.get_trait_count_discrete_total(
+                            emblem_set)
+                        dict_composition_traits_discrete_old = team_composition_container_temp_old.get_trait_count_discrete_total(
+                            emblem_set)
                         """
                         If the sum of the dict_composition_traits_discrete_new is greater than the
                         sum of the dict_composition_traits_discrete_old then trait has increased.
@@ -560,8 +740,8 @@ class TeamCompositionCombinationsSearcher:
                         trait_increased = True
                         break
 
-                # If a current trait in a composition has increased of if dict_composition_traits_old empty
-                if trait_increased or not dict_composition_traits_old:
+                # If a current trait in a composition has increased of if the old composition has no traits
+                if trait_increased or bool_composition_traits_old_empty:
 
                     # if team_composition_container_temp_new.dict_trait_count_discrete[
                     #     "Star Guardian"] >= 6 and dict_composition_traits_old:
@@ -597,7 +777,8 @@ class TeamCompositionCombinationsSearcher:
                                                                           team_composition_container_temp_new,
                                                                           team_composition_size,
                                                                           team_composition_selected,
-                                                                          search_type
+                                                                          search_type,
+                                                                          emblem_set
                                                                           )
             # If the frozenset_temp already exists
             else:
@@ -0,0 +1,78 @@
+"""
+10/19/2026
+
+Purpose:
+    Container for the traits of a batch of TFT team composition combinations
+
+Important Note:
+    The matrices are stored by column (trait id -> bytes of length number_rows) because that is how they are
+    calculated, bytes.translate and int.from_bytes work on a whole column at a time.
+
+    Made by TeamCompositionContainerFactory.get_team_composition_container_batch
+
+"""
+from typing import Tuple
+
+
+class TeamCompositionContainerBatch:
+    __slots__ = ['number_rows',
+                 'tuple_trait_id_bytes_trait_count',
+                 'tuple_trait_id_bytes_trait_count_discrete',
+                 'bytes_trait_count_discrete_total'
+                 ]
+
+    def __init__(self,
+                 number_rows: int,
+                 tuple_trait_id_bytes_trait_count: Tuple[bytes, ...],
+                 tuple_trait_id_bytes_trait_count_discrete: Tuple[bytes, ...],
+                 bytes_trait_count_discrete_total: bytes):
+        """
+        Container for the traits of a batch of TFT team composition combinations
+
+        :param number_rows: amount of team compositions in the batch
+        :param tuple_trait_id_bytes_trait_count: trait id -> trait count of every row
+        :param tuple_trait_id_bytes_trait_count_discrete: trait id -> trait count discrete of every row
+        :param bytes_trait_count_discrete_total: trait count discrete total of every row
+        """
+        # Amount of team compositions (rows)
+        self.number_rows = number_rows  # type: int
+
+        # N x number_traits trait count matrix (by column)
+        self.tuple_trait_id_bytes_trait_count = tuple_trait_id_bytes_trait_count  # type: Tuple[bytes, ...]
+
+        # N x number_traits trait count discrete matrix (by column)
+        self.tuple_trait_id_bytes_trait_count_discrete = tuple_trait_id_bytes_trait_count_discrete  # type: Tuple[bytes, ...]
+
+        # Trait count discrete total of every row
+        self.bytes_trait_count_discrete_total = bytes_trait_count_discrete_total  # type: bytes
+
+    def __len__(self):
+        return self.number_rows
+
+    def get_tuple_trait_count(self, row: int) -> Tuple[int, ...]:
+        """
+        Get the trait counts of a row indexed by trait id
+
+        :param row: index of the team composition in the batch
+        :return: tuple of trait counts
+        """
+        return tuple(bytes_trait_count[row] for bytes_trait_count in self.tuple_trait_id_bytes_trait_count)
+
+    def get_tuple_trait_count_discrete(self, row: int) -> Tuple[int, ...]:
+        """
+        Get the trait counts discrete of a row indexed by trait id
+
+        :param row: index of the team composition in the batch
+        :return: tuple of trait counts discrete
+        """
+        return tuple(bytes_trait_count_discrete[row] for bytes_trait_count_discrete in
+                     self.tuple_trait_id_bytes_trait_count_discrete)
+
+    def get_trait_count_discrete_total(self, row: int) -> int:
+        """
+        Get the trait count discrete total of a row
+
+        :param row: index of the team composition in the batch
+        :return: trait count discrete total
+        """
+        return self.bytes_trait_count_discrete_total[row]
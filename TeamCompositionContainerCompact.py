@@ -0,0 +1,126 @@
+"""
+10/19/2026
+
+Purpose:
+    Compact container for A TFT team composition combination
+
+Important Note:
+    The team composition is a bitmask where bit champion_id is set for every champion in the team composition and the
+    trait counts are an array('B') indexed by trait id, both based on the ChampionTraitIndex.
+
+    dict_trait_count, dict_trait_count_discrete and tuple_team_composition are views made on request for code that
+    was written for the TeamCompositionContainer, they should not be used in a hot loop.
+
+"""
+from array import array
+from typing import Dict, Tuple
+
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import ChampionTraitIndex
+from Teamfight_Tactics_Composition_Solver.EmblemSet import EmblemSet
+
+
+class TeamCompositionContainerCompact:
+    __slots__ = ['bitmask_team_composition',
+                 'array_trait_count',
+                 'champion_trait_index'
+                 ]
+
+    def __init__(self, bitmask_team_composition: int, array_trait_count: array,
+                 champion_trait_index: ChampionTraitIndex):
+        """
+        Compact container for a TFT team composition combination
+
+        :param bitmask_team_composition: bitmask of the champion ids in the team composition
+        :param array_trait_count: array('B') of the trait counts indexed by trait id
+        :param champion_trait_index: ChampionTraitIndex the ids are based on
+        """
+        # Bitmask of the team composition combination
+        self.bitmask_team_composition = bitmask_team_composition  # type: int
+
+        # Trait count of every trait indexed by trait id
+        self.array_trait_count = array_trait_count  # type: array
+
+        # ChampionTraitIndex object
+        self.champion_trait_index = champion_trait_index  # type: ChampionTraitIndex
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        string = "{}\n{}\n{}".format(self.tuple_team_composition,
+                                     self.dict_trait_count,
+                                     self.dict_trait_count_discrete)
+
+        return string
+
+    def get_team_composition_size(self) -> int:
+        """
+        Return the amount of champions in the team composition
+        :return:
+        """
+        return bin(self.bitmask_team_composition).count("1")
+
+    def get_trait_count_discrete(self, trait_id: int) -> int:
+        """
+        Return the trait count discrete of the trait given by trait_id
+        :return:
+        """
+        return self.champion_trait_index.tuple_trait_id_array_count_discrete[trait_id][
+            self.array_trait_count[trait_id]]
+
+    def get_trait_count_discrete_total(self, emblem_set: EmblemSet = None) -> int:
+        """
+        Return the sum of the trait count discrete of every trait
+
+        :param emblem_set: emblems added to the team composition (None for no emblems)
+        :return:
+        """
+        tuple_trait_id_array_count_discrete = self.champion_trait_index.tuple_trait_id_array_count_discrete
+
+        array_trait_count = self.array_trait_count
+
+        if emblem_set:
+            array_trait_count = emblem_set.get_array_trait_count(array_trait_count, self.get_team_composition_size())
+
+        return sum(tuple_trait_id_array_count_discrete[trait_id][trait_count] for trait_id, trait_count in
+                   enumerate(array_trait_count) if trait_count)
+
+    @property
+    def tuple_team_composition(self) -> Tuple[str, ...]:
+        """
+        Tuple of the champion names in the team composition (Ordered by champion id)
+        :return:
+        """
+        return self.champion_trait_index.get_tuple_champion_name(
+            self.champion_trait_index.get_tuple_champion_id_from_bitmask(self.bitmask_team_composition))
+
+    @property
+    def dict_trait_count(self) -> Dict[str, int]:
+        """
+        Dict of the traits and the synergy count, only traits that the team composition has are in the dict
+        :return:
+        """
+        tuple_trait_id_name = self.champion_trait_index.tuple_trait_id_name
+
+        return {tuple_trait_id_name[trait_id]: trait_count for trait_id, trait_count in
+                enumerate(self.array_trait_count) if trait_count}
+
+    @property
+    def dict_trait_count_discrete(self) -> Dict[str, int]:
+        """
+        Dict of the traits and the discrete synergy count, only traits that reached a division are in the dict
+        :return:
+        """
+        tuple_trait_id_name = self.champion_trait_index.tuple_trait_id_name
+        tuple_trait_id_array_count_discrete = self.champion_trait_index.tuple_trait_id_array_count_discrete
+
+        dict_trait_count_discrete = {}
+
+        for trait_id, trait_count in enumerate(self.array_trait_count):
+            if trait_count:
+                trait_count_discrete = tuple_trait_id_array_count_discrete[trait_id][trait_count]
+
+                if trait_count_discrete:
+                    dict_trait_count_discrete[tuple_trait_id_name[trait_id]] = trait_count_discrete
+
+        return dict_trait_count_discrete
@@ -6,12 +6,16 @@ Purpose:
 
 
 """
-from typing import List, Iterable
+from array import array
+from typing import List, Iterable, Tuple
 
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import ChampionTraitIndex, CHAMPION_ID_PADDING
 from Teamfight_Tactics_Composition_Solver.ChamptionPool import ChampionPool
+from Teamfight_Tactics_Composition_Solver.EmblemSet import EmblemSet
 from Teamfight_Tactics_Composition_Solver.TeamCompositionContainer import TeamCompositionContainer
+from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerBatch import TeamCompositionContainerBatch
+from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerCompact import TeamCompositionContainerCompact
 from Teamfight_Tactics_Composition_Solver.TraitPool import TraitPool
-from josephs_resources.Decorators.V2.Timer import timer
 
 
 class TeamCompositionContainerFactory:
@@ -27,6 +31,9 @@ class TeamCompositionContainerFactory:
 
         self.trait_pool = trait_pool  # type: TraitPool
 
+        # Integer indexed version of the champion pool and trait pool used by the hot loops
+        self.champion_trait_index = ChampionTraitIndex(champion_pool, trait_pool)  # type: ChampionTraitIndex
+
     def get_team_composition_container(self, list_composition_combination: Iterable[str]) -> TeamCompositionContainer:
         """
         Get an object of TeamCompositionContainer given list_composition_combination
@@ -37,52 +44,112 @@ class TeamCompositionContainerFactory:
         team_composition_container = TeamCompositionContainer(
             tuple(list_composition_combination))  # type: TeamCompositionContainer
 
+        # Local references to the integer indexed pools (Avoids the attribute lookups in the loop)
+        dict_key_champion_name_value_champion_id = self.champion_trait_index.dict_key_champion_name_value_champion_id
+        tuple_champion_id_tuple_trait_id = self.champion_trait_index.tuple_champion_id_tuple_trait_id
+        tuple_trait_id_name = self.champion_trait_index.tuple_trait_id_name
+        tuple_trait_id_array_count_discrete = self.champion_trait_index.tuple_trait_id_array_count_discrete
+
+        dict_trait_count = team_composition_container.dict_trait_count
+        dict_trait_count_discrete = team_composition_container.dict_trait_count_discrete
+
         for champion_name in list_composition_combination:
-            champion_object = self.champion_pool.dict_champion_pool_name.get(champion_name)
 
             """
-            For each trait in champion_object, add that trait to team_composition_container, if it doesn't exist in
-            the dict then add it to the dict and assign it a value of 0
+            For each trait id of the champion, add that trait to team_composition_container, defaultdict(int) inside of
+            the TeamCompositionContainer assigns it a value of 0 if it doesn't exist in the dict
             """
-            for trait in champion_object.list_traits:
-                """
-                If key is not in the dict then add it to the dict and assign it a value of 0.
-                
-                from collections import defaultdict
-                defaultdict(int) disregards the code below, it's inside of the TeamCompositionContainer
-                """
-                # if team_composition_container.dict_trait_count.get(trait, False) is False:
-                #     team_composition_container.dict_trait_count[trait] = 0
-                #     team_composition_container.dict_trait_count_discrete[trait] = 0
+            for trait_id in tuple_champion_id_tuple_trait_id[dict_key_champion_name_value_champion_id[champion_name]]:
+                trait = tuple_trait_id_name[trait_id]
 
-                team_composition_container.dict_trait_count[trait] += 1
-
-                trait_object = self.trait_pool.dict_trait_pool.get(trait)
+                dict_trait_count[trait] += 1
 
                 """
+                The lookup table replaces the walk through trait_object.list_divisions, a trait count discrete of 0
+                means that the first division has not been reached so the trait is not added
+                
                 FOR OPTIMIZATION 4
-                Add a few seconds and space in calculation
+                The units until the next division are in champion_trait_index.get_trait_count_discrete_difference()
                 """
-                # for i in reversed(range(len(trait_object.list_divisions))):
-                #     if team_composition_container.dict_trait_count[trait] >= trait_object.list_divisions[i]:
-                #         team_composition_container.dict_trait_count_discrete[trait] = trait_object.list_divisions[i]
-                #         if len(trait_object.list_divisions) == i + 1:
-                #             team_composition_container.dict_trait_count_discrete_difference[trait] = 0
-                #         else:
-                #             team_composition_container.dict_trait_count_discrete_difference[trait] = \
-                #                 trait_object.list_divisions[i + 1] - team_composition_container.dict_trait_count[trait]
-                #         break
+                trait_count_discrete = tuple_trait_id_array_count_discrete[trait_id][dict_trait_count[trait]]
 
-                """
-                USED FOR ANYTHING THAT ISN'T OPTIMIZATION 4
-                SLIGHTLY FASTER, no team_composition_container.dict_trait_count_discrete_difference[trait]
-                """
-                for trait_division in trait_object.list_divisions:
-                    if team_composition_container.dict_trait_count[trait] >= trait_division:
-                        team_composition_container.dict_trait_count_discrete[trait] = trait_division
+                if trait_count_discrete:
+                    dict_trait_count_discrete[trait] = trait_count_discrete
 
         return team_composition_container
 
+    def get_team_composition_container_compact(self,
+                                               list_composition_combination: Iterable[str]
+                                               ) -> TeamCompositionContainerCompact:
+        """
+        Get an object of TeamCompositionContainerCompact given list_composition_combination
+
+        :param list_composition_combination: list of champions in the team composition
+        :return: an object of the TeamCompositionContainerCompact type
+        """
+        return self.get_team_composition_container_compact_from_champion_ids(
+            self.champion_trait_index.get_tuple_champion_id(list_composition_combination))
+
+    def get_team_composition_container_compact_from_champion_ids(self,
+                                                                 iter_champion_ids: Iterable[int]
+                                                                 ) -> TeamCompositionContainerCompact:
+        """
+        Get an object of TeamCompositionContainerCompact given the champion ids of the team composition
+
+        :param iter_champion_ids: champion ids of the champions in the team composition
+        :return: an object of the TeamCompositionContainerCompact type
+        """
+        tuple_champion_id_tuple_trait_id = self.champion_trait_index.tuple_champion_id_tuple_trait_id
+
+        bitmask_team_composition = 0
+
+        array_trait_count = array('B', bytes(self.champion_trait_index.number_traits))
+
+        for champion_id in iter_champion_ids:
+            bitmask_team_composition |= 1 << champion_id
+
+            for trait_id in tuple_champion_id_tuple_trait_id[champion_id]:
+                array_trait_count[trait_id] += 1
+
+        return TeamCompositionContainerCompact(bitmask_team_composition,
+                                               array_trait_count,
+                                               self.champion_trait_index)
+
+    def get_team_composition_container_compact_from_bitmask(self,
+                                                            bitmask_team_composition: int
+                                                            ) -> TeamCompositionContainerCompact:
+        """
+        Get an object of TeamCompositionContainerCompact given the bitmask of the team composition
+
+        :param bitmask_team_composition: bitmask of the champion ids in the team composition
+        :return: an object of the TeamCompositionContainerCompact type
+        """
+        return self.get_team_composition_container_compact_from_champion_ids(
+            self.champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask_team_composition))
+
+    def get_team_composition_container_compact_added(self,
+                                                     team_composition_container_compact: TeamCompositionContainerCompact,
+                                                     champion_id: int) -> TeamCompositionContainerCompact:
+        """
+        Get a new TeamCompositionContainerCompact that is team_composition_container_compact with the champion given by
+        champion_id added to it, only the traits of the added champion are touched
+
+        :param team_composition_container_compact: team composition container to add the champion to
+        :param champion_id: champion id of the champion to add
+        :return: an object of the TeamCompositionContainerCompact type
+        """
+        # Copy of the trait counts (array slicing is a copy)
+        array_trait_count = team_composition_container_compact.array_trait_count[:]
+
+        for trait_id in self.champion_trait_index.tuple_champion_id_tuple_trait_id[champion_id]:
+            array_trait_count[trait_id] += 1
+
+        bitmask_team_composition = team_composition_container_compact.bitmask_team_composition | 1 << champion_id
+
+        return TeamCompositionContainerCompact(bitmask_team_composition,
+                                               array_trait_count,
+                                               self.champion_trait_index)
+
     def sort_tuple_team_composition(self, tuple_team_composition: iter) -> tuple:
         """
         Sort given team composition by unit cost
@@ -95,14 +162,157 @@ class TeamCompositionContainerFactory:
         if not isinstance(tuple_team_composition, list):
             tuple_team_composition = list(tuple_team_composition)
 
+        dict_champion_pool_name = self.champion_pool.dict_champion_pool_name
+
         tuple_team_composition.sort(
             key=lambda champion_name: (
-                self.champion_pool.dict_champion_pool_name.get(champion_name).name_simple,
-                self.champion_pool.dict_champion_pool_name.get(champion_name).cost,
+                dict_champion_pool_name[champion_name].name_simple,
+                dict_champion_pool_name[champion_name].cost,
             )
         )
         return tuple(tuple_team_composition)
 
+    def get_team_composition_container_batch(self,
+                                             iter_tuple_champion_ids: Iterable[Tuple[int, ...]],
+                                             emblem_set: EmblemSet = None
+                                             ) -> TeamCompositionContainerBatch:
+        """
+        Get the traits of a batch of team compositions given as tuples of champion ids
+
+        :param iter_tuple_champion_ids: iterable of team compositions as tuples of champion ids
+        :param emblem_set: emblems added to every team composition (None for no emblems)
+        :return: an object of the TeamCompositionContainerBatch type
+        """
+        list_tuple_champion_ids = list(iter_tuple_champion_ids)
+
+        # Width of the index matrix (Largest team composition in the batch)
+        width = max((len(tuple_champion_ids) for tuple_champion_ids in list_tuple_champion_ids), default=0)
+
+        return self.get_team_composition_container_batch_from_index_matrix(
+            self.get_bytes_index_matrix(list_tuple_champion_ids, width), width, emblem_set)
+
+    @staticmethod
+    def get_bytes_index_matrix(list_tuple_champion_ids: List[Tuple[int, ...]], width: int) -> bytes:
+        """
+        Get the index matrix of team compositions given as tuples of champion ids
+
+        :param list_tuple_champion_ids: list of team compositions as tuples of champion ids
+        :param width: amount of champion ids per row (At least the size of the largest team composition)
+        :return: row major N x width bytes of champion ids padded with CHAMPION_ID_PADDING
+        """
+        # Index matrix where the rows are padded with CHAMPION_ID_PADDING
+        bytearray_index_matrix = bytearray([CHAMPION_ID_PADDING]) * (width * len(list_tuple_champion_ids))
+
+        for row, tuple_champion_ids in enumerate(list_tuple_champion_ids):
+            bytearray_index_matrix[row * width: row * width + len(tuple_champion_ids)] = bytes(tuple_champion_ids)
+
+        return bytes(bytearray_index_matrix)
+
+    def get_bytes_index_matrix_from_names(self, iter_tuple_champion_names: Iterable[Tuple[str, ...]], width: int) -> \
+            bytes:
+        """
+        Get the index matrix of team compositions given as tuples of champion names (The names are turned into
+        champion ids a row at a time by a map instead of a tuple of champion ids per row)
+
+        :param iter_tuple_champion_names: team compositions as tuples of champion names
+        :param width: amount of champion ids per row (At least the size of the largest team composition)
+        :return: row major N x width bytes of champion ids padded with CHAMPION_ID_PADDING
+        """
+        get_champion_id = self.champion_trait_index.dict_key_champion_name_value_champion_id.__getitem__
+
+        bytes_padding = bytes((CHAMPION_ID_PADDING,))
+
+        return b"".join(bytes(map(get_champion_id, tuple_champion_names)).ljust(width, bytes_padding) for
+                        tuple_champion_names in iter_tuple_champion_names)
+
+    def get_team_composition_container_batch_from_bitmasks(self,
+                                                           iter_bitmask_team_composition: Iterable[int]
+                                                           ) -> TeamCompositionContainerBatch:
+        """
+        Get the traits of a batch of team compositions given as bitmasks of champion ids
+
+        :param iter_bitmask_team_composition: iterable of team compositions as bitmasks
+        :return: an object of the TeamCompositionContainerBatch type
+        """
+        return self.get_team_composition_container_batch(
+            self.champion_trait_index.get_tuple_champion_id_from_bitmask(bitmask_team_composition) for
+            bitmask_team_composition in iter_bitmask_team_composition)
+
+    def get_team_composition_container_batch_from_index_matrix(self,
+                                                               bytes_index_matrix: bytes,
+                                                               width: int,
+                                                               emblem_set: EmblemSet = None
+                                                               ) -> TeamCompositionContainerBatch:
+        """
+        Get the traits of a batch of team compositions given as an index matrix
+
+        The trait counts are the index matrix multiplied by the champion x trait incidence matrix, done a column at a
+        time. Translating a column of champion ids with a trait's incidence column gives a bytes of 0s and 1s, reading
+        those as one big little endian int and adding the int of every column adds all the rows at once (a row can't
+        be larger than 255 so it can never carry into the next row). The trait count discrete is another translation
+        and the trait count discrete total is the same big int addition over every trait.
+
+        The emblems of emblem_set are added to the trait count columns before the trait count discrete (See EmblemSet).
+
+        :param bytes_index_matrix: row major N x width bytes of champion ids padded with CHAMPION_ID_PADDING
+        :param width: amount of champion ids per row
+        :param emblem_set: emblems added to every team composition (None for no emblems)
+        :return: an object of the TeamCompositionContainerBatch type
+        """
+        number_rows = len(bytes_index_matrix) // width if width else 0
+
+        # Traits a champion can have (An emblem adds a trait to its holder)
+        trait_amount_max = max(map(len, self.champion_trait_index.tuple_champion_id_tuple_trait_id), default=0)
+
+        if emblem_set:
+            trait_amount_max += emblem_set.get_emblem_count_max()
+
+        # The trait count discrete total of a row is at most width * the most traits a champion has
+        if width * trait_amount_max > 255:
+            raise ValueError("A row of width {} can overflow a byte".format(width))
+
+        # Columns of the index matrix
+        list_bytes_column = [bytes_index_matrix[column::width] for column in range(width)]
+
+        list_bytes_trait_count = []
+
+        for trait_id in range(self.champion_trait_index.number_traits):
+            bytes_incidence = self.champion_trait_index.tuple_trait_id_bytes_incidence[trait_id]
+
+            # Column of the trait count matrix
+            int_trait_count = sum(int.from_bytes(bytes_column.translate(bytes_incidence), "little") for bytes_column in
+                                  list_bytes_column)
+
+            list_bytes_trait_count.append(int_trait_count.to_bytes(number_rows, "little"))
+
+        if emblem_set:
+            # Team composition size of every row (Every champion id that is not CHAMPION_ID_PADDING)
+            bytes_team_composition_size = sum(
+                int.from_bytes(bytes_column.translate(self.champion_trait_index.bytes_champion_id_not_padding),
+                               "little") for bytes_column in list_bytes_column).to_bytes(number_rows, "little")
+
+            list_bytes_trait_count = emblem_set.get_list_bytes_trait_count(tuple(list_bytes_trait_count),
+                                                                           bytes_team_composition_size)
+
+        list_bytes_trait_count_discrete = []
+
+        int_trait_count_discrete_total = 0
+
+        for trait_id, bytes_trait_count in enumerate(list_bytes_trait_count):
+
+            # Column of the trait count discrete matrix
+            bytes_trait_count_discrete = bytes_trait_count.translate(
+                self.champion_trait_index.tuple_trait_id_bytes_count_discrete[trait_id])
+
+            int_trait_count_discrete_total += int.from_bytes(bytes_trait_count_discrete, "little")
+
+            list_bytes_trait_count_discrete.append(bytes_trait_count_discrete)
+
+        return TeamCompositionContainerBatch(number_rows,
+                                             tuple(list_bytes_trait_count),
+                                             tuple(list_bytes_trait_count_discrete),
+                                             int_trait_count_discrete_total.to_bytes(number_rows, "little"))
+
     # TODO: NOT USED
     # @timer(show_arguments=False)
     def get_list_all_team_composition_containers(self, list_list_composition_combination: List[List[tuple]]) -> List[
@@ -120,9 +330,7 @@ class TeamCompositionContainerFactory:
         return list_all_team_composition_containers
 
     def get_tuple_team_composition_transformed_integer(self, tuple_team_composition: tuple):
-        return tuple([self.champion_pool.dict_champion_pool_name[champion_name].index_dict_position for champion_name in
-                     tuple_team_composition])
+        return self.champion_trait_index.get_tuple_champion_id(tuple_team_composition)
 
     def get_tuple_team_composition_transformed_name(self, tuple_team_composition_transformed_integer: tuple):
-        return tuple([self.champion_pool.dict_champion_pool_index_dict_position[integer].name for integer in
-                     tuple_team_composition_transformed_integer])
+        return self.champion_trait_index.get_tuple_champion_name(tuple_team_composition_transformed_integer)
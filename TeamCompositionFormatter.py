@@ -0,0 +1,180 @@
+"""
+10/19/2026
+
+Purpose:
+    Format the rows of the db query into the rows of the Treeview of the TeamCompositionSolverGUI (Or into dicts for
+    the TeamCompositionQueryServer and the BatchQuery reports)
+
+Important Note:
+    Nothing in here uses tkinter so the formatting can be ran (and benchmarked) without a display, the GUI only
+    changes the headings of the Treeview after the rows are formatted.
+
+"""
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Tuple
+
+from Teamfight_Tactics_Composition_Solver.EmblemSet import EmblemSet
+from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerFactory import TeamCompositionContainerFactory
+
+# Index states of a column of the Treeview
+INDEX_STATE_NO_SORT = 0
+INDEX_STATE_ASCENDING = 1
+INDEX_STATE_DESCENDING = 2
+
+# Index of the columns of a row of the Treeview (The trait columns follow in the order of the trait ids)
+INDEX_COLUMN_TEAM_COMPOSITION = 0
+INDEX_COLUMN_TEAM_COMPOSITION_SIZE = 1
+INDEX_COLUMN_TRAIT_COUNT_TOTAL = 2
+
+# Default sort of the GUI (Ascending names, descending trait count discrete total)
+TUPLE_INDEX_INDEX_STATE_DEFAULT = ((INDEX_COLUMN_TEAM_COMPOSITION, INDEX_STATE_ASCENDING),
+                                   (INDEX_COLUMN_TEAM_COMPOSITION_SIZE, INDEX_STATE_NO_SORT),
+                                   (INDEX_COLUMN_TRAIT_COUNT_TOTAL, INDEX_STATE_DESCENDING))
+
+
+def get_list_tuples_to_be_inserted(team_composition_container_factory: TeamCompositionContainerFactory,
+                                   list_tuple_db_result: list,
+                                   bool_trait_count_discrete: bool,
+                                   emblem_set: EmblemSet = None) -> List[list]:
+    """
+    Format the results of the SQLite query to be inserted into the Treeview
+
+    :param team_composition_container_factory: TeamCompositionContainerFactory object
+    :param list_tuple_db_result: rows from SQLiteHandlerTeamCompositionSolver.get_pickled_list_tuple_champion_composition
+    :param bool_trait_count_discrete: use the trait count discrete for the trait columns instead of the trait count
+    :param emblem_set: emblems added to every team composition, the trait columns and the trait count total are the
+        ones with the emblems (None for no emblems), only the rows given are re-scored (See EmblemSet)
+    :return: list of the rows of the Treeview
+    """
+    list_tuples_to_be_inserted = []
+
+    """
+    It's actually faster to get the traits of all the team compositions in one batch rather than the massive join
+    table in SQLite as it's load time is very long.
+    """
+    team_composition_container_batch = team_composition_container_factory.get_team_composition_container_batch(
+        (team_composition_container_factory.get_tuple_team_composition_transformed_integer(tuple_db_result[1]) for
+         tuple_db_result in list_tuple_db_result), emblem_set)
+
+    # Use the trait count discrete
+    if bool_trait_count_discrete:
+        tuple_trait_id_bytes_trait = team_composition_container_batch.tuple_trait_id_bytes_trait_count_discrete
+
+    # Use the trait count
+    else:
+        tuple_trait_id_bytes_trait = team_composition_container_batch.tuple_trait_id_bytes_trait_count
+
+    # Format the tuples from list_tuple_db_result
+    for row, tuple_db_result in enumerate(list_tuple_db_result):  # type: list
+        list_temp = []
+
+        # Tuple of the team composition sorted by name then cost
+        tuple_team_composition_sorted = team_composition_container_factory.sort_tuple_team_composition(
+            tuple_db_result[1])
+
+        # String of the team composition names
+        team_composition_names = ", ".join(tuple_team_composition_sorted)
+
+        # Team composition
+        list_temp.append(team_composition_names)  # Column 1 on Treeview
+
+        # Team Composition Size
+        list_temp.append(tuple_db_result[2])  # Column 2 on Treeview
+
+        # Trait Count Total (The db has the trait count total without the emblems)
+        if emblem_set:
+            list_temp.append(team_composition_container_batch.bytes_trait_count_discrete_total[row])  # Column 3
+        else:
+            list_temp.append(tuple_db_result[3])  # Column 3 on Treeview
+
+        # For each trait (Ordered by trait id which is the order of the trait_pool)
+        for bytes_trait in tuple_trait_id_bytes_trait:
+
+            # Team composition trait
+            team_composition_trait = bytes_trait[row]
+
+            # If the Team composition has the trait
+            if team_composition_trait:
+                list_temp.append(str(team_composition_trait))
+
+            # If it does not have the trait then leave the cell empty
+            else:
+                list_temp.append("")
+
+        # Add the tuple to list of tuples to tbe inserted
+        list_tuples_to_be_inserted.append(list_temp)
+
+    return list_tuples_to_be_inserted
+
+
+def sort_list_tuples_to_be_inserted(list_tuples_to_be_inserted: List[list],
+                                    iter_tuple_index_index_state: Iterable[Tuple[int, int]]):
+    """
+    Sort the rows of the Treeview in place by every column that has a sort state, the columns are sorted in order so
+    the last sorted column is the primary sort (Python's sort is stable)
+
+    :param list_tuples_to_be_inserted: list of the rows of the Treeview
+    :param iter_tuple_index_index_state: iterable of (column index, index state)
+    :return: None
+    """
+    for index, index_state in iter_tuple_index_index_state:
+
+        # Sort the list of tuples by the tuple's index item using python's sorting algorithm
+        if index_state == INDEX_STATE_ASCENDING:
+            list_tuples_to_be_inserted.sort(key=lambda list_item: list_item[index])
+
+        # Sort the list of tuples by the tuple's index item in reverse using python's sorting algorithm
+        elif index_state == INDEX_STATE_DESCENDING:
+            list_tuples_to_be_inserted.sort(key=lambda list_item: list_item[index], reverse=True)
+
+
+def get_list_tuples_to_be_inserted_trait_count_total(list_tuples_to_be_inserted: List[list],
+                                                     trait_count_discrete_total_min: int,
+                                                     trait_count_discrete_total_max: int) -> List[list]:
+    """
+    Get the rows of the Treeview with a trait count total between the min and the max (For the totals with emblems that
+    can not be filtered by the db)
+
+    :param list_tuples_to_be_inserted: list of the rows of the Treeview
+    :param trait_count_discrete_total_min: min trait count total
+    :param trait_count_discrete_total_max: max trait count total
+    :return: list of the rows of the Treeview
+    """
+    return [list_tuple_to_be_inserted for list_tuple_to_be_inserted in list_tuples_to_be_inserted if
+            trait_count_discrete_total_min <= list_tuple_to_be_inserted[INDEX_COLUMN_TRAIT_COUNT_TOTAL] <=
+            trait_count_discrete_total_max]
+
+
+def get_list_dict_team_composition(list_tuples_to_be_inserted: List[list], tuple_trait_id_name: Tuple[str, ...]) -> \
+        List[dict]:
+    """
+    Turn the rows of the Treeview into json serializable dicts
+
+    :param list_tuples_to_be_inserted: rows from get_list_tuples_to_be_inserted
+    :param tuple_trait_id_name: trait names in the order of the trait columns (ChampionTraitIndex.tuple_trait_id_name)
+    :return: list of dict of the team compositions (Only the traits the team composition has are in its traits)
+    """
+    return [{"team_composition": list_tuple_to_be_inserted[INDEX_COLUMN_TEAM_COMPOSITION].split(", "),
+             "team_composition_size": list_tuple_to_be_inserted[INDEX_COLUMN_TEAM_COMPOSITION_SIZE],
+             "trait_count_discrete_total": list_tuple_to_be_inserted[INDEX_COLUMN_TRAIT_COUNT_TOTAL],
+             "traits": {trait_name: int(trait_count) for trait_name, trait_count in
+                        zip(tuple_trait_id_name, list_tuple_to_be_inserted[INDEX_COLUMN_TRAIT_COUNT_TOTAL + 1:]) if
+                        trait_count}}
+            for list_tuple_to_be_inserted in list_tuples_to_be_inserted]
+
+
+def get_dict_key_champion_name_value_facet_count(list_tuple_db_result: list,
+                                                 iter_champion_names: Iterable[str]) -> Dict[str, int]:
+    """
+    Count the rows of the db query that have each champion in one pass over the rows (Adding a champion to the
+    included champions of the query would give that many rows, an excluded champion is always 0)
+
+    :param list_tuple_db_result: rows from SQLiteHandlerTeamCompositionSolver.get_pickled_list_tuple_champion_composition
+    :param iter_champion_names: champion names to count
+    :return: dict of champion name -> rows with the champion
+    """
+    counter_champion_name = Counter(chain.from_iterable(tuple_db_result[1] for tuple_db_result in
+                                                        list_tuple_db_result))
+
+    return {champion_name: counter_champion_name.get(champion_name, 0) for champion_name in iter_champion_names}
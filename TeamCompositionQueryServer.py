@@ -0,0 +1,611 @@
+"""
+10/19/2026
+
+Purpose:
+    Headless HTTP/JSON service of the team composition queries of the GUI (Selected champions, excluded champions,
+    team composition size and trait count discrete total) so the analysts and the overlay tool share one warm
+    TeamCompositionSolver instead of each loading the data
+
+Important Note:
+    Endpoints (GET, the query can also be POSTed as a json object with the same keys):
+
+        /health
+        /champions
+        /traits
+        /emblems
+        /builds?components=1,2,Spatula,Spatula
+        /upgrades?board=Ahri,Annie&add=2&exclude=Lux&page=0&page_size=50
+        /query?include=Ahri,Annie&exclude=Lux&size_min=0&size_max=9&trait_total_min=0&trait_total_max=100
+              &trait_count_discrete=1&emblems=58,Celestial Orb&level=8&limit=100&format=ndjson
+
+    format=json (default) returns a single json object, format=ndjson streams one json object per team composition.
+    include must have at least one champion (Same as the GUI, the team composition table is too big to send).
+
+    emblems are item ids or item names (Repeated for more than one of the same emblem), the traits and the trait count
+    discrete total of the results are the ones with the emblems on their best holders, trait_total_min and
+    trait_total_max filter those totals and Force of Nature adds to size_max. The results with emblems are limited to
+    the team compositions of the db (Built without emblems), a team composition that is only useful or only connected
+    with the emblems is not returned (See EmblemSet).
+
+    level adds the rerolls and gold to collect every team composition at that player level (ShopSimulator) and ranks
+    the team compositions by the gold (Least first, the sort of the GUI breaks the ties), it is applied after the cache
+    like the limit.
+
+    builds are the maximal completed item builds of the held components (ItemRecipeTable), the item ids of a build can
+    be given to emblems as is.
+
+    upgrades are the team compositions reachable from the board by adding add champions (SupersetIndex), a page of
+    them best trait count discrete total first, the pages of a board are served from the cache of the SupersetIndex.
+
+    Requests are handled by a fixed amount of worker threads, requests that come in while SERVER_QUEUE_SIZE requests
+    are already waiting are refused with 503 instead of piling up. A query that takes longer than the request
+    timeout is interrupted and answered with 504.
+
+    Results are shared by every client through a LRU cache keyed by the normalized query (The order of the champions
+    does not matter), the limit and the format are applied after the cache.
+
+        python main.py --serve --port 8765
+
+"""
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from Teamfight_Tactics_Composition_Solver.Instrumentation import increment_counter, span
+from Teamfight_Tactics_Composition_Solver.TeamCompositionFormatter import get_list_tuples_to_be_inserted, \
+    sort_list_tuples_to_be_inserted, get_list_dict_team_composition, TUPLE_INDEX_INDEX_STATE_DEFAULT, \
+    get_list_tuples_to_be_inserted_trait_count_total
+from Teamfight_Tactics_Composition_Solver.TeamCompositionSolver import TeamCompositionSolver
+from Teamfight_Tactics_Composition_Solver.constants import SERVER_HOST, SERVER_PORT, SERVER_WORKERS, \
+    SERVER_QUEUE_SIZE, SERVER_REQUEST_TIMEOUT_SEC, SERVER_CACHE_SIZE, TEAM_COMPOSITION_SIZE_MIN, \
+    TEAM_COMPOSITION_SIZE_MAX, TRAIT_COUNT_DISCRETE_TOTAL_MIN, TRAIT_COUNT_TOTAL_MAX, UPGRADE_PATH_PAGE_SIZE
+
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_NDJSON = "application/x-ndjson"
+
+# Largest POST body read
+CONTENT_LENGTH_MAX = 1 << 16
+
+
+class QueryError(Exception):
+    def __init__(self, status: int, message: str):
+        """
+        Error of a request that is answered with its status
+
+        :param status: HTTP status
+        :param message: message sent to the client
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class _HTTPServerBounded(HTTPServer):
+
+    def __init__(self, server_address: Tuple[str, int], team_composition_query_server: "TeamCompositionQueryServer",
+                 workers: int, queue_size: int):
+        """
+        HTTPServer whose requests are handled by a bounded pool of worker threads
+
+        :param server_address: (host, port)
+        :param team_composition_query_server: TeamCompositionQueryServer that answers the requests
+        :param workers: amount of worker threads
+        :param queue_size: amount of requests that can wait for a worker
+        """
+        super().__init__(server_address, _TeamCompositionQueryRequestHandler)
+
+        self.team_composition_query_server = team_composition_query_server
+
+        self.thread_pool_executor = ThreadPoolExecutor(max_workers=workers,
+                                                       thread_name_prefix="TeamCompositionQueryServer")
+
+        # Requests being handled or waiting for a worker
+        self.bounded_semaphore_request = threading.BoundedSemaphore(workers + queue_size)
+
+    def process_request(self, request, client_address):
+        """
+        Give the request to a worker or refuse it if too many requests are waiting
+
+        :param request: socket of the request
+        :param client_address: address of the client
+        :return: None
+        """
+        if not self.bounded_semaphore_request.acquire(blocking=False):
+            increment_counter("server.request_refused")
+
+            bytes_body = json.dumps({"error": "Too many requests"}).encode()
+
+            try:
+                request.sendall("HTTP/1.0 503 Service Unavailable\r\nContent-Type: {}\r\nContent-Length: {}\r\n"
+                                "Retry-After: 1\r\n\r\n".format(CONTENT_TYPE_JSON, len(bytes_body)).encode() +
+                                bytes_body)
+            except OSError:
+                pass
+
+            self.shutdown_request(request)
+            return
+
+        self.thread_pool_executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+
+        except Exception:
+            self.handle_error(request, client_address)
+
+        finally:
+            self.shutdown_request(request)
+            self.bounded_semaphore_request.release()
+
+    def server_close(self):
+        super().server_close()
+        self.thread_pool_executor.shutdown(wait=True)
+
+
+class _TeamCompositionQueryRequestHandler(BaseHTTPRequestHandler):
+    server_version = "TeamCompositionQueryServer"
+
+    def setup(self):
+        # Sec before reading the request is abandoned
+        self.timeout = self.server.team_composition_query_server.timeout
+        super().setup()
+
+    def do_GET(self):
+        url_parsed = urlparse(self.path)
+
+        self._handle(url_parsed.path, {key: list_value[-1] for key, list_value in parse_qs(url_parsed.query).items()})
+
+    def do_POST(self):
+        url_parsed = urlparse(self.path)
+
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+
+            if content_length > CONTENT_LENGTH_MAX:
+                raise QueryError(413, "Body is larger than {} bytes".format(CONTENT_LENGTH_MAX))
+
+            dict_parameters = json.loads(self.rfile.read(content_length) or b"{}")
+
+            if not isinstance(dict_parameters, dict):
+                raise QueryError(400, "Body must be a json object")
+
+        except QueryError as e:
+            self._send_json(e.status, {"error": str(e)})
+            return
+
+        except ValueError as e:
+            self._send_json(400, {"error": "Body is not json: {}".format(e)})
+            return
+
+        self._handle(url_parsed.path, dict_parameters)
+
+    def _handle(self, path: str, dict_parameters: dict):
+        """
+        Answer the request of an endpoint
+
+        :param path: path of the url
+        :param dict_parameters: parameters of the query
+        :return: None
+        """
+        team_composition_query_server = self.server.team_composition_query_server  # type: TeamCompositionQueryServer
+
+        increment_counter("server.request")
+
+        try:
+            with span("server.request", path=path):
+                if path == "/health":
+                    self._send_json(200, {"status": "ok"})
+
+                elif path == "/champions":
+                    self._send_json(200, team_composition_query_server.get_list_dict_champion())
+
+                elif path == "/traits":
+                    self._send_json(200, team_composition_query_server.get_list_dict_trait())
+
+                elif path == "/emblems":
+                    self._send_json(200, team_composition_query_server.get_list_dict_emblem())
+
+                elif path == "/builds":
+                    self._send_json(200, team_composition_query_server.get_list_dict_build(
+                        dict_parameters.get("components")))
+
+                elif path == "/upgrades":
+                    self._send_json(200, team_composition_query_server.get_dict_upgrade_path(dict_parameters))
+
+                elif path == "/query":
+                    dict_query = team_composition_query_server.get_dict_query(dict_parameters)
+
+                    list_dict_team_composition = team_composition_query_server.get_list_dict_team_composition(
+                        dict_query)
+
+                    if dict_query["level"] is not None:
+                        list_dict_team_composition = team_composition_query_server.get_list_dict_team_composition_shop(
+                            list_dict_team_composition, dict_query["level"])
+
+                    if dict_query["limit"] is not None:
+                        list_dict_team_composition = list_dict_team_composition[:dict_query["limit"]]
+
+                    if dict_query["format"] == FORMAT_NDJSON:
+                        self._send_ndjson(list_dict_team_composition)
+
+                    else:
+                        self._send_json(200, {"count": len(list_dict_team_composition),
+                                              "team_compositions": list_dict_team_composition})
+
+                else:
+                    raise QueryError(404, "Unknown path {}".format(path))
+
+        except QueryError as e:
+            self._send_json(e.status, {"error": str(e)})
+
+        except TimeoutError as e:
+            increment_counter("server.request_timeout")
+            self._send_json(504, {"error": str(e)})
+
+    def _send_json(self, status: int, object_json):
+        bytes_body = json.dumps(object_json).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", CONTENT_TYPE_JSON)
+        self.send_header("Content-Length", str(len(bytes_body)))
+        self.end_headers()
+        self.wfile.write(bytes_body)
+
+    def _send_ndjson(self, list_dict_team_composition: List[dict]):
+        # HTTP/1.0 so the end of the stream is the end of the connection
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE_NDJSON)
+        self.end_headers()
+
+        for dict_team_composition in list_dict_team_composition:
+            self.wfile.write(json.dumps(dict_team_composition).encode())
+            self.wfile.write(b"\n")
+
+    def log_message(self, format, *args):
+        # The GUI and the build print to stdout, the access log would drown them out
+        pass
+
+
+class TeamCompositionQueryServer:
+
+    def __init__(self,
+                 team_composition_solver: TeamCompositionSolver,
+                 host: str = SERVER_HOST,
+                 port: int = SERVER_PORT,
+                 workers: int = SERVER_WORKERS,
+                 queue_size: int = SERVER_QUEUE_SIZE,
+                 timeout: float = SERVER_REQUEST_TIMEOUT_SEC,
+                 cache_size: int = SERVER_CACHE_SIZE):
+        """
+        HTTP/JSON service of the team composition queries
+
+        :param team_composition_solver: TeamCompositionSolver object (Loaded once for every client)
+        :param host: host to listen on
+        :param port: port to listen on (0 for any free port)
+        :param workers: requests handled at the same time
+        :param queue_size: requests that can wait for a worker
+        :param timeout: sec before reading a request or its query is abandoned
+        :param cache_size: query results kept
+        """
+        self.team_composition_solver = team_composition_solver
+        self.team_composition_container_factory = team_composition_solver.team_composition_container_factory
+        self.champion_trait_index = team_composition_solver.champion_trait_index
+
+        self.timeout = timeout  # type: float
+        self.cache_size = cache_size  # type: int
+
+        # Lower case champion name -> champion name (Clients do not have to match the case of champions.json)
+        self.dict_key_champion_name_lower_value_champion_name = {
+            champion_name.lower(): champion_name for champion_name in
+            team_composition_solver.champion_pool.dict_champion_pool_name}  # type: Dict[str, str]
+
+        # Normalized query -> list of dict of the team compositions (Most recently used last)
+        self.ordered_dict_key_query_value_list_dict_team_composition = OrderedDict()  # type: OrderedDict
+
+        self.lock_cache = threading.Lock()
+
+        self.http_server = _HTTPServerBounded((host, port), self, workers, queue_size)
+
+    @property
+    def server_address(self) -> Tuple[str, int]:
+        return self.http_server.server_address
+
+    def _get_list_champion_name(self, value, key: str) -> List[str]:
+        """
+        Get the champion names of a parameter ("Ahri,Annie" or ["Ahri", "Annie"])
+
+        :param value: value of the parameter
+        :param key: name of the parameter (For the error message)
+        :return: list of champion names
+        """
+        if value is None:
+            return []
+
+        if isinstance(value, str):
+            value = [champion_name for champion_name in value.split(",") if champion_name.strip()]
+
+        if not isinstance(value, list):
+            raise QueryError(400, "{} must be a list of champion names".format(key))
+
+        list_champion_name = []
+
+        for champion_name in value:
+            champion_name_found = self.dict_key_champion_name_lower_value_champion_name.get(
+                str(champion_name).strip().lower())
+
+            if champion_name_found is None:
+                raise QueryError(400, "Unknown champion {} in {}".format(champion_name, key))
+
+            list_champion_name.append(champion_name_found)
+
+        return list_champion_name
+
+    def _get_emblem_set(self, value):
+        """
+        Get the EmblemSet of a parameter ("58,Celestial Orb" or [58, "Celestial Orb"])
+
+        :param value: value of the parameter
+        :return: EmblemSet object, None if there are no emblems
+        """
+        if value is None:
+            return None
+
+        if isinstance(value, str):
+            value = [item_key.strip() for item_key in value.split(",") if item_key.strip()]
+
+        if not isinstance(value, list):
+            raise QueryError(400, "emblems must be a list of item ids or item names")
+
+        try:
+            emblem_set = self.team_composition_solver.get_emblem_set(value)
+        except KeyError as e:
+            raise QueryError(400, "Unknown item {} in emblems".format(e))
+
+        return emblem_set or None
+
+    @staticmethod
+    def _get_int(dict_parameters: dict, key: str, default: int):
+        value = dict_parameters.get(key)
+
+        if value is None or value == "":
+            return default
+
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise QueryError(400, "{} must be an integer".format(key))
+
+    def get_dict_query(self, dict_parameters: dict) -> dict:
+        """
+        Validate and normalize the parameters of a query
+
+        :param dict_parameters: parameters from the url or the json body
+        :return: dict of the query
+        """
+        list_champion_name_include = self._get_list_champion_name(dict_parameters.get("include"), "include")
+
+        if not list_champion_name_include:
+            raise QueryError(400, "include must have at least one champion")
+
+        format_response = dict_parameters.get("format") or FORMAT_JSON
+
+        if format_response not in (FORMAT_JSON, FORMAT_NDJSON):
+            raise QueryError(400, "format must be {} or {}".format(FORMAT_JSON, FORMAT_NDJSON))
+
+        limit = self._get_int(dict_parameters, "limit", None)
+
+        if limit is not None and limit < 0:
+            raise QueryError(400, "limit must be positive")
+
+        emblem_set = self._get_emblem_set(dict_parameters.get("emblems"))
+
+        level = self._get_int(dict_parameters, "level", None)
+
+        if level is not None and level not in self.team_composition_solver.shop_simulator.dict_key_level_value_tuple_shop_odds:
+            raise QueryError(400, "There are no shop odds for level {}".format(level))
+
+        return {"include": tuple(sorted(set(list_champion_name_include))),
+                "exclude": tuple(sorted(set(self._get_list_champion_name(dict_parameters.get("exclude"),
+                                                                         "exclude")))),
+                "size_min": self._get_int(dict_parameters, "size_min", TEAM_COMPOSITION_SIZE_MIN),
+                "size_max": self._get_int(dict_parameters, "size_max", TEAM_COMPOSITION_SIZE_MAX),
+                "trait_total_min": self._get_int(dict_parameters, "trait_total_min", TRAIT_COUNT_DISCRETE_TOTAL_MIN),
+                "trait_total_max": self._get_int(dict_parameters, "trait_total_max", TRAIT_COUNT_TOTAL_MAX),
+                "trait_count_discrete": str(dict_parameters.get("trait_count_discrete", "0")).lower() in (
+                    "1", "true"),
+                "emblems": emblem_set.tuple_item_id if emblem_set else (),
+                "emblem_set": emblem_set,
+                "level": level,
+                "limit": limit,
+                "format": format_response}
+
+    def get_list_dict_team_composition(self, dict_query: dict) -> List[dict]:
+        """
+        Get the team compositions of a query from the cache or from the db
+
+        :param dict_query: dict from get_dict_query
+        :return: list of dict of the team compositions (Shared by the cache, do not change it)
+        """
+        key_query = (dict_query["include"], dict_query["exclude"], dict_query["size_min"], dict_query["size_max"],
+                     dict_query["trait_total_min"], dict_query["trait_total_max"], dict_query["trait_count_discrete"],
+                     dict_query["emblems"])
+
+        with self.lock_cache:
+            list_dict_team_composition = self.ordered_dict_key_query_value_list_dict_team_composition.get(key_query)
+
+            if list_dict_team_composition is not None:
+                self.ordered_dict_key_query_value_list_dict_team_composition.move_to_end(key_query)
+                increment_counter("server.cache_hit")
+                return list_dict_team_composition
+
+        increment_counter("server.cache_miss")
+
+        emblem_set = dict_query["emblem_set"]
+
+        # The trait count discrete totals in the db are without the emblems so they are filtered after the emblems
+        if emblem_set:
+            size_max = dict_query["size_max"] + emblem_set.team_composition_size_delta
+            trait_total_min = TRAIT_COUNT_DISCRETE_TOTAL_MIN
+            trait_total_max = TRAIT_COUNT_TOTAL_MAX
+
+        else:
+            size_max = dict_query["size_max"]
+            trait_total_min = dict_query["trait_total_min"]
+            trait_total_max = dict_query["trait_total_max"]
+
+        # Two clients asking for the same query at the same time both query the db, the second result is kept
+        list_tuple_db_result = self.team_composition_solver.sqlite_handler_team_composition_solver.get_pickled_list_tuple_champion_composition(
+            dict_query["include"],
+            dict_query["exclude"],
+            dict_query["size_min"],
+            size_max,
+            trait_total_min,
+            trait_total_max,
+            timeout=self.timeout)
+
+        list_tuples_to_be_inserted = get_list_tuples_to_be_inserted(self.team_composition_container_factory,
+                                                                    list_tuple_db_result,
+                                                                    dict_query["trait_count_discrete"],
+                                                                    emblem_set)
+
+        if emblem_set:
+            list_tuples_to_be_inserted = get_list_tuples_to_be_inserted_trait_count_total(
+                list_tuples_to_be_inserted, dict_query["trait_total_min"], dict_query["trait_total_max"])
+
+        sort_list_tuples_to_be_inserted(list_tuples_to_be_inserted, TUPLE_INDEX_INDEX_STATE_DEFAULT)
+
+        list_dict_team_composition = get_list_dict_team_composition(list_tuples_to_be_inserted,
+                                                                    self.champion_trait_index.tuple_trait_id_name)
+
+        with self.lock_cache:
+            self.ordered_dict_key_query_value_list_dict_team_composition[key_query] = list_dict_team_composition
+
+            while len(self.ordered_dict_key_query_value_list_dict_team_composition) > self.cache_size:
+                self.ordered_dict_key_query_value_list_dict_team_composition.popitem(last=False)
+
+        return list_dict_team_composition
+
+    def get_list_dict_team_composition_shop(self, list_dict_team_composition: List[dict], level: int) -> List[dict]:
+        """
+        Add the shop simulation of every team composition and rank them by the gold to collect them
+
+        :param list_dict_team_composition: list of dict of the team compositions (Not changed)
+        :param level: player level
+        :return: new list of dict of the team compositions with "shop", least gold first
+        """
+        shop_simulator = self.team_composition_solver.shop_simulator
+
+        list_shop_simulation_result = shop_simulator.get_list_shop_simulation_result(
+            (self.champion_trait_index.get_tuple_champion_id(dict_team_composition["team_composition"]) for
+             dict_team_composition in list_dict_team_composition), level)
+
+        list_tuple_gold_dict_team_composition = [
+            (shop_simulation_result.gold_mean, dict(dict_team_composition, shop=shop_simulation_result.get_dict()))
+            for dict_team_composition, shop_simulation_result in
+            zip(list_dict_team_composition, list_shop_simulation_result)]
+
+        list_tuple_gold_dict_team_composition.sort(key=lambda tuple_gold_dict_team_composition:
+                                                   tuple_gold_dict_team_composition[0])
+
+        return [dict_team_composition for _, dict_team_composition in list_tuple_gold_dict_team_composition]
+
+    def get_list_dict_champion(self) -> List[dict]:
+        return [{"name": champion.name, "cost": champion.cost, "traits": champion.list_traits} for champion in
+                self.team_composition_solver.champion_pool.dict_champion_pool_name.values()]
+
+    def get_list_dict_trait(self) -> List[dict]:
+        return [{"name": trait_name,
+                 "champions": [self.champion_trait_index.tuple_champion_id_name[champion_id] for champion_id in
+                               range(self.champion_trait_index.number_champions) if
+                               trait_id in self.champion_trait_index.tuple_champion_id_tuple_trait_id[champion_id]]}
+                for trait_id, trait_name in enumerate(self.champion_trait_index.tuple_trait_id_name)]
+
+    def get_list_dict_emblem(self) -> List[dict]:
+        return [{"id": item.item_id,
+                 "name": item.name,
+                 "trait": item.trait_emblem or None,
+                 "team_composition_size": item.get_team_composition_size_delta()}
+                for item in self.team_composition_solver.item_pool.get_list_item_emblem()]
+
+    def get_list_dict_build(self, value) -> List[dict]:
+        """
+        Get the maximal builds of a parameter of held components ("1,2,Spatula" or [1, 2, "Spatula"])
+
+        :param value: value of the parameter
+        :return: list of dict of the builds
+        """
+        if value is None:
+            value = []
+
+        if isinstance(value, str):
+            value = [item_key.strip() for item_key in value.split(",") if item_key.strip()]
+
+        if not isinstance(value, list):
+            raise QueryError(400, "components must be a list of item ids or item names")
+
+        try:
+            tuple_build = self.team_composition_solver.item_recipe_table.get_tuple_build(value)
+        except KeyError as e:
+            raise QueryError(400, "Unknown item {} in components".format(e))
+        except ValueError as e:
+            raise QueryError(400, str(e))
+
+        return [{"items": list(tuple_item_id), "components_left_over": list(tuple_component_id_left_over)} for
+                tuple_item_id, tuple_component_id_left_over in tuple_build]
+
+    def get_dict_upgrade_path(self, dict_parameters: dict) -> dict:
+        """
+        Get a page of the upgrade path of a board
+
+        :param dict_parameters: parameters from the url or the json body
+        :return: json serializable dict of the page
+        """
+        list_champion_name_board = self._get_list_champion_name(dict_parameters.get("board"), "board")
+
+        amount_add = self._get_int(dict_parameters, "add", 1)
+
+        if not 0 <= amount_add <= TEAM_COMPOSITION_SIZE_MAX - len(set(list_champion_name_board)):
+            raise QueryError(400, "add must be between 0 and {}".format(
+                TEAM_COMPOSITION_SIZE_MAX - len(set(list_champion_name_board))))
+
+        page = self._get_int(dict_parameters, "page", 0)
+        page_size = self._get_int(dict_parameters, "page_size", UPGRADE_PATH_PAGE_SIZE)
+
+        if page < 0 or page_size <= 0:
+            raise QueryError(400, "page must be positive and page_size must be more than 0")
+
+        return self.team_composition_solver.get_dict_upgrade_path(
+            list_champion_name_board, amount_add, page, page_size,
+            self._get_list_champion_name(dict_parameters.get("exclude"), "exclude"))
+
+    def serve_forever(self):
+        """
+        Handle requests until shutdown is called (Or KeyboardInterrupt)
+
+        :return: None
+        """
+        print("Serving team composition queries on http://{}:{}".format(*self.server_address[:2]))
+
+        try:
+            self.http_server.serve_forever()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            self.http_server.server_close()
+
+    def shutdown(self):
+        """
+        Stop serve_forever from another thread
+
+        :return: None
+        """
+        self.http_server.shutdown()
@@ -7,29 +7,54 @@ Purpose:
     ChampionPool, TraitPool, and SQLiteHandlerTeamCompositionSolver.
 
 """
+import json
 import os
 import pickle
-from collections import defaultdict
+import shutil
+import threading
 from concurrent.futures.process import ProcessPoolExecutor
-from typing import Set, FrozenSet, Tuple, List
-
+from array import array
+from typing import Dict, Set, FrozenSet, Tuple, List
+
+from Teamfight_Tactics_Composition_Solver.ChampionTraitIndex import ChampionTraitIndex
+from Teamfight_Tactics_Composition_Solver.EmblemSet import EmblemSet
+from Teamfight_Tactics_Composition_Solver.Instrumentation import traced
+from Teamfight_Tactics_Composition_Solver.ItemPool import ItemPool
+from Teamfight_Tactics_Composition_Solver.ItemRecipeTable import ItemRecipeTable
 from Teamfight_Tactics_Composition_Solver.ChamptionPool import ChampionPool
+from Teamfight_Tactics_Composition_Solver.PoolDifference import PoolDifference
+from Teamfight_Tactics_Composition_Solver.PostingIndex import PostingIndex, get_posting_index_from_tuple_array, \
+    get_tuple_array_team_composition_index
+from Teamfight_Tactics_Composition_Solver.ShopSimulator import ShopSimulator
+from Teamfight_Tactics_Composition_Solver.SummaryStatistics import SummaryStatistics
+from Teamfight_Tactics_Composition_Solver.SupersetIndex import SupersetIndex
+from Teamfight_Tactics_Composition_Solver.SupersetTrie import SupersetTrie
 from Teamfight_Tactics_Composition_Solver.SQLiteHandlerTeamCompositionSolver import \
     SQLiteHandlerTeamCompositionSolver, _create_db_champion_tables
 from Teamfight_Tactics_Composition_Solver.TeamCompositionCombinationsSearcher import \
     TeamCompositionCombinationsSearcher
 from Teamfight_Tactics_Composition_Solver.TeamCompositionContainerFactory import \
     TeamCompositionContainerFactory
+from Teamfight_Tactics_Composition_Solver.TeamCompositionFormatter import get_dict_key_champion_name_value_facet_count
 from Teamfight_Tactics_Composition_Solver.TraitPool import TraitPool
 from Teamfight_Tactics_Composition_Solver.constants import PICKLE_SET_FROZENSET_NAME, \
-    PICKLE_LIST_TUPLE_NAME
-from josephs_resources.Decorators.V1.MemoryUsage import memory_usage
-from josephs_resources.Decorators.V2.Timer import timer
+    PICKLE_LIST_TUPLE_NAME, FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION, DIR_BUILD_RECORD, \
+    NAME_BUILD_RECORD_CHAMPIONS, NAME_BUILD_RECORD_TRAITS, NAME_BUILD_RECORD, PATH_ITEMS, UPGRADE_PATH_PAGE_SIZE, \
+    TEAM_COMPOSITION_SIZE_MIN, TEAM_COMPOSITION_SIZE_MAX, TEAM_COMPOSITION_BATCH_SIZE, \
+    TRAIT_COUNT_DISCRETE_TOTAL_MIN, TRAIT_COUNT_TOTAL_MAX, INCREMENTAL_BUILD_UPDATED, INCREMENTAL_BUILD_UP_TO_DATE, \
+    INCREMENTAL_BUILD_NOT_APPLIED
 
 
 class TeamCompositionSolver:
 
-    def __init__(self, path_champions: str, path_traits: str):
+    def __init__(self,
+                 path_champions: str,
+                 path_traits: str,
+                 path_pickle_list_tuple: str = PICKLE_LIST_TUPLE_NAME,
+                 path_db: str = FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION,
+                 dir_build_record: str = DIR_BUILD_RECORD,
+                 bool_db_immutable: bool = False,
+                 path_items: str = PATH_ITEMS):
         """
         Creates the TeamCompositionCombinationsSearcher to get the TFT team composition combinations,
         accesses the SQLiteHandlerTeamCompositionSolver and serves as the intermediate between the database and all
@@ -37,30 +62,58 @@ class TeamCompositionSolver:
 
         :param path_champions: path to json file of champions
         :param path_traits: path to json file to traits of the champions
+        :param path_pickle_list_tuple: path to the pickle file of the list of tuples of the team compositions
+        :param path_db: path to the db file of the team compositions
+        :param dir_build_record: path to the dir of the inputs the generated files were made with
+        :param bool_db_immutable: the db will not be changed by this object (Its queries skip locking)
+        :param path_items: path to json file of the items (The emblems)
         """
 
+        # Paths to the json files the pools are made from
+        self.path_champions = path_champions  # type: str
+        self.path_traits = path_traits  # type: str
+
+        # Paths to the generated files
+        self.path_pickle_list_tuple = path_pickle_list_tuple  # type: str
+        self.path_db = path_db  # type: str
+        self.dir_build_record = dir_build_record  # type: str
+
+        self.bool_db_immutable = bool_db_immutable  # type: bool
+
         # ChampionPool object
         self.champion_pool = ChampionPool(path_champions)  # type: ChampionPool
 
         # TraitPool object
         self.trait_pool = TraitPool(path_traits)  # type: TraitPool
 
-        # Print Trait and it's divisions
-        for h, i in self.trait_pool.dict_trait_pool.items():
-            print(i.name)
-            print(i.list_divisions)
+        # ItemPool object
+        self.item_pool = ItemPool(path_items)  # type: ItemPool
+
+        # ItemRecipeTable object (Completed item builds of the held components)
+        self.item_recipe_table = ItemRecipeTable(self.item_pool)  # type: ItemRecipeTable
 
         # TeamCompositionContainerFactory object
         self.team_composition_container_factory = TeamCompositionContainerFactory(self.champion_pool,
                                                                                   self.trait_pool)  # type: TeamCompositionContainerFactory
 
+        # ChampionTraitIndex object (Integer indexed version of the champion_pool and the trait_pool)
+        self.champion_trait_index = self.team_composition_container_factory.champion_trait_index  # type: ChampionTraitIndex
+
+        # ShopSimulator object (Rerolls and gold to collect a team composition)
+        self.shop_simulator = ShopSimulator(self.champion_trait_index)  # type: ShopSimulator
+
         # TeamCompositionCombinationsSearcher object
         self.team_composition_combinations_searcher = TeamCompositionCombinationsSearcher(
             self.team_composition_container_factory)  # type: TeamCompositionCombinationsSearcher
 
-        # SQLiteHandlerTeamCompositionSolver object
-        self.sqlite_handler_team_composition_solver = SQLiteHandlerTeamCompositionSolver(
-            self.team_composition_container_factory)
+        # SQLiteHandlerTeamCompositionSolver object (Connects to the db on first use, see the property)
+        self._sqlite_handler_team_composition_solver = None  # type: SQLiteHandlerTeamCompositionSolver
+
+        # SupersetIndex object (Read from the db on first use, see the property)
+        self._superset_index = None  # type: SupersetIndex
+
+        # Lock of _superset_index (The query server reads it from its worker threads)
+        self.lock_superset_index = threading.Lock()
 
         # Set of frozensets that are the compositions
         self.set_frozenset_compositions_combinations = set()  # type: Set[FrozenSet]
@@ -68,11 +121,197 @@ class TeamCompositionSolver:
         # List of tuples that are the compositions
         self.list_tuple_compositions_combinations = []  # type: List[Tuple]
 
-        # Dict of champion names and the frozensets they are in
-        self.dict_key_champion_name_value_frozenset = {}  # type: dict
+        # SupersetTrie of the frozensets (Made by _transform_set_frozenset_compositions_combinations)
+        self.superset_trie = None  # type: SupersetTrie
+
+        # Dict of champion names and an array of the indices that corresponds to the tuples they are in
+        self.dict_key_champion_name_value_array_team_composition_index = {}  # type: Dict[str, array]
+
+        # PostingIndex of the champion names and the indices of the tuples they are in
+        self.posting_index = None  # type: PostingIndex
+
+    @property
+    def sqlite_handler_team_composition_solver(self) -> SQLiteHandlerTeamCompositionSolver:
+        """
+        SQLiteHandlerTeamCompositionSolver object, the connection to the db is made the first time it is used so
+        that starting the application (and pickling this object for a ProcessPoolExecutor) does not touch the db
+
+        :return: SQLiteHandlerTeamCompositionSolver object
+        """
+        if self._sqlite_handler_team_composition_solver is None:
+            self._sqlite_handler_team_composition_solver = SQLiteHandlerTeamCompositionSolver(
+                self.team_composition_container_factory,
+                self.path_db,
+                bool_db_immutable=self.bool_db_immutable)
+
+        return self._sqlite_handler_team_composition_solver
+
+    @property
+    def superset_index(self) -> SupersetIndex:
+        """
+        SupersetIndex object of the team compositions of the db, it is read from the db the first time it is used
+
+        :return: SupersetIndex object
+        """
+        superset_index = self._superset_index
 
-        # Dict of champion names and a list of the indices that corresponds to the tuples they are in
-        self.dict_key_champion_name_value_list_index_champion_composition = {}  # type: dict
+        if superset_index is None:
+            with self.lock_superset_index:
+                # Another thread may have read it while this one waited for the lock
+                if self._superset_index is None:
+                    sqlite_handler = self.sqlite_handler_team_composition_solver
+
+                    self._superset_index = SupersetIndex(
+                        self.champion_trait_index,
+                        sqlite_handler.get_iter_tuple_champion_ids_trait_count_discrete_total())
+
+                superset_index = self._superset_index
+
+        return superset_index
+
+    def __getstate__(self):
+        """
+        State of this object without lock_superset_index, a lock can not be pickled (This object is pickled for a
+        ProcessPoolExecutor)
+
+        :return: dict of the state
+        """
+        dict_state = self.__dict__.copy()
+        del dict_state["lock_superset_index"]
+        return dict_state
+
+    def __setstate__(self, dict_state):
+        """
+        Restore the state of this object from __getstate__ with a new lock_superset_index
+
+        :param dict_state: dict of the state
+        :return: None
+        """
+        self.__dict__.update(dict_state)
+        self.lock_superset_index = threading.Lock()
+
+    def get_dict_upgrade_path(self,
+                              iter_champion_names_board: iter,
+                              amount_add: int,
+                              page: int = 0,
+                              page_size: int = UPGRADE_PATH_PAGE_SIZE,
+                              iter_champion_names_exclude: iter = ()) -> dict:
+        """
+        Get a page of the team compositions reachable from the board by adding amount_add champions (Best trait count
+        discrete total first)
+
+        :param iter_champion_names_board: champion names of the board
+        :param amount_add: champions to add
+        :param page: page of the answer (From 0)
+        :param page_size: groups per page (None for every group)
+        :param iter_champion_names_exclude: champion names that can not be added
+        :return: json serializable dict of the page
+        """
+        return self.superset_index.get_dict_upgrade_path(iter_champion_names_board, amount_add, page, page_size,
+                                                         iter_champion_names_exclude)
+
+    @property
+    def summary_statistics(self) -> SummaryStatistics:
+        """
+        Counts of the team compositions of the db by size, trait count discrete total, champion and trait, they are
+        read from the summary tables of the db the first time they are used
+
+        :return: SummaryStatistics object, None if the db has no summary tables
+        """
+        return self.sqlite_handler_team_composition_solver.get_summary_statistics()
+
+    def get_team_composition_count(self,
+                                   team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                                   team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX,
+                                   trait_count_discrete_total_min: int = TRAIT_COUNT_DISCRETE_TOTAL_MIN,
+                                   trait_count_discrete_total_max: int = TRAIT_COUNT_TOTAL_MAX) -> int:
+        """
+        Get the amount of team compositions with a size and a trait count discrete total in the bounds without a query
+        of the team compositions
+
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :param trait_count_discrete_total_min:
+        :param trait_count_discrete_total_max:
+        :return: int, None if the db has no summary tables
+        """
+        summary_statistics = self.summary_statistics
+
+        if summary_statistics is None:
+            return None
+
+        return summary_statistics.get_count(team_composition_size_min, team_composition_size_max,
+                                            trait_count_discrete_total_min, trait_count_discrete_total_max)
+
+    def get_dict_histogram_trait_count_discrete_total(self,
+                                                      team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                                                      team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX
+                                                      ) -> Dict[int, int]:
+        """
+        Get the amount of team compositions of every trait count discrete total of the team compositions with a size
+        in the bounds without a query of the team compositions
+
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :return: dict of trait count discrete total -> team compositions, None if the db has no summary tables
+        """
+        summary_statistics = self.summary_statistics
+
+        if summary_statistics is None:
+            return None
+
+        return summary_statistics.get_dict_histogram_trait_count_discrete_total(team_composition_size_min,
+                                                                                team_composition_size_max)
+
+    def get_dict_facet_count(self,
+                             iter_champion_names_include: iter,
+                             iter_champion_names_exclude: iter = (),
+                             team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+                             team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX,
+                             trait_count_discrete_total_min: int = TRAIT_COUNT_DISCRETE_TOTAL_MIN,
+                             trait_count_discrete_total_max: int = TRAIT_COUNT_TOTAL_MAX) -> Dict[str, int]:
+        """
+        Get the amount of team compositions of the filter that have each champion (The team compositions the filter
+        would give if the champion was included), one query and one pass over its rows
+
+        :param iter_champion_names_include: champion names
+        :param iter_champion_names_exclude: champion names
+        :param team_composition_size_min:
+        :param team_composition_size_max:
+        :param trait_count_discrete_total_min:
+        :param trait_count_discrete_total_max:
+        :return: dict of champion name -> team compositions (Every count is 0 without an included champion since the
+            db is not queried for every team composition)
+        """
+        list_tuple_db_result = self.sqlite_handler_team_composition_solver.get_pickled_list_tuple_champion_composition(
+            list(iter_champion_names_include),
+            list(iter_champion_names_exclude),
+            team_composition_size_min,
+            team_composition_size_max,
+            trait_count_discrete_total_min,
+            trait_count_discrete_total_max)
+
+        return get_dict_key_champion_name_value_facet_count(list_tuple_db_result,
+                                                            self.champion_pool.dict_champion_pool_name)
+
+    def get_emblem_set(self, iter_item_key: iter) -> EmblemSet:
+        """
+        Get the EmblemSet of the emblems given by their item ids or item names (An emblem can be given more than once)
+
+        :param iter_item_key: iterable of item ids or item names
+        :return: EmblemSet object
+        :raises KeyError: an item does not exist
+        """
+        return EmblemSet(self.champion_trait_index, self.item_pool.get_list_item(iter_item_key))
+
+    def print_trait_pool(self):
+        """
+        Print every trait and its divisions
+        :return: None
+        """
+        for trait_name, trait_object in self.trait_pool.dict_trait_pool.items():
+            print(trait_object.name)
+            print(trait_object.list_divisions)
 
     def create_set_frozenset_compositions_combinations_pickle(self, composition_size=9):
         """
@@ -197,7 +436,7 @@ class TeamCompositionSolver:
             *get_list_tuple_all_compositions_combinations_args)
 
         # Write pickled result to file
-        with open(PICKLE_LIST_TUPLE_NAME, "wb") as file:
+        with open(self.path_pickle_list_tuple, "wb") as file:
             pickle.dump(list_tuple_all_compositions_combinations_call, file)
 
     def load_pickle_set_frozenset_compositions_combinations(self):
@@ -220,22 +459,21 @@ class TeamCompositionSolver:
 
         self.set_frozenset_compositions_combinations = set_frozenset_compositions_combinations_all
 
-    @timer
-    @memory_usage
+    @traced("build.load_pickle_list_tuple_compositions_combinations", bool_memory=True)
     def load_pickle_list_tuple_compositions_combinations(self):
         """
-        Loads the pickle file based on the name PICKLE_LIST_TUPLE_NAME that contains the list of TFT team composition
+        Loads the pickle file based on the name self.path_pickle_list_tuple that contains the list of TFT team composition
         combinations into self.set_frozenset_all_compositions_combinations_callable
 
         :return: None
         """
         try:
-            with open(PICKLE_LIST_TUPLE_NAME, "rb") as file:
+            with open(self.path_pickle_list_tuple, "rb") as file:
                 list_tuple_compositions_combinations = pickle.load(file)
 
         except FileNotFoundError as e:
             print(e)
-            print("Does {} exists?".format(PICKLE_LIST_TUPLE_NAME))
+            print("Does {} exists?".format(self.path_pickle_list_tuple))
 
         # for i in list_tuple_compositions_combinations:
         #     print(i)
@@ -244,46 +482,30 @@ class TeamCompositionSolver:
 
     def _transform_set_frozenset_compositions_combinations(self):
         """
-        Transforms self.set_frozenset_compositions_combinations into a dict where the key is the champion name
-        and the value is a set that contains the indices
+        Transforms self.set_frozenset_compositions_combinations into a SupersetTrie over the champion ids of the
+        compositions (Replaces the dict of champion name -> set of the frozensets with that champion)
 
-        :return:
+        :return: None
         """
-
-        dict_temp = defaultdict(set)
+        champion_trait_index = self.champion_trait_index
 
         try:
-            # For frozenset_given in self.set_frozenset_compositions_combinations_all
-            for index, frozenset_given in enumerate(self.set_frozenset_compositions_combinations):
-
-                # For champion_name in frozenset_given
-                for champion_name in frozenset_given:
-
-                    """
-                    The below code is commented out because of the default dict
-                    """
-                    # # If champion_name does not exist in dict_temp
-                    # if dict_temp.get(champion_name, False) is False:
-                    #     # Add champion_name and set to dict_temp
-                    #     dict_temp[champion_name] = set()
-
-                    # Add frozenset_given to set based on champion_name
-                    dict_temp[champion_name].add(frozenset_given)
+            self.superset_trie = SupersetTrie(
+                champion_trait_index,
+                (champion_trait_index.get_tuple_champion_id(frozenset_given) for frozenset_given in
+                 self.set_frozenset_compositions_combinations))
 
         except Exception as e:
             print(e)
             print("Has {} been initialized?".format(self.set_frozenset_compositions_combinations))
 
-        self.dict_key_champion_name_value_frozenset = dict_temp
-
-    @timer
-    @memory_usage
+    @traced("build.transform_list_tuple_compositions_combinations_all", bool_memory=True)
     def _transform_list_tuple_compositions_combinations_all(self):
         """
         Transforms self.list_tuple_compositions_combinations_all into a dict where the key is the champion name
-        and the value is a set that contains the indices
+        and the value is an array('I') of the indices of the compositions it is in (And the PostingIndex of them)
 
-        Memory Usage:
+        Memory Usage (The old transform appending every index to a defaultdict(list)):
             Memory (Before):                                             6056.3046875 Mb
             Running Callable transform_list_tuple_compositions_combinations_all ...
             Memory (After):                                              10830.56640625 Mb
@@ -291,56 +513,68 @@ class TeamCompositionSolver:
             Callable: TeamCompositionSolver.transform_list_tuple_compositions_combinations_all
             Callable ran in 72.66071796417236 Sec
 
-        :return:
-        """
+        The compositions are turned into the index matrix TEAM_COMPOSITION_BATCH_SIZE at a time and the posting lists
+        of every champion are made from each chunk at once (See get_tuple_array_team_composition_index), an index
+        costs 4 bytes in its array instead of an int and a list slot.
 
-        dict_temp = defaultdict(list)
-
-        try:
-            # For tuple_composition_combination in self.set_frozenset_compositions_combinations_all
-            for index, tuple_composition_combination in enumerate(self.list_tuple_compositions_combinations):
+        :return: None
+        """
+        champion_trait_index = self.champion_trait_index
 
-                # For champion_name in tuple_composition_combination
-                for champion_name in tuple_composition_combination:
+        list_tuple_compositions_combinations = self.list_tuple_compositions_combinations
 
-                    """
-                    The below code is commented out because of the default dict
-                    """
-                    # # If champion_name does not exist in dict_temp
-                    # if dict_temp.get(champion_name, False) is False:
-                    #     # Add champion_name and set to dict_temp
-                    #     dict_temp[champion_name] = []
+        # Width of the index matrix (Largest composition)
+        width = max(map(len, list_tuple_compositions_combinations), default=0)
 
-                    # Add tuple_composition_combination to set based on champion_name
-                    dict_temp[champion_name].append(index)
+        try:
+            tuple_array_team_composition_index = get_tuple_array_team_composition_index(
+                (self.team_composition_container_factory.get_bytes_index_matrix_from_names(
+                    list_tuple_compositions_combinations[index_start: index_start + TEAM_COMPOSITION_BATCH_SIZE],
+                    width) for index_start in
+                 range(0, len(list_tuple_compositions_combinations), TEAM_COMPOSITION_BATCH_SIZE)),
+                width,
+                champion_trait_index.number_champions)
 
         except Exception as e:
             print(e)
             print("Has {} been initialized?".format(self.list_tuple_compositions_combinations))
-
-        self.dict_key_champion_name_value_list_index_champion_composition = dict_temp
-
-    def get_set_frozenset_compositions_given_list_champion_names(self, iter_champion_names: iter) -> Set[FrozenSet]:
+            return
+
+        self.dict_key_champion_name_value_array_team_composition_index = {
+            champion_trait_index.tuple_champion_id_name[champion_id]: array_team_composition_index for
+            champion_id, array_team_composition_index in enumerate(tuple_array_team_composition_index) if
+            array_team_composition_index}
+
+        self.posting_index = get_posting_index_from_tuple_array(champion_trait_index.tuple_champion_id_name,
+                                                                tuple_array_team_composition_index,
+                                                                len(list_tuple_compositions_combinations))
+
+    def get_set_frozenset_compositions_given_list_champion_names(
+            self,
+            iter_champion_names: iter,
+            iter_champion_names_exclude: iter = (),
+            team_composition_size_min: int = TEAM_COMPOSITION_SIZE_MIN,
+            team_composition_size_max: int = TEAM_COMPOSITION_SIZE_MAX) -> Set[FrozenSet]:
         """
         Given a iterable of champion names, get a set of frozensets containing the champions in iter_champion_names
 
-        :param iter_champion_names: iterable of champion names
-        :return: None
-        """
+        Only the branches of self.superset_trie that can still have every champion of iter_champion_names are walked
+        instead of intersecting the set of every champion.
 
+        :param iter_champion_names: iterable of champion names
+        :param iter_champion_names_exclude: iterable of champion names that are not in the frozensets
+        :param team_composition_size_min: min size of the frozensets
+        :param team_composition_size_max: max size of the frozensets
+        :return: set of frozensets of champion names
         """
-        Set containing the first frozenset in set_frozenset_compositions_iter_champion_names is iter_champion_names[0]
-        """
-        set_frozenset_compositions_iter_champion_names = self.dict_key_champion_name_value_frozenset.get(
-            iter_champion_names[0])
+        champion_trait_index = self.champion_trait_index
 
-        # For index in 1 to the last champion_name in iter_champion_names
-        for index in range(1, len(iter_champion_names)):
-            # Do the intersection of the frozensets to get the frozensets that contain all iter_champion_names
-            set_frozenset_compositions_iter_champion_names = set_frozenset_compositions_iter_champion_names.intersection(
-                self.dict_key_champion_name_value_frozenset.get(iter_champion_names[index]))
-
-        return set_frozenset_compositions_iter_champion_names
+        return {frozenset(champion_trait_index.get_tuple_champion_name(tuple_champion_id)) for tuple_champion_id in
+                self.superset_trie.get_list_tuple_champion_id(
+                    champion_trait_index.get_bitmask_champion(iter_champion_names),
+                    champion_trait_index.get_bitmask_champion(iter_champion_names_exclude),
+                    team_composition_size_min,
+                    team_composition_size_max)}
 
     # @timer
     # @memory_usage
@@ -412,8 +646,7 @@ class TeamCompositionSolver:
     #     return [self.list_tuple_compositions_combinations[tuple_composition_combination[0]] for
     #             tuple_composition_combination in list_tuple_row]
 
-    @timer
-    @memory_usage
+    @traced("build.add_list_tuple_compositions_combinations_all_to_db", bool_memory=True)
     def _add_list_tuple_compositions_combinations_all_to_db(self):
         """
         Add the list of tuples that are the team composition combinations into the db
@@ -428,8 +661,7 @@ class TeamCompositionSolver:
         self.sqlite_handler_team_composition_solver.add_list_tuple_compositions_combinations_to_table_team_composition_combination(
             self.list_tuple_compositions_combinations)
 
-    @timer
-    @memory_usage
+    @traced("build.add_dict_key_champion_name_value_list_index_champion_composition_to_db", bool_memory=True)
     def _add_dict_key_champion_name_value_list_index_champion_composition_to_db(self):
         """
         Add the the dict of champions and their list that containing the index that represents which composition they
@@ -443,10 +675,9 @@ class TeamCompositionSolver:
         :return: None
         """
         self.sqlite_handler_team_composition_solver.add_dict_key_champion_name_value_list_index_champion_composition(
-            self.dict_key_champion_name_value_list_index_champion_composition)
+            self.dict_key_champion_name_value_array_team_composition_index)
 
-    @timer
-    @memory_usage
+    @traced("build.run_complete_calculation_list_tuple", bool_memory=True)
     def run_complete_calculation_list_tuple(self, team_composition_size=9):
         """
         DO NOT RUN THIS UNLESS YOU KNOW WHAT YOU ARE DOING
@@ -465,7 +696,7 @@ class TeamCompositionSolver:
         Memory:
             6 GB to 50 GB used.
 
-        :return: None
+        :return: True if the generated files were built
         """
         # Ask user if they are sure they should do the operation
         user_response = input("Are you sure you want to\n"
@@ -479,20 +710,25 @@ class TeamCompositionSolver:
         if user_response == "yes":
 
             # If the pickle file does not exist
-            if not os.path.exists(PICKLE_LIST_TUPLE_NAME):
+            if not os.path.exists(self.path_pickle_list_tuple):
                 # Calculate all useful tft team compositions and pickle it into a file
                 self._create_list_tuple_compositions_combinations_pickle(team_composition_size)
 
             else:
-                print("{} already exists!".format(os.path.basename(PICKLE_LIST_TUPLE_NAME)))
+                print("{} already exists!".format(os.path.basename(self.path_pickle_list_tuple)))
 
-            self._run_complete_calculation_list_tuple_faster_operations()
+            self._run_complete_calculation_list_tuple_faster_operations(team_composition_size)
 
-    def _run_complete_calculation_list_tuple_faster_operations(self):
+            return True
+
+        return False
+
+    def _run_complete_calculation_list_tuple_faster_operations(self, team_composition_size=None):
         """
         The faster operations of run_complete_calculation_list_tuple if you already have a pickle of the list of tuples
         that are the list of team composition combinations.
 
+        :param team_composition_size: team comp size of the pickle (None to use the largest team composition in it)
         :return: None
         """
         # Load the pickle into a var
@@ -502,10 +738,210 @@ class TeamCompositionSolver:
         self._transform_list_tuple_compositions_combinations_all()
 
         # Create database
-        _create_db_champion_tables(self.champion_pool.dict_champion_pool_name, self.trait_pool.dict_trait_pool)
+        _create_db_champion_tables(self.champion_pool.dict_champion_pool_name, self.trait_pool.dict_trait_pool,
+                                   self.path_db)
 
         # Add the index of the list composition combinations and the list itself into the db
         self._add_list_tuple_compositions_combinations_all_to_db()
 
         # Add the tables based on champion name and their compositions they are in based on index
         self._add_dict_key_champion_name_value_list_index_champion_composition_to_db()
+
+        # Count the team compositions into the summary tables of the db
+        self.sqlite_handler_team_composition_solver.write_summary_statistics()
+
+        # Write the posting lists next to the db (The queries use them instead of the champion tables)
+        self.sqlite_handler_team_composition_solver.write_posting_index(self.posting_index)
+
+        # Record the inputs of this build for run_incremental_calculation_list_tuple
+        if team_composition_size is None:
+            team_composition_size = max(map(len, self.list_tuple_compositions_combinations), default=0)
+
+        self._write_build_record(team_composition_size)
+
+    def _write_build_record(self, team_composition_size: int):
+        """
+        Copy the champions.json and traits.json the generated files were made with into self.dir_build_record with
+        the team_composition_size so that a later patch can be applied incrementally
+
+        :param team_composition_size: team comp size of the generated files
+        :return: None
+        """
+        os.makedirs(self.dir_build_record, exist_ok=True)
+
+        shutil.copyfile(self.path_champions, os.path.join(self.dir_build_record, NAME_BUILD_RECORD_CHAMPIONS))
+        shutil.copyfile(self.path_traits, os.path.join(self.dir_build_record, NAME_BUILD_RECORD_TRAITS))
+
+        with open(os.path.join(self.dir_build_record, NAME_BUILD_RECORD), "w") as file:
+            json.dump({"team_composition_size": team_composition_size}, file)
+
+        # The db was changed by the build, the SupersetIndex is read again on its next use
+        with self.lock_superset_index:
+            self._superset_index = None
+
+    def _load_build_record(self) -> Tuple[ChampionPool, TraitPool, int]:
+        """
+        Load the champion pool, the trait pool and the team_composition_size the generated files were made with
+
+        :return: tuple of the champion pool, the trait pool and the team_composition_size or None if no record exists
+        """
+        path_build_record = os.path.join(self.dir_build_record, NAME_BUILD_RECORD)
+
+        if not os.path.exists(path_build_record):
+            return None
+
+        with open(path_build_record, "r") as file:
+            dict_build_record = json.load(file)
+
+        return (ChampionPool(os.path.join(self.dir_build_record, NAME_BUILD_RECORD_CHAMPIONS)),
+                TraitPool(os.path.join(self.dir_build_record, NAME_BUILD_RECORD_TRAITS)),
+                dict_build_record["team_composition_size"])
+
+    def get_pool_difference(self) -> PoolDifference:
+        """
+        Get the difference between the pools the generated files were made with and the current pools
+
+        :return: PoolDifference object or None if the generated files have no build record
+        """
+        tuple_build_record = self._load_build_record()
+
+        if tuple_build_record is None:
+            return None
+
+        champion_pool_old, trait_pool_old, team_composition_size = tuple_build_record
+
+        return PoolDifference(champion_pool_old, trait_pool_old, self.champion_pool, self.trait_pool)
+
+    @traced("build.run_incremental_calculation_list_tuple", bool_memory=True)
+    def run_incremental_calculation_list_tuple(self) -> str:
+        """
+        Update the pickle and the db made by run_complete_calculation_list_tuple to the current champions.json and
+        traits.json without searching every team composition again
+
+        Only the team compositions with a champion whose traits (or the divisions of its traits) have changed are
+        removed and only the team compositions containing those champions (and new champions) are searched, the rest
+        of the team compositions keep their team_composition_index.
+
+        The team_composition_index of the team compositions stay 0 to N - 1:
+            1.  New team compositions fill the team_composition_index of the removed team compositions and are
+                appended after the last team_composition_index if there are more new ones
+            2.  If there are less new ones, the team compositions at the end fill the remaining holes
+
+        :return: INCREMENTAL_BUILD_UPDATED if the generated files were updated, INCREMENTAL_BUILD_UP_TO_DATE if the
+            changes do not change them (Only the build record is updated) or INCREMENTAL_BUILD_NOT_APPLIED if there
+            is no build record to start from
+        """
+        tuple_build_record = self._load_build_record()
+
+        if tuple_build_record is None:
+            print("{} does not exist, run run_complete_calculation_list_tuple instead!".format(
+                os.path.join(self.dir_build_record, NAME_BUILD_RECORD)))
+            return INCREMENTAL_BUILD_NOT_APPLIED
+
+        champion_pool_old, trait_pool_old, team_composition_size = tuple_build_record
+
+        pool_difference = PoolDifference(champion_pool_old, trait_pool_old, self.champion_pool, self.trait_pool)
+
+        if pool_difference.is_empty():
+            print("{} is up to date!".format(os.path.basename(self.path_pickle_list_tuple)))
+
+            # The inputs may still differ (The cost or the formatting), the build record is of the current inputs
+            self._write_build_record(team_composition_size)
+
+            return INCREMENTAL_BUILD_UP_TO_DATE
+
+        print(pool_difference)
+
+        self.load_pickle_list_tuple_compositions_combinations()
+
+        list_tuple_compositions_combinations = self.list_tuple_compositions_combinations
+
+        size_old = len(list_tuple_compositions_combinations)
+
+        # Indices of the team compositions that are no longer valid
+        list_team_composition_index_free = [
+            team_composition_index for team_composition_index, tuple_composition in
+            enumerate(list_tuple_compositions_combinations) if
+            not pool_difference.set_champion_names_invalidated.isdisjoint(tuple_composition)]
+
+        # Search only the team compositions containing the affected champions
+        list_tuple_compositions_combinations_new = [
+            tuple(frozenset_composition) for frozenset_composition in
+            self.team_composition_combinations_searcher.get_set_frozenset_compositions_combinations_containing(
+                team_composition_size,
+                pool_difference.set_champion_names_affected)]
+
+        size_new = size_old - len(list_team_composition_index_free) + len(list_tuple_compositions_combinations_new)
+
+        # Free indices that stay in range and the indices appended after the end
+        list_team_composition_index_slot = [team_composition_index for team_composition_index in
+                                            list_team_composition_index_free if team_composition_index < size_new]
+        list_team_composition_index_slot.extend(range(size_old, size_new))
+
+        list_team_composition_index_new = list_team_composition_index_slot[
+                                          :len(list_tuple_compositions_combinations_new)]
+
+        # Team compositions past the end that are moved into the remaining slots
+        set_team_composition_index_free = set(list_team_composition_index_free)
+
+        list_tuple_team_composition_index_move = list(zip(
+            (team_composition_index for team_composition_index in range(size_new, size_old) if
+             team_composition_index not in set_team_composition_index_free),
+            list_team_composition_index_slot[len(list_tuple_compositions_combinations_new):]))
+
+        # Update the db
+        sqlite_handler = self.sqlite_handler_team_composition_solver
+
+        sqlite_handler.create_tables_champion_and_trait(pool_difference.set_champion_names_added,
+                                                        pool_difference.set_trait_names_added)
+
+        sqlite_handler.delete_list_team_composition_index(list_team_composition_index_free,
+                                                          champion_pool_old.dict_champion_pool_name)
+
+        if pool_difference.bool_champion_id_changed:
+            sqlite_handler.update_team_composition_champion_id(
+                pool_difference.dict_key_champion_id_old_value_champion_id_new)
+
+        sqlite_handler.move_list_team_composition_index(list_tuple_team_composition_index_move,
+                                                        champion_pool_old.dict_champion_pool_name)
+
+        sqlite_handler.add_list_tuple_compositions_combinations_at_list_team_composition_index(
+            list_team_composition_index_new,
+            list_tuple_compositions_combinations_new)
+
+        sqlite_handler.drop_tables_champion_and_trait(pool_difference.set_champion_names_removed,
+                                                      pool_difference.set_trait_names_removed)
+
+        sqlite_handler.connection.commit()
+
+        # Update the list the same way as the db
+        list_tuple_compositions_combinations.extend([None] * max(size_new - size_old, 0))
+
+        for team_composition_index_old, team_composition_index_new in list_tuple_team_composition_index_move:
+            list_tuple_compositions_combinations[team_composition_index_new] = list_tuple_compositions_combinations[
+                team_composition_index_old]
+
+        for team_composition_index, tuple_composition in zip(list_team_composition_index_new,
+                                                             list_tuple_compositions_combinations_new):
+            list_tuple_compositions_combinations[team_composition_index] = tuple_composition
+
+        del list_tuple_compositions_combinations[size_new:]
+
+        with open(self.path_pickle_list_tuple, "wb") as file:
+            pickle.dump(list_tuple_compositions_combinations, file)
+
+        # The posting lists are made again from the updated list (The team_composition_index of many champions moved)
+        self._transform_list_tuple_compositions_combinations_all()
+
+        # The summary tables are counted again from the whole db (A changed trait changes team compositions that were
+        # not searched again)
+        sqlite_handler.write_summary_statistics()
+
+        sqlite_handler.write_posting_index(self.posting_index)
+
+        self._write_build_record(team_composition_size)
+
+        print("Removed {} team compositions, added {} team compositions".format(
+            len(list_team_composition_index_free), len(list_tuple_compositions_combinations_new)))
+
+        return INCREMENTAL_BUILD_UPDATED
@@ -28,11 +28,16 @@ from tkinter.ttk import Scrollbar, Treeview, Style, Label, Entry, Checkbutton
 from typing import Dict, Tuple
 
 from Teamfight_Tactics_Composition_Solver.Champion import Champion
+from Teamfight_Tactics_Composition_Solver.ChampionIconSpriteCache import ChampionIconSpriteCache, \
+    get_dict_key_icon_name_value_photo_image_from_sprite
+from Teamfight_Tactics_Composition_Solver.Instrumentation import span, traced
+from Teamfight_Tactics_Composition_Solver.StartupReport import StartupReport
+from Teamfight_Tactics_Composition_Solver.TeamCompositionFormatter import get_list_tuples_to_be_inserted, \
+    sort_list_tuples_to_be_inserted, get_dict_key_champion_name_value_facet_count
 from Teamfight_Tactics_Composition_Solver.TeamCompositionSolver import TeamCompositionSolver
 from Teamfight_Tactics_Composition_Solver.constants import DIR_CHAMPION_ICONS, TEAM_COMPOSITION_SIZE_MAX, \
-    TRAIT_COUNT_TOTAL_MAX
+    TRAIT_COUNT_TOTAL_MAX, CHAMPION_ICON_SIZE
 from josephs_resources.Database.functions_data_base_formatter import format_db_input
-from josephs_resources.Decorators.V2.Timer import timer
 
 FONT_BUTTON_TEXT = ('Arial', 6, 'bold')
 
@@ -43,6 +48,13 @@ FONT_DEFAULT = 'Arial 12 bold'
 
 COLUMN_LIMIT = 17
 
+# Phases of the StartupReport
+PHASE_TK_ROOT = "Tk root"
+PHASE_FRAMES = "Frames (buttons without icons)"
+PHASE_FIRST_FRAME = "First frame shown"
+PHASE_CHAMPION_ICONS = "Champion icons"
+PHASE_FIRST_QUERY = "First query (db connection included)"
+
 
 class CallablePreservedContainer:
     __slots__ = ["callable_given", "args", "kwargs"]
@@ -64,7 +76,9 @@ class CallablePreservedContainer:
         Run the callable with it's arguments
         :return: callable(*args, **kwargs)
         """
-        return self.callable_given(*self.args, **self.kwargs)
+        # Span of the task of the thread that runs it (GUI worker thread or main thread)
+        with span("gui.task.{}".format(getattr(self.callable_given, "__name__", "callable"))):
+            return self.callable_given(*self.args, **self.kwargs)
 
 
 class Integer:
@@ -115,18 +129,28 @@ class Integer:
 
 class TeamCompositionSolverGUI:
 
-    def __init__(self, team_composition_solver: TeamCompositionSolver):
+    def __init__(self, team_composition_solver: TeamCompositionSolver, startup_report: StartupReport = None):
         """
         The GUI for the TeamCompositionSolver object.
 
         :param team_composition_solver: None
+        :param startup_report: StartupReport that the phases of the startup of the GUI are added to
         """
 
         # ---- Main Thread ----
 
+        # Report of the time taken by every phase of the startup
+        self.startup_report = startup_report if startup_report is not None else StartupReport()
+        self.bool_startup_report_printed = False
+
+        self.startup_report.start_phase(PHASE_FIRST_FRAME)
+
         # TeamCompositionSolver Object
         self.team_composition_solver = team_composition_solver
 
+        # Sprite cache of the champion icons (The icons are loaded after the first frame is shown)
+        self.champion_icon_sprite_cache = ChampionIconSpriteCache()
+
         # Using the names of the champions based on their images as the key and a Champion object as the value
         self.dict_champion_pool_transformed = {}  # type: Dict[str, Champion]
 
@@ -188,6 +212,8 @@ class TeamCompositionSolverGUI:
         # Queue for thread to enforce sequential calls and prevent race conditions
         self.queue_threaded_methods = Queue()
 
+        self.startup_report.start_phase(PHASE_TK_ROOT)
+
         # Root for Tkinter
         self.root = Tk()
 
@@ -221,6 +247,8 @@ class TeamCompositionSolverGUI:
         self.scrollbar_y = Scrollbar(self.frame_right, orient="vertical")
         self.scrollbar_x = Scrollbar(self.frame_right, orient="horizontal")
 
+        self.startup_report.end_phase(PHASE_TK_ROOT)
+
         # self.root.mainloop()
         self.mainloop_custom()
 
@@ -254,10 +282,75 @@ class TeamCompositionSolverGUI:
         self.dict_key_column_name_formatted_value_index_state["team_composition_size"] = 0
         self.dict_key_column_name_formatted_value_index_state["trait_count_total"] = 2
 
+        # Read the champion icons on a thread, they are put on the buttons by the main thread when read
+        self.startup_report.start_phase(PHASE_CHAMPION_ICONS)
+
+        self.queue_threaded_methods.put(
+            CallablePreservedContainer(self.threaded_read_champion_icon_sprite_cache))
+
         # Add format SQLite query's result to to queue for threads to be executed by a thread
+        self.startup_report.start_phase(PHASE_FIRST_QUERY)
+
         self.queue_threaded_methods.put(
             CallablePreservedContainer(self.threaded_get_team_composition_based_on_current_set_from_db))
 
+    def _print_startup_report(self):
+        """
+        Print the startup report once every phase of the startup is done
+        :return: None
+        """
+        if self.bool_startup_report_printed:
+            return
+
+        if any(self.startup_report.is_phase_pending(phase_name) for phase_name in
+               (PHASE_FIRST_FRAME, PHASE_CHAMPION_ICONS, PHASE_FIRST_QUERY)):
+            return
+
+        self.bool_startup_report_printed = True
+
+        print(self.startup_report)
+
+    def threaded_read_champion_icon_sprite_cache(self):
+        """
+        This should be threaded
+        Read the sprite cache of the champion icons and add load_champion_icons to the queue for the main thread
+
+        :return: None
+        """
+        tuple_sprite = self.champion_icon_sprite_cache.read_sprite_cache()
+
+        self.queue_main_thread_methods.put(CallablePreservedContainer(self.load_champion_icons, tuple_sprite))
+
+    def load_champion_icons(self, tuple_sprite: tuple):
+        """
+        Put the champion icons on the buttons of the champions, from the sprite sheet if the sprite cache was read or
+        from the png files which are then written to the sprite cache for the next startup
+
+        :param tuple_sprite: result of ChampionIconSpriteCache.read_sprite_cache
+        :return: None
+        """
+        if tuple_sprite is not None:
+            dict_key_icon_name_value_photo_image = get_dict_key_icon_name_value_photo_image_from_sprite(
+                *tuple_sprite)
+
+        else:
+            dict_key_icon_name_value_photo_image = {
+                champion_name: PhotoImage(file=button_champion_container.path_abs) for
+                champion_name, button_champion_container in
+                self.dict_key_champion_name_value_button_champion_container.items()}
+
+            self.champion_icon_sprite_cache.write_sprite_cache(dict_key_icon_name_value_photo_image)
+
+        for champion_name, button_champion_container in self.dict_key_champion_name_value_button_champion_container.items():
+            photo_image = dict_key_icon_name_value_photo_image.get(champion_name)
+
+            if photo_image is not None:
+                button_champion_container.set_photo_image(photo_image)
+
+        self.startup_report.end_phase(PHASE_CHAMPION_ICONS)
+
+        self._print_startup_report()
+
     def mainloop_custom(self):
         """
         Custom main loop to introduce more flexibility
@@ -265,8 +358,12 @@ class TeamCompositionSolverGUI:
         """
 
         # Load data for frames
+        self.startup_report.start_phase(PHASE_FRAMES)
+
         self._load_frame_data()
 
+        self.startup_report.end_phase(PHASE_FRAMES)
+
         try:
             while True:
 
@@ -294,6 +391,12 @@ class TeamCompositionSolverGUI:
                 self.root.update_idletasks()
                 self.root.update()
 
+                # The first frame has been shown
+                if self.startup_report.is_phase_pending(PHASE_FIRST_FRAME):
+                    self.startup_report.end_phase(PHASE_FIRST_FRAME)
+
+                    self._print_startup_report()
+
         # Handle update even though program is is dead
         except TclError as e:
             print(e)
@@ -650,6 +753,13 @@ class TeamCompositionSolverGUI:
 
         self.checkbutton_trait_count_total.grid(row=0, column=7)
 
+        # Label of the amount of team compositions (The count of the filters is shown before the query is done)
+        self.label_team_composition_count = Label(self.frame_top,
+                                                  text="",
+                                                  font=FONT_DEFAULT)
+
+        self.label_team_composition_count.grid(row=0, column=8)
+
     def _checkbutton_trait_count_total_handler(self):
         """
         Handles the Checkbutton object self.checkbutton_trait_count_total and its state
@@ -975,7 +1085,7 @@ class TeamCompositionSolverGUI:
         self.queue_threaded_methods.put(
             CallablePreservedContainer(self.threaded_get_team_composition_based_on_current_set_from_db))
 
-    @timer
+    @traced("gui.get_team_composition_based_on_current_set_from_db")
     def threaded_get_team_composition_based_on_current_set_from_db(self):
         """
         This should be threaded
@@ -988,6 +1098,17 @@ class TeamCompositionSolverGUI:
         # Acquire thread lock
         # self.threading_lock.acquire()
 
+        # Team compositions in the size and trait count total bounds from the summary tables of the db (No query)
+        team_composition_count = self.team_composition_solver.get_team_composition_count(
+            self.integer_team_composition_size_min.get(),
+            self.integer_team_composition_size_max.get(),
+            self.integer_trait_count_total_min.get(),
+            self.integer_trait_count_total_max.get()
+        )
+
+        self.queue_main_thread_methods.put(
+            CallablePreservedContainer(self.set_label_team_composition_count, None, team_composition_count))
+
         with self.threading_lock:
             # Run database query
             self.list_tuple_db_result = self.team_composition_solver.sqlite_handler_team_composition_solver.get_pickled_list_tuple_champion_composition(
@@ -999,6 +1120,22 @@ class TeamCompositionSolverGUI:
                 self.integer_trait_count_total_max.get()
             )
 
+            self.queue_main_thread_methods.put(
+                CallablePreservedContainer(self.set_label_team_composition_count, len(self.list_tuple_db_result),
+                                           team_composition_count))
+
+            # Rows of the query with each champion, one pass over the rows (No counts without an included champion)
+            if self.set_team_composition_current:
+                dict_key_champion_name_value_facet_count = get_dict_key_champion_name_value_facet_count(
+                    self.list_tuple_db_result,
+                    self.team_composition_solver.champion_pool.dict_champion_pool_name)
+            else:
+                dict_key_champion_name_value_facet_count = {}
+
+            self.queue_main_thread_methods.put(
+                CallablePreservedContainer(self.set_button_champion_facet_count,
+                                           dict_key_champion_name_value_facet_count))
+
             # Add format SQlite query's result to to queue for threads to be executed by a thread
             self.queue_threaded_methods.put(
                 CallablePreservedContainer(self.threaded_format_list_tuples_to_be_inserted_v2))
@@ -1006,6 +1143,40 @@ class TeamCompositionSolverGUI:
         # Release thread lock
         # self.threading_lock.release()
 
+    def set_label_team_composition_count(self, team_composition_count_result: int, team_composition_count: int):
+        """
+        Must be called the main thread
+        Show the amount of team compositions of the query out of the team compositions in the size and trait count
+        total bounds
+
+        :param team_composition_count_result: team compositions of the query (None while the query is running)
+        :param team_composition_count: team compositions in the bounds (None if the db has no summary tables)
+        :return: None
+        """
+        string_team_composition_count_result = "..." if team_composition_count_result is None else "{:,}".format(
+            team_composition_count_result)
+
+        if team_composition_count is None:
+            self.label_team_composition_count.config(
+                text="Team Compositions: {}".format(string_team_composition_count_result))
+        else:
+            self.label_team_composition_count.config(
+                text="Team Compositions: {} of {:,}".format(string_team_composition_count_result,
+                                                             team_composition_count))
+
+    def set_button_champion_facet_count(self, dict_key_champion_name_value_facet_count: Dict[str, int]):
+        """
+        Must be called the main thread
+        Show on every champion button the amount of team compositions of the query with that champion
+
+        :param dict_key_champion_name_value_facet_count: champion name -> team compositions (Champions that are not in
+            the dict show no count)
+        :return: None
+        """
+        for button_champion_container in self.dict_key_champion_name_value_button_champion_container.values():
+            button_champion_container.set_facet_count(
+                dict_key_champion_name_value_facet_count.get(button_champion_container.champion.name))
+
     # TODO: NOT USED, REPLACED WITH v2
     def threaded_format_list_tuples_to_be_inserted(self):
         """
@@ -1183,125 +1354,29 @@ class TeamCompositionSolverGUI:
 
          :return: None
         """
-        self.list_tuples_to_be_inserted = []
-
-        t1_a = time.time()
-
-        # Format the tuples from self.list_tuple_db_result
-        for tuple_db_result in self.list_tuple_db_result:  # type: list
-            list_temp = []
-
-            # Tuple of the team composition sorted by name then cost
-            tuple_team_composition_sorted = self.team_composition_solver.team_composition_container_factory.sort_tuple_team_composition(
-                tuple_db_result[1])
-
-            # String of the team composition names
-            team_composition_names = ", ".join(tuple_team_composition_sorted)
-
-            # Team composition
-            list_temp.append(team_composition_names)  # Column 1 on Treeview
-
-            # Team Composition Size
-            list_temp.append(tuple_db_result[2])  # Column 2 on Treeview
-
-            # Trait Count Total
-            list_temp.append(tuple_db_result[3])  # Column 3 on Treeview
-
-            # Temporary TeamCompositionContainer object for it's traits
-            tuple_team_composition_container = self.team_composition_solver.team_composition_container_factory.get_team_composition_container(
-                tuple_db_result[1])
-
-            """
-            It's actually faster to make a TeamCompositionContainer object then get its traits rather than
-            the massive join table in SQLite as it's load time is very long.
-            """
-            # For each index with trait from the trait_pool
-            for index, trait in enumerate(self.team_composition_solver.trait_pool.dict_trait_pool):
-
-                """
-                # += 4 because the first 3 index are 
-                Team composition, Team Composition Size, and Trait Count Total
-                """
-                index += 4
-
-                # Team composition trait
-                team_composition_trait = None
-
-                # Use the dict_trait_count
-                if self.int_checkbutton_trait_count_total == 0:
-                    # Team composition trait
-                    team_composition_trait = tuple_team_composition_container.dict_trait_count.get(trait, False)
-
-                # Use the dict_trait_count_discrete
-                elif self.int_checkbutton_trait_count_total == 1:
-                    # Team composition trait
-                    team_composition_trait = tuple_team_composition_container.dict_trait_count_discrete.get(trait,
-                                                                                                            False)
-                # If the Team composition has the trait
-                if team_composition_trait is not False:
-                    list_temp.append(str(team_composition_trait))
-
-                # If it does not have the trait then leave the cell empty
-                else:
-                    list_temp.append("")
-
-            # Add the tuple to list of tuples to tbe inserted
-            self.list_tuples_to_be_inserted.append(list_temp)
-
-        # Enumerate each tuple containing the column_name_formatted and index_state
-        for index, tuple_column_name_index_state in enumerate(
-                self.dict_key_column_name_formatted_value_index_state.items()):
-
-            # Get the column name from the tuple to match the Treeview's Column name
-            column_name_formatted = tuple_column_name_index_state[0]
-
-            # print(self.dict_key_column_name_formatted_value_index_state.get(column_name_formatted))
-            # print(index)
-
-            # Handle the state 0 (No sort on column)
-            state_0 = 0
-            # Check the index_state of the given column_name
-            if self.dict_key_column_name_formatted_value_index_state.get(column_name_formatted) == state_0:
-                # Queue a self.tree_view.heading text change
-                self.queue_main_thread_methods.put(CallablePreservedContainer(
-                    self.tree_view.heading,
-                    column_name_formatted,
-                    text="{} {}".format(
-                        self.dict_key_column_name_formatted_value_column_name_full.get(
-                            column_name_formatted),
-                        self.dict_key_index_state_value_state_text.get(state_0))))
-
-            # Handle the state 0 (Sort Ascending)
-            state_1 = 1
-            # Check the index_state of the given column_name
-            if self.dict_key_column_name_formatted_value_index_state.get(column_name_formatted) == state_1:
-                # Sort the list of tuples by the tuple's index item using python's sorting algorithm
-                self.list_tuples_to_be_inserted.sort(key=lambda list_item: list_item[index])
-
-                # Queue a self.tree_view.heading text change
-                self.queue_main_thread_methods.put(CallablePreservedContainer(
-                    self.tree_view.heading,
-                    column_name_formatted,
-                    text="{} {}".format(
-                        self.dict_key_column_name_formatted_value_column_name_full.get(
-                            column_name_formatted),
-                        self.dict_key_index_state_value_state_text.get(state_1))))
-
-            # Handle the state 0 (Sort Descending)
-            state_2 = 2
-            # Check the index_state of the given column_name
-            if self.dict_key_column_name_formatted_value_index_state.get(column_name_formatted) == state_2:
-                # Sort the list of tuples by the tuple's index item in reverse using python's sorting algorithm
-                self.list_tuples_to_be_inserted.sort(key=lambda list_item: list_item[index], reverse=True)
-
-                # Queue a self.tree_view.heading text change
-                self.queue_main_thread_methods.put(CallablePreservedContainer(
-                    self.tree_view.heading,
-                    column_name_formatted,
-                    text="{} {}".format(
-                        self.dict_key_column_name_formatted_value_column_name_full.get(
-                            column_name_formatted),
-                        self.dict_key_index_state_value_state_text.get(state_2))))
+        # Format the tuples from self.list_tuple_db_result (Use the trait count discrete if the checkbutton is on)
+        list_tuples_to_be_inserted = get_list_tuples_to_be_inserted(
+            self.team_composition_solver.team_composition_container_factory,
+            self.list_tuple_db_result,
+            self.int_checkbutton_trait_count_total != 0)
+
+        # Sort by the columns that have a sort state
+        sort_list_tuples_to_be_inserted(
+            list_tuples_to_be_inserted,
+            ((index, index_state) for index, index_state in
+             enumerate(self.dict_key_column_name_formatted_value_index_state.values())))
+
+        self.list_tuples_to_be_inserted = list_tuples_to_be_inserted
+
+        # Queue a self.tree_view.heading text change for every column
+        for column_name_formatted, index_state in self.dict_key_column_name_formatted_value_index_state.items():
+            self.queue_main_thread_methods.put(CallablePreservedContainer(
+                self.tree_view.heading,
+                column_name_formatted,
+                text="{} {}".format(
+                    self.dict_key_column_name_formatted_value_column_name_full.get(
+                        column_name_formatted),
+                    self.dict_key_index_state_value_state_text.get(index_state))))
 
         # Add load_team_compositions to queue for the main thread
         self.add_load_team_compositions_to_thread_main_queue()
@@ -1314,7 +1389,7 @@ class TeamCompositionSolverGUI:
         """
         self.clear_tree_view()
 
-    @timer
+    @traced("gui.load_team_compositions")
     def load_team_compositions(self):
         """
         Insert the list of tuples that will be in the Treeview
@@ -1336,6 +1411,12 @@ class TeamCompositionSolverGUI:
         # Boolean to show if this method is out of the queue for the main thread
         self.bool_load_team_compositions_queued = False
 
+        # The result of the first query is shown
+        if self.startup_report.is_phase_pending(PHASE_FIRST_QUERY):
+            self.startup_report.end_phase(PHASE_FIRST_QUERY)
+
+            self._print_startup_report()
+
     def add_load_team_compositions_to_thread_main_queue(self):
         """
         Put self.load_team_compositions in queue only if it's not in queue
@@ -1368,8 +1449,10 @@ class ButtonChampionContainer:
         """
         self.team_composition_solver_gui = team_composition_solver_gui
         self.champion = champion
+        self.path_abs = path_abs
 
-        self.tk_photo_image = PhotoImage(file=path_abs)
+        # Blank icon of the same size until TeamCompositionSolverGUI.load_champion_icons gives the real icon
+        self.tk_photo_image = PhotoImage(width=CHAMPION_ICON_SIZE, height=CHAMPION_ICON_SIZE)
         self.tk_button = Button(team_composition_solver_gui.frame_left)
 
         self.tk_button.grid(row=position[0], column=position[1])
@@ -1388,6 +1471,31 @@ class ButtonChampionContainer:
         # Alternative bind
         # self.tk_button.bind('<Button-1>', self.toggle_selected_switch)
 
+    def set_photo_image(self, tk_photo_image: PhotoImage):
+        """
+        Replace the icon of the button (A reference to the PhotoImage must be kept or Tk removes the image)
+
+        :param tk_photo_image: icon of the champion
+        :return: None
+        """
+        self.tk_photo_image = tk_photo_image
+
+        self.tk_button.config(image=self.tk_photo_image)
+
+    def set_facet_count(self, facet_count: int):
+        """
+        Show the amount of team compositions of the query with the champion under its name, a champion that would
+        leave no team compositions has its name grayed out
+
+        :param facet_count: team compositions with the champion (None to only show the name)
+        :return: None
+        """
+        if facet_count is None:
+            self.tk_button.config(text=self.champion.name, fg="white")
+        else:
+            self.tk_button.config(text="{}\n{:,}".format(self.champion.name, facet_count),
+                                  fg="white" if facet_count else "gray")
+
     def toggle_selected_switch(self, *args):
         """
         Explicit toggle switch to determine if the button is toggled or not
@@ -12,13 +12,103 @@ PICKLE_SET_FROZENSET_NAME = r"resources/generated/TFT_Champion_Combinations_Pick
 
 FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION = r"resources/generated/champion_name_team_composition.db"
 
+# File names of the generated files (Used for the generated files in DIR_ARTIFACT_CACHE)
+NAME_PICKLE_LIST_TUPLE = "TFT_Champion_Combinations_Pickle_list_tuple.pickle"
+NAME_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION = "champion_name_team_composition.db"
+
+# Copy of the inputs the generated files were made with (Used by the incremental build)
+DIR_BUILD_RECORD = r"resources/generated/build_record"
+NAME_BUILD_RECORD_CHAMPIONS = "champions.json"
+NAME_BUILD_RECORD_TRAITS = "traits.json"
+NAME_BUILD_RECORD = "build_record.json"
+
+# Results of the incremental build (Not applied is when there is no build record to start from)
+INCREMENTAL_BUILD_UPDATED = "updated"
+INCREMENTAL_BUILD_UP_TO_DATE = "up_to_date"
+INCREMENTAL_BUILD_NOT_APPLIED = "not_applied"
+
+# Generated files stored by the hash of their inputs
+DIR_ARTIFACT_CACHE = r"resources/generated/cache"
+NAME_ARTIFACT_CACHE_MANIFEST = "manifest.json"
+
+# Increase when the search or the format of the generated files changes so old generated files are not reused
+ENGINE_VERSION = 1
+
 TEAM_COMPOSITION_SIZE_MIN = 0
 TEAM_COMPOSITION_SIZE_MAX = 9
 
 TRAIT_COUNT_DISCRETE_TOTAL_MIN = 0
 TRAIT_COUNT_TOTAL_MAX = 100
 
+# Amount of team compositions handled at a time by the batch operations (db loading, formatting)
+TEAM_COMPOSITION_BATCH_SIZE = 100000
+
 PATH_TRAITS = r"resources/official/traits.json"
 PATH_CHAMPIONS = r"resources/official/champions.json"
+PATH_ITEMS = r"resources/official/items.json"
 
 DIR_CHAMPION_ICONS = r"resources/official/champions"
+
+# Width and height of the champion icons
+CHAMPION_ICON_SIZE = 64
+
+# Champion icons decoded into a single sprite sheet (Used by the GUI at startup)
+DIR_SPRITE_CACHE = r"resources/generated/sprite_cache"
+NAME_SPRITE_CACHE_CHAMPION_ICONS = "champion_icons.ppm"
+NAME_SPRITE_CACHE_CHAMPION_ICONS_INDEX = "champion_icons.json"
+
+# Slow queries of a db with their query plan (Next to the db file)
+NAME_SLOW_QUERY_LOG = "slow_query_log.jsonl"
+
+# Roaring bitmap posting lists of the champions of a db (Next to the db file, see PostingIndex)
+NAME_POSTING_INDEX = "champion_posting_index.roaring"
+
+# Read only connections of the db used by the queries (SQLiteConnectionPool)
+SQLITE_CONNECTION_POOL_SIZE = 4
+
+# Bytes of the db memory mapped by every read only connection (Larger than the 11 GB db)
+SQLITE_MMAP_SIZE = 1 << 34
+
+# Page cache of every read only connection in KiB
+SQLITE_CACHE_SIZE_KIB = 1 << 16
+
+# Headless query service (TeamCompositionQueryServer), only serves localhost by default
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+
+# Requests handled at the same time and requests waiting for a worker before new requests are refused with 503
+SERVER_WORKERS = 4
+SERVER_QUEUE_SIZE = 16
+
+# Sec before a request (Reading it or its query) is abandoned
+SERVER_REQUEST_TIMEOUT_SEC = 30.0
+
+# Query results kept by the server
+SERVER_CACHE_SIZE = 256
+
+# Shop of the ShopSimulator (Set 3), champions in a shop and gold of a reroll
+SHOP_SLOTS = 5
+SHOP_REROLL_COST = 2
+
+# Player level -> percent odds of a shop slot being a champion of cost 1 to 5
+DICT_KEY_LEVEL_VALUE_TUPLE_SHOP_ODDS = {
+    1: (100, 0, 0, 0, 0),
+    2: (100, 0, 0, 0, 0),
+    3: (75, 25, 0, 0, 0),
+    4: (55, 30, 15, 0, 0),
+    5: (40, 35, 20, 5, 0),
+    6: (25, 35, 30, 10, 0),
+    7: (19, 30, 35, 15, 1),
+    8: (14, 20, 35, 25, 6),
+    9: (10, 15, 30, 30, 15),
+}
+
+# Copies of every champion of cost 1 to 5 in the shared pool
+TUPLE_SHOP_POOL_SIZE = (29, 22, 18, 12, 10)
+
+# Trials of every team composition and rerolls before a trial gives up
+SHOP_TRIALS = 1000
+SHOP_REROLLS_MAX = 1000
+
+# Groups of an upgrade path page (SupersetIndex)
+UPGRADE_PATH_PAGE_SIZE = 50
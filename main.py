@@ -6,24 +6,98 @@ Purpose:
     Calculates the possible team composition combinations to create the .pickle file and the .db file if not created.
     else
     Runs the GUI if the .db and .pickle file are created.
+
+    The .pickle file and the .db file are stored in the ArtifactCache by the hash of champions.json, traits.json, the
+    team composition size and the engine version, generated files from another patch are never reused.
+
+    python main.py --serve runs the TeamCompositionQueryServer (Headless HTTP/JSON queries) instead of the GUI.
 """
+import argparse
 import os
 
+from Teamfight_Tactics_Composition_Solver.ArtifactCache import ArtifactCache
+from Teamfight_Tactics_Composition_Solver.StartupReport import StartupReport
+from Teamfight_Tactics_Composition_Solver.TeamCompositionQueryServer import TeamCompositionQueryServer
 from Teamfight_Tactics_Composition_Solver.TeamCompositionSolver import TeamCompositionSolver
 from Teamfight_Tactics_Composition_Solver.TeamCompositionSolverGUI import TeamCompositionSolverGUI
-from Teamfight_Tactics_Composition_Solver.constants import PATH_CHAMPIONS, PATH_TRAITS, \
-    FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION
+from Teamfight_Tactics_Composition_Solver.constants import PATH_CHAMPIONS, PATH_TRAITS, SERVER_HOST, SERVER_PORT, \
+    SERVER_WORKERS, SERVER_REQUEST_TIMEOUT_SEC, INCREMENTAL_BUILD_NOT_APPLIED
+
+TEAM_COMPOSITION_SIZE = 4
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Teamfight Tactics team composition solver")
+    parser.add_argument("--serve", action="store_true", help="serve the queries over HTTP instead of running the GUI")
+    parser.add_argument("--host", default=SERVER_HOST, help="host of the server")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="port of the server")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help="requests handled at the same time")
+    parser.add_argument("--timeout", type=float, default=SERVER_REQUEST_TIMEOUT_SEC, help="sec before a request fails")
+
+    namespace = parser.parse_args()
+
+    # Time of every phase of the startup (Printed by the GUI once it has shown its first query)
+    startup_report = StartupReport()
+
+    startup_report.start_phase("Artifact cache")
+
+    # Cache of the generated files
+    artifact_cache = ArtifactCache()
+
+    # Key of the generated files for the current inputs
+    dict_key_input = artifact_cache.get_dict_key_input(PATH_CHAMPIONS, PATH_TRAITS, TEAM_COMPOSITION_SIZE)
+    key = artifact_cache.get_key(dict_key_input)
+
+    bool_entry_valid = artifact_cache.is_entry_valid(key)
+
+    # Newest generated files of another patch to start an incremental build from
+    key_latest = None
+
+    if not bool_entry_valid:
+        key_latest = artifact_cache.get_key_latest(TEAM_COMPOSITION_SIZE)
+
+        if key_latest is not None:
+            artifact_cache.copy_entry(key_latest, key)
+
+        os.makedirs(artifact_cache.get_dir_entry(key), exist_ok=True)
+
+    startup_report.end_phase("Artifact cache")
+
+    startup_report.start_phase("TeamCompositionSolver")
 
     # Creates a team_composition solver object
-    team_composition_solver = TeamCompositionSolver(PATH_CHAMPIONS, PATH_TRAITS)
+    team_composition_solver = TeamCompositionSolver(PATH_CHAMPIONS,
+                                                    PATH_TRAITS,
+                                                    artifact_cache.get_path_pickle_list_tuple(key),
+                                                    artifact_cache.get_path_db(key),
+                                                    artifact_cache.get_dir_build_record(key),
+                                                    # A valid entry is a published build that is never changed
+                                                    bool_db_immutable=bool_entry_valid)
+
+    startup_report.end_phase("TeamCompositionSolver")
 
     # Does calculation if necessary
-    if not os.path.exists(FILE_SQLITE_DB_CHAMPION_NAME_TEAM_COMPOSITION):
-        # Do not run this unless you want to calculate all possible useful team compositions
-        team_composition_solver.run_complete_calculation_list_tuple(4)
+    if not bool_entry_valid:
+        if key_latest is not None:
+            # Apply the changes of the new patch (champions.json or traits.json) to a copy of the latest generated files
+            print("Updating generated files {} to {}".format(key_latest, key))
+            # An up to date build (The changes do not change the generated files) is as valid as an updated one
+            if team_composition_solver.run_incremental_calculation_list_tuple() != INCREMENTAL_BUILD_NOT_APPLIED:
+                artifact_cache.add_entry(key, dict_key_input)
+
+        else:
+            # Do not run this unless you want to calculate all possible useful team compositions
+            if team_composition_solver.run_complete_calculation_list_tuple(TEAM_COMPOSITION_SIZE):
+                artifact_cache.add_entry(key, dict_key_input)
+            exit(0)
+
+    if namespace.serve:
+        team_composition_query_server = TeamCompositionQueryServer(team_composition_solver,
+                                                                   namespace.host,
+                                                                   namespace.port,
+                                                                   namespace.workers,
+                                                                   timeout=namespace.timeout)
+        team_composition_query_server.serve_forever()
         exit(0)
 
     print("Running GUI")
-    team_composition_solver_gui = TeamCompositionSolverGUI(team_composition_solver)
+    team_composition_solver_gui = TeamCompositionSolverGUI(team_composition_solver, startup_report)
@@ -0,0 +1,135 @@
+"""
+10/19/2026
+
+Purpose:
+    Tests of TeamCompositionSolver.run_incremental_calculation_list_tuple
+
+Important Note:
+    The generated files are built in a temp dir from a copy of the official json files.
+
+        python -m unittest Teamfight_Tactics_Composition_Solver.tests.test_incremental_calculation
+
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from Teamfight_Tactics_Composition_Solver.ChamptionPool import ChampionPool
+from Teamfight_Tactics_Composition_Solver.PoolDifference import PoolDifference
+from Teamfight_Tactics_Composition_Solver.TeamCompositionSolver import TeamCompositionSolver
+from Teamfight_Tactics_Composition_Solver.TraitPool import TraitPool
+from Teamfight_Tactics_Composition_Solver.constants import PATH_CHAMPIONS, PATH_TRAITS, INCREMENTAL_BUILD_UPDATED, \
+    INCREMENTAL_BUILD_UP_TO_DATE, NAME_BUILD_RECORD_CHAMPIONS
+
+# Directory of the package (The paths of constants are relative to it)
+DIR_PACKAGE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Team comp size of the generated files of the tests
+TEAM_COMPOSITION_SIZE = 3
+
+
+class TestIncrementalCalculation(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_temp = tempfile.mkdtemp(prefix="tft_test_incremental_")
+
+        self.path_champions = os.path.join(self.dir_temp, "champions.json")
+        self.path_traits = os.path.join(self.dir_temp, "traits.json")
+
+        shutil.copyfile(os.path.join(DIR_PACKAGE, PATH_CHAMPIONS), self.path_champions)
+        shutil.copyfile(os.path.join(DIR_PACKAGE, PATH_TRAITS), self.path_traits)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_temp, ignore_errors=True)
+
+    def _get_team_composition_solver(self) -> TeamCompositionSolver:
+        return TeamCompositionSolver(self.path_champions,
+                                     self.path_traits,
+                                     os.path.join(self.dir_temp, "list_tuple.pickle"),
+                                     os.path.join(self.dir_temp, "team_composition.db"),
+                                     os.path.join(self.dir_temp, "build_record"))
+
+    @staticmethod
+    def _get_set_frozenset_team_composition_db(team_composition_solver: TeamCompositionSolver) -> set:
+        """
+        Team compositions of the db decoded to champion names with the champion ids of team_composition_solver
+        """
+        get_tuple_champion_name = team_composition_solver.champion_trait_index.get_tuple_champion_name
+
+        sqlite_handler = team_composition_solver.sqlite_handler_team_composition_solver
+
+        set_frozenset_team_composition = {
+            frozenset(get_tuple_champion_name(tuple_champion_ids)) for tuple_champion_ids, _ in
+            sqlite_handler.get_iter_tuple_champion_ids_trait_count_discrete_total()}
+
+        sqlite_handler.connection.close()
+
+        return set_frozenset_team_composition
+
+    def _build(self) -> TeamCompositionSolver:
+        team_composition_solver = self._get_team_composition_solver()
+        team_composition_solver._create_pickle_list_tuple_compositions_combinations(TEAM_COMPOSITION_SIZE)
+        team_composition_solver._run_complete_calculation_list_tuple_faster_operations(TEAM_COMPOSITION_SIZE)
+
+        return team_composition_solver
+
+    def test_reordered_champions_are_remapped(self):
+        team_composition_solver = self._build()
+
+        set_frozenset_team_composition_old = self._get_set_frozenset_team_composition_db(team_composition_solver)
+
+        self.assertTrue(set_frozenset_team_composition_old)
+
+        # Same champions in the reverse order (Every champion id changes)
+        with open(self.path_champions) as file:
+            list_champions = json.load(file)
+
+        with open(self.path_champions, "w") as file:
+            json.dump(list_champions[::-1], file)
+
+        pool_difference = PoolDifference(team_composition_solver.champion_pool,
+                                         team_composition_solver.trait_pool,
+                                         ChampionPool(self.path_champions),
+                                         TraitPool(self.path_traits))
+
+        self.assertTrue(pool_difference.bool_champion_id_changed)
+        self.assertFalse(pool_difference.is_empty())
+
+        team_composition_solver = self._get_team_composition_solver()
+
+        self.assertEqual(team_composition_solver.run_incremental_calculation_list_tuple(), INCREMENTAL_BUILD_UPDATED)
+
+        self.assertEqual(self._get_set_frozenset_team_composition_db(team_composition_solver),
+                         set_frozenset_team_composition_old)
+
+    def test_cost_change_is_up_to_date(self):
+        team_composition_solver = self._build()
+
+        set_frozenset_team_composition_old = self._get_set_frozenset_team_composition_db(team_composition_solver)
+
+        # The cost is not used by the search or the db
+        with open(self.path_champions) as file:
+            list_champions = json.load(file)
+
+        list_champions[0]["cost"] += 1
+
+        with open(self.path_champions, "w") as file:
+            json.dump(list_champions, file)
+
+        team_composition_solver = self._get_team_composition_solver()
+
+        self.assertEqual(team_composition_solver.run_incremental_calculation_list_tuple(),
+                         INCREMENTAL_BUILD_UP_TO_DATE)
+
+        self.assertEqual(self._get_set_frozenset_team_composition_db(team_composition_solver),
+                         set_frozenset_team_composition_old)
+
+        # The build record is of the current champions.json
+        with open(os.path.join(self.dir_temp, "build_record", NAME_BUILD_RECORD_CHAMPIONS)) as file:
+            self.assertEqual(json.load(file), list_champions)
+
+
+if __name__ == '__main__':
+    unittest.main()